@@ -0,0 +1,131 @@
+"""
+资源文件存储模块
+
+按内容哈希发布嵌入的资源文件：未变化的资源不重复复制，
+内容相同的资源在磁盘上只保存一份（硬链接到已有副本）
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from .base import logger
+
+# 资源清单文件名（位于资源目录）
+ASSET_MANIFEST_NAME = ".asset_manifest.json"
+
+ASSET_MANIFEST_VERSION = 1
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class AssetStore:
+    """基于内容哈希的资源文件存储"""
+
+    def __init__(self, target_dir: Union[str, Path]):
+        """
+        初始化资源存储
+
+        Args:
+            target_dir: 资源输出目录
+        """
+        self.target_dir = Path(target_dir)
+        self.manifest_path = self.target_dir / ASSET_MANIFEST_NAME
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._entries: Dict[str, Dict[str, Any]] = self._load_manifest()
+        # 内容哈希到资源文件名的索引，用于去重
+        self._by_digest: Dict[str, str] = {entry["sha256"]: name for name, entry in self._entries.items() if entry.get("sha256")}
+
+    def publish(self, source_path: Union[str, Path], name: str) -> Optional[Path]:
+        """
+        发布资源文件，内容未变化时跳过复制
+
+        Args:
+            source_path: 源文件路径
+            name: 资源在输出目录中的文件名
+
+        Returns:
+            输出文件路径，源文件不存在时返回None
+        """
+        source_path = Path(source_path)
+        target_path = self.target_dir / name
+        with self._lock:
+            try:
+                stat = source_path.stat()
+            except OSError:
+                return None
+
+            # 修改时间和大小未变化时只需一次stat
+            entry = self._entries.get(name)
+            if entry and target_path.exists() and (entry.get("mtime_ns"), entry.get("size")) == (stat.st_mtime_ns, stat.st_size):
+                return target_path
+
+            digest = _file_digest(source_path)
+            if entry and entry.get("sha256") == digest and target_path.exists():
+                # 只是修改时间变化
+                self._remember(name, stat, digest)
+                return target_path
+
+            self._write(source_path, target_path, digest)
+            self._remember(name, stat, digest)
+            return target_path
+
+    def save(self) -> None:
+        """原子写入资源清单（无变化时跳过）"""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {"version": ASSET_MANIFEST_VERSION, "assets": self._entries}
+            self.target_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.manifest_path.with_name(f"{ASSET_MANIFEST_NAME}.tmp")
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(tmp_path, self.manifest_path)
+                self._dirty = False
+            except OSError as e:
+                logger.warning(f"写入资源清单失败: {e}")
+
+    def _write(self, source_path: Path, target_path: Path, digest: str) -> None:
+        """写入目标文件，已有相同内容的副本时创建硬链接"""
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target_path.with_name(f".{target_path.name}.tmp")
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+        other = self._by_digest.get(digest)
+        duplicate = self.target_dir / other if other else None
+        if duplicate is not None and duplicate != target_path and self._entries.get(other, {}).get("sha256") == digest and duplicate.exists():
+            try:
+                os.link(duplicate, tmp_path)
+            except OSError:
+                shutil.copy2(source_path, tmp_path)
+        else:
+            shutil.copy2(source_path, tmp_path)
+        os.replace(tmp_path, target_path)
+
+    def _remember(self, name: str, stat: os.stat_result, digest: str) -> None:
+        self._entries[name] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": digest}
+        self._by_digest[digest] = name
+        self._dirty = True
+
+    def _load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != ASSET_MANIFEST_VERSION:
+            return {}
+        return data.get("assets", {})
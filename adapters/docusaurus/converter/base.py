@@ -7,6 +7,7 @@ Obsidian到Docusaurus转换基础模块
 import logging
 import os
 import re
+import threading
 from pathlib import Path
 from typing import Dict, Optional, Union
 
@@ -28,6 +29,9 @@ class BaseConverter:
     # Obsidian嵌入模式: ![[文件名]]
     OBSIDIAN_EMBED_PATTERN = r"!\[\[([^\]|#]+)(?:#([^\]|]+))?(?:\|([^\]]+))?\]\]"
 
+    # 链接和嵌入的合并模式，第一组为嵌入标记"!"，用于单遍改写
+    OBSIDIAN_TOKEN_PATTERN = r"(!?)\[\[([^\]|#]+)(?:#([^\]|]+))?(?:\|([^\]]+))?\]\]"
+
     def __init__(
         self,
         obsidian_dir: Union[str, Path],
@@ -53,9 +57,12 @@ class BaseConverter:
         # 编译正则表达式
         self.obsidian_link_regex = re.compile(self.OBSIDIAN_LINK_PATTERN)
         self.obsidian_embed_regex = re.compile(self.OBSIDIAN_EMBED_PATTERN)
+        self.obsidian_token_regex = re.compile(self.OBSIDIAN_TOKEN_PATTERN)
 
-        # 存储文件映射
+        # 存储文件映射，以及用于增量重建的目录条目
         self.file_mapping = {}
+        self._mapping_dirs = {}
+        self._mapping_lock = threading.RLock()
 
     def is_image_file(self, filename: str) -> bool:
         """
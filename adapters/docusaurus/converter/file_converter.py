@@ -80,4 +80,5 @@ class FileConverter(LinkConverter):
             else:
                 failure_count += 1
 
+        self.save_caches()
         return success_count, failure_count
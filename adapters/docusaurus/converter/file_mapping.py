@@ -1,14 +1,22 @@
 """
 文件映射模块
 
-处理Obsidian和Docusaurus之间的文件映射关系
+处理Obsidian和Docusaurus之间的文件映射关系.
+映射按目录修改时间缓存在磁盘上，重建时只重新扫描发生变化的目录.
 """
 
+import json
+import os
 from pathlib import Path
-from typing import Dict
+from typing import Any, Dict, Iterable, Optional
 
 from .base import BaseConverter, logger
 
+# 映射缓存文件名（位于Docusaurus文档目录）
+MAPPING_CACHE_NAME = ".vibe_file_mapping.json"
+
+MAPPING_CACHE_VERSION = 1
+
 
 class FileMappingHandler(BaseConverter):
     """文件映射处理器"""
@@ -17,27 +25,66 @@ class FileMappingHandler(BaseConverter):
         """
         构建Obsidian文件路径与文件的映射
 
+        目录的修改时间未变化时直接复用缓存的目录条目（文件的增删和重命名都会
+        更新所在目录的修改时间），因此大库中只有变化的目录会被重新扫描.
+
         Returns:
             文件名到文件路径的映射
         """
-        file_mapping = {}
+        with self._mapping_lock:
+            cached_dirs = self._load_mapping_cache()
+            dirs: Dict[str, Dict[str, Any]] = {}
+            scanned = 0
 
-        # 遍历所有Markdown文件
-        for md_file in self.obsidian_dir.glob("**/*.md"):
-            # 只跳过.obsidian配置目录和assets目录，而不是路径中包含这些名称的所有目录
-            if (
-                md_file.name == ".obsidian"
-                or md_file.parent.name == ".obsidian"
-                or md_file.parent.name == "assets"
-            ):
-                continue
-
-            # 使用文件名作为键（去除扩展名）
-            file_mapping[md_file.stem] = md_file.relative_to(self.obsidian_dir)
-
-        self.file_mapping = file_mapping
-        logger.info(f"构建了 {len(file_mapping)} 个文件的映射")
-        return file_mapping
+            pending = [""]
+            while pending:
+                rel_dir = pending.pop()
+                entry = self._scan_directory(rel_dir, cached_dirs.get(rel_dir))
+                if entry is None:
+                    continue
+                if entry is not cached_dirs.get(rel_dir):
+                    scanned += 1
+                dirs[rel_dir] = entry
+                pending.extend(f"{rel_dir}/{name}" if rel_dir else name for name in entry["dirs"])
+
+            self._mapping_dirs = dirs
+            self.file_mapping = self._mapping_from_dirs(dirs)
+            if scanned or len(dirs) != len(cached_dirs):
+                self._save_mapping_cache()
+
+        logger.info(f"构建了 {len(self.file_mapping)} 个文件的映射（重新扫描 {scanned} 个目录）")
+        return self.file_mapping
+
+    def update_file_mapping(self, added: Iterable[str] = (), removed: Iterable[str] = ()) -> Dict[str, Path]:
+        """
+        按已知的文件增删增量更新映射，无需重新遍历目录
+
+        Args:
+            added: 新增的文件（相对于obsidian_dir）
+            removed: 删除的文件（相对于obsidian_dir）
+
+        Returns:
+            更新后的映射
+        """
+        self.ensure_file_mapping()
+        with self._mapping_lock:
+            for rel_path in removed:
+                path = Path(rel_path)
+                entry = self._mapping_dirs.get(self._dir_key(path.parent))
+                if entry and path.name in entry["files"]:
+                    entry["files"].remove(path.name)
+                    # 目录内容已变化，下次构建时重新扫描
+                    entry["mtime_ns"] = None
+            for rel_path in added:
+                path = Path(rel_path)
+                if not self._is_mapped_file(path):
+                    continue
+                entry = self._mapping_dirs.setdefault(self._dir_key(path.parent), {"mtime_ns": None, "files": [], "dirs": []})
+                if path.name not in entry["files"]:
+                    entry["files"].append(path.name)
+                    entry["mtime_ns"] = None
+            self.file_mapping = self._mapping_from_dirs(self._mapping_dirs)
+        return self.file_mapping
 
     def get_file_by_name(self, filename: str) -> Path:
         """
@@ -62,3 +109,77 @@ class FileMappingHandler(BaseConverter):
         """
         if not self.file_mapping:
             self.build_file_mapping()
+
+    @property
+    def mapping_cache_path(self) -> Path:
+        """映射缓存文件路径"""
+        return self.docusaurus_dir / MAPPING_CACHE_NAME
+
+    def _scan_directory(self, rel_dir: str, cached: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """扫描单个目录，修改时间未变化时返回缓存条目"""
+        directory = self.obsidian_dir / rel_dir if rel_dir else self.obsidian_dir
+        try:
+            mtime_ns = directory.stat().st_mtime_ns
+        except OSError:
+            return None
+        if cached and cached.get("mtime_ns") == mtime_ns:
+            return cached
+
+        files, dirs = [], []
+        try:
+            with os.scandir(directory) as it:
+                for item in it:
+                    if item.is_dir(follow_symlinks=False):
+                        # 跳过 .obsidian、.git 等隐藏目录
+                        if not item.name.startswith("."):
+                            dirs.append(item.name)
+                    elif item.name.endswith(".md") and self._is_mapped_file(Path(rel_dir) / item.name):
+                        files.append(item.name)
+        except OSError as e:
+            logger.warning(f"无法扫描目录 {directory}: {e}")
+            return None
+        return {"mtime_ns": mtime_ns, "files": sorted(files), "dirs": sorted(dirs)}
+
+    @staticmethod
+    def _is_mapped_file(path: Path) -> bool:
+        # 只跳过.obsidian配置目录和assets目录，而不是路径中包含这些名称的所有目录
+        return path.suffix == ".md" and path.name != ".obsidian" and path.parent.name not in (".obsidian", "assets")
+
+    @staticmethod
+    def _dir_key(path: Path) -> str:
+        key = path.as_posix()
+        return "" if key == "." else key
+
+    @staticmethod
+    def _mapping_from_dirs(dirs: Dict[str, Dict[str, Any]]) -> Dict[str, Path]:
+        # 使用文件名作为键（去除扩展名），按路径排序使同名文件的选择稳定
+        file_mapping = {}
+        for rel_dir in sorted(dirs):
+            for name in dirs[rel_dir]["files"]:
+                rel_path = Path(rel_dir) / name if rel_dir else Path(name)
+                file_mapping[rel_path.stem] = rel_path
+        return file_mapping
+
+    def _load_mapping_cache(self) -> Dict[str, Dict[str, Any]]:
+        """读取映射缓存，优先使用内存中的目录条目"""
+        if self._mapping_dirs:
+            return self._mapping_dirs
+        try:
+            with open(self.mapping_cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != MAPPING_CACHE_VERSION or data.get("root") != str(self.obsidian_dir.resolve()):
+            return {}
+        return data.get("dirs", {})
+
+    def _save_mapping_cache(self) -> None:
+        """原子写入映射缓存"""
+        data = {"version": MAPPING_CACHE_VERSION, "root": str(self.obsidian_dir.resolve()), "dirs": self._mapping_dirs}
+        tmp_path = self.mapping_cache_path.with_name(f"{MAPPING_CACHE_NAME}.tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.mapping_cache_path)
+        except OSError as e:
+            logger.warning(f"写入文件映射缓存失败: {e}")
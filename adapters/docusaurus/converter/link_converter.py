@@ -4,17 +4,38 @@
 处理Obsidian链接到Docusaurus链接的转换
 """
 
-import shutil
 from pathlib import Path
-from typing import Union
+from typing import Optional, Union
 
-from .base import BaseConverter, logger
+from .asset_store import AssetStore
+from .base import logger
 from .file_mapping import FileMappingHandler
 
 
 class LinkConverter(FileMappingHandler):
     """链接转换器"""
 
+    def __init__(
+        self,
+        obsidian_dir: Union[str, Path],
+        docusaurus_dir: Union[str, Path],
+        assets_dir: Optional[str] = None,
+    ):
+        """
+        初始化链接转换器
+
+        Args:
+            obsidian_dir: Obsidian文档目录
+            docusaurus_dir: Docusaurus文档目录
+            assets_dir: 资源文件目录
+        """
+        super().__init__(obsidian_dir, docusaurus_dir, assets_dir)
+        self.asset_store = AssetStore(self.docusaurus_dir / "assets")
+
+    def save_caches(self) -> None:
+        """保存资源清单（文件映射缓存在重建时已写入）"""
+        self.asset_store.save()
+
     def convert_links(self, content: str, file_path: Path) -> str:
         """
         转换Obsidian链接为Docusaurus链接
@@ -33,21 +54,15 @@ class LinkConverter(FileMappingHandler):
 
         # 转换嵌入内容
         def embed_replacer(match):
-            target_file = match.group(1).strip()
-            display_text = match.group(3) or ""
+            target_file = match.group(2).strip()
+            display_text = match.group(4) or ""
 
             # 如果有扩展名且是图片
             if self.is_image_file(target_file):
-                # 复制资源文件
+                # 发布资源文件（内容未变化时不重复复制）
                 source_path = self.assets_dir / target_file
-                if source_path.exists():
-                    # 目标路径
+                if self.asset_store.publish(source_path, target_file) is not None:
                     rel_assets_dir = Path("assets")
-                    target_assets_dir = self.docusaurus_dir / rel_assets_dir
-                    target_assets_dir.mkdir(parents=True, exist_ok=True)
-
-                    # 复制文件
-                    shutil.copy2(source_path, target_assets_dir / target_file)
 
                     # 构建相对路径
                     rel_path = f"/{rel_assets_dir}/{target_file}"
@@ -80,9 +95,9 @@ class LinkConverter(FileMappingHandler):
 
         # 转换普通链接
         def link_replacer(match):
-            target_file = match.group(1).strip()
-            section = match.group(2)
-            display_text = match.group(3) or target_file
+            target_file = match.group(2).strip()
+            section = match.group(3)
+            display_text = match.group(4) or target_file
 
             # 查找目标文件
             if target_file in self.file_mapping:
@@ -99,8 +114,10 @@ class LinkConverter(FileMappingHandler):
                 logger.warning(f"链接的文档未找到: {target_file}")
                 return f"[{display_text} (链接不存在)](#{target_file.lower().replace(' ', '-')})"
 
-        # 先处理嵌入，再处理普通链接
-        content = self.obsidian_embed_regex.sub(embed_replacer, content)
-        content = self.obsidian_link_regex.sub(link_replacer, content)
+        # 单遍扫描，按是否带"!"分派到嵌入或普通链接的改写
+        def token_replacer(match):
+            if match.group(1):
+                return embed_replacer(match)
+            return link_replacer(match)
 
-        return content
+        return self.obsidian_token_regex.sub(token_replacer, content)
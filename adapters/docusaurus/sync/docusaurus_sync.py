@@ -4,22 +4,39 @@ Docusaurus同步工具 - 将Obsidian文档同步到Docusaurus.
 监控Obsidian文档变更，自动转换并同步到Docusaurus文档目录.
 """
 
+import hashlib
+import json
 import logging
 import os
-import shutil
-import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
-from ..converters.index_generator import IndexGenerator
-from ..converters.link_converter import LinkConverter
+from ..converter.link_converter import LinkConverter
+from ..index_generator import IndexGenerator
+
+# 同步清单文件名（位于Docusaurus文档目录）
+MANIFEST_FILENAME = ".vibe_sync_manifest.json"
+
+MANIFEST_VERSION = 1
+
+# 每批读入内存的文档数，读写在线程池中进行，链接转换串行执行
+IO_BATCH_SIZE = 256
+
+
+def _hash_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
 
 
 class DocusaurusSync:
     """Obsidian到Docusaurus的文档同步工具."""
 
     def __init__(
-        self, obsidian_dir: str, docusaurus_dir: str, exclude_patterns: Optional[List[str]] = None
+        self,
+        obsidian_dir: str,
+        docusaurus_dir: str,
+        exclude_patterns: Optional[List[str]] = None,
+        max_workers: Optional[int] = None,
     ):
         """
         初始化Docusaurus同步工具.
@@ -28,12 +45,14 @@ class DocusaurusSync:
             obsidian_dir: Obsidian文档根目录
             docusaurus_dir: Docusaurus文档目录
             exclude_patterns: 要排除的文件/目录模式列表
+            max_workers: 并行读写文件的线程数
         """
         self.obsidian_dir = Path(obsidian_dir)
         self.docusaurus_dir = Path(docusaurus_dir)
         self.exclude_patterns = exclude_patterns or [".obsidian/**", ".git/**", "**/.DS_Store"]
+        self.max_workers = max_workers
 
-        self.link_converter = LinkConverter(obsidian_dir)
+        self.link_converter = LinkConverter(obsidian_dir, docusaurus_dir)
         self.index_generator = IndexGenerator(docusaurus_dir)
 
         self.logger = logging.getLogger("docusaurus_sync")
@@ -41,12 +60,22 @@ class DocusaurusSync:
         # 确保目标目录存在
         self.docusaurus_dir.mkdir(parents=True, exist_ok=True)
 
-    def sync_all(self) -> Dict[str, int]:
+        # 同步清单：源文件哈希、输出哈希和链接依赖
+        self.manifest_path = self.docusaurus_dir / MANIFEST_FILENAME
+        self.manifest = self._load_manifest()
+
+    def sync_all(self, force: bool = False) -> Dict[str, int]:
         """
-        同步所有文档.
+        增量同步所有文档.
+
+        只转换新增、内容变化、输出被改动或链接目标被重命名/移动的笔记，
+        并且只重建受影响目录的索引文件.
+
+        Args:
+            force: 是否忽略清单，重新转换所有文档
 
         Returns:
-            同步统计信息字典 {'added': n, 'updated': n, 'deleted': n}
+            同步统计信息字典 {'added': n, 'updated': n, 'deleted': n, 'unchanged': n}
         """
         # 获取Obsidian和Docusaurus中的所有文档
         obsidian_files = self._get_all_markdown_files(self.obsidian_dir)
@@ -58,20 +87,76 @@ class DocusaurusSync:
             self._to_relative_path(p, self.docusaurus_dir) for p in docusaurus_files
         }
 
+        # 链接目标路径发生变化的名称（新增、删除、重命名或移动）
+        mapping = {name: Path(path).as_posix() for name, path in self.link_converter.build_file_mapping().items()}
+        previous_mapping = self.manifest.get("mapping", {})
+        changed_names = {name for name in set(mapping) | set(previous_mapping) if mapping.get(name) != previous_mapping.get(name)}
+
         # 计算需要添加、更新和删除的文件
+        entries = self.manifest["files"]
         to_add = obsidian_relative - docusaurus_relative
-        to_update = obsidian_relative.intersection(docusaurus_relative)
-        to_delete = docusaurus_relative - obsidian_relative
+        to_update = set()
+        for rel_path in obsidian_relative & docusaurus_relative:
+            if force or self._needs_conversion(rel_path, entries.get(rel_path), changed_names):
+                to_update.add(rel_path)
+        to_delete = {p for p in docusaurus_relative - obsidian_relative if Path(p).name != self.index_generator.index_filename}
 
         # 执行同步操作
         added = self._sync_files(to_add, "add")
         updated = self._sync_files(to_update, "update")
         deleted = self._delete_files(to_delete)
+        for rel_path in set(entries) - obsidian_relative:
+            entries.pop(rel_path, None)
+
+        # 只重建受影响目录的索引
+        affected_dirs = {str(Path(rel_path).parent) for rel_path in to_add | to_update | to_delete}
+        self._regenerate_indexes(affected_dirs)
+
+        self.manifest["mapping"] = mapping
+        self._save_manifest()
 
-        # 生成索引文件
-        self.generate_indexes()
+        unchanged = len(obsidian_relative) - len(to_add) - len(to_update)
+        return {"added": added, "updated": updated, "deleted": deleted, "unchanged": unchanged}
 
-        return {"added": added, "updated": updated, "deleted": deleted}
+    def sync_changes(self, changes: Any) -> Dict[str, int]:
+        """
+        批量同步一组已合并的变更（如文件监控产生的ChangeBatch）.
+
+        只在有文件新增、删除或移动时重建链接映射，并额外重新转换链接到
+        这些文件的笔记；索引和清单在整批处理完后各写一次.
+
+        Args:
+            changes: 具有created、modified、deleted集合和moved字典(旧路径->新路径)的变更对象
+
+        Returns:
+            同步统计信息字典 {'converted': n, 'deleted': n}
+        """
+        moved = dict(changes.moved)
+        to_convert = {p for p in set(changes.created) | set(changes.modified) | set(moved.values()) if not self._is_excluded(p)}
+        to_delete = (set(changes.deleted) | set(moved)) - to_convert
+
+        entries = self.manifest["files"]
+        if changes.created or changes.deleted or moved:
+            # 文件集合变化时才需要重建映射，并找出链接目标路径变化的笔记
+            file_mapping = self.link_converter.update_file_mapping(
+                added=set(changes.created) | set(moved.values()), removed=set(changes.deleted) | set(moved)
+            )
+            mapping = {name: Path(path).as_posix() for name, path in file_mapping.items()}
+            previous_mapping = self.manifest.get("mapping", {})
+            changed_names = {name for name in set(mapping) | set(previous_mapping) if mapping.get(name) != previous_mapping.get(name)}
+            for rel_path, entry in entries.items():
+                if rel_path not in to_delete and changed_names.intersection(entry.get("links", [])):
+                    to_convert.add(rel_path)
+            self.manifest["mapping"] = mapping
+
+        deleted = self._delete_files(to_delete)
+        for rel_path in to_delete:
+            entries.pop(rel_path, None)
+        converted = self._sync_files(to_convert, "update")
+
+        self._regenerate_indexes({str(Path(rel_path).parent) for rel_path in to_convert | to_delete})
+        self._save_manifest()
+        return {"converted": converted, "deleted": deleted}
 
     def sync_file(self, file_path: str) -> bool:
         """
@@ -80,39 +165,204 @@ class DocusaurusSync:
         Args:
             file_path: 要同步的文件路径(相对于obsidian_dir)
 
+        Returns:
+            同步是否成功
+        """
+        if not self._convert_file(file_path):
+            return False
+
+        # 尝试生成目录索引
+        self._regenerate_indexes({str(Path(file_path).parent)})
+        self._save_manifest()
+        return True
+
+    def _convert_file(self, file_path: str) -> bool:
+        """
+        转换单个文件并更新清单条目（不重建索引、不保存清单）.
+
+        Args:
+            file_path: 要同步的文件路径(相对于obsidian_dir)
+
+        Returns:
+            同步是否成功
+        """
+        source = self._read_source(file_path)
+        return self._write_output(file_path, source, self._convert_source(file_path, source))
+
+    def _read_source(self, file_path: str) -> Any:
+        """
+        读取源文件.
+
+        Args:
+            file_path: 文件路径(相对于obsidian_dir)
+
+        Returns:
+            文件内容；源文件不存在时返回None，读取失败时返回异常
+        """
+        try:
+            return (self.obsidian_dir / file_path).read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            return e
+
+    def _convert_source(self, file_path: str, source: Any) -> Any:
+        """
+        转换文档中的链接.
+
+        Args:
+            file_path: 文件路径(相对于obsidian_dir)
+            source: _read_source 的结果
+
+        Returns:
+            (转换后的内容, 链接目标列表)；源文件不存在时返回None，失败时返回异常
+        """
+        if not isinstance(source, bytes):
+            return source
+        try:
+            self.link_converter.ensure_file_mapping()
+            content = source.decode("utf-8")
+            converted = self.link_converter.convert_links(content, Path(file_path)).encode("utf-8")
+            links = sorted({m.group(1).strip() for m in self.link_converter.obsidian_link_regex.finditer(content)})
+            return converted, links
+        except Exception as e:
+            return e
+
+    def _write_output(self, file_path: str, source: Any, result: Any) -> bool:
+        """
+        写入转换结果并更新清单条目.
+
+        Args:
+            file_path: 文件路径(相对于obsidian_dir)
+            source: _read_source 的结果
+            result: _convert_source 的结果
+
         Returns:
             同步是否成功
         """
         src_path = self.obsidian_dir / file_path
         dst_path = self.docusaurus_dir / file_path
 
-        if not src_path.exists():
+        if source is None:
+            self.manifest["files"].pop(file_path, None)
             # 如果源文件不存在，但目标文件存在，则删除目标文件
             if dst_path.exists():
                 dst_path.unlink()
                 return True
             return False
 
-        # 确保目标目录存在
-        dst_path.parent.mkdir(parents=True, exist_ok=True)
-
-        # 读取内容并转换链接
         try:
-            content = src_path.read_text(encoding="utf-8")
-            converted = self.link_converter.obsidian_to_docusaurus(content, file_path)
+            if isinstance(result, Exception):
+                raise result
+            converted, links = result
 
             # 写入转换后的内容
-            dst_path.write_text(converted, encoding="utf-8")
-
-            # 尝试生成目录索引
-            self.index_generator.generate_index_for_directory(dst_path.parent)
-
+            dst_path.parent.mkdir(parents=True, exist_ok=True)
+            dst_path.write_bytes(converted)
+
+            src_stat = src_path.stat()
+            dst_stat = dst_path.stat()
+            self.manifest["files"][file_path] = {
+                "src_hash": _hash_bytes(source),
+                "src_mtime_ns": src_stat.st_mtime_ns,
+                "src_size": src_stat.st_size,
+                "out_hash": _hash_bytes(converted),
+                "out_mtime_ns": dst_stat.st_mtime_ns,
+                "out_size": dst_stat.st_size,
+                "links": links,
+            }
             return True
 
         except Exception as e:
             self.logger.error(f"同步文件失败: {file_path} - {str(e)}")
             return False
 
+    def _needs_conversion(self, rel_path: str, entry: Optional[Dict[str, Any]], changed_names: Set[str]) -> bool:
+        """
+        判断已存在输出的文档是否需要重新转换.
+
+        Args:
+            rel_path: 相对路径
+            entry: 清单条目
+            changed_names: 路径发生变化的链接目标名称
+
+        Returns:
+            是否需要重新转换
+        """
+        if not entry:
+            return True
+
+        # 链接的目标被重命名或移动时，输出中的相对链接需要更新
+        if changed_names.intersection(entry.get("links", [])):
+            return True
+
+        src_path = self.obsidian_dir / rel_path
+        dst_path = self.docusaurus_dir / rel_path
+        try:
+            src_stat = src_path.stat()
+            dst_stat = dst_path.stat()
+        except OSError:
+            return True
+
+        if (src_stat.st_mtime_ns, src_stat.st_size) != (entry.get("src_mtime_ns"), entry.get("src_size")):
+            if _hash_bytes(src_path.read_bytes()) != entry.get("src_hash"):
+                return True
+            entry["src_mtime_ns"], entry["src_size"] = src_stat.st_mtime_ns, src_stat.st_size
+
+        # 输出文件被外部修改时重新生成
+        if (dst_stat.st_mtime_ns, dst_stat.st_size) != (entry.get("out_mtime_ns"), entry.get("out_size")):
+            if _hash_bytes(dst_path.read_bytes()) != entry.get("out_hash"):
+                return True
+            entry["out_mtime_ns"], entry["out_size"] = dst_stat.st_mtime_ns, dst_stat.st_size
+
+        return False
+
+    def _regenerate_indexes(self, rel_dirs: Set[str]) -> List[str]:
+        """
+        重建指定目录的索引文件，目录中已没有文档时删除过期的索引.
+
+        Args:
+            rel_dirs: 相对于Docusaurus目录的目录集合
+
+        Returns:
+            生成的索引文件路径列表
+        """
+        generated = []
+        for rel_dir in sorted(rel_dirs):
+            directory = self.docusaurus_dir / rel_dir
+            if not directory.is_dir():
+                continue
+            index_path = self.index_generator.generate_index_for_directory(directory)
+            if index_path:
+                generated.append(str(index_path))
+            else:
+                stale_index = directory / self.index_generator.index_filename
+                if stale_index.exists():
+                    stale_index.unlink()
+        return generated
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        """读取同步清单，不存在或版本不匹配时返回空清单"""
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("version") == MANIFEST_VERSION:
+                return manifest
+        except (OSError, ValueError):
+            pass
+        return {"version": MANIFEST_VERSION, "mapping": {}, "files": {}}
+
+    def _save_manifest(self) -> None:
+        """原子写入同步清单，同时保存转换器的资源清单"""
+        self.link_converter.save_caches()
+        tmp_path = self.manifest_path.with_name(f"{MANIFEST_FILENAME}.tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.manifest, f, ensure_ascii=False)
+            os.replace(tmp_path, self.manifest_path)
+        except OSError as e:
+            self.logger.warning(f"写入同步清单失败: {e}")
+
     def generate_indexes(self) -> List[str]:
         """
         为所有文档目录生成索引文件.
@@ -133,12 +383,22 @@ class DocusaurusSync:
         Returns:
             成功同步的文件数量
         """
-        success_count = 0
+        if not file_paths:
+            return 0
 
-        for rel_path in file_paths:
-            if self.sync_file(rel_path):
-                success_count += 1
-                self.logger.info(f"{mode.capitalize()}d: {rel_path}")
+        success_count = 0
+        ordered = sorted(file_paths)
+
+        # 链接转换是纯Python计算，在GIL下多线程几乎没有加速，因此串行执行；线程池只用于读写文件
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="docusaurus-sync") as executor:
+            for start in range(0, len(ordered), IO_BATCH_SIZE):
+                batch = ordered[start : start + IO_BATCH_SIZE]
+                sources = list(executor.map(self._read_source, batch))
+                results = [self._convert_source(rel_path, source) for rel_path, source in zip(batch, sources)]
+                for rel_path, success in zip(batch, executor.map(self._write_output, batch, sources, results)):
+                    if success:
+                        success_count += 1
+                        self.logger.info(f"{mode.capitalize()}d: {rel_path}")
 
         return success_count
 
@@ -13,6 +13,8 @@ GitDiagram 项目分析工具
   --output: 输出目录，默认为当前目录
   --instructions: 自定义分析指令，如"突出显示数据流"
   --openai-key: OpenAI API密钥(可选)
+  --max-tree-lines: 提示中文件树的最大行数，超出时折叠大型子目录
+  --no-cache: 不使用扫描缓存
 """
 
 import argparse
@@ -28,6 +30,11 @@ from typing import Dict, List, Optional, Tuple
 import requests
 from dotenv import load_dotenv
 
+try:
+    from adapters.gitdiagram.scanner import ProjectScanner, render_file_tree
+except ImportError:  # 作为独立脚本运行
+    from scanner import ProjectScanner, render_file_tree
+
 # 加载环境变量
 load_dotenv()
 
@@ -36,6 +43,8 @@ DEFAULT_OUTPUT_DIR = Path.cwd()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 GITHUB_PAT = os.getenv("GITHUB_PAT", "")
 AI_MODEL = os.getenv("AI_MODEL", "gpt-4o-mini")  # 默认使用环境变量中指定的模型
+DEFAULT_MAX_TREE_LINES = 1500  # 文件树行数预算，避免大型仓库的提示过长
+DEFAULT_MAX_FILES_PER_DIR = 50
 
 
 class GitAnalyzer:
@@ -47,11 +56,17 @@ class GitAnalyzer:
         output_path: str = None,
         custom_instructions: str = "",
         openai_key: str = None,
+        max_tree_lines: Optional[int] = DEFAULT_MAX_TREE_LINES,
+        max_files_per_dir: Optional[int] = DEFAULT_MAX_FILES_PER_DIR,
+        use_cache: bool = True,
     ):
         self.project_path = Path(project_path).resolve()
         self.output_path = Path(output_path or DEFAULT_OUTPUT_DIR).resolve()
         self.custom_instructions = custom_instructions
         self.openai_key = openai_key or OPENAI_API_KEY
+        self.max_tree_lines = max_tree_lines
+        self.max_files_per_dir = max_files_per_dir
+        self.use_cache = use_cache
 
         # 验证项目路径
         if not self.project_path.exists():
@@ -68,56 +83,14 @@ class GitAnalyzer:
         """收集项目文件路径"""
         print("收集项目文件路径...")
 
-        exclude_patterns = [
-            ".git/",
-            "node_modules/",
-            "venv/",
-            "__pycache__/",
-            ".vscode/",
-            ".idea/",
-            "dist/",
-            "build/",
-            ".DS_Store",
-            "*.pyc",
-            "*.pyo",
-            "*.pyd",
-            "*.so",
-            "*.dll",
-            "*.class",
-            "*.exe",
-            "*.bin",
-            "*.jpg",
-            "*.jpeg",
-            "*.png",
-            "*.gif",
-            "*.ico",
-            "*.svg",
-            "*.ttf",
-            "*.woff",
-            "*.webp",
-            "yarn.lock",
-            "package-lock.json",
-            "*.log",
-        ]
-
-        def should_include(path: Path) -> bool:
-            """判断文件是否应该被包含"""
-            path_str = str(path)
-            return not any(pattern in path_str for pattern in exclude_patterns)
-
-        paths = []
-        for root, dirs, files in os.walk(self.project_path):
-            # 修改dirs列表，移除不需要遍历的目录
-            dirs[:] = [d for d in dirs if should_include(Path(root) / d)]
-
-            for file in files:
-                file_path = Path(root) / file
-                if should_include(file_path):
-                    # 存储相对路径
-                    rel_path = file_path.relative_to(self.project_path)
-                    paths.append(str(rel_path))
-
-        return "\n".join(sorted(paths))
+        # 遵循 .gitignore 并发扫描，结果按HEAD和未提交文件缓存
+        scanner = ProjectScanner(str(self.project_path), cache_path=None if self.use_cache else "")
+        paths = scanner.scan()
+
+        # 超出行数预算时折叠大型子目录，保持提示长度有界
+        file_tree = render_file_tree(paths, max_lines=self.max_tree_lines, max_files_per_dir=self.max_files_per_dir)
+        print(f"共 {len(paths)} 个文件，文件树 {file_tree.count(chr(10)) + 1 if file_tree else 0} 行")
+        return file_tree
 
     def get_readme_content(self) -> str:
         """获取项目README内容"""
@@ -373,6 +346,8 @@ def main():
     parser.add_argument("--output", help="输出目录，默认为当前目录")
     parser.add_argument("--instructions", help="自定义分析指令，例如'突出显示数据流'")
     parser.add_argument("--openai-key", help="OpenAI API密钥")
+    parser.add_argument("--max-tree-lines", type=int, default=DEFAULT_MAX_TREE_LINES, help="文件树最大行数，0表示不限制")
+    parser.add_argument("--no-cache", action="store_true", help="不使用扫描缓存")
 
     args = parser.parse_args()
 
@@ -382,6 +357,8 @@ def main():
             output_path=args.output,
             custom_instructions=args.instructions or "",
             openai_key=args.openai_key,
+            max_tree_lines=args.max_tree_lines or None,
+            use_cache=not args.no_cache,
         )
 
         explanation, diagram = analyzer.analyze_project()
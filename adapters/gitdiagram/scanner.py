@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+GitDiagram 项目扫描器
+
+按 .gitignore 规则（以及默认排除规则）并发遍历项目目录，规则只编译一次；
+扫描结果按 git HEAD 和未提交文件集合缓存，项目未变化时直接复用。
+另外提供文件树渲染，在超过行数预算时折叠大型子目录为摘要行，
+使提交给LLM的提示长度保持有界。
+"""
+
+import hashlib
+import json
+import os
+import re
+import subprocess
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 默认排除规则（gitignore语法）
+DEFAULT_EXCLUDES = [
+    ".git/",
+    "node_modules/",
+    "venv/",
+    ".venv/",
+    "__pycache__/",
+    ".vscode/",
+    ".idea/",
+    "dist/",
+    "build/",
+    ".DS_Store",
+    "*.pyc",
+    "*.pyo",
+    "*.pyd",
+    "*.so",
+    "*.dll",
+    "*.class",
+    "*.exe",
+    "*.bin",
+    "*.jpg",
+    "*.jpeg",
+    "*.png",
+    "*.gif",
+    "*.ico",
+    "*.svg",
+    "*.ttf",
+    "*.woff",
+    "*.webp",
+    "yarn.lock",
+    "package-lock.json",
+    "*.log",
+]
+
+CACHE_VERSION = 1
+CACHE_FILENAME = "gitdiagram-scan.json"
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """把gitignore的glob模式转换为正则表达式（不含锚点）"""
+    result = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith("**/", i):
+            result.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("/**", i) and i + 3 == len(pattern):
+            result.append("/.*")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            result.append(".*")
+            i += 2
+            continue
+        if char == "*":
+            result.append("[^/]*")
+        elif char == "?":
+            result.append("[^/]")
+        elif char == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                result.append(re.escape(char))
+            else:
+                body = pattern[i + 1 : end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                result.append(f"[{body}]")
+                i = end
+        elif char == "\\" and i + 1 < len(pattern):
+            i += 1
+            result.append(re.escape(pattern[i]))
+        else:
+            result.append(re.escape(char))
+        i += 1
+    return "".join(result)
+
+
+class IgnoreRules:
+    """一组编译后的忽略规则，语义与 .gitignore 一致（后出现的规则优先）"""
+
+    def __init__(self, patterns: Iterable[str], base: str = ""):
+        """编译规则
+
+        Args:
+            patterns: gitignore格式的规则行
+            base: 规则文件所在目录（相对于项目根目录，posix格式）
+        """
+        self.base = base
+        self.rules: List[Tuple[re.Pattern, bool, bool]] = []
+        for line in patterns:
+            rule = self._compile(line)
+            if rule:
+                self.rules.append(rule)
+        # 没有否定规则时合并为一个正则，一次匹配即可
+        self._combined: Dict[bool, Optional[re.Pattern]] = {}
+        if self.rules and not any(negate for _, negate, _ in self.rules):
+            for is_dir in (False, True):
+                parts = [regex.pattern for regex, _, dir_only in self.rules if is_dir or not dir_only]
+                self._combined[is_dir] = re.compile("|".join(f"(?:{p})" for p in parts)) if parts else None
+
+    @classmethod
+    def from_file(cls, path: Path, base: str = "") -> Optional["IgnoreRules"]:
+        """读取规则文件
+
+        Args:
+            path: .gitignore文件路径
+            base: 规则文件所在目录（相对于项目根目录）
+
+        Returns:
+            规则对象，文件不存在或没有规则时返回None
+        """
+        try:
+            lines = path.read_text(encoding="utf-8", errors="ignore").splitlines()
+        except OSError:
+            return None
+        rules = cls(lines, base)
+        return rules if rules.rules else None
+
+    @staticmethod
+    def _compile(line: str) -> Optional[Tuple[re.Pattern, bool, bool]]:
+        line = line.rstrip("\n")
+        if not line.strip() or line.startswith("#"):
+            return None
+        line = line.rstrip()
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+        elif line.startswith("\\"):
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.strip("/") if dir_only else line
+        anchored = "/" in line
+        line = line.lstrip("/")
+        if not line:
+            return None
+        body = _glob_to_regex(line)
+        regex = re.compile(f"^{body}$" if anchored else f"^(?:.*/)?{body}$")
+        return regex, negate, dir_only
+
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """判断路径是否被忽略
+
+        Args:
+            rel_path: 相对于规则所在目录的路径（posix格式）
+            is_dir: 是否为目录
+
+        Returns:
+            True表示忽略，False表示被否定规则重新包含，None表示没有规则匹配
+        """
+        if self._combined:
+            combined = self._combined[is_dir]
+            return True if combined is not None and combined.match(rel_path) else None
+        result = None
+        for regex, negate, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                result = not negate
+        return result
+
+
+def _is_ignored(rule_chain: Tuple[IgnoreRules, ...], rel_path: str, is_dir: bool) -> bool:
+    """按从根到当前目录的顺序应用规则，越深的规则优先"""
+    ignored = False
+    for rules in rule_chain:
+        sub_path = rel_path[len(rules.base) + 1 :] if rules.base else rel_path
+        result = rules.match(sub_path, is_dir)
+        if result is not None:
+            ignored = result
+    return ignored
+
+
+class ProjectScanner:
+    """并发、遵循 .gitignore 的项目扫描器"""
+
+    def __init__(
+        self,
+        project_path: str,
+        exclude_patterns: Optional[List[str]] = None,
+        max_workers: Optional[int] = None,
+        use_gitignore: bool = True,
+        cache_path: Optional[str] = None,
+    ):
+        """初始化扫描器
+
+        Args:
+            project_path: 项目根目录
+            exclude_patterns: 额外的排除规则（gitignore语法），默认使用DEFAULT_EXCLUDES
+            max_workers: 并发扫描的线程数
+            use_gitignore: 是否读取项目中的 .gitignore 文件
+            cache_path: 缓存文件路径，默认为 .git 目录下的文件；传入空字符串禁用缓存
+        """
+        self.project_path = Path(project_path).resolve()
+        self.exclude_patterns = DEFAULT_EXCLUDES if exclude_patterns is None else exclude_patterns
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+        self.use_gitignore = use_gitignore
+        if cache_path is None:
+            git_dir = self.project_path / ".git"
+            cache_path = str(git_dir / CACHE_FILENAME) if git_dir.is_dir() else ""
+        self.cache_path = cache_path
+        self.root_rules = IgnoreRules(self.exclude_patterns)
+
+    def scan(self) -> List[str]:
+        """扫描项目文件
+
+        Returns:
+            排序后的相对路径列表（posix格式）
+        """
+        cache_key = self._cache_key()
+        if cache_key:
+            cached = self._read_cache(cache_key)
+            if cached is not None:
+                return cached
+
+        paths = self._walk()
+        if cache_key:
+            self._write_cache(cache_key, paths)
+        return paths
+
+    def _walk(self) -> List[str]:
+        """并发遍历目录，每个目录一个任务"""
+        paths: List[str] = []
+        root_chain = (self.root_rules,)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = {executor.submit(self._scan_dir, "", root_chain)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    files, subdirs = future.result()
+                    paths.extend(files)
+                    for rel_dir, chain in subdirs:
+                        pending.add(executor.submit(self._scan_dir, rel_dir, chain))
+        paths.sort()
+        return paths
+
+    def _scan_dir(self, rel_dir: str, chain: Tuple[IgnoreRules, ...]) -> Tuple[List[str], List[Tuple[str, Tuple[IgnoreRules, ...]]]]:
+        """扫描单个目录
+
+        Returns:
+            (文件相对路径列表, [(子目录相对路径, 适用的规则链)])
+        """
+        directory = self.project_path / rel_dir if rel_dir else self.project_path
+        if self.use_gitignore:
+            local_rules = IgnoreRules.from_file(directory / ".gitignore", rel_dir)
+            if local_rules:
+                chain = chain + (local_rules,)
+
+        files, subdirs = [], []
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if _is_ignored(chain, rel_path, is_dir):
+                        continue
+                    if is_dir:
+                        subdirs.append((rel_path, chain))
+                    else:
+                        files.append(rel_path)
+        except OSError:
+            pass
+        return files, subdirs
+
+    def _cache_key(self) -> Optional[str]:
+        """缓存键：HEAD提交 + 未提交文件集合 + 扫描配置，非git项目返回None"""
+        if not self.cache_path:
+            return None
+        try:
+            head = subprocess.run(
+                ["git", "rev-parse", "HEAD"], cwd=self.project_path, capture_output=True, text=True, timeout=10, check=True
+            ).stdout.strip()
+            status = subprocess.run(
+                ["git", "status", "--porcelain", "--untracked-files=all"],
+                cwd=self.project_path,
+                capture_output=True,
+                text=True,
+                timeout=30,
+                check=True,
+            ).stdout
+        except (OSError, subprocess.SubprocessError):
+            return None
+        digest = hashlib.sha256()
+        for part in (head, status, json.dumps(self.exclude_patterns), str(self.use_gitignore)):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _read_cache(self, cache_key: str) -> Optional[List[str]]:
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != CACHE_VERSION or data.get("key") != cache_key:
+            return None
+        return data.get("paths")
+
+    def _write_cache(self, cache_key: str, paths: List[str]) -> None:
+        tmp_path = f"{self.cache_path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": CACHE_VERSION, "key": cache_key, "paths": paths}, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            pass
+
+
+def _summary_line(rel_dir: str, files: List[str], label: str = "") -> str:
+    """生成折叠子目录的摘要行"""
+    extensions = Counter(Path(path).suffix or "(无扩展名)" for path in files)
+    top = ", ".join(f"{ext} {count}" for ext, count in extensions.most_common(3))
+    prefix = f"{rel_dir}/" if rel_dir else "./"
+    return f"{prefix} … ({label}{len(files)} 个文件: {top})"
+
+
+def render_file_tree(paths: List[str], max_lines: Optional[int] = None, max_files_per_dir: Optional[int] = None) -> str:
+    """渲染文件树，超过预算时折叠大型子目录
+
+    先按 max_files_per_dir 折叠单个目录中过多的直接文件，再在总行数超过 max_lines 时
+    选择能放入预算的最大目录深度，更深的子目录各折叠为一行摘要.
+
+    Args:
+        paths: 排序后的相对路径列表
+        max_lines: 最大行数，None表示不限制
+        max_files_per_dir: 每个目录最多列出的直接文件数，None表示不限制
+
+    Returns:
+        文件树字符串（每行一个路径或摘要）
+    """
+    if max_lines is None and max_files_per_dir is None:
+        return "\n".join(paths)
+
+    by_dir: Dict[str, List[str]] = {}
+    for path in paths:
+        by_dir.setdefault(path.rpartition("/")[0], []).append(path)
+
+    def dir_lines(rel_dir: str) -> List[Tuple[str, str]]:
+        files = by_dir[rel_dir]
+        if max_files_per_dir is not None and len(files) > max_files_per_dir:
+            # 摘要行排在该目录所有内容之后
+            summary = _summary_line(rel_dir, files[max_files_per_dir:], label="其余 ")
+            return [(path, path) for path in files[:max_files_per_dir]] + [(f"{rel_dir}/\uffff", summary)]
+        return [(path, path) for path in files]
+
+    def render(depth_limit: Optional[int]) -> List[str]:
+        lines: List[Tuple[str, str]] = []
+        collapsed: Dict[str, List[str]] = {}
+        for rel_dir in sorted(by_dir):
+            depth = rel_dir.count("/") + 1 if rel_dir else 0
+            if depth_limit is not None and depth > depth_limit:
+                ancestor = "/".join(rel_dir.split("/")[:depth_limit])
+                collapsed.setdefault(ancestor, []).extend(by_dir[rel_dir])
+                continue
+            lines.extend(dir_lines(rel_dir))
+        lines.extend((f"{rel_dir}/", _summary_line(rel_dir, files)) for rel_dir, files in collapsed.items())
+        return [line for _, line in sorted(lines)]
+
+    lines = render(None)
+    if max_lines is None or len(lines) <= max_lines:
+        return "\n".join(lines)
+
+    max_depth = max((d.count("/") + 1 for d in by_dir if d), default=0)
+    for depth_limit in range(max_depth - 1, 0, -1):
+        lines = render(depth_limit)
+        if len(lines) <= max_lines:
+            break
+    return "\n".join(lines[:max_lines])
@@ -163,6 +163,14 @@ class N8nAdapter:
         """删除变量"""
         return self.variable_client.delete_variable(variable_id)
 
+    def sync_variables(self, variables: Dict[str, Any]) -> Dict[str, bool]:
+        """批量同步变量"""
+        return self.variable_client.sync_variables(variables)
+
+    def sync_credentials(self, credentials: List[Dict[str, Any]]) -> Dict[str, bool]:
+        """批量同步凭证"""
+        return self.credential_client.sync_credentials(credentials)
+
     # 基础方法兼容
 
     def make_request(
@@ -0,0 +1,122 @@
+"""
+异步HTTP客户端模块
+
+提供基于httpx的n8n异步HTTP客户端，复用连接池并限制并发，
+用于在asyncio环境中并发执行大量API调用
+"""
+
+import asyncio
+import logging
+import os
+from typing import Any, Dict, Optional
+
+import httpx
+
+from adapters.n8n.client.http_client import RETRY_STATUS_CODES, SUPPORTED_METHODS
+
+logger = logging.getLogger(__name__)
+
+
+class N8nAsyncHttpClient:
+    """n8n异步HTTP客户端类"""
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        timeout: int = 30,
+        pool_size: int = 10,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """初始化异步HTTP客户端
+
+        Args:
+            base_url: n8n API基础URL，如果未提供则从环境变量获取
+            api_key: n8n API密钥，如果未提供则从环境变量获取
+            timeout: 请求超时时间（秒）
+            pool_size: 连接池大小，同时也是最大并发请求数
+            max_retries: 瞬时错误的最大重试次数
+            backoff_factor: 重试的指数退避因子（秒）
+            transport: 自定义传输层（用于测试）
+        """
+        self.base_url = (base_url or os.environ.get("N8N_BASE_URL", "http://localhost:5678")).rstrip("/")
+        self.api_key = api_key or os.environ.get("N8N_API_KEY", "")
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+
+        headers = {"Content-Type": "application/json", "Accept": "application/json"}
+        if self.api_key:
+            headers["X-N8N-API-KEY"] = self.api_key
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=headers,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            transport=transport,
+        )
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def make_request(self, method: str, endpoint: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """发送HTTP请求，瞬时错误按指数退避重试
+
+        Args:
+            method: HTTP方法（GET, POST, PUT, PATCH, DELETE）
+            endpoint: API端点
+            data: 请求数据
+
+        Returns:
+            响应数据
+
+        Raises:
+            httpx.HTTPError: 请求失败
+        """
+        method = method.upper()
+        if method not in SUPPORTED_METHODS:
+            raise ValueError(f"不支持的HTTP方法: {method}")
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.pool_size)
+
+        body = data if method in ("POST", "PUT", "PATCH") else None
+        attempt = 0
+        while True:
+            try:
+                async with self._semaphore:
+                    response = await self.client.request(method, f"/{endpoint}", json=body)
+                response.raise_for_status()
+                return response.json() if response.content else {}
+            except httpx.HTTPStatusError as e:
+                error = e
+                retryable = e.response.status_code in RETRY_STATUS_CODES and self._can_retry(method, attempt, sent=True)
+            except httpx.ConnectError as e:
+                error = e
+                retryable = self._can_retry(method, attempt, sent=False)
+            except httpx.TransportError as e:
+                error = e
+                retryable = self._can_retry(method, attempt, sent=True)
+            if not retryable:
+                logger.error(f"n8n API请求失败: {str(error)}")
+                raise error
+
+            delay = self.backoff_factor * (2**attempt)
+            attempt += 1
+            logger.debug(f"{method} {endpoint} 第{attempt}次重试，等待{delay:.2f}秒")
+            await asyncio.sleep(delay)
+
+    def _can_retry(self, method: str, attempt: int, sent: bool) -> bool:
+        # POST不是幂等的，只在请求未发出（连接失败）时重试
+        if attempt >= self.max_retries:
+            return False
+        return method != "POST" or not sent
+
+    async def close(self) -> None:
+        """关闭连接池"""
+        await self.client.aclose()
+
+    async def __aenter__(self) -> "N8nAsyncHttpClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
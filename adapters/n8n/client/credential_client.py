@@ -5,11 +5,13 @@
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional
 
 from requests.exceptions import RequestException
 
 from adapters.n8n.client.http_client import N8nHttpClient
+from adapters.n8n.client.variable_client import extract_items
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +39,52 @@ class N8nCredentialClient:
             logger.exception("获取凭证列表失败")
             return []
 
+    def sync_credentials(self, credentials: List[Dict[str, Any]], max_workers: Optional[int] = None) -> Dict[str, bool]:
+        """批量同步凭证
+
+        凭证列表只拉取一次，按名称匹配后并发创建或更新.
+
+        Args:
+            credentials: 凭证列表，每项包含name、type和data
+            max_workers: 最大并发数，默认为连接池大小
+
+        Returns:
+            各凭证（按名称）的同步结果
+        """
+        if not credentials:
+            return {}
+        try:
+            items, cursor = extract_items(self.http_client.make_request("GET", "api/v1/credentials"))
+            while cursor:
+                page, cursor = extract_items(self.http_client.make_request("GET", f"api/v1/credentials?cursor={cursor}"))
+                items.extend(page)
+        except RequestException:
+            logger.exception("获取凭证列表失败")
+            return {credential["name"]: False for credential in credentials}
+
+        existing = {item.get("name"): item for item in items}
+        tasks = []
+        for credential in credentials:
+            item = existing.get(credential["name"])
+            if item:
+                payload = {"name": credential["name"], "type": credential["type"], "data": credential["data"]}
+                tasks.append((credential["name"], lambda cid=str(item["id"]), payload=payload: self.update_credential(cid, payload)))
+            else:
+                tasks.append(
+                    (
+                        credential["name"],
+                        lambda c=credential: self.create_credential(c["type"], c["data"], c["name"]),
+                    )
+                )
+
+        workers = max_workers or getattr(self.http_client, "pool_size", 4)
+        results = {}
+        with ThreadPoolExecutor(max_workers=min(workers, len(tasks)), thread_name_prefix="n8n-sync") as executor:
+            futures = [(name, executor.submit(task)) for name, task in tasks]
+            for name, future in futures:
+                results[name] = future.result() is not None
+        return results
+
     def get_credential(self, credential_id: str) -> Optional[Dict[str, Any]]:
         """获取指定凭证
 
@@ -1,7 +1,8 @@
 """
 HTTP客户端模块
 
-提供与n8n API通信的基础HTTP请求封装
+提供与n8n API通信的基础HTTP请求封装.
+所有请求复用同一个连接池会话（保持长连接），并对瞬时错误按指数退避重试.
 """
 
 import logging
@@ -9,16 +10,54 @@ import os
 from typing import Any, Dict, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+SUPPORTED_METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE")
+
+# 可重试的状态码：限流和网关/服务暂不可用
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+def build_retry(max_retries: int, backoff_factor: float) -> Retry:
+    """构建重试策略
+
+    POST不是幂等的，只在连接建立失败（请求未发出）时重试.
+
+    Args:
+        max_retries: 最大重试次数
+        backoff_factor: 指数退避因子（秒）
+
+    Returns:
+        urllib3重试策略
+    """
+    return Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=max_retries,
+        status=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=frozenset({"GET", "PUT", "PATCH", "DELETE"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
 
 class N8nHttpClient:
     """n8n HTTP客户端类"""
 
     def __init__(
-        self, base_url: Optional[str] = None, api_key: Optional[str] = None, timeout: int = 30
+        self,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        timeout: int = 30,
+        pool_size: int = 10,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
     ):
         """初始化HTTP客户端
 
@@ -26,10 +65,16 @@ class N8nHttpClient:
             base_url: n8n API基础URL，如果未提供则从环境变量获取
             api_key: n8n API密钥，如果未提供则从环境变量获取
             timeout: 请求超时时间（秒）
+            pool_size: 连接池大小，决定可并发复用的连接数
+            max_retries: 瞬时错误的最大重试次数
+            backoff_factor: 重试的指数退避因子（秒）
         """
         self.base_url = base_url or os.environ.get("N8N_BASE_URL", "http://localhost:5678")
         self.api_key = api_key or os.environ.get("N8N_API_KEY", "")
         self.timeout = timeout
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
 
         # 移除URL末尾的斜杠
         if self.base_url.endswith("/"):
@@ -41,6 +86,31 @@ class N8nHttpClient:
         if not self.api_key:
             logger.warning("n8n API密钥未配置，可能导致认证失败")
 
+        self.session = self._create_session()
+
+    def _create_session(self) -> requests.Session:
+        """创建带连接池和重试策略的会话"""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_size,
+            pool_maxsize=self.pool_size,
+            max_retries=build_retry(self.max_retries, self.backoff_factor),
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update(self.get_headers())
+        return session
+
+    def close(self) -> None:
+        """关闭连接池"""
+        self.session.close()
+
+    def __enter__(self) -> "N8nHttpClient":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
     def get_headers(self) -> Dict[str, str]:
         """获取请求头
 
@@ -61,7 +131,7 @@ class N8nHttpClient:
         """发送HTTP请求
 
         Args:
-            method: HTTP方法（GET, POST, PUT, DELETE）
+            method: HTTP方法（GET, POST, PUT, PATCH, DELETE）
             endpoint: API端点
             data: 请求数据
 
@@ -72,21 +142,15 @@ class N8nHttpClient:
             RequestException: 请求失败
         """
         url = f"{self.base_url}/{endpoint}"
-        headers = self.get_headers()
+        method = method.upper()
+        if method not in SUPPORTED_METHODS:
+            raise ValueError(f"不支持的HTTP方法: {method}")
         response_data = {}
 
         try:
             logger.debug(f"发送{method}请求至{url}")
-            if method.upper() == "GET":
-                response = requests.get(url, headers=headers, timeout=self.timeout)
-            elif method.upper() == "POST":
-                response = requests.post(url, headers=headers, json=data, timeout=self.timeout)
-            elif method.upper() == "PUT":
-                response = requests.put(url, headers=headers, json=data, timeout=self.timeout)
-            elif method.upper() == "DELETE":
-                response = requests.delete(url, headers=headers, timeout=self.timeout)
-            else:
-                raise ValueError(f"不支持的HTTP方法: {method}")
+            body = data if method in ("POST", "PUT", "PATCH") else None
+            response = self.session.request(method, url, json=body, timeout=self.timeout)
 
             response.raise_for_status()
             if response.content:
@@ -113,10 +177,11 @@ class N8nHttpClient:
         Raises:
             RequestException: 请求失败
         """
-        headers = {"Content-Type": "application/json"}
+        # Webhook不需要API密钥，值为None的头会从会话默认头中移除
+        headers = {"Content-Type": "application/json", "X-N8N-API-KEY": None}
         try:
             logger.debug(f"发送Webhook请求至{webhook_url}")
-            response = requests.post(
+            response = self.session.post(
                 webhook_url, headers=headers, json=payload, timeout=self.timeout
             )
             response.raise_for_status()
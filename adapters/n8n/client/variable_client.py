@@ -1,11 +1,14 @@
 """
 变量管理模块
 
-提供n8n变量的管理功能
+提供n8n变量的管理功能，包括一次拉取远端状态、本地比对后并发提交的批量同步
 """
 
+import asyncio
+import json
 import logging
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
 from requests.exceptions import RequestException
 
@@ -14,6 +17,64 @@ from adapters.n8n.client.http_client import N8nHttpClient
 logger = logging.getLogger(__name__)
 
 
+def extract_items(response: Any) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """从列表接口的响应中提取条目和下一页游标
+
+    Args:
+        response: 接口响应（列表或包含data/nextCursor的字典）
+
+    Returns:
+        (条目列表, 下一页游标)
+    """
+    if isinstance(response, list):
+        return response, None
+    if isinstance(response, dict):
+        return response.get("data") or [], response.get("nextCursor")
+    return [], None
+
+
+def format_variable_value(value: Any) -> str:
+    """把变量值转换为n8n保存的字符串形式
+
+    Args:
+        value: 变量值
+
+    Returns:
+        字符串值
+    """
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (dict, list, bool)) or value is None:
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+def plan_variable_changes(
+    remote: List[Dict[str, Any]], variables: Dict[str, Any]
+) -> Tuple[List[Dict[str, Any]], List[Tuple[str, Dict[str, Any]]], List[str]]:
+    """比对远端变量和期望值，得出最小变更集
+
+    Args:
+        remote: 远端变量列表
+        variables: 期望的变量字典
+
+    Returns:
+        (待创建的变量, 待更新的(变量ID, 数据), 无需变更的键)
+    """
+    existing = {item.get("key"): item for item in remote}
+    creates, updates, unchanged = [], [], []
+    for key, value in variables.items():
+        value = format_variable_value(value)
+        item = existing.get(key)
+        if item is None:
+            creates.append({"key": key, "value": value})
+        elif item.get("value") != value:
+            updates.append((str(item.get("id")), {"key": key, "value": value}))
+        else:
+            unchanged.append(key)
+    return creates, updates, unchanged
+
+
 class N8nVariableClient:
     """n8n变量客户端类"""
 
@@ -37,6 +98,58 @@ class N8nVariableClient:
             logger.exception("获取变量列表失败")
             return []
 
+    def get_all_variables(self) -> List[Dict[str, Any]]:
+        """获取所有变量（跟随分页游标）
+
+        Returns:
+            变量列表
+
+        Raises:
+            RequestException: 请求失败
+        """
+        items, cursor = extract_items(self.http_client.make_request("GET", "api/v1/variables"))
+        while cursor:
+            page, cursor = extract_items(self.http_client.make_request("GET", f"api/v1/variables?cursor={cursor}"))
+            items.extend(page)
+        return items
+
+    def sync_variables(self, variables: Dict[str, Any], max_workers: Optional[int] = None) -> Dict[str, bool]:
+        """批量同步变量
+
+        远端状态只拉取一次，本地比对后通过连接池并发创建或更新，
+        值未变化的变量不发送请求.
+
+        Args:
+            variables: 变量字典
+            max_workers: 最大并发数，默认为连接池大小
+
+        Returns:
+            各变量同步结果
+        """
+        if not variables:
+            return {}
+        try:
+            remote = self.get_all_variables()
+        except RequestException:
+            logger.exception("获取变量列表失败")
+            return {key: False for key in variables}
+
+        creates, updates, unchanged = plan_variable_changes(remote, variables)
+        results = {key: True for key in unchanged}
+        tasks = [(data["key"], lambda data=data: self.create_variable(data["key"], data["value"])) for data in creates]
+        tasks += [(data["key"], lambda vid=vid, data=data: self.update_variable(vid, data)) for vid, data in updates]
+        if not tasks:
+            return results
+
+        workers = max_workers or getattr(self.http_client, "pool_size", 4)
+        with ThreadPoolExecutor(max_workers=min(workers, len(tasks)), thread_name_prefix="n8n-sync") as executor:
+            futures = [(key, executor.submit(task)) for key, task in tasks]
+            for key, future in futures:
+                results[key] = future.result() is not None
+
+        logger.info(f"批量同步变量: 创建{len(creates)}个，更新{len(updates)}个，未变化{len(unchanged)}个")
+        return results
+
     def get_variable(self, variable_id: str) -> Optional[Dict[str, Any]]:
         """获取指定变量
 
@@ -107,3 +220,37 @@ class N8nVariableClient:
         except RequestException:
             logger.exception(f"删除变量失败: {variable_id}")
             return False
+
+
+async def sync_variables_async(async_client: Any, variables: Dict[str, Any]) -> Dict[str, bool]:
+    """使用异步客户端批量同步变量
+
+    Args:
+        async_client: N8nAsyncHttpClient实例
+        variables: 变量字典
+
+    Returns:
+        各变量同步结果
+    """
+    if not variables:
+        return {}
+    try:
+        remote, cursor = extract_items(await async_client.make_request("GET", "api/v1/variables"))
+        while cursor:
+            page, cursor = extract_items(await async_client.make_request("GET", f"api/v1/variables?cursor={cursor}"))
+            remote.extend(page)
+    except Exception:
+        logger.exception("获取变量列表失败")
+        return {key: False for key in variables}
+
+    creates, updates, unchanged = plan_variable_changes(remote, variables)
+    keys = [data["key"] for data in creates] + [data["key"] for _, data in updates]
+    calls = [async_client.make_request("POST", "api/v1/variables", data) for data in creates]
+    calls += [async_client.make_request("PATCH", f"api/v1/variables/{vid}", data) for vid, data in updates]
+
+    results = {key: True for key in unchanged}
+    for key, outcome in zip(keys, await asyncio.gather(*calls, return_exceptions=True)):
+        if isinstance(outcome, Exception):
+            logger.error(f"同步变量失败: {key} - {outcome}")
+        results[key] = not isinstance(outcome, Exception)
+    return results
@@ -5,5 +5,6 @@ Obsidian语法检查工具模块
 from adapters.obsidian.checker.checker import ObsidianSyntaxChecker
 from adapters.obsidian.checker.logger import setup_logging
 from adapters.obsidian.checker.report import generate_report
+from adapters.obsidian.checker.vault_index import VaultIndex
 
-__all__ = ["ObsidianSyntaxChecker", "setup_logging", "generate_report"]
+__all__ = ["ObsidianSyntaxChecker", "VaultIndex", "setup_logging", "generate_report"]
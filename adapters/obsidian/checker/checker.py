@@ -5,10 +5,29 @@ Obsidian语法检查工具的核心检查器
 
 import logging
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 from adapters.obsidian.checker.utils import create_line_map, get_line_col, resolve_link_path
+from adapters.obsidian.checker.vault_index import VaultIndex
+
+# 待检查文件数达到该阈值时使用进程池
+PARALLEL_CHECK_THRESHOLD = 200
+
+# 进程池中每个工作进程持有的检查器
+_worker_checker = None
+
+
+def _init_worker(base_dir: str, index: VaultIndex) -> None:
+    """初始化工作进程的检查器，索引只随进程启动传递一次"""
+    global _worker_checker
+    _worker_checker = ObsidianSyntaxChecker(base_dir)
+    _worker_checker.index = index
+
+
+def _check_file_in_worker(file_path: str) -> Tuple[str, Dict[str, List[Dict]]]:
+    return file_path, _worker_checker.check_file(file_path)
 
 
 class ObsidianSyntaxChecker:
@@ -32,15 +51,27 @@ class ObsidianSyntaxChecker:
     # YAML前置元数据检测
     YAML_FRONTMATTER_PATTERN = r"^---\s*\n(.*?)\n---\s*$"
 
-    def __init__(self, base_dir: str, logger: Optional[logging.Logger] = None):
+    def __init__(
+        self,
+        base_dir: str,
+        logger: Optional[logging.Logger] = None,
+        index_cache_path: Optional[str] = None,
+        index_cache_in_vault: bool = False,
+    ):
         """初始化语法检查器
 
         Args:
             base_dir: 基础目录路径
             logger: 日志记录器
+            index_cache_path: 库索引缓存文件路径，默认位于VibeCopilot缓存目录，空字符串表示不缓存
+            index_cache_in_vault: 未指定缓存路径时是否把缓存写入基础目录
         """
         self.base_dir = Path(base_dir)
         self.logger = logger or logging.getLogger("obsidian_syntax_checker")
+        self.index_cache_path = index_cache_path
+        self.index_cache_in_vault = index_cache_in_vault
+        # 库索引，check_directory 每次运行时重建；为None时逐个探测文件系统
+        self.index: Optional[VaultIndex] = None
 
         # 编译正则表达式
         self.obsidian_link_regex = re.compile(self.OBSIDIAN_LINK_PATTERN)
@@ -85,32 +116,57 @@ class ObsidianSyntaxChecker:
 
         return issues
 
+    def build_index(self) -> VaultIndex:
+        """建立（或增量刷新）库索引
+
+        Returns:
+            库索引
+        """
+        self.index = VaultIndex.build(self.base_dir, self.index_cache_path, cache_in_vault=self.index_cache_in_vault)
+        return self.index
+
     def check_directory(
-        self, directory: Union[str, Path], recursive: bool = True
+        self, directory: Union[str, Path], recursive: bool = True, workers: Optional[int] = None
     ) -> Dict[str, Dict]:
         """检查目录中的所有Markdown文件
 
+        先建立库索引，链接和段落引用都在内存中校验；文件较多时使用进程池并行检查。
+
         Args:
             directory: 目录路径
             recursive: 是否递归检查子目录
+            workers: 进程数，1表示串行检查，None表示由系统决定
 
         Returns:
             所有文件的问题列表
         """
         directory = Path(directory)
         all_issues = {}
+        self.build_index()
 
         # 查找所有Markdown文件
         pattern = "**/*.md" if recursive else "*.md"
-        for md_file in directory.glob(pattern):
-            file_issues = self.check_file(md_file)
+        md_files = list(directory.glob(pattern))
 
+        if workers != 1 and len(md_files) >= PARALLEL_CHECK_THRESHOLD:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(str(self.base_dir), self.index)) as executor:
+                results = list(executor.map(_check_file_in_worker, [str(f) for f in md_files], chunksize=64))
+        else:
+            results = [(str(md_file), self.check_file(md_file)) for md_file in md_files]
+
+        for md_file, file_issues in results:
             # 只添加有问题的文件
             if any(file_issues.values()):
-                all_issues[str(md_file.relative_to(self.base_dir))] = file_issues
+                all_issues[str(Path(md_file).relative_to(self.base_dir))] = file_issues
 
         return all_issues
 
+    def _resolve_link(self, target_file: str, current_dir: Path) -> Optional[Path]:
+        """解析链接目标，有库索引时在内存中查找"""
+        if self.index is not None:
+            return self.index.resolve(target_file, current_dir)
+        return resolve_link_path(target_file, current_dir)
+
     def _check_links(self, content: str, file_path: Path, issues: Dict[str, List[Dict]]):
         """检查Obsidian链接语法和引用完整性
 
@@ -130,7 +186,7 @@ class ObsidianSyntaxChecker:
             section = match.group(2)
 
             # 检查目标文件是否存在
-            target_path = resolve_link_path(target_file, current_dir)
+            target_path = self._resolve_link(target_file, current_dir)
             if not target_path:
                 # 查找行号和列号
                 start_pos = match.start()
@@ -146,11 +202,19 @@ class ObsidianSyntaxChecker:
                     }
                 )
 
-            # 如果链接包含段落引用，但目标文件存在
-            elif section and target_path:
-                # 这里可以添加进一步检查段落引用的完整性
-                # 但需要读取目标文件内容，可能会影响性能
-                pass
+            # 如果链接包含段落引用，但目标文件存在，通过库索引校验标题或块引用
+            elif section and self.index is not None and not self.index.has_anchor(target_path, section):
+                line_no, col_no = get_line_col(match.start(), line_map)
+
+                issues["warnings"].append(
+                    {
+                        "type": "broken_section",
+                        "message": f"段落引用不存在: {target_file}#{section}",
+                        "line": line_no,
+                        "column": col_no,
+                        "text": match.group(0),
+                    }
+                )
 
     def _check_embeds(self, content: str, file_path: Path, issues: Dict[str, List[Dict]]):
         """检查Obsidian嵌入语法和引用完整性
@@ -170,7 +234,7 @@ class ObsidianSyntaxChecker:
             target_file = match.group(1).strip()
 
             # 检查目标文件是否存在
-            target_path = resolve_link_path(target_file, current_dir)
+            target_path = self._resolve_link(target_file, current_dir)
             if not target_path:
                 # 查找行号和列号
                 start_pos = match.start()
@@ -3,6 +3,7 @@
 Obsidian语法检查工具的工具函数
 """
 
+import re
 from pathlib import Path
 from typing import List, Optional, Tuple
 
@@ -74,11 +75,7 @@ def create_line_map(content: str) -> List[int]:
     Returns:
         每行起始字符位置的列表
     """
-    line_starts = [0]
-    for i, char in enumerate(content):
-        if char == "\n":
-            line_starts.append(i + 1)
-    return line_starts
+    return [0] + [match.end() for match in re.finditer("\n", content)]
 
 
 def get_line_col(pos: int, line_map: List[int]) -> Tuple[int, int]:
@@ -0,0 +1,266 @@
+#!/usr/bin/env python
+"""
+Obsidian语法检查工具的库索引
+
+一次遍历整个库，建立文件名到路径的映射以及每个笔记的标题和块引用集合，
+使链接和段落引用的校验都在内存中完成。索引按文件修改时间缓存在磁盘上（默认位于VibeCopilot的缓存目录，
+不写入库本身），再次检查时只重新读取发生变化的笔记。
+"""
+
+import hashlib
+import json
+import logging
+import os
+import posixpath
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Union
+
+logger = logging.getLogger("obsidian_syntax_checker")
+
+# 与 resolve_link_path 一致的候选扩展名
+LINK_EXTENSIONS = [".md", ".pdf", ".png", ".jpg", ".jpeg"]
+
+# 写入库根目录时使用的缓存文件名（需显式启用）
+DEFAULT_CACHE_NAME = ".obsidian_checker_index.json"
+
+INDEX_VERSION = 1
+
+HEADING_PATTERN = re.compile(r"^#{1,6}\s+(.+?)\s*#*\s*$")
+BLOCK_ID_PATTERN = re.compile(r"\s\^([\w-]+)\s*$")
+FENCE_PATTERN = re.compile(r"^\s*(```|~~~)")
+
+
+def normalize_anchor(text: str) -> str:
+    """标准化标题文本，用于与链接中的段落引用比较"""
+    return " ".join(text.strip().lower().split())
+
+
+def extract_anchors(content: str) -> Dict[str, List[str]]:
+    """提取笔记中的标题和块ID（忽略代码块）
+
+    Args:
+        content: 笔记内容
+
+    Returns:
+        包含headings和blocks列表的字典
+    """
+    headings, blocks = [], []
+    in_fence = False
+    for line in content.splitlines():
+        if FENCE_PATTERN.match(line):
+            in_fence = not in_fence
+            continue
+        if in_fence:
+            continue
+        heading = HEADING_PATTERN.match(line)
+        if heading:
+            headings.append(normalize_anchor(heading.group(1)))
+            continue
+        block = BLOCK_ID_PATTERN.search(line)
+        if block:
+            blocks.append(block.group(1))
+    return {"headings": headings, "blocks": blocks}
+
+
+class VaultIndex:
+    """Obsidian库索引
+
+    files 以库内相对路径（posix格式）为键，记录文件的修改时间、大小，
+    以及Markdown笔记的标题和块ID。
+    """
+
+    def __init__(self, root: Union[str, Path], files: Optional[Dict[str, Dict[str, Any]]] = None):
+        """初始化库索引
+
+        Args:
+            root: 库根目录
+            files: 文件条目
+        """
+        self.root = Path(root).resolve()
+        self.files: Dict[str, Dict[str, Any]] = files or {}
+        self._by_name: Dict[str, List[str]] = {}
+        self._anchors: Dict[str, Set[str]] = {}
+        self._rebuild_lookup()
+
+    @classmethod
+    def build(cls, root: Union[str, Path], cache_path: Optional[Union[str, Path]] = None, cache_in_vault: bool = False) -> "VaultIndex":
+        """遍历库并建立索引，未变化的笔记复用磁盘缓存
+
+        Args:
+            root: 库根目录
+            cache_path: 缓存文件路径，默认位于VibeCopilot缓存目录；传入空字符串禁用缓存
+            cache_in_vault: 未指定cache_path时是否把缓存写入库根目录下的隐藏文件
+
+        Returns:
+            库索引
+        """
+        root = Path(root).resolve()
+        if cache_path is None:
+            cache_path = root / DEFAULT_CACHE_NAME if cache_in_vault else _default_cache_path(root)
+        cached = _load_cache(cache_path, root) if cache_path else {}
+
+        files: Dict[str, Dict[str, Any]] = {}
+        reparsed = 0
+        for dir_path, dir_names, file_names in os.walk(root):
+            # 跳过 .obsidian、.git 等隐藏目录
+            dir_names[:] = [d for d in dir_names if not d.startswith(".")]
+            rel_dir = os.path.relpath(dir_path, root)
+            for file_name in file_names:
+                if file_name.startswith("."):
+                    continue
+                full_path = os.path.join(dir_path, file_name)
+                try:
+                    stat = os.stat(full_path)
+                except OSError:
+                    continue
+                rel_path = file_name if rel_dir == "." else posixpath.join(Path(rel_dir).as_posix(), file_name)
+                entry = cached.get(rel_path)
+                if entry and entry.get("mtime_ns") == stat.st_mtime_ns and entry.get("size") == stat.st_size:
+                    files[rel_path] = entry
+                    continue
+
+                entry = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+                if file_name.endswith(".md"):
+                    try:
+                        with open(full_path, "r", encoding="utf-8") as f:
+                            entry.update(extract_anchors(f.read()))
+                    except (OSError, UnicodeDecodeError) as e:
+                        logger.debug(f"无法读取笔记标题: {full_path}: {e}")
+                    reparsed += 1
+                files[rel_path] = entry
+
+        index = cls(root, files)
+        if cache_path and (reparsed or len(files) != len(cached)):
+            index.save(cache_path)
+        logger.debug(f"库索引完成: {len(files)} 个文件，重新解析 {reparsed} 个笔记")
+        return index
+
+    def save(self, cache_path: Union[str, Path]) -> None:
+        """保存索引到磁盘缓存
+
+        Args:
+            cache_path: 缓存文件路径
+        """
+        data = {"version": INDEX_VERSION, "root": str(self.root), "files": self.files}
+        tmp_path = f"{cache_path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"无法写入库索引缓存 {cache_path}: {e}")
+
+    def resolve(self, link_target: str, current_dir: Union[str, Path]) -> Optional[Path]:
+        """在内存中解析链接目标
+
+        依次尝试相对当前目录的路径、相对库根目录的路径，最后按文件名在整个库中查找，
+        同名文件优先选择当前目录下的，其次选择路径最短的。
+
+        Args:
+            link_target: 链接目标名称
+            current_dir: 当前文件所在目录
+
+        Returns:
+            目标文件的绝对路径，找不到时返回None
+        """
+        rel_dir = self._relative_dir(current_dir)
+        if rel_dir is None:
+            return None
+
+        parts = link_target.split("/")
+        basename = parts[-1]
+        names = [f"{basename}{ext}" for ext in LINK_EXTENSIONS] + [basename]
+
+        if len(parts) > 1:
+            bases = [posixpath.normpath(posixpath.join(rel_dir, *parts[:-1])), posixpath.normpath(posixpath.join(*parts[:-1]))]
+        else:
+            bases = [rel_dir]
+        for base in bases:
+            for name in names:
+                candidate = name if base in ("", ".") else posixpath.join(base, name)
+                if candidate in self.files:
+                    return self.root / candidate
+
+        prefix = "" if rel_dir in ("", ".") else f"{rel_dir}/"
+        for name in names:
+            matches = self._by_name.get(name)
+            if matches:
+                best = min(matches, key=lambda path: (not path.startswith(prefix), path.count("/"), path))
+                return self.root / best
+        return None
+
+    def has_anchor(self, target_path: Union[str, Path], section: str) -> bool:
+        """检查笔记中是否存在链接引用的标题或块
+
+        Args:
+            target_path: 目标笔记路径
+            section: 链接中的段落引用（# 之后的部分，可为 ^块ID 或多级标题）
+
+        Returns:
+            引用存在时返回True；非Markdown文件或不在索引中的文件视为存在
+        """
+        rel_path = self._relative_path(target_path)
+        if rel_path is None or rel_path not in self._anchors:
+            return True
+
+        # 多级引用 [[note#A#B]] 只校验最后一级
+        anchor = section.split("#")[-1].strip()
+        if anchor.startswith("^"):
+            return f"^{anchor[1:]}" in self._anchors[rel_path]
+        return normalize_anchor(anchor) in self._anchors[rel_path]
+
+    def _rebuild_lookup(self) -> None:
+        self._by_name.clear()
+        self._anchors.clear()
+        for rel_path, entry in self.files.items():
+            self._by_name.setdefault(posixpath.basename(rel_path), []).append(rel_path)
+            if rel_path.endswith(".md"):
+                anchors = set(entry.get("headings", []))
+                anchors.update(f"^{block}" for block in entry.get("blocks", []))
+                self._anchors[rel_path] = anchors
+
+    def _relative_dir(self, directory: Union[str, Path]) -> Optional[str]:
+        try:
+            rel = Path(directory).resolve().relative_to(self.root).as_posix()
+        except ValueError:
+            return None
+        return "" if rel == "." else rel
+
+    def _relative_path(self, path: Union[str, Path]) -> Optional[str]:
+        try:
+            return Path(path).resolve().relative_to(self.root).as_posix()
+        except ValueError:
+            return None
+
+
+def _default_cache_dir() -> str:
+    """默认的库索引缓存目录"""
+    try:
+        from src.core.config import get_config
+
+        config = get_config()
+        project_root = config.get("paths.project_root", os.getcwd())
+        agent_work_dir = config.get("paths.agent_work_dir", ".ai")
+    except Exception:
+        project_root, agent_work_dir = os.getcwd(), ".ai"
+    return os.path.join(project_root, agent_work_dir, "cache", "obsidian_index")
+
+
+def _default_cache_path(root: Path) -> str:
+    """按库根目录生成默认缓存文件路径，不同的库互不覆盖"""
+    digest = hashlib.sha1(str(root).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(_default_cache_dir(), f"{root.name or 'vault'}-{digest}.json")
+
+
+def _load_cache(cache_path: Union[str, Path], root: Path) -> Dict[str, Dict[str, Any]]:
+    """读取磁盘缓存，版本或根目录不匹配时忽略"""
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != INDEX_VERSION or data.get("root") != str(root):
+        return {}
+    return data.get("files", {})
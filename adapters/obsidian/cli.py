@@ -27,6 +27,7 @@ def main():
     watch_parser = subparsers.add_parser("watch", help="监控知识库变更")
     watch_parser.add_argument("--callback", help="回调脚本路径")
     watch_parser.add_argument("--exclude", nargs="+", help="排除的文件模式")
+    watch_parser.add_argument("--docusaurus", help="批量同步到的Docusaurus文档目录")
 
     # check命令 - 检查语法
     check_parser = subparsers.add_parser("check", help="检查Obsidian语法")
@@ -58,7 +59,20 @@ def main():
 
             # 创建文件监控器
             exclude_patterns = args.exclude or []
-            watcher = FileWatcher(args.vault, callback, exclude_patterns)
+            batch_callback = None
+            if args.docusaurus:
+                from adapters.docusaurus.sync.docusaurus_sync import DocusaurusSync
+
+                docusaurus_sync = DocusaurusSync(args.vault, args.docusaurus)
+
+                # 整批变更一次同步，切换分支等大量变更不会逐文件触发
+                def sync_to_docusaurus(changes):
+                    stats = docusaurus_sync.sync_changes(changes)
+                    print(f"同步 {len(changes)} 项变更: 转换 {stats['converted']} 个，删除 {stats['deleted']} 个")
+
+                batch_callback = sync_to_docusaurus
+
+            watcher = FileWatcher(args.vault, callback, exclude_patterns, batch_callback=batch_callback)
 
             # 开始监控
             print(f"开始监控知识库: {args.vault}")
@@ -4,6 +4,6 @@ Obsidian同步模块
 提供Obsidian文件监控和同步功能。
 """
 
-from adapters.obsidian.sync.file_watcher import FileWatcher
+from adapters.obsidian.sync.file_watcher import ChangeBatch, ChangeCoalescer, FileWatcher
 
-__all__ = ["FileWatcher"]
+__all__ = ["FileWatcher", "ChangeBatch", "ChangeCoalescer"]
@@ -2,32 +2,245 @@
 文件监控工具 - 监控文档变更并触发同步.
 
 使用watchdog库实现对文档目录的实时监控，检测文件变更并触发同步操作.
+事件先合并为最小变更集（含重命名识别），再按批次交给同步回调.
 """
 
+import hashlib
 import logging
 import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Callable, Dict, List, Optional, Set
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
 from watchdog.events import (
     FileCreatedEvent,
     FileDeletedEvent,
     FileModifiedEvent,
+    FileMovedEvent,
     FileSystemEvent,
     FileSystemEventHandler,
 )
 from watchdog.observers import Observer
 
 
+@dataclass
+class ChangeBatch:
+    """一批合并后的文件变更，路径均相对于监控目录."""
+
+    created: Set[str] = field(default_factory=set)
+    modified: Set[str] = field(default_factory=set)
+    deleted: Set[str] = field(default_factory=set)
+    moved: Dict[str, str] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.created) + len(self.modified) + len(self.deleted) + len(self.moved)
+
+    def is_empty(self) -> bool:
+        """是否没有任何变更."""
+        return len(self) == 0
+
+    def as_events(self) -> List[Tuple[str, str]]:
+        """
+        展开为逐文件的 (相对路径, 事件类型) 列表，供逐文件回调使用.
+
+        Returns:
+            事件列表，移动拆分为旧路径的删除和新路径的创建
+        """
+        events = [(path, "deleted") for path in sorted(self.deleted)]
+        for old_path, new_path in sorted(self.moved.items()):
+            events.append((old_path, "deleted"))
+            events.append((new_path, "created"))
+        events.extend((path, "created") for path in sorted(self.created))
+        events.extend((path, "modified") for path in sorted(self.modified))
+        return events
+
+
+class ChangeCoalescer:
+    """把一段时间内的文件事件合并为最小变更集.
+
+    同一路径的事件序列按状态折叠：创建后修改仍是创建，创建后删除相互抵消，
+    删除后重建视为修改，连续移动合并为一次移动。刷新时再把同一批次中的
+    删除+创建配对为重命名（按已知内容哈希，其次按唯一的文件名）。
+    """
+
+    def __init__(self, base_dir: str):
+        """
+        初始化合并器.
+
+        Args:
+            base_dir: 监控目录，用于计算内容哈希
+        """
+        self.base_dir = Path(base_dir)
+        self._state: Dict[str, str] = {}
+        # 移动后的新路径 -> 批次开始时的原路径
+        self._origins: Dict[str, str] = {}
+        # 已知文件的内容哈希，用于识别删除+创建形式的重命名
+        self._hashes: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def add(self, rel_path: str, event_type: str, dest_path: Optional[str] = None) -> None:
+        """
+        记录一个文件事件.
+
+        Args:
+            rel_path: 相对路径
+            event_type: created、modified、deleted或moved
+            dest_path: 移动事件的目标相对路径
+        """
+        with self._lock:
+            if event_type == "moved" and dest_path:
+                self._add_move(rel_path, dest_path)
+            else:
+                self._add_simple(rel_path, event_type)
+
+    def __len__(self) -> int:
+        return len(self._state)
+
+    def flush(self) -> ChangeBatch:
+        """
+        取出当前累积的变更并清空状态.
+
+        Returns:
+            合并后的变更批次
+        """
+        with self._lock:
+            state, origins = self._state, self._origins
+            self._state, self._origins = {}, {}
+
+        batch = ChangeBatch()
+        for path, kind in state.items():
+            if kind == "created":
+                batch.created.add(path)
+            elif kind == "modified":
+                batch.modified.add(path)
+            elif kind == "deleted":
+                batch.deleted.add(path)
+            elif kind == "moved":
+                batch.moved[origins[path]] = path
+            elif kind == "moved+modified":
+                batch.moved[origins[path]] = path
+                batch.modified.add(path)
+
+        self._detect_renames(batch)
+        self._update_hashes(batch)
+        return batch
+
+    def _add_simple(self, path: str, event_type: str) -> None:
+        current = self._state.get(path)
+        if event_type == "created":
+            # 删除后重建视为修改
+            self._state[path] = "modified" if current == "deleted" else (current or "created")
+        elif event_type == "modified":
+            if current is None or current == "deleted":
+                self._state[path] = "modified"
+            elif current == "moved":
+                self._state[path] = "moved+modified"
+        elif event_type == "deleted":
+            if current == "created":
+                # 本批次内创建又删除，相互抵消
+                del self._state[path]
+            elif current in ("moved", "moved+modified"):
+                # 移动后删除等价于删除原路径
+                del self._state[path]
+                self._state[self._origins.pop(path)] = "deleted"
+            else:
+                self._state[path] = "deleted"
+
+    def _add_move(self, src: str, dest: str) -> None:
+        current = self._state.pop(src, None)
+        if current == "created":
+            self._state[dest] = "created"
+            return
+
+        origin = self._origins.pop(src, src) if current in ("moved", "moved+modified") else src
+        if origin == dest:
+            # 移回原位置
+            self._state[dest] = "modified"
+            return
+        if self._state.get(dest) in ("created", "modified"):
+            # 覆盖了本批次内的另一个文件
+            self._state[origin] = "deleted"
+            self._state[dest] = "modified"
+            return
+
+        self._state[dest] = "moved+modified" if current in ("modified", "moved+modified") else "moved"
+        self._origins[dest] = origin
+
+    def _detect_renames(self, batch: ChangeBatch) -> None:
+        """把同一批次中内容相同或文件名唯一对应的删除+创建识别为重命名."""
+        if not batch.deleted or not batch.created:
+            return
+
+        by_hash: Dict[str, List[str]] = {}
+        for path in batch.deleted:
+            digest = self._hashes.get(path)
+            if digest:
+                by_hash.setdefault(digest, []).append(path)
+
+        for new_path in sorted(batch.created):
+            digest = self._hash_file(new_path)
+            candidates = by_hash.get(digest) if digest else None
+            if candidates:
+                old_path = candidates.pop()
+                self._pair(batch, old_path, new_path)
+
+        # 没有哈希记录时，按唯一的文件名配对（文件被移动到其他目录）
+        deleted_names: Dict[str, List[str]] = {}
+        for path in batch.deleted:
+            deleted_names.setdefault(os.path.basename(path), []).append(path)
+        created_names: Dict[str, List[str]] = {}
+        for path in batch.created:
+            created_names.setdefault(os.path.basename(path), []).append(path)
+        for name, old_paths in deleted_names.items():
+            new_paths = created_names.get(name, [])
+            if len(old_paths) == 1 and len(new_paths) == 1:
+                self._pair(batch, old_paths[0], new_paths[0])
+                batch.modified.add(new_paths[0])
+
+    @staticmethod
+    def _pair(batch: ChangeBatch, old_path: str, new_path: str) -> None:
+        batch.deleted.discard(old_path)
+        batch.created.discard(new_path)
+        batch.moved[old_path] = new_path
+
+    def _update_hashes(self, batch: ChangeBatch) -> None:
+        for path in batch.deleted:
+            self._hashes.pop(path, None)
+        for old_path, new_path in batch.moved.items():
+            digest = self._hashes.pop(old_path, None)
+            if digest and new_path not in batch.modified:
+                self._hashes[new_path] = digest
+        for path in batch.created | batch.modified:
+            digest = self._hash_file(path)
+            if digest:
+                self._hashes[path] = digest
+
+    def _hash_file(self, rel_path: str) -> Optional[str]:
+        try:
+            return hashlib.sha1((self.base_dir / rel_path).read_bytes()).hexdigest()
+        except OSError:
+            return None
+
+
 class DocFileHandler(FileSystemEventHandler):
-    """文档文件变更处理器."""
+    """文档文件变更处理器.
+
+    事件先进入合并器，静默 debounce_seconds 后（或自首个事件起超过 max_delay 秒）
+    作为一个批次交给 batch_callback；未提供批量回调时，由有界线程池逐文件调用 callback.
+    """
 
     def __init__(
         self,
         base_dir: str,
-        callback: Callable[[str, str], None],
+        callback: Optional[Callable[[str, str], None]] = None,
         exclude_patterns: List[str] = None,
+        batch_callback: Optional[Callable[[ChangeBatch], None]] = None,
+        debounce_seconds: float = 1.0,
+        max_delay: float = 10.0,
+        max_workers: int = 4,
     ):
         """
         初始化文件处理器.
@@ -36,15 +249,29 @@ class DocFileHandler(FileSystemEventHandler):
             base_dir: 基准目录
             callback: 变更回调函数(接收相对路径和事件类型)
             exclude_patterns: 要排除的文件模式
+            batch_callback: 批量变更回调函数(接收ChangeBatch)
+            debounce_seconds: 静默多久后提交批次
+            max_delay: 持续有事件时，批次最长等待时间
+            max_workers: 逐文件回调的最大并发数
         """
         self.base_dir = Path(base_dir)
         self.callback = callback
+        self.batch_callback = batch_callback
         self.exclude_patterns = exclude_patterns or []
         self.logger = logging.getLogger("doc_file_handler")
 
         # 延迟处理缓冲，避免频繁触发同一文件的多个事件
-        self.pending_events = {}
-        self.debounce_seconds = 1.0
+        self.coalescer = ChangeCoalescer(base_dir)
+        self.debounce_seconds = debounce_seconds
+        self.max_delay = max_delay
+        self.max_workers = max_workers
+
+        self._lock = threading.Lock()
+        # 批次按顺序投递，投递期间到达的事件进入下一批次
+        self._delivery_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._first_event_at: Optional[float] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
 
     def on_any_event(self, event: FileSystemEvent):
         """
@@ -57,35 +284,120 @@ class DocFileHandler(FileSystemEventHandler):
             return
 
         # 获取相对路径
-        try:
-            src_path = Path(event.src_path)
-            rel_path = src_path.relative_to(self.base_dir)
-            rel_path_str = str(rel_path)
-        except (ValueError, AttributeError):
-            return
-
-        # 检查是否应该忽略
-        if self._should_ignore(rel_path_str):
+        rel_path_str = self._relative(event.src_path)
+        if rel_path_str is None:
             return
 
         # 确定事件类型
-        event_type = "unknown"
-        if isinstance(event, FileCreatedEvent):
+        dest_path = None
+        if isinstance(event, FileMovedEvent):
+            event_type = "moved"
+            dest_path = self._relative(event.dest_path)
+        elif isinstance(event, FileCreatedEvent):
             event_type = "created"
         elif isinstance(event, FileModifiedEvent):
             event_type = "modified"
         elif isinstance(event, FileDeletedEvent):
             event_type = "deleted"
-
-        # 只处理Markdown文件
-        if event_type != "deleted" and not self._is_markdown_file(rel_path_str):
+        else:
             return
 
-        # 将事件添加到延迟处理缓冲
-        self.pending_events[rel_path_str] = (event_type, time.time())
+        if event_type == "moved":
+            src_tracked = not self._should_ignore(rel_path_str) and self._is_markdown_file(rel_path_str)
+            dest_tracked = dest_path is not None and not self._should_ignore(dest_path) and self._is_markdown_file(dest_path)
+            if src_tracked and dest_tracked:
+                self.coalescer.add(rel_path_str, "moved", dest_path)
+            elif src_tracked:
+                self.coalescer.add(rel_path_str, "deleted")
+            elif dest_tracked:
+                self.coalescer.add(dest_path, "created")
+            else:
+                return
+        else:
+            # 检查是否应该忽略
+            if self._should_ignore(rel_path_str):
+                return
+
+            # 只处理Markdown文件
+            if event_type != "deleted" and not self._is_markdown_file(rel_path_str):
+                return
+
+            self.coalescer.add(rel_path_str, event_type)
 
         # 启动延迟处理
-        self._process_pending_events()
+        self._schedule_flush()
+
+    def flush(self) -> ChangeBatch:
+        """
+        立即提交当前累积的变更.
+
+        Returns:
+            已投递的变更批次
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._first_event_at = None
+
+        with self._delivery_lock:
+            batch = self.coalescer.flush()
+            if not batch.is_empty():
+                self._deliver(batch)
+        return batch
+
+    def close(self) -> None:
+        """提交剩余变更并关闭线程池."""
+        self.flush()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _relative(self, path: str) -> Optional[str]:
+        try:
+            return Path(path).relative_to(self.base_dir).as_posix()
+        except (ValueError, TypeError):
+            return None
+
+    def _schedule_flush(self) -> None:
+        """每个新事件重置静默计时器，但不超过 max_delay."""
+        with self._lock:
+            now = time.monotonic()
+            if self._first_event_at is None:
+                self._first_event_at = now
+            delay = min(self.debounce_seconds, max(0.0, self._first_event_at + self.max_delay - now))
+
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(delay, self._on_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _on_timer(self) -> None:
+        try:
+            self.flush()
+        except Exception as e:
+            self.logger.error(f"处理文件变更批次失败: {str(e)}")
+
+    def _deliver(self, batch: ChangeBatch) -> None:
+        """投递一个批次，逐文件回调时使用有界线程池并等待全部完成."""
+        self.logger.debug(f"提交变更批次: {len(batch)} 项")
+        if self.batch_callback is not None:
+            self.batch_callback(batch)
+            return
+        if self.callback is None:
+            return
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="file-watcher")
+
+        # 同一路径在批次中只会出现一次（移动拆分的旧路径和新路径不同），可以安全并发
+        futures = {self._executor.submit(self.callback, rel_path, event_type): rel_path for rel_path, event_type in batch.as_events()}
+        for future, rel_path in futures.items():
+            try:
+                future.result()
+            except Exception as e:
+                self.logger.error(f"处理文件事件失败: {rel_path} - {str(e)}")
 
     def _should_ignore(self, rel_path: str) -> bool:
         """
@@ -119,25 +431,6 @@ class DocFileHandler(FileSystemEventHandler):
         extensions = [".md", ".mdx", ".markdown"]
         return any(file_path.lower().endswith(ext) for ext in extensions)
 
-    def _process_pending_events(self):
-        """处理挂起的文件事件，应用防抖动逻辑."""
-        current_time = time.time()
-        processed = set()
-
-        for rel_path, (event_type, timestamp) in list(self.pending_events.items()):
-            # 检查事件是否已经足够"老"可以处理
-            if current_time - timestamp >= self.debounce_seconds:
-                try:
-                    self.callback(rel_path, event_type)
-                except Exception as e:
-                    self.logger.error(f"处理文件事件失败: {rel_path} - {str(e)}")
-
-                processed.add(rel_path)
-
-        # 从挂起事件中移除已处理的事件
-        for rel_path in processed:
-            self.pending_events.pop(rel_path, None)
-
 
 class FileWatcher:
     """文档文件监控器，监控文件变更并触发同步."""
@@ -145,8 +438,12 @@ class FileWatcher:
     def __init__(
         self,
         watch_dir: str,
-        sync_callback: Callable[[str, str], None],
+        sync_callback: Optional[Callable[[str, str], None]] = None,
         exclude_patterns: List[str] = None,
+        batch_callback: Optional[Callable[[ChangeBatch], None]] = None,
+        debounce_seconds: float = 1.0,
+        max_delay: float = 10.0,
+        max_workers: int = 4,
     ):
         """
         初始化文件监控器.
@@ -155,12 +452,24 @@ class FileWatcher:
             watch_dir: 要监控的目录
             sync_callback: 同步回调函数(接收相对路径和事件类型)
             exclude_patterns: 要排除的文件模式
+            batch_callback: 批量同步回调函数(接收ChangeBatch)，提供时优先使用
+            debounce_seconds: 静默多久后提交批次
+            max_delay: 持续有事件时，批次最长等待时间
+            max_workers: 逐文件回调的最大并发数
         """
         self.watch_dir = Path(watch_dir)
         self.sync_callback = sync_callback
         self.exclude_patterns = exclude_patterns or []
 
-        self.event_handler = DocFileHandler(watch_dir, sync_callback, exclude_patterns)
+        self.event_handler = DocFileHandler(
+            watch_dir,
+            sync_callback,
+            exclude_patterns,
+            batch_callback=batch_callback,
+            debounce_seconds=debounce_seconds,
+            max_delay=max_delay,
+            max_workers=max_workers,
+        )
         self.observer = Observer()
 
         # 设置logger
@@ -173,9 +482,10 @@ class FileWatcher:
         self.logger.info(f"开始监控目录: {self.watch_dir}")
 
     def stop(self):
-        """停止文件监控."""
+        """停止文件监控，并提交尚未处理的变更."""
         self.observer.stop()
         self.observer.join()
+        self.event_handler.close()
         self.logger.info("停止监控目录")
 
     def is_running(self) -> bool:
@@ -25,6 +25,8 @@ def main():
     parser.add_argument("-r", "--recursive", action="store_true", help="递归检查子目录")
     parser.add_argument("-v", "--verbose", action="store_true", help="显示详细信息")
     parser.add_argument("-b", "--base-dir", default=None, help="基础目录，用于相对路径显示")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="并行检查的进程数，1表示串行")
+    parser.add_argument("--cache-in-vault", action="store_true", help="把库索引缓存写入库根目录，而不是VibeCopilot缓存目录")
     args = parser.parse_args()
 
     # 设置日志
@@ -40,12 +42,12 @@ def main():
     base_dir = args.base_dir or (target_path if target_path.is_dir() else target_path.parent)
 
     # 初始化检查器
-    checker = ObsidianSyntaxChecker(base_dir, logger)
+    checker = ObsidianSyntaxChecker(base_dir, logger, index_cache_in_vault=args.cache_in_vault)
 
     # 执行检查
     if target_path.is_dir():
         logger.info(f"检查目录: {target_path}")
-        issues = checker.check_directory(target_path, args.recursive)
+        issues = checker.check_directory(target_path, args.recursive, workers=args.workers)
     else:
         logger.info(f"检查文件: {target_path}")
         file_issues = checker.check_file(target_path)
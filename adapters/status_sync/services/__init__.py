@@ -6,6 +6,7 @@
 
 from adapters.status_sync.services.execution_sync import ExecutionSync
 from adapters.status_sync.services.n8n_sync import N8nSync
+from adapters.status_sync.services.outbox_flusher import StatusSyncOutboxFlusher
 from adapters.status_sync.services.status_subscriber import StatusSyncSubscriber
 
-__all__ = ["ExecutionSync", "N8nSync", "StatusSyncSubscriber"]
+__all__ = ["ExecutionSync", "N8nSync", "StatusSyncSubscriber", "StatusSyncOutboxFlusher"]
@@ -10,7 +10,7 @@ from typing import Any, Dict, List, Optional
 
 from sqlalchemy.orm import Session
 
-from src.db import WorkflowDefinitionRepository
+from src.db.repositories.workflow_definition_repository import WorkflowDefinitionRepository
 from src.models.db import WorkflowDefinition
 
 logger = logging.getLogger(__name__)
@@ -32,7 +32,7 @@ class ExecutionSync:
         """
         self.db_session = db_session
         self.n8n_adapter = n8n_adapter
-        self.workflow_repo = WorkflowDefinitionRepository(db_session)
+        self.workflow_repo = WorkflowDefinitionRepository()
         logger.info("ExecutionSync服务已初始化")
 
     def sync_execution_status(self, execution_id: str) -> bool:
@@ -70,7 +70,7 @@ class ExecutionSync:
         """
         try:
             # 验证工作流存在
-            workflow = self.workflow_repo.get_by_id(workflow_id)
+            workflow = self.workflow_repo.get_by_id(self.db_session, workflow_id)
             if not workflow:
                 logger.error(f"工作流不存在: {workflow_id}")
                 return None
@@ -106,7 +106,7 @@ class ExecutionSync:
             执行记录列表
         """
         # 验证工作流存在
-        workflow = self.workflow_repo.get_by_id(workflow_id)
+        workflow = self.workflow_repo.get_by_id(self.db_session, workflow_id)
         if not workflow:
             logger.error(f"工作流不存在: {workflow_id}")
             return []
@@ -41,36 +41,7 @@ class N8nSync:
         Returns:
             是否同步成功
         """
-        try:
-            if not self.n8n_adapter:
-                logger.error("n8n适配器未初始化")
-                return False
-
-            # 检查变量是否存在
-            existing = self.n8n_adapter.get_variable(key)
-
-            if existing:
-                # 更新变量
-                result = self.n8n_adapter.update_variable(key, value)
-                if result:
-                    logger.info(f"更新n8n变量: {key}")
-                    return True
-                else:
-                    logger.error(f"更新n8n变量失败: {key}")
-                    return False
-            else:
-                # 创建变量
-                result = self.n8n_adapter.create_variable(key, value)
-                if result:
-                    logger.info(f"创建n8n变量: {key}")
-                    return True
-                else:
-                    logger.error(f"创建n8n变量失败: {key}")
-                    return False
-
-        except Exception as e:
-            logger.exception(f"同步变量到n8n失败: {str(e)}")
-            return False
+        return self.update_system_variables({key: value}).get(key, False)
 
     def sync_credentials(self, credential_type: str, credential_data: Dict[str, Any]) -> bool:
         """同步凭证到n8n
@@ -177,9 +148,32 @@ class N8nSync:
         Returns:
             各变量更新结果
         """
-        results = {}
+        if not self.n8n_adapter:
+            logger.error("n8n适配器未初始化")
+            return {key: False for key in variables}
+
+        # 一次拉取远端变量，本地比对后并发提交变化的部分
+        try:
+            return self.n8n_adapter.sync_variables(variables)
+        except Exception as e:
+            logger.exception(f"批量同步变量到n8n失败: {str(e)}")
+            return {key: False for key in variables}
 
-        for key, value in variables.items():
-            results[key] = self.sync_variable(key, value)
+    def sync_credentials_batch(self, credentials: List[Dict[str, Any]]) -> Dict[str, bool]:
+        """批量同步凭证
 
-        return results
+        Args:
+            credentials: 凭证列表，每项包含name、type和data
+
+        Returns:
+            各凭证（按名称）的同步结果
+        """
+        if not self.n8n_adapter:
+            logger.error("n8n适配器未初始化")
+            return {credential.get("name"): False for credential in credentials}
+
+        try:
+            return self.n8n_adapter.sync_credentials(credentials)
+        except Exception as e:
+            logger.exception(f"批量同步凭证到n8n失败: {str(e)}")
+            return {credential.get("name"): False for credential in credentials}
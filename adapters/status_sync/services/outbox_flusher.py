@@ -0,0 +1,139 @@
+"""
+状态同步发件箱后台发送服务
+
+在后台线程中定期领取发件箱中到期的状态变更，批量交给发送函数，
+成功的条目删除，失败的条目按指数退避安排重试
+"""
+
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from src.core.config import get_config
+from src.db.repositories.status_sync_outbox_repository import StatusSyncOutboxRepository
+
+logger = logging.getLogger(__name__)
+
+# 发送函数：接收条目列表，返回 条目ID -> 错误信息（成功为None）
+DeliverFunc = Callable[[List[Dict[str, Any]]], Dict[str, Optional[str]]]
+
+
+def _load_outbox_settings() -> Dict[str, float]:
+    """读取状态同步配置"""
+    settings = {"flush_interval": 2.0, "batch_size": 100, "retry_base": 5.0, "retry_max": 300.0}
+    try:
+        config = get_config()
+        for key in settings:
+            settings[key] = float(config.get(f"status_sync.{key}", settings[key]))
+    except Exception as e:
+        logger.warning(f"读取状态同步配置失败，使用默认值: {e}")
+    return settings
+
+
+class StatusSyncOutboxFlusher:
+    """状态同步发件箱后台发送器"""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Any],
+        deliver: DeliverFunc,
+        flush_interval: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        retry_base: Optional[float] = None,
+        retry_max: Optional[float] = None,
+    ):
+        """初始化发送器
+
+        Args:
+            session_factory: 数据库会话工厂，后台线程使用独立会话
+            deliver: 批量发送函数
+            flush_interval: 两次发送之间的间隔（秒）
+            batch_size: 每批最多发送的条目数
+            retry_base: 失败重试的基础退避时间（秒）
+            retry_max: 失败重试的最大退避时间（秒）
+        """
+        settings = _load_outbox_settings()
+        self.session_factory = session_factory
+        self.deliver = deliver
+        self.flush_interval = flush_interval if flush_interval is not None else settings["flush_interval"]
+        self.batch_size = int(batch_size if batch_size is not None else settings["batch_size"])
+        self.retry_base = retry_base if retry_base is not None else settings["retry_base"]
+        self.retry_max = retry_max if retry_max is not None else settings["retry_max"]
+        self.repository = StatusSyncOutboxRepository()
+
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """启动后台线程（已启动时忽略）"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="status-sync-outbox", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """停止后台线程，未发送的条目保留在发件箱中
+
+        Args:
+            timeout: 等待线程退出的秒数
+        """
+        self._stopping.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def wake(self) -> None:
+        """通知后台线程尽快发送"""
+        self._wake.set()
+
+    def flush_once(self) -> Dict[str, int]:
+        """领取并发送一批到期条目
+
+        Returns:
+            统计信息 {'sent': n, 'failed': n}
+        """
+        session = self.session_factory()
+        try:
+            entries = self.repository.claim_due(session, self.batch_size)
+            if not entries:
+                return {"sent": 0, "failed": 0}
+
+            try:
+                errors = self.deliver(entries)
+            except Exception as e:
+                logger.exception(f"发送状态同步批次失败: {e}")
+                errors = {entry["id"]: str(e) for entry in entries}
+
+            delivered = {}
+            failed = 0
+            for entry in entries:
+                error = errors.get(entry["id"])
+                if error is None:
+                    delivered[entry["id"]] = entry["version"]
+                else:
+                    failed += 1
+                    backoff = min(self.retry_max, self.retry_base * (2 ** entry["attempts"]))
+                    self.repository.mark_failed(session, entry["id"], entry["version"], error, backoff)
+            if delivered:
+                self.repository.mark_delivered(session, delivered)
+            return {"sent": len(delivered), "failed": failed}
+        finally:
+            session.close()
+
+    def _run(self) -> None:
+        """后台循环：被唤醒或到达间隔后发送，直到没有到期条目"""
+        while not self._stopping.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                while not self._stopping.is_set():
+                    stats = self.flush_once()
+                    if stats["sent"] + stats["failed"] < self.batch_size:
+                        break
+            except Exception as e:
+                logger.exception(f"状态同步发件箱处理失败: {e}")
@@ -1,18 +1,26 @@
 """
 状态订阅服务
 
-实现IStatusSubscriber接口，订阅系统状态变更并同步到外部系统
+实现IStatusSubscriber接口，订阅系统状态变更并同步到外部系统.
+状态变更先写入本地发件箱（同一实体合并为最新状态），由后台发送器批量同步，
+调用方不等待外部系统，未发送的变更在重启后继续发送.
 """
 
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, sessionmaker
 
+from adapters.status_sync.services.outbox_flusher import StatusSyncOutboxFlusher
+from src.core.config import get_config
+from src.db.repositories.status_sync_outbox_repository import StatusSyncOutboxRepository
+from src.models.db.status_sync_outbox import StatusSyncOutbox
 from src.status.interfaces import IStatusSubscriber
 
 logger = logging.getLogger(__name__)
 
+SUPPORTED_DOMAINS = ("workflow", "roadmap")
+
 
 class StatusSyncSubscriber(IStatusSubscriber):
     """状态同步订阅者
@@ -20,13 +28,30 @@ class StatusSyncSubscriber(IStatusSubscriber):
     订阅状态变更事件，将状态同步到外部系统（如n8n）
     """
 
-    def __init__(self, db_session: Session):
+    def __init__(
+        self,
+        db_session: Session,
+        n8n_adapter: Any = None,
+        session_factory: Optional[Callable[[], Session]] = None,
+        auto_start: bool = True,
+    ):
         """初始化状态同步订阅者
 
         Args:
             db_session: 数据库会话
+            n8n_adapter: n8n适配器，未提供时按配置创建
+            session_factory: 发件箱写入和后台发送器使用的会话工厂，默认绑定到db_session的引擎
+            auto_start: 收到第一个状态变更时是否自动启动后台发送器
         """
         self.db_session = db_session
+        self.auto_start = auto_start
+        self._n8n_adapter = n8n_adapter
+        self.outbox_repo = StatusSyncOutboxRepository()
+
+        bind = db_session.get_bind()
+        # 发件箱表可能早于数据库初始化脚本引入
+        StatusSyncOutbox.__table__.create(bind=bind, checkfirst=True)
+        self.flusher = StatusSyncOutboxFlusher(session_factory or sessionmaker(bind=bind), self._deliver_batch)
         logger.info("状态同步订阅者已初始化")
 
     def on_status_changed(
@@ -39,7 +64,7 @@ class StatusSyncSubscriber(IStatusSubscriber):
     ) -> None:
         """状态变更事件处理
 
-        当系统中的状态发生变更时，此方法会被调用，用于同步状态到外部系统
+        当系统中的状态发生变更时，此方法会被调用，把变更写入发件箱后立即返回
 
         Args:
             domain: 领域名称（如 'roadmap', 'workflow'）
@@ -50,119 +75,132 @@ class StatusSyncSubscriber(IStatusSubscriber):
         """
         logger.info(f"状态变更: {domain}/{entity_id}: {old_status} -> {new_status}")
 
+        if domain not in SUPPORTED_DOMAINS:
+            logger.debug(f"不支持的领域类型: {domain}")
+            return
+
+        # 使用独立会话写入发件箱，提交或回滚不会影响调用方会话中未完成的事务
+        session = self.flusher.session_factory()
         try:
-            # 根据领域类型处理不同的状态同步
-            if domain == "workflow":
-                self._sync_workflow_status(entity_id, new_status, context)
-            elif domain == "roadmap":
-                self._sync_roadmap_status(entity_id, new_status, context)
-            else:
-                logger.debug(f"不支持的领域类型: {domain}")
+            self.outbox_repo.enqueue(session, domain, entity_id, old_status, new_status, context)
         except Exception as e:
-            logger.exception(f"同步状态时发生错误: {e}")
+            logger.exception(f"写入状态同步发件箱失败: {e}")
+            return
+        finally:
+            session.close()
+
+        if self.auto_start:
+            self.flusher.start()
+        self.flusher.wake()
+
+    def close(self) -> None:
+        """停止后台发送器"""
+        self.flusher.stop()
+
+    def _get_n8n_adapter(self) -> Any:
+        """获取n8n适配器，未启用时返回None"""
+        if self._n8n_adapter is None and get_config().get("status_sync.n8n_enabled", False):
+            from adapters.n8n.adapter import N8nAdapter
 
-    def _sync_workflow_status(self, workflow_id: str, status: str, context: Dict[str, Any]) -> None:
-        """同步工作流状态
+            self._n8n_adapter = N8nAdapter()
+        return self._n8n_adapter
 
-        Args:
-            workflow_id: 工作流ID
-            status: 新状态
-            context: 上下文信息
-        """
-        try:
-            # 导入所需服务
-            from adapters.n8n.adapter import N8nAdapter
-            from adapters.status_sync.services.execution_sync import ExecutionSync
-            from adapters.status_sync.services.n8n_sync import N8nSync
-            from src.core.config import settings
-
-            # 初始化N8n适配器
-            n8n_adapter = None
-            if settings.n8n.enabled:
-                n8n_adapter = N8nAdapter(base_url=settings.n8n.api_url, api_key=settings.n8n.api_key)
-
-            # 使用ExecutionSync占位实现 - 暂时记录日志
-            logger.warning(f"工作流状态同步待实现: {workflow_id} -> {status} (将在status模块重构)")
-
-            # 仅记录同步结果
-            logger.info(f"工作流状态同步：{workflow_id} -> {status} (临时占位)")
-
-            # 同步系统变量
-            if n8n_adapter and status == "active":
-                n8n_sync = N8nSync(self.db_session, n8n_adapter)
-                n8n_sync.sync_variable(
-                    "SYSTEM_STATUS_UPDATE",
-                    {
-                        "type": "workflow",
-                        "id": workflow_id,
-                        "status": status,
-                        "timestamp": context.get("updated_at", ""),
-                    },
-                )
-        except ImportError as e:
-            logger.error(f"导入依赖模块失败: {e}")
-        except Exception as e:
-            logger.exception(f"同步工作流状态失败: {e}")
+    def _deliver_batch(self, entries: List[Dict[str, Any]]) -> Dict[str, Optional[str]]:
+        """批量发送发件箱条目
 
-    def _sync_roadmap_status(self, entity_id: str, status: str, context: Dict[str, Any]) -> None:
-        """同步路线图状态
+        同一批次中写入同一n8n变量的条目只发送最新的一条，所有变量一次批量同步.
 
         Args:
-            entity_id: 实体ID
-            status: 新状态
-            context: 上下文信息
-        """
-        try:
-            # 导入N8nSync服务
-            from adapters.n8n.adapter import N8nAdapter
-            from adapters.status_sync.services.n8n_sync import N8nSync
-            from src.core.config import settings
+            entries: 发件箱条目列表
 
-            # 初始化N8n适配器
-            if not settings.n8n.enabled:
-                logger.debug("N8n未启用，跳过路线图状态同步")
-                return
+        Returns:
+            条目ID到错误信息的映射，成功为None
+        """
+        n8n_adapter = self._get_n8n_adapter()
+        if n8n_adapter is None:
+            logger.debug(f"N8n未启用，跳过 {len(entries)} 条状态同步")
+            return {entry["id"]: None for entry in entries}
+
+        # 变量名 -> (值, 使用该变量的条目ID)
+        variables: Dict[str, Any] = {}
+        owners: Dict[str, List[str]] = {}
+        for entry in sorted(entries, key=lambda e: e["updated_at"] or ""):
+            key, value = self._status_variable(entry)
+            if key is None:
+                continue
+            variables[key] = value
+            owners.setdefault(key, []).append(entry["id"])
+
+        errors: Dict[str, Optional[str]] = {entry["id"]: None for entry in entries}
+        if variables:
+            results = n8n_adapter.sync_variables(variables)
+            for key, ok in results.items():
+                if not ok:
+                    for entry_id in owners.get(key, []):
+                        errors[entry_id] = f"同步n8n变量失败: {key}"
+
+        for entry in entries:
+            workflow_id = entry["context"].get("workflow_id")
+            if entry["domain"] == "roadmap" and workflow_id and errors[entry["id"]] is None:
+                errors[entry["id"]] = self._trigger_workflow(n8n_adapter, workflow_id, entry)
+        return errors
+
+    @staticmethod
+    def _status_variable(entry: Dict[str, Any]) -> tuple:
+        """把发件箱条目转换为n8n系统变量
 
-            n8n_adapter = N8nAdapter(base_url=settings.n8n.api_url, api_key=settings.n8n.api_key)
+        Args:
+            entry: 发件箱条目
 
-            # 获取完整的上下文信息
-            entity_type = context.get("type", "unknown")
-            entity_name = context.get("name", entity_id)
+        Returns:
+            (变量名, 变量值)，无需同步时变量名为None
+        """
+        context = entry["context"]
+        if entry["domain"] == "workflow":
+            if entry["status"] != "active":
+                return None, None
+            return "SYSTEM_STATUS_UPDATE", {
+                "type": "workflow",
+                "id": entry["entity_id"],
+                "status": entry["status"],
+                "timestamp": context.get("updated_at", ""),
+            }
+        return "ROADMAP_STATUS_UPDATE", {
+            "type": context.get("type", "unknown"),
+            "id": entry["entity_id"],
+            "name": context.get("name", entry["entity_id"]),
+            "status": entry["status"],
+            "timestamp": context.get("updated_at", ""),
+        }
+
+    def _trigger_workflow(self, n8n_adapter: Any, workflow_id: str, entry: Dict[str, Any]) -> Optional[str]:
+        """触发与路线图实体关联的工作流执行
+
+        Returns:
+            错误信息，成功为None
+        """
+        from adapters.status_sync.services.execution_sync import ExecutionSync
 
-            # 同步系统变量
-            n8n_sync = N8nSync(self.db_session, n8n_adapter)
-            n8n_sync.sync_variable(
-                "ROADMAP_STATUS_UPDATE",
+        context = entry["context"]
+        session = self.flusher.session_factory()
+        try:
+            execution_id = ExecutionSync(session, n8n_adapter).create_execution(
+                workflow_id,
                 {
-                    "type": entity_type,
-                    "id": entity_id,
-                    "name": entity_name,
-                    "status": status,
-                    "timestamp": context.get("updated_at", ""),
+                    "entity_id": entry["entity_id"],
+                    "entity_type": context.get("type", "unknown"),
+                    "entity_name": context.get("name", entry["entity_id"]),
+                    "status": entry["status"],
                 },
             )
-
-            # 如果有关联的工作流，也触发工作流状态同步
-            workflow_id = context.get("workflow_id")
-            if workflow_id:
-                from adapters.status_sync.services.execution_sync import ExecutionSync
-
-                execution_sync = ExecutionSync(self.db_session, n8n_adapter)
-                execution_id = execution_sync.create_execution(
-                    workflow_id,
-                    {
-                        "entity_id": entity_id,
-                        "entity_type": entity_type,
-                        "entity_name": entity_name,
-                        "status": status,
-                    },
-                )
-
-                if execution_id:
-                    logger.info(f"触发工作流执行: {workflow_id} (execution: {execution_id})")
-                else:
-                    logger.warning(f"触发工作流执行失败: {workflow_id}")
-        except ImportError as e:
-            logger.error(f"导入依赖模块失败: {e}")
         except Exception as e:
-            logger.exception(f"同步路线图状态失败: {e}")
+            return f"触发工作流执行失败: {workflow_id} - {e}"
+        finally:
+            session.close()
+
+        if not execution_id:
+            # 工作流不存在等情况重试也不会成功，只记录日志
+            logger.warning(f"触发工作流执行失败: {workflow_id}")
+        else:
+            logger.info(f"触发工作流执行: {workflow_id} (execution: {execution_id})")
+        return None
@@ -192,13 +192,14 @@ def delete_db(service, type: str, id: str, force: bool = False, verbose: bool =
 
 @db.command(name="backup", help="备份数据库")
 @click.option("--output", help="备份文件路径")
+@click.option("--incremental", is_flag=True, help="生成增量快照（输出路径为快照目录）")
 @click.option("--verbose", is_flag=True, help="显示详细信息")
 @pass_service(service_type="db")
-def backup_db(service, output: Optional[str] = None, verbose: bool = False) -> int:
+def backup_db(service, output: Optional[str] = None, incremental: bool = False, verbose: bool = False) -> int:
     """备份数据库"""
     try:
         # 创建参数字典，与BackupHandler兼容
-        args_dict = {"output": output, "verbose": verbose, "service": service}
+        args_dict = {"output": output, "incremental": incremental, "verbose": verbose, "service": service}
 
         # 实例化并执行BackupHandler
         from src.cli.commands.db.handlers.backup_handler import BackupHandler
@@ -212,14 +213,15 @@ def backup_db(service, output: Optional[str] = None, verbose: bool = False) -> i
 
 @db.command(name="restore", help="恢复数据库")
 @click.argument("backup_file")
+@click.option("--snapshot", help="快照ID（备份路径为快照目录时使用，默认最新快照）")
 @click.option("--force", is_flag=True, help="强制恢复，不提示确认")
 @click.option("--verbose", is_flag=True, help="显示详细信息")
 @pass_service(service_type="db")
-def restore_db(service, backup_file: str, force: bool = False, verbose: bool = False) -> int:
-    """从备份文件恢复数据库"""
+def restore_db(service, backup_file: str, snapshot: Optional[str] = None, force: bool = False, verbose: bool = False) -> int:
+    """从备份文件或快照目录恢复数据库"""
     try:
         # 创建参数字典，与RestoreHandler兼容
-        args_dict = {"backup_file": backup_file, "force": force, "verbose": verbose, "service": service}
+        args_dict = {"backup_path": backup_file, "snapshot": snapshot, "force": force, "verbose": verbose, "service": service}
 
         # 实例化并执行RestoreHandler
         from src.cli.commands.db.handlers.restore_handler import RestoreHandler
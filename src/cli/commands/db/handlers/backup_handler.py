@@ -6,15 +6,15 @@
 
 import logging
 import os
-import shutil
 from datetime import datetime
 from typing import Any, Dict, Optional
 
 import click
 from rich.console import Console
+from rich.progress import BarColumn, Progress, TextColumn
 
 from src.cli.decorators import pass_service
-from src.models.db.init_db import get_db_path
+from src.utils.sqlite_backup import SQLiteSnapshotStore, get_sqlite_db_path, online_backup
 
 from .base_handler import ClickBaseHandler
 from .exceptions import DatabaseError, ValidationError
@@ -76,10 +76,11 @@ class BackupHandler(ClickBaseHandler):
         """
         verbose = kwargs.get("verbose", False)
         output_path = kwargs.get("output")
+        incremental = kwargs.get("incremental", False)
 
         try:
             # 获取数据库文件路径
-            db_path = get_db_path()
+            db_path = get_sqlite_db_path()
 
             # 检查数据库文件是否存在
             if not os.path.exists(db_path):
@@ -87,17 +88,42 @@ class BackupHandler(ClickBaseHandler):
 
             # 如果没有指定输出路径，生成默认路径
             if not output_path:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 backup_dir = os.path.join(os.path.dirname(db_path), "backups")
-                if not os.path.exists(backup_dir):
-                    os.makedirs(backup_dir)
-                output_path = os.path.join(backup_dir, f"vibecopilot_db_{timestamp}.backup")
+                if incremental:
+                    output_path = os.path.join(backup_dir, "snapshots")
+                else:
+                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                    if not os.path.exists(backup_dir):
+                        os.makedirs(backup_dir)
+                    output_path = os.path.join(backup_dir, f"vibecopilot_db_{timestamp}.backup")
 
             if verbose:
                 console.print(f"开始备份数据库到 {output_path}")
 
-            # 复制数据库文件
-            shutil.copy2(db_path, output_path)
+            # 在线备份，按步复制页面并显示进度，备份期间数据库仍可写入
+            with Progress(
+                TextColumn("[progress.description]{task.description}"),
+                BarColumn(),
+                TextColumn("{task.completed}/{task.total} 页"),
+                console=console,
+                transient=True,
+            ) as progress:
+                task = progress.add_task("备份数据库", total=None)
+
+                def on_progress(copied: int, total: int) -> None:
+                    progress.update(task, completed=copied, total=total)
+
+                if incremental:
+                    snapshot = SQLiteSnapshotStore(output_path).create_snapshot(db_path, progress=on_progress)
+                else:
+                    online_backup(db_path, output_path, progress=on_progress)
+
+            if incremental:
+                kind = "全量" if snapshot["type"] == "full" else "增量"
+                console.print(
+                    f"[green]已创建{kind}快照 {snapshot['id']}（{snapshot['changed_pages']}/{snapshot['page_count']} 页）: {output_path}[/green]"
+                )
+                return 0
 
             # 校验备份是否成功
             if not os.path.exists(output_path) or os.path.getsize(output_path) == 0:
@@ -124,20 +150,22 @@ class BackupHandler(ClickBaseHandler):
 
 @click.command(name="backup", help="备份数据库")
 @click.option("--output", "-o", help="备份文件输出路径")
+@click.option("--incremental", "-i", is_flag=True, help="生成增量快照（输出路径为快照目录）")
 @click.option("--verbose", "-v", is_flag=True, help="显示详细信息")
 @pass_service(service_type="db")
-def backup_db(service, output: Optional[str], verbose: bool):
+def backup_db(service, output: Optional[str], incremental: bool, verbose: bool):
     """
     备份数据库命令
 
     Args:
         service: 数据库服务实例
         output: 备份文件输出路径
+        incremental: 是否生成增量快照
         verbose: 是否显示详细信息
     """
     handler = BackupHandler()
     try:
-        result = handler.execute(service=service, output=output, verbose=verbose)
+        result = handler.execute(service=service, output=output, incremental=incremental, verbose=verbose)
         return result
     except Exception:
         return 1
@@ -6,7 +6,6 @@
 
 import logging
 import os
-import shutil
 from datetime import datetime
 from typing import Any, Dict, Optional
 
@@ -16,6 +15,7 @@ from rich.console import Console
 from src.cli.decorators import pass_service
 from src.core.config import get_config
 from src.utils.file_utils import ensure_directory_exists
+from src.utils.sqlite_backup import INDEX_FILE, SQLiteSnapshotStore, online_backup, online_restore
 
 from .base_handler import ClickBaseHandler
 from .exceptions import DatabaseError, ValidationError
@@ -45,6 +45,7 @@ class RestoreHandler(ClickBaseHandler):
             ValidationError: 验证失败时抛出
         """
         backup_path = kwargs.get("backup_path")
+        snapshot_id = kwargs.get("snapshot")
 
         if not backup_path:
             raise ValidationError("必须指定备份文件路径")
@@ -53,6 +54,15 @@ class RestoreHandler(ClickBaseHandler):
         if not os.path.exists(backup_path):
             raise ValidationError(f"备份文件不存在: {backup_path}")
 
+        # db backup --incremental 生成的快照目录
+        if os.path.isdir(backup_path):
+            if not os.path.isfile(os.path.join(backup_path, INDEX_FILE)):
+                raise ValidationError(f"指定目录不是快照目录: {backup_path}")
+            return True
+
+        if snapshot_id:
+            raise ValidationError("--snapshot 只能与快照目录一起使用")
+
         if not os.path.isfile(backup_path):
             raise ValidationError(f"指定路径不是文件: {backup_path}")
 
@@ -101,6 +111,7 @@ class RestoreHandler(ClickBaseHandler):
             DatabaseError: 数据库操作失败时抛出
         """
         backup_path = kwargs.get("backup_path")
+        snapshot_id = kwargs.get("snapshot")
         force = kwargs.get("force", False)
         verbose = kwargs.get("verbose", False)
 
@@ -123,12 +134,15 @@ class RestoreHandler(ClickBaseHandler):
                 if not os.path.exists(backup_dir):
                     os.makedirs(backup_dir)
                 auto_backup = os.path.join(backup_dir, f"vibecopilot_db_before_restore_{timestamp}.backup")
-                shutil.copy2(db_path, auto_backup)
+                online_backup(db_path, auto_backup)
                 if verbose:
                     console.print(f"已创建现有数据库备份: {auto_backup}")
 
-            # 复制备份文件到数据库位置
-            shutil.copy2(backup_path, db_path)
+            # 通过备份API写回数据库，已打开的连接不会读到被替换的文件
+            if os.path.isdir(backup_path):
+                self._restore_snapshot(backup_path, snapshot_id, db_path, verbose)
+            else:
+                online_restore(backup_path, db_path)
 
             # 校验恢复是否成功
             if not os.path.exists(db_path) or os.path.getsize(db_path) == 0:
@@ -140,6 +154,18 @@ class RestoreHandler(ClickBaseHandler):
         except Exception as e:
             raise DatabaseError(f"恢复数据库失败: {str(e)}")
 
+    def _restore_snapshot(self, snapshot_dir: str, snapshot_id: Optional[str], db_path: str, verbose: bool) -> None:
+        """先把快照链还原为临时数据库文件，再在线写回目标数据库"""
+        tmp_path = f"{db_path}.snapshot"
+        try:
+            snapshot = SQLiteSnapshotStore(snapshot_dir).restore_snapshot(tmp_path, snapshot_id)
+            if verbose:
+                console.print(f"已还原快照 {snapshot['id']}（{snapshot['type']}）")
+            online_restore(tmp_path, db_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
     def error_handler(self, error: Exception) -> None:
         """
         处理恢复命令错误
@@ -153,24 +179,26 @@ class RestoreHandler(ClickBaseHandler):
             super().error_handler(error)
 
 
-@click.command(name="restore", help="从备份文件恢复数据库")
+@click.command(name="restore", help="从备份文件或快照目录恢复数据库")
 @click.argument("backup_path", type=click.Path(exists=True))
+@click.option("--snapshot", "-s", help="快照ID（仅用于快照目录，默认最新快照）")
 @click.option("--force", "-f", is_flag=True, help="强制覆盖现有数据库")
 @click.option("--verbose", "-v", is_flag=True, help="显示详细信息")
 @pass_service(service_type="db")
-def restore_db(service, backup_path: str, force: bool, verbose: bool):
+def restore_db(service, backup_path: str, snapshot: Optional[str], force: bool, verbose: bool):
     """
     从备份文件恢复数据库命令
 
     Args:
         service: 数据库服务实例
-        backup_path: 备份文件路径
+        backup_path: 备份文件或快照目录路径
+        snapshot: 快照ID
         force: 是否强制覆盖现有数据库
         verbose: 是否显示详细信息
     """
     handler = RestoreHandler()
     try:
-        result = handler.execute(service=service, backup_path=backup_path, force=force, verbose=verbose)
+        result = handler.execute(service=service, backup_path=backup_path, snapshot=snapshot, force=force, verbose=verbose)
         return result
     except Exception:
         return 1
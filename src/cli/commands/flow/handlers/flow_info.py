@@ -40,6 +40,7 @@ from src.flow_session.manager import (
 from src.models.db.flow_session import FlowSession, StageInstance
 from src.models.db.stage import Stage
 from src.models.db.workflow_definition import WorkflowDefinition
+from src.workflow.graph import get_workflow_graph
 
 logger = logging.getLogger(__name__)
 console = Console()
@@ -101,8 +102,8 @@ def handle_next_subcommand(args: Dict[str, Any]) -> Dict[str, Any]:
                 return {"status": "error", "code": 404, "message": f"找不到ID为 '{session_id}' 的会话", "data": None}
 
             # 获取工作流定义
-            workflow_repo = WorkflowDefinitionRepository(db_session)
-            workflow = workflow_repo.get_by_id(flow_session.workflow_id)
+            workflow_repo = WorkflowDefinitionRepository()
+            workflow = workflow_repo.get_by_id(db_session, flow_session.workflow_id)
             if not workflow:
                 return {"status": "error", "code": 404, "message": f"找不到会话对应的工作流定义 (ID: {flow_session.workflow_id})", "data": None}
 
@@ -133,12 +134,8 @@ def handle_next_subcommand(args: Dict[str, Any]) -> Dict[str, Any]:
             # 使用FlowSessionManager的get_next_stages方法获取下一阶段
             next_stages = manager.get_next_stages(session_id, current_stage_id)
 
-            # 获取当前阶段信息
-            current_stage = None
-            for stage in workflow.stages:
-                if stage.get("id") == current_stage_id:
-                    current_stage = stage
-                    break
+            # 从编译后的阶段图获取当前阶段信息
+            current_stage = get_workflow_graph(db_session, workflow).get_stage(current_stage_id)
 
             if not current_stage:
                 return {"status": "error", "code": 404, "message": f"找不到ID为 '{current_stage_id}' 的阶段定义", "data": None}
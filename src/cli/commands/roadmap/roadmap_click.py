@@ -21,6 +21,7 @@ from src.cli.commands.roadmap.handlers.show_handlers import handle_show_roadmap
 from src.cli.commands.roadmap.handlers.story_handlers import handle_story_command
 from src.cli.commands.roadmap.handlers.switch_handlers import handle_switch_roadmap
 from src.cli.decorators import friendly_error_handling, pass_service
+from src.cli.llm_progress import llm_stream_progress
 
 console = Console()
 
@@ -399,8 +400,9 @@ async def validate(
 async def import_roadmap(service, source: str, roadmap_id: Optional[str], fix: bool, activate: bool, verbose: bool):
     """从YAML文件导入路线图"""
     try:
-        # 调用导入处理器
-        result = await handle_import(source, service, roadmap_id, fix, activate, verbose)
+        # 调用导入处理器，需要LLM解析时显示流式接收进度
+        with llm_stream_progress(console, "正在导入路线图..."):
+            result = await handle_import(source, service, roadmap_id, fix, activate, verbose)
 
         # 处理警告
         if result.get("warnings"):
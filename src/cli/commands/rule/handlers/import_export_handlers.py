@@ -14,7 +14,7 @@ from src.core.config import ConfigManager
 
 # 引入解析和验证模块
 from src.parsing.base_parser import BaseParser
-from src.parsing.parsers.openai_parser import OpenAIParser
+from src.parsing.parser_factory import create_parser
 
 # 使用新的验证器模块
 from src.validation import ValidatorFactory
@@ -113,25 +113,22 @@ def import_rule(template_manager, args) -> Dict[str, Any]:
 
         # 使用适当的解析器
         if extension in [".mdc", ".md"]:
-            logger.info(f"使用OpenAI解析器解析文件: {file_path}")
-            # 尝试使用LLM解析器解析内容
+            # 规则只需要front matter和标题，本地解析即可，不调用LLM
             config = ConfigManager().get_config()
-            parser_config = config.get("parsing", {})
-            parser = OpenAIParser(config=parser_config)
+            parser_config = dict(config.get("parsing", {}))
+            parser = create_parser("rule", "tiered", parser_config)
+            content = path.read_text(encoding="utf-8")
 
-            try:
-                parsed_data = parser.parse_file(file_path, content_type="rule")
-                logger.info(f"解析结果: {parsed_data}")
-            except Exception as parse_error:
-                logger.warning(f"LLM解析失败: {str(parse_error)}，使用简单解析")
-                # 如果LLM解析失败，回退到简单方法
-                parsed_data = {
-                    "id": path.stem,
-                    "name": path.stem,
-                    "type": "rule",
-                    "description": f"从文件 {path.name} 导入的规则",
-                    "content": path.read_text(encoding="utf-8"),
-                }
+            parse_result = parser.parse(content, "rule")
+            logger.info(f"解析规则文件: {file_path}（置信度 {parse_result.get('confidence')}）")
+            front_matter = parse_result.get("front_matter") or {}
+            parsed_data = {
+                "id": path.stem,
+                "name": front_matter.get("title", "").strip("\"'") or parse_result.get("title") or path.stem,
+                "type": "rule",
+                "description": front_matter.get("description") or f"从文件 {path.name} 导入的规则",
+                "content": content,
+            }
         elif extension in [".json"]:
             # 解析JSON文件
             try:
@@ -13,6 +13,7 @@ from rich.markdown import Markdown
 from rich.panel import Panel
 from rich.table import Table
 
+from src.cli.llm_progress import llm_stream_progress
 from src.rule_engine import RuleManager, init_rule_engine
 from src.validation.rule_validator import validate_rule
 
@@ -163,7 +164,8 @@ priority: {priority}
 ## 示例
 """
         # 导入规则内容
-        rule = rule_manager.import_rule_from_content(content=content, context=f"创建规则 {rule_name}", validate=True, overwrite=True)
+        with llm_stream_progress(console, f"正在创建规则 '{rule_name}'..."):
+            rule = rule_manager.import_rule_from_content(content=content, context=f"创建规则 {rule_name}", validate=True, overwrite=True)
         console.print(f"[green]成功:[/green] 创建规则 '{rule_name}'")
     except Exception as e:
         console.print(f"[red]错误:[/red] 创建规则 '{rule_name}' 时出错: {e}")
@@ -58,6 +58,8 @@ def process_result(result: Dict[str, Union[bool, str, List, Dict]], show_table:
                     item.get("description", "")[:80] + "..." if item.get("description", "") else "",
                 )
         console.print(table)
+        if "message" in result:
+            console.print(f"[green]{result['message']}[/green]")
     else:
         if "message" in result:
             console.print(f"[green]{result['message']}[/green]")
@@ -104,15 +106,43 @@ def template():
 
 @template.command()
 @click.option("--type", "template_type", type=click.Choice(["rule", "command", "doc", "flow", "roadmap", "general"]), help="模板类型筛选")
+@click.option("--page", type=int, default=1, show_default=True, help="页码")
+@click.option("--page-size", type=int, default=50, show_default=True, help="每页数量")
 @click.option("--verbose", "-v", is_flag=True, help="显示详细信息")
-def list(template_type: Optional[str] = None, verbose: bool = False):
+def list(template_type: Optional[str] = None, page: int = 1, page_size: int = 50, verbose: bool = False):
     """列出所有模板"""
     with TemplateContext() as ctx:
-        templates = ctx.manager.get_all_templates()
-        result = {"success": True, "data": [template.dict() for template in templates] if templates else []}
+        result = _search_page(ctx, template_type=template_type, page=page, page_size=page_size)
+        process_result(result, show_table=not verbose)
+
+
+@template.command()
+@click.argument("query", required=False)
+@click.option("--tag", "tags", multiple=True, help="按标签筛选，可多次指定")
+@click.option("--type", "template_type", type=click.Choice(["rule", "command", "doc", "flow", "roadmap", "general"]), help="模板类型筛选")
+@click.option("--page", type=int, default=1, show_default=True, help="页码")
+@click.option("--page-size", type=int, default=50, show_default=True, help="每页数量")
+@click.option("--verbose", "-v", is_flag=True, help="显示详细信息")
+def search(query: Optional[str], tags: tuple, template_type: Optional[str], page: int, page_size: int, verbose: bool):
+    """按名称、描述、类型和标签搜索模板"""
+    with TemplateContext() as ctx:
+        result = _search_page(ctx, query=query, tags=[*tags] or None, template_type=template_type, page=page, page_size=page_size)
         process_result(result, show_table=not verbose)
 
 
+def _search_page(ctx: TemplateContext, page: int, page_size: int, **criteria) -> Dict:
+    """在数据库中分页搜索模板并构建命令结果"""
+    try:
+        page_result = ctx.manager.search_templates_page(page=page, page_size=page_size, **criteria)
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+    templates = page_result["items"]
+    total = page_result["total"]
+    message = f"共 {total} 个模板，第 {page_result['page']} 页（每页 {page_result['page_size']} 个）"
+    return {"success": True, "message": message, "data": [template.dict() for template in templates] if templates else []}
+
+
 @template.command()
 @click.argument("template_id")
 @click.option("--format", "output_format", type=click.Choice(["json", "text"]), default="text", help="输出格式")
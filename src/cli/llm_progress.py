@@ -0,0 +1,46 @@
+"""
+LLM流式输出进度显示
+
+在命令执行期间显示LLM响应的接收进度，替代只有转圈的等待。
+"""
+
+import contextlib
+from typing import Iterator
+
+from rich.console import Console
+
+from src.parsing.parsers.streaming import StreamProgress, report_stream_progress
+
+
+def format_stream_progress(progress: StreamProgress) -> str:
+    """格式化流式进度
+
+    Args:
+        progress: 流式进度
+
+    Returns:
+        str: 进度描述
+    """
+    text = f"已接收 {progress.chars} 个字符"
+    if progress.items:
+        text += f"，已解析 {progress.items} 项（{progress.last_path}）"
+    return f"{text}，{progress.elapsed:.1f}s"
+
+
+@contextlib.contextmanager
+def llm_stream_progress(console: Console, description: str) -> Iterator[None]:
+    """在上下文中显示LLM流式响应进度
+
+    没有LLM调用时只显示描述；本地解析完成的内容不会出现进度
+
+    Args:
+        console: 输出控制台
+        description: 操作描述
+    """
+    with console.status(description) as status:
+
+        def update(progress: StreamProgress) -> None:
+            status.update(f"{description} {format_stream_progress(progress)}")
+
+        with report_stream_progress(update):
+            yield
@@ -55,6 +55,14 @@ DEFAULT_CONFIG = {
         "embedding_dimension": ConfigValue(384, env_key="AI_EMBEDDING_DIMENSION"),
         "openai": {
             "api_key": ConfigValue(None, env_key="OPENAI_API_KEY"),
+            "max_concurrency": ConfigValue(8, env_key="OPENAI_MAX_CONCURRENCY"),
+            "requests_per_minute": ConfigValue(0, env_key="OPENAI_REQUESTS_PER_MINUTE"),
+            "tokens_per_minute": ConfigValue(0, env_key="OPENAI_TOKENS_PER_MINUTE"),
+        },
+        "ollama": {
+            "max_concurrency": ConfigValue(2, env_key="OLLAMA_MAX_CONCURRENCY"),
+            "requests_per_minute": ConfigValue(0, env_key="OLLAMA_REQUESTS_PER_MINUTE"),
+            "tokens_per_minute": ConfigValue(0, env_key="OLLAMA_TOKENS_PER_MINUTE"),
         },
         "anthropic": {
             "api_key": ConfigValue(None, env_key="ANTHROPIC_API_KEY"),
@@ -66,11 +74,21 @@ DEFAULT_CONFIG = {
     "ide": {
         "name": ConfigValue("cursor", env_key="IDE_NAME"),
     },
+    "cursor": {
+        "max_workers": ConfigValue(4, env_key="VIBE_CURSOR_MAX_WORKERS"),
+        "command_timeout": ConfigValue(300, env_key="VIBE_CURSOR_COMMAND_TIMEOUT"),
+        "progress_interval": ConfigValue(1.0, env_key="VIBE_CURSOR_PROGRESS_INTERVAL"),
+    },
     "content_parsing": {
         "parser": ConfigValue("openai", env_key="VIBE_CONTENT_PARSER"),
         "openai_model": ConfigValue("gpt-4o-mini", env_key="VIBE_OPENAI_MODEL"),
         "ollama_model": ConfigValue("mistral", env_key="VIBE_OLLAMA_MODEL"),
         "ollama_base_url": ConfigValue("http://localhost:11434", env_key="VIBE_OLLAMA_BASE_URL"),
+        "confidence_threshold": ConfigValue(0.8, env_key="VIBE_PARSING_CONFIDENCE_THRESHOLD"),
+        "batch_token_budget": ConfigValue(6000, env_key="VIBE_PARSING_BATCH_TOKEN_BUDGET"),
+        "batch_max_documents": ConfigValue(10, env_key="VIBE_PARSING_BATCH_MAX_DOCUMENTS"),
+        "batch_concurrency": ConfigValue(4, env_key="VIBE_PARSING_BATCH_CONCURRENCY"),
+        "stream": ConfigValue(True, env_key="VIBE_PARSING_STREAM"),
     },
     "notion_export": {
         "api_key": ConfigValue(None, env_key="NOTION_API_KEY"),
@@ -101,6 +119,43 @@ DEFAULT_CONFIG = {
         "workflows_dir": ConfigValue(str(PROJECT_ROOT / "workflows"), env_key="VIBECOPILOT_WORKFLOW_DIR"),
         "template_extension": ConfigValue(".json"),
     },
+    "validation": {
+        "max_workers": ConfigValue(4, env_key="VIBE_VALIDATION_MAX_WORKERS"),
+        "parallel_threshold": ConfigValue(200, env_key="VIBE_VALIDATION_PARALLEL_THRESHOLD"),
+    },
+    "templates": {
+        "compile_cache_size": ConfigValue(256, env_key="VIBE_TEMPLATE_CACHE_SIZE"),
+        "bytecode_cache": ConfigValue(True, env_key="VIBE_TEMPLATE_BYTECODE_CACHE"),
+        "bytecode_cache_dir": ConfigValue(None, env_key="VIBE_TEMPLATE_BYTECODE_CACHE_DIR"),
+    },
+    "status": {
+        "cache_ttl": ConfigValue(5.0, env_key="VIBE_STATUS_CACHE_TTL"),
+        "max_workers": ConfigValue(4, env_key="VIBE_STATUS_MAX_WORKERS"),
+        "dispatch_mode": ConfigValue("thread", env_key="VIBE_STATUS_DISPATCH_MODE", validator=lambda x: x in ["sync", "thread", "asyncio"]),
+        "dispatch_workers": ConfigValue(4, env_key="VIBE_STATUS_DISPATCH_WORKERS"),
+        "dispatch_max_pending": ConfigValue(1000, env_key="VIBE_STATUS_DISPATCH_MAX_PENDING"),
+    },
+    "status_sync": {
+        "n8n_enabled": ConfigValue(False, env_key="N8N_ENABLED"),
+        "flush_interval": ConfigValue(2.0, env_key="VIBE_STATUS_SYNC_FLUSH_INTERVAL"),
+        "batch_size": ConfigValue(100, env_key="VIBE_STATUS_SYNC_BATCH_SIZE"),
+        "retry_base": ConfigValue(5.0, env_key="VIBE_STATUS_SYNC_RETRY_BASE"),
+        "retry_max": ConfigValue(300.0, env_key="VIBE_STATUS_SYNC_RETRY_MAX"),
+    },
+    "backup": {
+        "chunk_size": ConfigValue(1000, env_key="VIBE_BACKUP_CHUNK_SIZE"),
+        "compress_level": ConfigValue(6, env_key="VIBE_BACKUP_COMPRESS_LEVEL"),
+        "max_workers": ConfigValue(4, env_key="VIBE_BACKUP_MAX_WORKERS"),
+        "page_step": ConfigValue(256, env_key="VIBE_BACKUP_PAGE_STEP"),
+        "step_sleep": ConfigValue(0.005, env_key="VIBE_BACKUP_STEP_SLEEP"),
+        "max_chain": ConfigValue(24, env_key="VIBE_BACKUP_MAX_CHAIN"),
+    },
+    "rule_engine": {
+        "embedding_cache": ConfigValue("data/rule_embeddings.json", env_key="VIBE_RULE_EMBEDDING_CACHE"),
+        "index_refresh_interval": ConfigValue(60.0, env_key="VIBE_RULE_INDEX_REFRESH_INTERVAL"),
+        "semantic_top_k": ConfigValue(5, env_key="VIBE_RULE_SEMANTIC_TOP_K"),
+        "semantic_min_score": ConfigValue(0.35, env_key="VIBE_RULE_SEMANTIC_MIN_SCORE"),
+    },
     "project_settings": {
         "default_template": ConfigValue("standard", env_key="DEFAULT_TEMPLATE"),
         "auto_save": ConfigValue(True, env_key="AUTO_SAVE"),
@@ -5,7 +5,6 @@
 """
 
 import logging
-import sys
 from typing import Any, Dict, List, Tuple
 
 import click
@@ -123,20 +122,13 @@ class CursorCommandHandler:
         # 构建完整的命令参数列表
         full_args = [command_name] + args
 
-        # 保存原始的sys.argv
-        original_argv = sys.argv
         try:
-            # 替换sys.argv为当前命令
-            sys.argv = ["vibecopilot"] + full_args
-            # 执行命令
-            result = self.cli.main(standalone_mode=False)
+            # 显式传入参数，不修改全局sys.argv，允许多个命令并发执行
+            result = self.cli.main(args=full_args, prog_name="vibecopilot", standalone_mode=False)
             return {"success": True, "result": result}
         except click.exceptions.Exit as e:
             # 正常退出（比如显示帮助信息）
             return {"success": True, "result": None}
-        finally:
-            # 恢复原始的sys.argv
-            sys.argv = original_argv
 
     def _get_command_suggestions(self, command: str) -> List[str]:
         """获取命令建议
@@ -0,0 +1,241 @@
+"""
+Cursor命令执行引擎
+
+在线程池中并发执行命令，避免慢命令阻塞MCP事件循环：
+- 每个调用的stdout/stderr按线程捕获，互不干扰，也不会写入MCP的stdio通道
+- 每个调用独立超时，调用方取消时不等待结果
+- 执行期间定期回调进度，便于推送MCP进度通知
+"""
+
+import asyncio
+import io
+import logging
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from src.core.config import get_config
+
+logger = logging.getLogger(__name__)
+
+# 进度回调：接收 (已用秒数, 预计总秒数, 说明)
+ProgressCallback = Callable[[float, Optional[float], str], Awaitable[None]]
+
+
+class _ThreadLocalStream(io.TextIOBase):
+    """按线程重定向的输出流
+
+    当前线程登记了捕获缓冲区时写入缓冲区，否则写入原始流
+    """
+
+    def __init__(self, original):
+        self._original = original
+        self._local = threading.local()
+
+    @property
+    def original(self):
+        return self._original
+
+    def capture(self, buffer: Optional[io.StringIO]) -> None:
+        """为当前线程设置（或清除）捕获缓冲区"""
+        self._local.buffer = buffer
+
+    def _target(self):
+        buffer = getattr(self._local, "buffer", None)
+        return buffer if buffer is not None else self._original
+
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+
+    def flush(self) -> None:
+        self._target().flush()
+
+    def isatty(self) -> bool:
+        return getattr(self._local, "buffer", None) is None and self._original.isatty()
+
+    def writable(self) -> bool:
+        return True
+
+    @property
+    def encoding(self):
+        return getattr(self._original, "encoding", "utf-8")
+
+    def __getattr__(self, name: str) -> Any:
+        # buffer、fileno等属性交给原始流
+        return getattr(self._original, name)
+
+
+_install_lock = threading.Lock()
+
+
+def _install_streams() -> tuple:
+    """将sys.stdout/sys.stderr替换为按线程重定向的输出流（只替换一次）"""
+    with _install_lock:
+        if not isinstance(sys.stdout, _ThreadLocalStream):
+            sys.stdout = _ThreadLocalStream(sys.stdout)
+        if not isinstance(sys.stderr, _ThreadLocalStream):
+            sys.stderr = _ThreadLocalStream(sys.stderr)
+        return sys.stdout, sys.stderr
+
+
+class CommandExecutionEngine:
+    """并发命令执行引擎"""
+
+    def __init__(
+        self,
+        handler: Any,
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        progress_interval: Optional[float] = None,
+    ):
+        """初始化执行引擎
+
+        Args:
+            handler: 命令处理器，需提供 handle_command(command) 方法
+            max_workers: 并发执行的最大命令数
+            timeout: 默认单个命令超时时间（秒），0或None表示不限制
+            progress_interval: 进度回调间隔（秒）
+        """
+        config = get_config()
+        self.handler = handler
+        self.max_workers = int(max_workers or config.get("cursor.max_workers", 4))
+        self.timeout = timeout if timeout is not None else float(config.get("cursor.command_timeout", 300))
+        self.progress_interval = progress_interval if progress_interval is not None else float(config.get("cursor.progress_interval", 1.0))
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="cursor-command")
+        self._running = 0
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> int:
+        """正在执行或排队的命令数"""
+        with self._lock:
+            return self._running
+
+    async def execute(
+        self,
+        command: str,
+        timeout: Optional[float] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Dict[str, Any]:
+        """在线程池中执行命令
+
+        Args:
+            command: 命令字符串，例如 "/check --type=task --id=T2.1"
+            timeout: 本次调用的超时时间（秒），未指定时使用默认值
+            progress: 进度回调，执行期间按间隔调用
+
+        Returns:
+            Dict[str, Any]: 处理结果，附带捕获的stdout/stderr和耗时
+
+        Raises:
+            asyncio.CancelledError: 调用被取消
+        """
+        timeout = self.timeout if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        cancelled = threading.Event()
+        started = time.monotonic()
+
+        with self._lock:
+            self._running += 1
+        future = loop.run_in_executor(self._executor, self._run_captured, command, cancelled)
+        try:
+            result, stdout, stderr = await self._wait(future, started, timeout, progress)
+        except asyncio.TimeoutError:
+            cancelled.set()
+            logger.warning(f"命令执行超时（{timeout}秒）: {command}")
+            return {
+                "success": False,
+                "error": f"命令执行超时（{timeout}秒）",
+                "error_type": "TimeoutError",
+                "command": command,
+                "elapsed": round(time.monotonic() - started, 3),
+            }
+        except asyncio.CancelledError:
+            # 线程无法强制终止，只标记并放弃结果
+            cancelled.set()
+            logger.info(f"命令已取消: {command}")
+            raise
+        finally:
+            with self._lock:
+                self._running -= 1
+
+        result = dict(result) if isinstance(result, dict) else {"success": True, "result": result}
+        if stdout:
+            result["stdout"] = stdout
+        if stderr:
+            result["stderr"] = stderr
+        result["elapsed"] = round(time.monotonic() - started, 3)
+        return result
+
+    async def _wait(self, future: "asyncio.Future", started: float, timeout: Optional[float], progress: Optional[ProgressCallback]):
+        """等待执行结果，期间按间隔回调进度"""
+        deadline = started + timeout if timeout else None
+        while True:
+            wait_for = self.progress_interval if progress else None
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    future.cancel()
+                    raise asyncio.TimeoutError()
+                wait_for = remaining if wait_for is None else min(wait_for, remaining)
+
+            done, _ = await asyncio.wait({future}, timeout=wait_for)
+            if done:
+                return future.result()
+            if progress and (deadline is None or time.monotonic() < deadline):
+                try:
+                    await progress(time.monotonic() - started, timeout or None, "命令执行中")
+                except Exception as e:
+                    logger.debug(f"发送进度通知失败: {e}")
+
+    def _run_captured(self, command: str, cancelled: threading.Event):
+        """在工作线程中执行命令并捕获输出"""
+        if cancelled.is_set():
+            return {"success": False, "error": "命令已取消", "error_type": "CancelledError"}, "", ""
+
+        stdout_stream, stderr_stream = _install_streams()
+        stdout, stderr = io.StringIO(), io.StringIO()
+        stdout_stream.capture(stdout)
+        stderr_stream.capture(stderr)
+        try:
+            result = self.handler.handle_command(command)
+        finally:
+            stdout_stream.capture(None)
+            stderr_stream.capture(None)
+        return result, stdout.getvalue(), stderr.getvalue()
+
+    def shutdown(self, wait: bool = False) -> None:
+        """关闭线程池
+
+        Args:
+            wait: 是否等待正在执行的命令结束
+        """
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+# 执行引擎单例
+_execution_engine = None
+
+
+def get_execution_engine() -> CommandExecutionEngine:
+    """获取执行引擎单例
+
+    Returns:
+        CommandExecutionEngine: 执行引擎实例
+    """
+    global _execution_engine
+    if _execution_engine is None:
+        from src.cursor.command_handler import get_command_handler
+
+        _execution_engine = CommandExecutionEngine(get_command_handler())
+    return _execution_engine
+
+
+def shutdown_execution_engine() -> None:
+    """关闭执行引擎单例（未创建时忽略）"""
+    global _execution_engine
+    if _execution_engine is not None:
+        _execution_engine.shutdown()
+        _execution_engine = None
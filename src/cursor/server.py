@@ -12,7 +12,7 @@ import json
 import logging
 import os
 import sys
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 import click
 import mcp.server.stdio
@@ -23,6 +23,7 @@ from rich.console import Console
 from rich.logging import RichHandler
 
 from src.cursor.command_handler import get_command_handler
+from src.cursor.execution_engine import get_execution_engine, shutdown_execution_engine
 
 logger = logging.getLogger(__name__)
 console = Console()
@@ -51,7 +52,10 @@ async def handle_list_tools() -> List[types.Tool]:
             inputSchema={
                 "type": "object",
                 "required": ["command"],
-                "properties": {"command": {"type": "string", "description": f"执行 {cmd_name} 命令"}},
+                "properties": {
+                    "command": {"type": "string", "description": f"执行 {cmd_name} 命令"},
+                    "timeout": {"type": "number", "description": "超时时间（秒），可选"},
+                },
             },
         )
         tools.append(tool)
@@ -76,12 +80,49 @@ async def handle_list_tools() -> List[types.Tool]:
 
 
 @server.call_tool()
+async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[types.TextContent]:
+    """按工具名称分发工具调用
+
+    MCP服务器只能注册一个call_tool处理器，内置工具单独处理，其余工具都作为命令执行
+
+    Args:
+        name: 工具名称
+        arguments: 命令参数
+
+    Returns:
+        List[types.TextContent]: 工具调用结果
+    """
+    if name == "vibecopilot.list_commands":
+        return await handle_list_commands(name, arguments)
+    if name == "vibecopilot.get_command_help":
+        return await handle_get_command_help(name, arguments)
+    return await handle_execute_command(name, arguments)
+
+
+def _progress_reporter() -> Optional[Callable[[float, Optional[float], str], Awaitable[None]]]:
+    """为当前请求创建进度通知回调，客户端未提供progressToken时返回None"""
+    try:
+        ctx = server.request_context
+    except LookupError:
+        return None
+    token = ctx.meta.progressToken if ctx.meta else None
+    if token is None:
+        return None
+
+    async def report(elapsed: float, total: Optional[float], message: str) -> None:
+        await ctx.session.send_progress_notification(token, round(elapsed, 1), total)
+
+    return report
+
+
 async def handle_execute_command(name: str, arguments: Dict[str, Any]) -> List[types.TextContent]:
     """执行VibeCopilot命令
 
+    命令在执行引擎的线程池中运行，不阻塞其他MCP请求
+
     Args:
         name: 工具名称
-        arguments: 命令参数
+        arguments: 命令参数，可选timeout指定本次超时秒数
 
     Returns:
         List[types.TextContent]: 命令执行结果
@@ -90,15 +131,18 @@ async def handle_execute_command(name: str, arguments: Dict[str, Any]) -> List[t
     if not command:
         raise ValueError("缺少必要的command参数")
 
-    # 调用命令处理器执行命令
-    command_handler = get_command_handler()
-    result = command_handler.handle_command(command)
+    # 在执行引擎中运行命令
+    timeout = arguments.get("timeout")
+    result = await get_execution_engine().execute(
+        command,
+        timeout=float(timeout) if timeout is not None else None,
+        progress=_progress_reporter(),
+    )
 
     # 将结果转换为TextContent格式
-    return [types.TextContent(type="text", text=json.dumps(result, ensure_ascii=False, indent=2))]
+    return [types.TextContent(type="text", text=json.dumps(result, ensure_ascii=False, indent=2, default=str))]
 
 
-@server.call_tool()
 async def handle_list_commands(name: str, arguments: Dict[str, Any]) -> List[types.TextContent]:
     """获取所有可用命令列表
 
@@ -116,7 +160,6 @@ async def handle_list_commands(name: str, arguments: Dict[str, Any]) -> List[typ
     return [types.TextContent(type="text", text=json.dumps(result, ensure_ascii=False, indent=2))]
 
 
-@server.call_tool()
 async def handle_get_command_help(name: str, arguments: Dict[str, Any]) -> List[types.TextContent]:
     """获取特定命令的帮助信息
 
@@ -206,6 +249,8 @@ def main(workspace: Optional[str], verbose: bool):
         console.print(f"[bold red]服务器启动失败: {str(e)}[/bold red]")
         logger.error("服务器启动失败", exc_info=True)
         sys.exit(1)
+    finally:
+        shutdown_execution_engine()
 
 
 if __name__ == "__main__":
@@ -11,6 +11,7 @@ from src.db.repositories.roadmap_repository import EpicRepository, MilestoneRepo
 from src.db.repositories.rule_repository import RuleExampleRepository, RuleItemRepository, RuleRepository
 from src.db.repositories.stage_instance_repository import StageInstanceRepository
 from src.db.repositories.stage_repository import StageRepository
+from src.db.repositories.status_sync_outbox_repository import StatusSyncOutboxRepository
 from src.db.repositories.system_config_repository import SystemConfigRepository
 from src.db.repositories.template_repository import TemplateRepository, TemplateVariableRepository
 from src.db.repositories.transition_repository import TransitionRepository
@@ -42,6 +43,8 @@ __all__ = [
     "RuleExampleRepository",
     # 系统配置仓库
     "SystemConfigRepository",
+    # 状态同步发件箱仓库
+    "StatusSyncOutboxRepository",
     # 工作流会话仓库
     "WorkflowDefinitionRepository",
     "FlowSessionRepository",
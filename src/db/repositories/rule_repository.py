@@ -5,13 +5,21 @@
 """
 
 import json
+import threading
 import uuid
+import weakref
 from typing import Any, Dict, List, Optional
 
 from sqlalchemy.orm import Session
 
+from src.core.config import get_config
 from src.db.repository import Repository
 from src.models.db import Rule, RuleExample, RuleItem
+from src.utils.rule_index import RuleEntry, RuleIndex
+
+# 数据库引擎 -> 规则适用性索引（只保存规则快照，不计算嵌入向量），各仓库实例共享
+_file_indexes: "weakref.WeakKeyDictionary[Any, RuleIndex]" = weakref.WeakKeyDictionary()
+_file_indexes_lock = threading.Lock()
 
 
 class RuleRepository(Repository[Rule]):
@@ -48,53 +56,61 @@ class RuleRepository(Repository[Rule]):
     def get_for_file(self, session: Session, file_path: str) -> List[Rule]:
         """获取适用于指定文件的规则
 
+        通过该仓库创建、更新、删除的规则会立即更新索引；其他途径的修改在
+        rule_engine.index_refresh_interval秒后重新加载全部规则时生效
+
         Args:
             session: SQLAlchemy会话对象
             file_path: 文件路径
 
         Returns:
-            适用的Rule对象列表
+            适用的Rule对象列表（始终应用的规则和文件模式匹配的规则）
         """
-        # 获取所有规则
-        all_rules = self.get_all(session)
-
-        # 筛选出始终应用的规则和文件模式匹配的规则
-        applicable_rules = []
-
-        for rule in all_rules:
-            # 检查是否始终应用
-            if rule.always_apply:
-                applicable_rules.append(rule)
-                continue
-
-            # 检查文件模式匹配
-            rule_globs = json.loads(rule.globs) if rule.globs else []
-            if not rule_globs:
-                continue
-
-            # 文件路径匹配检查（简化实现）
-            # 在实际应用中，应该使用glob模块进行更准确的匹配
-            for pattern in rule_globs:
-                if self._glob_match(file_path, pattern):
-                    applicable_rules.append(rule)
-                    break
-
-        return applicable_rules
-
-    def _glob_match(self, path: str, pattern: str) -> bool:
-        """简化的glob匹配实现
-
-        Args:
-            path: 文件路径
-            pattern: glob模式
+        index = self._file_index(session)
+        if index.is_stale(float(get_config().get("rule_engine.index_refresh_interval", 60.0))):
+            index.replace([RuleEntry.from_rule(rule) for rule in self.get_all(session)])
+        rule_ids = [match.rule_id for match in index.match_path(file_path)]
+        if not rule_ids:
+            return []
+
+        rules = {rule.id: rule for rule in session.query(Rule).filter(Rule.id.in_(rule_ids)).all()}
+        return [rules[rule_id] for rule_id in rule_ids if rule_id in rules]
+
+    def _file_index(self, session: Session) -> RuleIndex:
+        """获取会话所连接数据库的规则适用性索引"""
+        bind = session.get_bind()
+        bind = getattr(bind, "engine", bind)
+        index = _file_indexes.get(bind)
+        if index is None:
+            with _file_indexes_lock:
+                index = _file_indexes.get(bind)
+                if index is None:
+                    index = _file_indexes[bind] = RuleIndex(embedder=None)
+        return index
+
+    def _reindex(self, session: Session, rule: Optional[Rule]) -> None:
+        """把规则的变化同步到规则适用性索引"""
+        if rule is not None:
+            self._file_index(session).upsert(RuleEntry.from_rule(rule))
+
+    def create(self, session: Session, data: Dict[str, Any]) -> Rule:
+        """创建规则并加入规则适用性索引"""
+        rule = super().create(session, data)
+        self._reindex(session, rule)
+        return rule
 
-        Returns:
-            是否匹配
-        """
-        # 注意：这是一个简化实现，真实场景应使用glob模块
-        import fnmatch
+    def update(self, session: Session, id: str, data: Dict[str, Any]) -> Optional[Rule]:
+        """更新规则并同步规则适用性索引"""
+        rule = super().update(session, id, data)
+        self._reindex(session, rule)
+        return rule
 
-        return fnmatch.fnmatch(path, pattern)
+    def delete(self, session: Session, id: str) -> bool:
+        """删除规则并从规则适用性索引中移除"""
+        deleted = super().delete(session, id)
+        if deleted:
+            self._file_index(session).remove(id)
+        return deleted
 
     def search_by_tags(self, session: Session, tags: List[str]) -> List[Rule]:
         """根据标签搜索规则
@@ -183,7 +199,11 @@ class RuleRepository(Repository[Rule]):
                 setattr(rule, key, value)
 
         if items is not None:
+            # 旧的条目先删除，新记录沿用相同的ID
+            for old in list(rule.items):
+                session.delete(old)
             rule.items = []
+            session.flush()
             item_repo = RuleItemRepository()
             for item_data in items:
                 item_id = f"{rule.id}-item-{len(rule.items) + 1}"
@@ -191,13 +211,18 @@ class RuleRepository(Repository[Rule]):
                 rule.items.append(item)
 
         if examples is not None:
+            # 旧的示例先删除，新记录沿用相同的ID
+            for old in list(rule.examples):
+                session.delete(old)
             rule.examples = []
+            session.flush()
             example_repo = RuleExampleRepository()
             for example_data in examples:
                 example_id = f"{rule.id}-example-{len(rule.examples) + 1}"
                 example = example_repo.create(session, {**example_data, "id": example_id})
                 rule.examples.append(example)
 
+        self._reindex(session, rule)
         return rule
 
 
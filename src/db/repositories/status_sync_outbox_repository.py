@@ -0,0 +1,164 @@
+"""
+状态同步发件箱仓库模块
+
+提供发件箱的合并写入、到期条目领取以及发送结果回写
+"""
+
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.db.repository import Repository
+from src.models.db.status_sync_outbox import StatusSyncOutbox
+
+
+def outbox_key(domain: str, entity_id: str) -> str:
+    """生成发件箱主键
+
+    Args:
+        domain: 领域名称
+        entity_id: 实体ID
+
+    Returns:
+        发件箱主键
+    """
+    return f"{domain}:{entity_id}"
+
+
+class StatusSyncOutboxRepository(Repository[StatusSyncOutbox]):
+    """状态同步发件箱仓库"""
+
+    def __init__(self):
+        super().__init__(StatusSyncOutbox)
+
+    def enqueue(
+        self,
+        session: Session,
+        domain: str,
+        entity_id: str,
+        old_status: Optional[str],
+        status: str,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> StatusSyncOutbox:
+        """写入状态变更，同一实体尚未发送的变更合并为最新状态
+
+        写入会提交或回滚传入的会话，应使用发件箱专用的会话
+
+        Args:
+            session: 数据库会话
+            domain: 领域名称
+            entity_id: 实体ID
+            old_status: 旧状态
+            status: 新状态
+            context: 上下文信息
+
+        Returns:
+            发件箱条目
+        """
+        key = outbox_key(domain, entity_id)
+        context_json = json.dumps(context or {}, ensure_ascii=False, default=str)
+        now = datetime.utcnow()
+
+        for _ in range(2):
+            entry = session.get(StatusSyncOutbox, key)
+            if entry is None:
+                entry = StatusSyncOutbox(
+                    id=key,
+                    domain=domain,
+                    entity_id=entity_id,
+                    old_status=old_status,
+                    status=status,
+                    context=context_json,
+                    version=1,
+                    attempts=0,
+                    next_attempt_at=now,
+                )
+                session.add(entry)
+            else:
+                # 保留第一次未发送变更之前的旧状态
+                entry.status = status
+                entry.context = context_json
+                entry.version = (entry.version or 0) + 1
+                entry.attempts = 0
+                entry.next_attempt_at = now
+                entry.last_error = None
+            try:
+                session.commit()
+                return entry
+            except IntegrityError:
+                # 其他线程同时插入了同一实体，回滚后按更新处理
+                session.rollback()
+        raise RuntimeError(f"写入状态同步发件箱失败: {key}")
+
+    def claim_due(self, session: Session, limit: int, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """获取到期待发送的条目
+
+        Args:
+            session: 数据库会话
+            limit: 最大条目数
+            now: 当前时间，默认为UTC当前时间
+
+        Returns:
+            条目字典列表（context已解析为字典）
+        """
+        now = now or datetime.utcnow()
+        stmt = select(StatusSyncOutbox).where(StatusSyncOutbox.next_attempt_at <= now).order_by(StatusSyncOutbox.updated_at).limit(limit)
+        entries = []
+        for entry in session.execute(stmt).scalars():
+            data = entry.to_dict()
+            data["context"] = json.loads(entry.context) if entry.context else {}
+            entries.append(data)
+        return entries
+
+    def mark_delivered(self, session: Session, versions: Dict[str, int]) -> int:
+        """删除已发送的条目，发送期间又有新变更的条目保留
+
+        Args:
+            session: 数据库会话
+            versions: 条目ID到发送时版本的映射
+
+        Returns:
+            删除的条目数
+        """
+        deleted = 0
+        for key, version in versions.items():
+            result = session.execute(delete(StatusSyncOutbox).where(StatusSyncOutbox.id == key, StatusSyncOutbox.version == version))
+            deleted += result.rowcount
+        session.commit()
+        return deleted
+
+    def mark_failed(self, session: Session, key: str, version: int, error: str, backoff_seconds: float) -> None:
+        """记录发送失败并安排重试
+
+        Args:
+            session: 数据库会话
+            key: 条目ID
+            version: 发送时的版本
+            error: 错误信息
+            backoff_seconds: 距下次重试的秒数
+        """
+        session.execute(
+            update(StatusSyncOutbox)
+            .where(StatusSyncOutbox.id == key, StatusSyncOutbox.version == version)
+            .values(
+                attempts=StatusSyncOutbox.attempts + 1,
+                next_attempt_at=datetime.utcnow() + timedelta(seconds=backoff_seconds),
+                last_error=error[:2000],
+            )
+        )
+        session.commit()
+
+    def pending_count(self, session: Session) -> int:
+        """获取待发送的条目数
+
+        Args:
+            session: 数据库会话
+
+        Returns:
+            条目数
+        """
+        return session.execute(select(func.count()).select_from(StatusSyncOutbox)).scalar_one()
@@ -4,14 +4,19 @@
 提供Template和TemplateVariable数据访问实现，使用统一的Repository模式。
 """
 
+import json
+import logging
 import uuid
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy import or_
+from sqlalchemy.orm import Query, Session, selectinload
 
 from src.db.repository import Repository
 from src.models.db import Template, TemplateVariable
 
+logger = logging.getLogger(__name__)
+
 
 class TemplateRepository(Repository[Template]):
     """Template仓库类 (无状态)"""
@@ -66,19 +71,92 @@ class TemplateRepository(Repository[Template]):
         Returns:
             匹配的Template对象列表
         """
-        templates = self.get_all(session)
         if not tags:
-            return templates
+            return self.get_all(session)
+        return self.search(session, tags=tags)
+
+    def search(
+        self,
+        session: Session,
+        query: Optional[str] = None,
+        template_type: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[Template]:
+        """在数据库中搜索模板
+
+        名称和描述按关键词模糊匹配（不区分大小写），类型精确匹配，
+        标签匹配任意一个即可。结果按名称排序并预加载变量。
 
-        results = []
-        for template in templates:
-            import json
+        Args:
+            session: SQLAlchemy会话对象
+            query: 搜索关键词
+            template_type: 模板类型
+            tags: 标签列表
+            limit: 返回数量上限，None表示不限制
+            offset: 跳过的记录数
 
-            template_tags = json.loads(template.tags) if template.tags else []
-            if any(tag in template_tags for tag in tags):
-                results.append(template)
+        Returns:
+            匹配的Template对象列表
+        """
+        db_query = self._build_search_query(session, query, template_type, tags)
+        db_query = db_query.options(selectinload(Template.variables)).order_by(Template.name, Template.id)
+        if offset:
+            db_query = db_query.offset(offset)
+        if limit is not None:
+            db_query = db_query.limit(limit)
+        return db_query.all()
+
+    def count_search(
+        self, session: Session, query: Optional[str] = None, template_type: Optional[str] = None, tags: Optional[List[str]] = None
+    ) -> int:
+        """统计搜索结果总数，用于分页
 
-        return results
+        Args:
+            session: SQLAlchemy会话对象
+            query: 搜索关键词
+            template_type: 模板类型
+            tags: 标签列表
+
+        Returns:
+            匹配的模板数量
+        """
+        return self._build_search_query(session, query, template_type, tags).count()
+
+    def _build_search_query(self, session: Session, query: Optional[str], template_type: Optional[str], tags: Optional[List[str]]) -> Query:
+        """构建搜索查询条件"""
+        db_query = session.query(Template)
+
+        if template_type:
+            db_query = db_query.filter(Template.type == template_type)
+
+        if query:
+            pattern = f"%{_escape_like(query)}%"
+            db_query = db_query.filter(or_(Template.name.ilike(pattern, escape="\\"), Template.description.ilike(pattern, escape="\\")))
+
+        if tags:
+            # 标签以JSON数组字符串存储，按JSON编码后的标签文本匹配（兼容转义与非转义的非ASCII字符）
+            conditions = []
+            for tag in tags:
+                for encoded in {json.dumps(tag), json.dumps(tag, ensure_ascii=False)}:
+                    conditions.append(Template.tags.like(f"%{_escape_like(encoded)}%", escape="\\"))
+            db_query = db_query.filter(or_(*conditions))
+
+        return db_query
+
+    def ensure_indexes(self, session: Session) -> None:
+        """为已存在的模板表补建搜索索引
+
+        Args:
+            session: SQLAlchemy会话对象
+        """
+        bind = session.get_bind()
+        for index in Template.__table__.indexes:
+            try:
+                index.create(bind=bind, checkfirst=True)
+            except Exception as e:
+                logger.warning(f"创建模板索引 {index.name} 失败: {e}")
 
     def create_template(self, session: Session, template_data: Dict[str, Any], variables: List[Dict[str, Any]]) -> Template:
         """创建模板及其变量
@@ -133,3 +211,8 @@ class TemplateVariableRepository(Repository[TemplateVariable]):
             TemplateVariable对象或None
         """
         return session.query(TemplateVariable).filter(TemplateVariable.name == name, TemplateVariable.templates.any(id=template_id)).first()
+
+
+def _escape_like(value: str) -> str:
+    """转义LIKE模式中的通配符"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
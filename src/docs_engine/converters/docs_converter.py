@@ -3,16 +3,45 @@
 提供统一的文档引擎接口，使用src.parsing解析文档文件，并提供格式转换功能
 """
 
+import inspect
 import logging
 import os
 from typing import Any, Dict, List, Optional
 
 from src.docs_engine.engine import create_document_engine
+from src.llm.runtime import run_sync
 from src.parsing import create_parser
 
 logger = logging.getLogger(__name__)
 
 
+def _parse_document_text(parser: Any, content: str) -> Dict[str, Any]:
+    """在同步上下文中调用解析器的parse_text
+
+    parse_text可能是同步方法（正则解析器）或协程（LLM解析器），协程交给LLM运行时线程执行
+
+    Args:
+        parser: 解析器实例
+        content: 文档内容
+
+    Returns:
+        Dict[str, Any]: 解析结果，失败时包含错误信息
+    """
+    try:
+        result = parser.parse_text(content, content_type="document")
+        if inspect.isawaitable(result):
+            result = run_sync(result)
+        return result
+    except Exception as e:
+        logger.error(f"调用解析器失败: {str(e)}")
+        return {
+            "success": False,
+            "error": str(e),
+            "content_type": "document",
+            "content_preview": content[:100] + "..." if len(content) > 100 else content,
+        }
+
+
 def parse_document_file(file_path: str, parser_type: Optional[str] = None, model: Optional[str] = None) -> Dict[str, Any]:
     """解析文档文件
 
@@ -44,25 +73,7 @@ def parse_document_file(file_path: str, parser_type: Optional[str] = None, model
     # 使用新的parsing接口
     parser = create_parser(content_type="document", backend=parser_type or "openai", config=config)
 
-    # 使用parse_text方法
-    # 注意：parse_text是异步方法，需要在异步上下文中调用
-    # 这里我们使用一个简单的同步实现
-    import asyncio
-
-    try:
-        import nest_asyncio
-
-        nest_asyncio.apply()
-        loop = asyncio.get_event_loop()
-        result = loop.run_until_complete(parser.parse_text(content, content_type="document"))
-    except Exception as e:
-        logger.error(f"调用解析器失败: {str(e)}")
-        result = {
-            "success": False,
-            "error": str(e),
-            "content_type": "document",
-            "content_preview": content[:100] + "..." if len(content) > 100 else content,
-        }
+    result = _parse_document_text(parser, content)
 
     # 添加文件信息
     result["_file_info"] = {
@@ -105,23 +116,8 @@ def parse_document_content(content: str, context: str = "", parser_type: Optiona
         # 如果是LLMParser，使用parse方法
         result = parser.parse(content, content_type="document")
     else:
-        # 如果是其他解析器，使用同步方法
-        import asyncio
-
-        try:
-            import nest_asyncio
-
-            nest_asyncio.apply()
-            loop = asyncio.get_event_loop()
-            result = loop.run_until_complete(parser.parse_text(content, content_type="document"))
-        except Exception as e:
-            logger.error(f"调用解析器失败: {str(e)}")
-            result = {
-                "success": False,
-                "error": str(e),
-                "content_type": "document",
-                "content_preview": content[:100] + "..." if len(content) > 100 else content,
-            }
+        # 如果是其他解析器，使用parse_text方法
+        result = _parse_document_text(parser, content)
 
     logger.info(f"文档内容解析完成")
     return result
@@ -169,24 +165,7 @@ def import_document_to_db(file_path: str) -> Dict[str, Any]:
     # 使用新的parsing接口解析并保存
     parser = create_parser(content_type="document")
 
-    # 使用parse_text方法
-    # 注意：parse_text是异步方法，需要在异步上下文中调用
-    import asyncio
-
-    try:
-        import nest_asyncio
-
-        nest_asyncio.apply()
-        loop = asyncio.get_event_loop()
-        doc_data = loop.run_until_complete(parser.parse_text(content, content_type="document"))
-    except Exception as e:
-        logger.error(f"调用解析器失败: {str(e)}")
-        doc_data = {
-            "success": False,
-            "error": str(e),
-            "content_type": "document",
-            "content_preview": content[:100] + "..." if len(content) > 100 else content,
-        }
+    doc_data = _parse_document_text(parser, content)
 
     # 添加文件信息
     doc_data["_file_info"] = {
@@ -7,7 +7,9 @@
 import json
 from typing import Any, Dict, List, Optional
 
-from src.models.db import FlowSession
+from src.db.repositories.workflow_definition_repository import WorkflowDefinitionRepository
+from src.models.db import FlowSession, WorkflowDefinition
+from src.workflow.graph import WorkflowGraph, get_workflow_graph
 
 
 class SessionContextMixin:
@@ -29,16 +31,19 @@ class SessionContextMixin:
         if not session:
             raise ValueError(f"找不到会话: {id_or_name}")
 
-        # 获取会话上下文
-        context = {}
-        if session.context:
-            try:
-                context = json.loads(session.context)
-            except Exception as e:
-                self._log("log_error", f"解析会话上下文失败: {str(e)}")
-                context = {}
+        return self._parse_context(session)
 
-        return context
+    def _parse_context(self, session: FlowSession) -> Dict[str, Any]:
+        """解析会话对象上的上下文数据（兼容JSON列和字符串）"""
+        if not session.context:
+            return {}
+        if isinstance(session.context, dict):
+            return dict(session.context)
+        try:
+            return json.loads(session.context)
+        except Exception as e:
+            self._log("log_error", f"解析会话上下文失败: {str(e)}")
+            return {}
 
     def update_session_context(self, id_or_name: str, context_data: Dict[str, Any]) -> Dict[str, Any]:
         """更新会话上下文数据
@@ -139,42 +144,38 @@ class SessionContextMixin:
         if not session:
             raise ValueError(f"找不到会话: {id_or_name}")
 
-        # 获取会话上下文中的进度信息
-        context = self.get_session_context(id_or_name)
-        progress = context.get("progress", {})
-
-        # 获取阶段信息
-        stages = self.get_session_stages(id_or_name)
-
-        # 计算进度百分比
-        total_stages = len(stages)
-        completed_stages_count = sum(1 for stage in stages if stage.get("status") == "COMPLETED")
-
-        # 分类阶段
-        completed_stages_list = []
-        pending_stages_list = []
-        current_stage_info = None
-
-        # 为了确保返回的数据格式正确，显式构建各个阶段列表
-        for stage in stages:
-            stage_status = stage.get("status", "")
-            if stage_status == "COMPLETED":
-                completed_stages_list.append(stage)
-            elif stage_status == "ACTIVE" or (context.get("current_stage") and stage.get("id") == context.get("current_stage")):
-                current_stage_info = stage
-            else:
-                pending_stages_list.append(stage)
+        graph = self._get_session_graph(session)
+        context = self._parse_context(session)
+        current_stage_id = session.current_stage_id or context.get("current_stage")
+        return graph.progress(current_stage_id, session.completed_stages)
+
+    def _get_session_graph(self, session: FlowSession) -> WorkflowGraph:
+        """获取会话所属工作流的编译阶段图
+
+        Args:
+            session: 会话对象
+
+        Returns:
+            WorkflowGraph: 编译后的阶段图（按工作流版本缓存）
+
+        Raises:
+            ValueError: 如果找不到工作流定义
+        """
+        workflow = self._get_session_workflow(session)
+        if not workflow:
+            raise ValueError(f"找不到工作流定义: {session.workflow_id}")
+        return get_workflow_graph(self.session, workflow)
+
+    def _get_session_workflow(self, session: FlowSession) -> Optional[WorkflowDefinition]:
+        """获取会话所属的工作流定义
 
-        progress_info = {
-            "current_stage": current_stage_info,
-            "total_stages": total_stages,
-            "completed_count": completed_stages_count,
-            "completed_stages": completed_stages_list,  # 确保是列表
-            "pending_stages": pending_stages_list,  # 确保是列表
-            "progress_percentage": (completed_stages_count / total_stages * 100) if total_stages > 0 else 0,
-        }
+        Args:
+            session: 会话对象
 
-        return progress_info
+        Returns:
+            工作流定义对象，如果不存在则返回None
+        """
+        return WorkflowDefinitionRepository().get_by_id(self.session, session.workflow_id)
 
     def set_current_stage(self, id_or_name: str, stage_id: str) -> bool:
         """设置会话当前阶段
@@ -216,7 +217,7 @@ class SessionContextMixin:
             current_stage_id: 当前阶段ID，如果不提供则使用会话当前阶段
 
         Returns:
-            可能的下一阶段列表
+            可能的下一阶段列表（阶段字典，按权重排序）
 
         Raises:
             ValueError: 如果找不到指定的会话或阶段
@@ -226,86 +227,18 @@ class SessionContextMixin:
             raise ValueError(f"找不到会话: {id_or_name}")
 
         # 如果没有提供当前阶段ID，使用会话当前阶段
+        context = self._parse_context(session)
         if not current_stage_id:
-            context = self.get_session_context(id_or_name)
             current_stage_id = context.get("current_stage")
             if not current_stage_id:
                 raise ValueError("无法确定当前阶段")
 
-        # 获取工作流定义
-        workflow = self.workflow_repo.get_by_id(session.workflow_id)
-        if not workflow:
-            raise ValueError(f"找不到工作流定义: {session.workflow_id}")
-
-        # 获取当前阶段
-        from src.db.repositories.stage_repository import StageRepository
-
-        stage_repo = StageRepository(self.session)
-        current_stage = stage_repo.get_by_id(current_stage_id)
-        if not current_stage:
+        # 使用编译后的阶段图在内存中计算
+        graph = self._get_session_graph(session)
+        if current_stage_id not in graph:
             raise ValueError(f"找不到阶段: {current_stage_id}")
 
-        # 获取所有阶段
-        all_stages = stage_repo.get_by_workflow_id(workflow.id)
-        all_stages_dict = {stage.id: stage for stage in all_stages}
-
-        # 计算下一阶段
-        next_stages = []
-        completed_stages = session.completed_stages or []
-
-        # 遍历所有阶段，找出满足条件的下一阶段
-        for stage_id, stage in all_stages_dict.items():
-            # 跳过当前阶段和已完成阶段
-            if stage_id == current_stage_id or stage_id in completed_stages:
-                continue
-
-            # 检查依赖关系
-            if stage.depends_on:
-                depends_satisfied = True
-                for dep_id in stage.depends_on:
-                    if dep_id not in completed_stages and dep_id != current_stage_id:
-                        depends_satisfied = False
-                        break
-
-                if not depends_satisfied:
-                    continue
-
-            # 检查阶段是否可访问（有些阶段可能有额外条件）
-            session_context = self.get_session_context(id_or_name)
-            if stage.prerequisites and not self._check_prerequisites(stage.prerequisites, session_context):
-                continue
-
-            next_stages.append(stage)
-
-        # 根据权重排序
-        next_stages.sort(key=lambda s: s.weight if s.weight is not None else 999)
-
-        return next_stages
-
-    def _check_prerequisites(self, prerequisites: Dict[str, Any], context: Dict[str, Any]) -> bool:
-        """检查阶段先决条件是否满足
-
-        Args:
-            prerequisites: 先决条件字典
-            context: 会话上下文
-
-        Returns:
-            是否满足先决条件
-        """
-        if not prerequisites:
-            return True
-
-        if not context:
-            return False
-
-        for key, value in prerequisites.items():
-            if key not in context:
-                return False
-
-            if context[key] != value:
-                return False
-
-        return True
+        return graph.next_stages(current_stage_id, session.completed_stages, context)
 
     def get_session_first_stage(self, id_or_name: str) -> Optional[str]:
         """获取会话的第一个阶段ID
@@ -327,20 +260,17 @@ class SessionContextMixin:
         self._log("log_info", f"获取会话 {session.id} 的第一个阶段")
 
         # 获取工作流定义
-        workflow = self.workflow_repo.get_by_id(session.workflow_id)
+        workflow = self._get_session_workflow(session)
         if not workflow:
             self._log("log_error", f"找不到工作流定义: {session.workflow_id}")
             return None
 
-        if not workflow.stages or len(workflow.stages) == 0:
+        # 按编译后阶段图的拓扑顺序取第一个阶段
+        first_stage = get_workflow_graph(self.session, workflow).first_stage()
+        if not first_stage:
             self._log("log_error", f"工作流定义 {session.workflow_id} 没有定义阶段")
             return None
-
-        # 获取第一个阶段的ID
-        first_stage_id = workflow.stages[0].get("id")
-        if not first_stage_id:
-            self._log("log_error", f"工作流定义 {session.workflow_id} 的第一个阶段没有ID")
-            return None
+        first_stage_id = first_stage["id"]
 
         self._log("log_info", f"工作流 {session.workflow_id} 的第一个阶段ID是 {first_stage_id}")
 
@@ -360,7 +290,7 @@ class SessionContextMixin:
                 stage_manager = StageInstanceManager(self.session)
 
                 # 创建阶段实例
-                stage_data = {"stage_id": first_stage_id, "name": workflow.stages[0].get("name", f"阶段-{first_stage_id}")}
+                stage_data = {"stage_id": first_stage_id, "name": first_stage.get("name") or f"阶段-{first_stage_id}"}
                 new_instance = stage_manager.create_instance(session.id, stage_data)
                 self._log("log_info", f"为会话 {session.id} 创建了阶段实例 {first_stage_id} -> {new_instance.id if new_instance else 'Failed'}")
             else:
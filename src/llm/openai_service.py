@@ -1,18 +1,18 @@
 """
 OpenAI service for interacting with OpenAI API.
 """
-import asyncio
 import logging
 import os
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
 
 import numpy as np
 import openai
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import AsyncOpenAI
 from openai.types.chat import ChatCompletion
 
 from src.core.config.manager import get_config
+from src.llm.runtime import estimate_message_tokens, estimate_tokens, get_llm_runtime
 
 logger = logging.getLogger(__name__)
 
@@ -32,7 +32,9 @@ class OpenAIService:
         if not self.api_key:
             raise ValueError("OpenAI API key not found in config or environment variables")
 
-        self.client = OpenAI(api_key=self.api_key)
+        # 同一API密钥的服务实例共享一个异步客户端（连接池），请求经运行时统一限流
+        self.runtime = get_llm_runtime()
+        self.client = self.runtime.get_client(("openai", self.api_key), lambda: AsyncOpenAI(api_key=self.api_key))
 
         # 从配置获取模型和服务名称
         self.chat_model = config_manager.get("ai.chat_model", "gpt-4o-mini")
@@ -60,12 +62,12 @@ class OpenAIService:
         """
         try:
             logger.debug(f"Making chat completion request with {len(messages)} messages")
-            # Run the synchronous API call in a thread pool
-            response = await asyncio.get_event_loop().run_in_executor(
-                None,
+            response = await self.runtime.call(
+                "openai",
                 lambda: self.client.chat.completions.create(
                     model=self.chat_model, messages=messages, temperature=temperature, max_tokens=max_tokens, **kwargs
                 ),
+                cost=estimate_message_tokens(messages, max_tokens),
             )
             logger.debug("Chat completion request successful")
             return response
@@ -79,6 +81,39 @@ class OpenAIService:
             logger.error(f"Unexpected error in chat completion: {str(e)}")
             raise Exception(f"OpenAI API call failed: {str(e)}")
 
+    async def stream_chat_completion(
+        self, messages: List[Dict[str, str]], temperature: float = 0.7, max_tokens: Optional[int] = None, **kwargs: Any
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat completion from OpenAI API, yielding content deltas as they arrive.
+
+        Stopping the iteration early cancels the request and closes the connection.
+
+        Args:
+            messages: List of message dictionaries with role and content
+            temperature: Sampling temperature (0.0 to 2.0)
+            max_tokens: Maximum number of tokens to generate
+            **kwargs: Additional parameters to pass to the API
+
+        Yields:
+            Content deltas of the first choice
+        """
+
+        async def open_stream() -> AsyncIterator[str]:
+            stream = await self.client.chat.completions.create(
+                model=self.chat_model, messages=messages, temperature=temperature, max_tokens=max_tokens, stream=True, **kwargs
+            )
+            try:
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            finally:
+                await stream.close()
+
+        logger.debug(f"Making streaming chat completion request with {len(messages)} messages")
+        async for delta in self.runtime.stream("openai", open_stream, cost=estimate_message_tokens(messages, max_tokens)):
+            yield delta
+
     async def create_embeddings(self, texts: Union[str, List[str]]) -> List[List[float]]:
         """
         为文本创建嵌入向量，并降维到指定维度
@@ -98,10 +133,11 @@ class OpenAIService:
 
         try:
             logger.debug(f"创建嵌入向量, 文本数量: {len(texts)}")
-            # 运行同步API调用 - 注意：OpenAI API可能不允许直接指定输出维度，降维在后面处理
-            response = await asyncio.get_event_loop().run_in_executor(
-                None,
+            # 注意：OpenAI API可能不允许直接指定输出维度，降维在后面处理
+            response = await self.runtime.call(
+                "openai",
                 lambda: self.client.embeddings.create(model=self.embedding_model, input=texts),
+                cost=sum(estimate_tokens(text) for text in texts),
             )
             logger.debug("嵌入向量创建成功")
 
@@ -5,10 +5,12 @@ import asyncio
 import json
 import logging
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 import httpx
 
+from src.llm.runtime import estimate_message_tokens, get_llm_runtime
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,7 +22,9 @@ class OllamaService:
         self.config = config or {}
         self.base_url = self.config.get("base_url", "http://localhost:11434")
         self.model = self.config.get("model", "llama3")
-        self.api_client = httpx.AsyncClient(base_url=self.base_url, timeout=60.0)
+        # 同一地址的服务实例共享一个异步客户端（连接池），请求经运行时统一限流
+        self.runtime = get_llm_runtime()
+        self.api_client = self.runtime.get_client(("ollama", self.base_url), lambda: httpx.AsyncClient(base_url=self.base_url, timeout=60.0))
 
     async def chat_completion(
         self, messages: List[Dict[str, str]], temperature: float = 0.7, max_tokens: Optional[int] = None, **kwargs: Any
@@ -41,28 +45,10 @@ class OllamaService:
             Exception: If the API call fails
         """
         try:
-            # Prepare the request payload
-            payload = {
-                "model": kwargs.get("model", self.model),
-                "messages": messages,
-                "temperature": temperature,
-                "max_length": max_tokens,
-                "stream": False,
-            }
-
-            # Remove None values
-            payload = {k: v for k, v in payload.items() if v is not None}
-
-            # Add any additional parameters
-            for key, value in kwargs.items():
-                if key not in payload and value is not None:
-                    payload[key] = value
+            payload = self._build_payload(messages, temperature, max_tokens, stream=False, **kwargs)
 
             # Make the API call
-            response = await self.api_client.post("/api/chat", json=payload)
-            response.raise_for_status()
-
-            result = response.json()
+            result = await self.runtime.call("ollama", lambda: self._post_chat(payload), cost=estimate_message_tokens(messages, max_tokens))
 
             # Format response to match the expected structure
             return {"choices": [{"message": {"role": "assistant", "content": result.get("response", "")}}], "model": result.get("model", self.model)}
@@ -73,3 +59,65 @@ class OllamaService:
             raise Exception(f"Ollama API request error: {str(e)}")
         except Exception as e:
             raise Exception(f"Ollama API call failed: {str(e)}")
+
+    async def stream_chat_completion(
+        self, messages: List[Dict[str, str]], temperature: float = 0.7, max_tokens: Optional[int] = None, **kwargs: Any
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat completion from Ollama API, yielding content deltas as they arrive.
+
+        Stopping the iteration early cancels the request and closes the connection.
+
+        Args:
+            messages: List of message dictionaries with role and content
+            temperature: Sampling temperature (0.0 to 2.0)
+            max_tokens: Maximum number of tokens to generate
+            **kwargs: Additional parameters to pass to the API
+
+        Yields:
+            Content deltas
+        """
+        payload = self._build_payload(messages, temperature, max_tokens, stream=True, **kwargs)
+
+        async def open_stream() -> AsyncIterator[str]:
+            # Ollama streams one JSON object per line
+            async with self.api_client.stream("POST", "/api/chat", json=payload) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.strip():
+                        continue
+                    data = json.loads(line)
+                    delta = (data.get("message") or {}).get("content") or data.get("response")
+                    if delta:
+                        yield delta
+                    if data.get("done"):
+                        break
+
+        async for delta in self.runtime.stream("ollama", open_stream, cost=estimate_message_tokens(messages, max_tokens)):
+            yield delta
+
+    def _build_payload(
+        self, messages: List[Dict[str, str]], temperature: float, max_tokens: Optional[int], stream: bool, **kwargs: Any
+    ) -> Dict[str, Any]:
+        # Prepare the request payload
+        payload = {
+            "model": kwargs.get("model", self.model),
+            "messages": messages,
+            "temperature": temperature,
+            "max_length": max_tokens,
+            "stream": stream,
+        }
+
+        # Remove None values
+        payload = {k: v for k, v in payload.items() if v is not None}
+
+        # Add any additional parameters
+        for key, value in kwargs.items():
+            if key not in payload and value is not None:
+                payload[key] = value
+        return payload
+
+    async def _post_chat(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        response = await self.api_client.post("/api/chat", json=payload)
+        response.raise_for_status()
+        return response.json()
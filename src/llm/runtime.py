@@ -0,0 +1,325 @@
+"""
+LLM提供者运行时
+
+所有LLM请求都在一个专用的事件循环线程上执行：
+- 每个提供者的异步客户端在进程内共享，复用连接池
+- 每个提供者有全局并发信号量和令牌桶限流（请求数/分钟、token数/分钟）
+- 同步代码通过run_sync把协程提交到该线程执行，不需要nest_asyncio之类的嵌套事件循环
+- 流式请求通过stream把数据块转发回调用方的事件循环，提前停止迭代会取消请求
+"""
+
+import asyncio
+import atexit
+import inspect
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, List, Optional, TypeVar
+
+from src.core.config import get_config
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# 各提供者默认的最大并发请求数
+DEFAULT_MAX_CONCURRENCY = {"openai": 8, "ollama": 2}
+
+# 流式请求结束标记
+_STREAM_END = object()
+
+
+def estimate_tokens(text: str) -> int:
+    """粗略估算文本的token数
+
+    ASCII字符约4个一个token，中文等非ASCII字符约一个字符一个token
+
+    Args:
+        text: 文本
+
+    Returns:
+        int: 估算的token数
+    """
+    non_ascii = (len(text.encode("utf-8")) - len(text)) // 2
+    return (len(text) - non_ascii) // 4 + non_ascii + 1
+
+
+def estimate_message_tokens(messages: List[Dict[str, str]], max_tokens: Optional[int] = None) -> int:
+    """估算一次聊天请求消耗的token数（输入加最大输出）"""
+    return sum(estimate_tokens(message.get("content") or "") for message in messages) + (max_tokens or 0)
+
+
+class TokenBucket:
+    """令牌桶限流器（只能在运行时事件循环中使用）"""
+
+    def __init__(self, rate: float, capacity: float):
+        """初始化令牌桶
+
+        Args:
+            rate: 每秒补充的令牌数
+            capacity: 桶容量，即允许的突发量
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        """取出令牌，不足时等待补充（按到达顺序）
+
+        Args:
+            amount: 令牌数，超过容量时按容量计算
+        """
+        amount = min(amount, self.capacity)
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                await asyncio.sleep((amount - self._tokens) / self.rate)
+
+
+@dataclass
+class ProviderLimiter:
+    """单个提供者的并发和速率限制"""
+
+    semaphore: asyncio.Semaphore
+    requests: Optional[TokenBucket] = None
+    tokens: Optional[TokenBucket] = None
+
+    @classmethod
+    def from_config(cls, provider: str) -> "ProviderLimiter":
+        """根据配置ai.<provider>.*创建限制器，速率为0表示不限制"""
+        config = get_config()
+        concurrency = int(config.get(f"ai.{provider}.max_concurrency", DEFAULT_MAX_CONCURRENCY.get(provider, 4)))
+        rpm = float(config.get(f"ai.{provider}.requests_per_minute", 0) or 0)
+        tpm = float(config.get(f"ai.{provider}.tokens_per_minute", 0) or 0)
+        return cls(
+            semaphore=asyncio.Semaphore(max(1, concurrency)),
+            requests=TokenBucket(rpm / 60.0, max(1.0, min(rpm, concurrency))) if rpm > 0 else None,
+            tokens=TokenBucket(tpm / 60.0, tpm) if tpm > 0 else None,
+        )
+
+
+class LLMRuntime:
+    """LLM提供者运行时"""
+
+    def __init__(self):
+        """初始化运行时，事件循环线程在首次使用时启动"""
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._clients: Dict[Hashable, Any] = {}
+        # 只在运行时事件循环中访问
+        self._limiters: Dict[str, ProviderLimiter] = {}
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """运行时事件循环，必要时启动线程"""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+                thread = threading.Thread(target=self._run_loop, args=(loop, ready), name="llm-runtime", daemon=True)
+                thread.start()
+                ready.wait()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop, ready: threading.Event) -> None:
+        asyncio.set_event_loop(loop)
+        loop.call_soon(ready.set)
+        loop.run_forever()
+
+    def in_runtime_thread(self) -> bool:
+        """当前是否在运行时事件循环线程中"""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def get_client(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """获取共享的客户端，不存在时创建
+
+        Args:
+            key: 客户端键，如(提供者, 地址)
+            factory: 创建客户端的函数
+
+        Returns:
+            Any: 共享的客户端实例
+        """
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._clients[key] = factory()
+            return client
+
+    async def call(self, provider: str, operation: Callable[[], Awaitable[T]], cost: float = 0) -> T:
+        """在运行时事件循环中执行一次受限的提供者请求
+
+        可以在任意事件循环中调用；调用方被取消时请求也会被取消
+
+        Args:
+            provider: 提供者名称
+            operation: 返回请求协程的函数
+            cost: 估算的token消耗，用于token速率限制
+
+        Returns:
+            T: 请求结果
+        """
+        loop = self.loop
+        coro = self._guarded(provider, operation, cost)
+        if self.in_runtime_thread():
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+    async def stream(self, provider: str, open_stream: Callable[[], AsyncIterator[T]], cost: float = 0) -> AsyncIterator[T]:
+        """在运行时事件循环中执行一次受限的流式请求，逐个产出数据块
+
+        可以在任意事件循环中迭代；提前停止迭代或调用方被取消时请求会被取消，连接随之关闭。
+        并发名额在整个流结束前一直占用
+
+        Args:
+            provider: 提供者名称
+            open_stream: 返回数据块异步迭代器的函数
+            cost: 估算的token消耗，用于token速率限制
+
+        Yields:
+            T: 数据块
+        """
+        caller = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        def emit(item: Any, error: Optional[BaseException] = None) -> None:
+            try:
+                caller.call_soon_threadsafe(queue.put_nowait, (item, error))
+            except RuntimeError:
+                # 调用方事件循环已关闭
+                pass
+
+        async def pump() -> None:
+            async for chunk in open_stream():
+                emit(chunk)
+
+        async def produce() -> None:
+            try:
+                await self._guarded(provider, pump, cost)
+            except Exception as e:
+                emit(_STREAM_END, e)
+            else:
+                emit(_STREAM_END)
+
+        future = asyncio.run_coroutine_threadsafe(produce(), self.loop)
+        try:
+            while True:
+                chunk, error = await queue.get()
+                if chunk is _STREAM_END:
+                    if error is not None:
+                        raise error
+                    return
+                yield chunk
+        finally:
+            future.cancel()
+
+    async def _guarded(self, provider: str, operation: Callable[[], Awaitable[T]], cost: float) -> T:
+        limiter = self._limiters.get(provider)
+        if limiter is None:
+            limiter = self._limiters[provider] = ProviderLimiter.from_config(provider)
+        async with limiter.semaphore:
+            if limiter.requests:
+                await limiter.requests.acquire()
+            if limiter.tokens and cost:
+                await limiter.tokens.acquire(cost)
+            return await operation()
+
+    def run_sync(self, awaitable: Awaitable[T], timeout: Optional[float] = None) -> T:
+        """在同步代码中等待协程完成（协程在运行时线程中执行）
+
+        Args:
+            awaitable: 协程
+            timeout: 超时秒数
+
+        Returns:
+            T: 协程结果
+
+        Raises:
+            RuntimeError: 在运行时线程中调用（会导致死锁）
+        """
+        if self.in_runtime_thread():
+            raise RuntimeError("不能在LLM运行时线程中同步等待协程")
+
+        async def wrapper():
+            return await awaitable
+
+        return asyncio.run_coroutine_threadsafe(wrapper(), self.loop).result(timeout)
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """关闭所有共享客户端并停止事件循环线程"""
+        with self._lock:
+            loop, thread, clients = self._loop, self._thread, list(self._clients.values())
+            self._loop, self._thread = None, None
+            self._clients.clear()
+        self._limiters = {}
+        if loop is None:
+            return
+
+        async def close_clients():
+            for client in clients:
+                close = getattr(client, "aclose", None) or getattr(client, "close", None)
+                if close is None:
+                    continue
+                try:
+                    result = close()
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception as e:
+                    logger.warning(f"关闭LLM客户端失败: {e}")
+
+        try:
+            asyncio.run_coroutine_threadsafe(close_clients(), loop).result(timeout)
+        except Exception as e:
+            logger.warning(f"关闭LLM客户端超时或失败: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        if not thread.is_alive():
+            loop.close()
+
+
+_runtime: Optional[LLMRuntime] = None
+_runtime_lock = threading.Lock()
+
+
+def get_llm_runtime() -> LLMRuntime:
+    """获取LLM运行时单例
+
+    Returns:
+        LLMRuntime: 运行时实例
+    """
+    global _runtime
+    if _runtime is None:
+        with _runtime_lock:
+            if _runtime is None:
+                _runtime = LLMRuntime()
+    return _runtime
+
+
+def shutdown_llm_runtime() -> None:
+    """关闭LLM运行时单例（未创建时不做任何事）"""
+    global _runtime
+    with _runtime_lock:
+        runtime, _runtime = _runtime, None
+    if runtime is not None:
+        runtime.shutdown()
+
+
+atexit.register(shutdown_llm_runtime)
+
+
+def run_sync(awaitable: Awaitable[T], timeout: Optional[float] = None) -> T:
+    """在同步代码中运行协程，见LLMRuntime.run_sync"""
+    return get_llm_runtime().run_sync(awaitable, timeout)
@@ -15,6 +15,7 @@ from .milestone import Milestone
 from .roadmap import Roadmap
 from .rule import Rule, RuleExample, RuleItem, RuleMetadata
 from .stage import Stage
+from .status_sync_outbox import StatusSyncOutbox
 from .story import Story
 from .system_config import SystemConfig
 from .task import Task, TaskComment
@@ -53,4 +54,5 @@ __all__ = [
     "RuleExample",
     "RuleMetadata",
     "MemoryItem",
+    "StatusSyncOutbox",
 ]
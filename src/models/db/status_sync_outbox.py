@@ -0,0 +1,51 @@
+"""
+状态同步发件箱数据库模型
+
+记录待同步到外部系统的状态变更。同一实体只保留一行最新状态，
+由后台任务批量发送，保证状态更新不等待外部系统且在重启后不丢失。
+"""
+
+from datetime import datetime
+from typing import Any, Dict
+
+from sqlalchemy import Column, DateTime, Integer, String, Text
+
+from src.models.db.base import Base
+
+
+class StatusSyncOutbox(Base):
+    """状态同步发件箱数据库模型"""
+
+    __tablename__ = "status_sync_outbox"
+
+    # 主键为 "领域:实体ID"，同一实体的多次变更合并为一行
+    id = Column(String(255), primary_key=True)
+    domain = Column(String(50), nullable=False)
+    entity_id = Column(String(200), nullable=False)
+    old_status = Column(String(50), nullable=True)
+    status = Column(String(50), nullable=False)
+    context = Column(Text, nullable=True)  # 存储为JSON格式的字符串
+    # 每次合并新状态时递增，发送成功后只删除版本未变化的行
+    version = Column(Integer, nullable=False, default=1)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典"""
+        return {
+            "id": self.id,
+            "domain": self.domain,
+            "entity_id": self.entity_id,
+            "old_status": self.old_status,
+            "status": self.status,
+            "context": self.context,
+            "version": self.version,
+            "attempts": self.attempts,
+            "next_attempt_at": self.next_attempt_at.isoformat() if self.next_attempt_at else None,
+            "last_error": self.last_error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
@@ -21,9 +21,9 @@ class Template(Base):
     __tablename__ = "templates"
 
     id = Column(String(50), primary_key=True, default=lambda: f"template_{uuid.uuid4().hex[:8]}")
-    name = Column(String(100))
+    name = Column(String(100), index=True)
     description = Column(Text, nullable=True)
-    type = Column(String(50))
+    type = Column(String(50), index=True)
     content = Column(Text)
     example = Column(Text, nullable=True)
     author = Column(String(100), nullable=True)
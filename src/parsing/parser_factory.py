@@ -11,6 +11,7 @@ from typing import Any, Dict, Optional
 from src.parsing.base_parser import BaseParser
 from src.parsing.parsers.llm_parser import LLMParser
 from src.parsing.parsers.regex_parser import RegexParser
+from src.parsing.parsers.tiered_parser import TieredParser
 
 
 def create_parser(content_type: str = "generic", backend: str = "openai", config: Optional[Dict[str, Any]] = None) -> BaseParser:
@@ -19,7 +20,7 @@ def create_parser(content_type: str = "generic", backend: str = "openai", config
 
     Args:
         content_type: 内容类型，如'rule'、'document'、'generic'等
-        backend: 提供者类型，如'openai'、'ollama'、'regex'等
+        backend: 提供者类型，如'openai'、'ollama'、'regex'、'tiered'等
         config: 配置参数
 
     Returns:
@@ -40,6 +41,9 @@ def create_parser(content_type: str = "generic", backend: str = "openai", config
         return LLMParser(config)
     elif backend == "regex":
         return RegexParser(config)
+    elif backend == "tiered":
+        # 本地优先，低置信度内容才交给config["provider"]指定的LLM
+        return TieredParser(config)
     else:
         raise ValueError(f"Unsupported backend: {backend}")
 
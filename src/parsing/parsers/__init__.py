@@ -5,5 +5,6 @@ Specific parser implementations for different backends.
 from src.parsing.parsers.ollama_parser import OllamaParser
 from src.parsing.parsers.openai_parser import OpenAIParser
 from src.parsing.parsers.regex_parser import RegexParser
+from src.parsing.parsers.tiered_parser import TieredParser
 
-__all__ = ["OpenAIParser", "OllamaParser", "RegexParser"]
+__all__ = ["OpenAIParser", "OllamaParser", "RegexParser", "TieredParser"]
@@ -0,0 +1,108 @@
+"""
+编译提取引擎
+
+正则模式按内容类型只编译一次；Markdown结构由单遍扫描器提取：
+一个编译好的结构行正则只在标题和代码围栏行上停下，
+一次遍历同时产出Front Matter、标题、章节和代码块。
+"""
+
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Match, Optional, Pattern
+
+# 各模式需要的编译标志，未列出的模式不带标志
+PATTERN_FLAGS: Dict[str, int] = {
+    "front_matter": re.DOTALL,
+    "title": re.MULTILINE,
+    "sections": re.MULTILINE,
+    "headings": re.MULTILINE,
+    "examples": re.DOTALL,
+    "code_blocks": re.DOTALL,
+    "tags": re.MULTILINE,
+    "description": re.MULTILINE,
+    "type": re.MULTILINE,
+}
+
+# 文档开头的Front Matter（前面允许空行）
+_FRONT_MATTER = re.compile(r"\A(?:[^\S\n]*\n)*[^\S\n]*---[^\S\n]*\n(.*?)^[^\S\n]*---[^\S\n]*$", re.MULTILINE | re.DOTALL)
+
+# 结构行：代码围栏或标题，其余行由正则引擎直接跳过。
+# 以换行符开头而不是用^锚定，正则引擎可以按字面前缀快速定位候选行
+_STRUCTURE_LINE = re.compile(r"\n(?P<line>[^\S\n]*```(?P<language>[a-zA-Z]*).*|(?P<hashes>#+)[^\S\n]+(?P<text>.+))")
+
+
+@lru_cache(maxsize=None)
+def _compile(pattern: str, flags: int) -> Pattern:
+    return re.compile(pattern, flags)
+
+
+def compile_patterns(patterns: Dict[str, str]) -> Dict[str, Pattern]:
+    """编译一组模式，相同的模式在进程内只编译一次
+
+    Args:
+        patterns: 模式名到正则表达式字符串的映射
+
+    Returns:
+        Dict[str, Pattern]: 模式名到编译后正则的映射
+    """
+    return {name: _compile(pattern, PATTERN_FLAGS.get(name, 0)) for name, pattern in patterns.items()}
+
+
+@dataclass
+class MarkdownStructure:
+    """单遍扫描得到的Markdown结构"""
+
+    front_matter: Dict[str, str] = field(default_factory=dict)
+    title: str = ""
+    headings: List[Dict[str, object]] = field(default_factory=list)
+    sections: List[str] = field(default_factory=list)
+    code_blocks: List[Dict[str, str]] = field(default_factory=list)
+
+
+def scan_markdown(content: str, front_matter: bool = True) -> MarkdownStructure:
+    """单遍扫描Markdown内容
+
+    Front Matter只在文档开头识别；代码块内的行不会被当作标题；未闭合的代码块不计入结果。
+
+    Args:
+        content: Markdown内容
+        front_matter: 是否识别文档开头的Front Matter
+
+    Returns:
+        MarkdownStructure: 扫描结果
+    """
+    structure = MarkdownStructure()
+    # 补一个换行让首行也能被结构行正则匹配，以下位置均相对于text
+    text = "\n" + content
+    position = 0
+
+    if front_matter:
+        match = _FRONT_MATTER.match(content)
+        if match:
+            for line in match.group(1).split("\n"):
+                if ":" in line:
+                    key, value = line.split(":", 1)
+                    structure.front_matter[key.strip()] = value.strip()
+            position = match.end() + 1
+
+    fence: Optional[Match] = None
+    for match in _STRUCTURE_LINE.finditer(text, position):
+        hashes = match.group("hashes")
+        if fence is not None:
+            if hashes is None:
+                structure.code_blocks.append({"language": fence.group("language"), "code": text[fence.end() + 1 : match.start() + 1]})
+                fence = None
+            continue
+
+        if hashes is None:
+            fence = match
+            continue
+        level = len(hashes)
+        structure.headings.append({"level": level, "text": match.group("text")})
+        if level == 1 and not structure.title:
+            structure.title = match.group("text")
+        elif level == 2:
+            structure.sections.append(match.group("line"))
+
+    return structure
@@ -4,15 +4,19 @@ LLM解析器
 使用LLM服务进行内容解析的统一实现。
 """
 
+import asyncio
 import json
 import logging
 import os
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
+from src.core.config import get_config
+from src.llm.runtime import estimate_tokens, run_sync
 from src.llm.service_factory import create_llm_service
 from src.parsing.base_parser import BaseParser
-from src.parsing.prompt_templates import get_prompt_template, get_system_prompt
+from src.parsing.parsers.streaming import StreamAbortError, stream_completion, supports_streaming
+from src.parsing.prompt_templates import format_batch_document, get_batch_prompt, get_prompt_template, get_system_prompt
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +25,65 @@ PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(o
 TEMP_ROOT = os.path.join(PROJECT_ROOT, "temp")
 
 
+def pack_batches(contents: Sequence[str], token_budget: int, max_documents: int, overhead: int = 0) -> List[List[int]]:
+    """按token预算把文档贪心地打包成批次
+
+    Args:
+        contents: 文档内容列表
+        token_budget: 每个批次的输入token预算
+        max_documents: 每个批次最多包含的文档数
+        overhead: 每个批次固定占用的token数（提示说明等）
+
+    Returns:
+        List[List[int]]: 每个批次包含的文档下标，超出预算的单个文档单独成批
+    """
+    batches: List[List[int]] = []
+    current: List[int] = []
+    used = overhead
+    for index, content in enumerate(contents):
+        cost = estimate_tokens(format_batch_document(index, content))
+        if current and (used + cost > token_budget or len(current) >= max_documents):
+            batches.append(current)
+            current, used = [], overhead
+        current.append(index)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _extract_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """从响应中提取JSON对象，兼容代码块包裹和前后说明文字"""
+    try:
+        data = json.loads(text)
+    except (TypeError, ValueError):
+        start, end = text.find("{"), text.rfind("}")
+        if start == -1 or end <= start:
+            return None
+        try:
+            data = json.loads(text[start : end + 1])
+        except ValueError:
+            return None
+    return data if isinstance(data, dict) else None
+
+
+def _response_text(response: Any) -> str:
+    """获取聊天补全响应的文本，兼容对象和字典两种格式"""
+    if hasattr(response, "choices") and hasattr(response.choices[0], "message"):
+        return response.choices[0].message.content
+    return response["choices"][0]["message"]["content"]
+
+
+def _finish_reason(response: Any) -> Optional[str]:
+    """获取聊天补全响应的结束原因"""
+    try:
+        if hasattr(response, "choices"):
+            return response.choices[0].finish_reason
+        return response["choices"][0].get("finish_reason")
+    except (AttributeError, IndexError, KeyError, TypeError):
+        return None
+
+
 class LLMParser(BaseParser):
     """
     LLM解析器
@@ -46,6 +109,9 @@ class LLMParser(BaseParser):
         except Exception as e:
             raise
 
+        # 是否使用流式响应（服务不支持时自动回退）
+        self.stream = bool(self.config.get("stream", get_config().get("content_parsing.stream", True)))
+
         # 初始化缓存
         self._cache = {}
 
@@ -135,16 +201,22 @@ class LLMParser(BaseParser):
         # 调用LLM服务
         try:
             logger.info("🚀 开始调用LLM服务...")
-            response = await self.llm_service.chat_completion(messages)
-            logger.info("✅ LLM服务调用成功")
-
-            # 根据不同的LLM服务提供者处理响应
-            if hasattr(response, "choices") and hasattr(response.choices[0], "message"):
-                # OpenAI API的原生对象格式
-                result_text = response.choices[0].message.content
+            if self.stream and supports_streaming(self.llm_service):
+                try:
+                    result_text = await stream_completion(self.llm_service, messages, content_type)
+                except StreamAbortError as e:
+                    return {
+                        "success": False,
+                        "error": f"LLM响应不符合预期结构，已提前终止: {str(e)}",
+                        "content_type": content_type,
+                        "content_preview": e.text[:300] + "..." if len(e.text) > 300 else e.text,
+                        "raw_response": e.text,
+                        "aborted": True,
+                    }
             else:
-                # 字典格式的响应
-                result_text = response["choices"][0]["message"]["content"]
+                response = await self.llm_service.chat_completion(messages)
+                result_text = _response_text(response)
+            logger.info("✅ LLM服务调用成功")
 
             logger.info("📥 获取到LLM响应，开始处理")
 
@@ -284,6 +356,108 @@ class LLMParser(BaseParser):
                 "raw_response": result_text if result_text else "解析过程中发生异常，未能获取响应",
             }
 
+    async def parse_batch(self, contents: Sequence[str], content_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        批量解析多个文档
+
+        按token预算把小文档打包进同一个请求，系统提示只发送一次；
+        响应被截断或无法解析时对半拆分重试，结果中缺失的文档逐个回退到parse_text
+
+        Args:
+            contents: 文档内容列表
+            content_type: 内容类型，如'rule'、'document'等
+
+        Returns:
+            List[Dict[str, Any]]: 与contents顺序一致的解析结果
+        """
+        content_type = content_type or "generic"
+        config = get_config()
+        token_budget = int(self.config.get("batch_token_budget", config.get("content_parsing.batch_token_budget", 6000)))
+        max_documents = int(self.config.get("batch_max_documents", config.get("content_parsing.batch_max_documents", 10)))
+        concurrency = int(self.config.get("batch_concurrency", config.get("content_parsing.batch_concurrency", 4)))
+
+        overhead = estimate_tokens(get_system_prompt(content_type) + get_batch_prompt(content_type, []))
+        batches = pack_batches(contents, token_budget, max_documents, overhead)
+        logger.info(f"批量解析 {len(contents)} 个{content_type}文档，打包为 {len(batches)} 个请求")
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(contents)
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def run(batch: List[int]) -> None:
+            async with semaphore:
+                batch_results = await self._parse_packed(contents, batch, content_type)
+            for index, result in zip(batch, batch_results):
+                results[index] = result
+
+        await asyncio.gather(*(run(batch) for batch in batches))
+        return results
+
+    async def _parse_packed(self, contents: Sequence[str], batch: List[int], content_type: str) -> List[Dict[str, Any]]:
+        """解析一个打包批次，返回与batch顺序一致的结果"""
+        if len(batch) == 1:
+            return [await self.parse_text(contents[batch[0]], content_type)]
+
+        messages = [
+            {"role": "system", "content": get_system_prompt(content_type)},
+            {"role": "user", "content": get_batch_prompt(content_type, [contents[index] for index in batch])},
+        ]
+        items = None
+        try:
+            response = await self.llm_service.chat_completion(messages)
+            result_text = _response_text(response)
+            self._save_batch_log(content_type, messages, result_text)
+            if _finish_reason(response) == "length":
+                logger.warning(f"批量响应被截断（{len(batch)} 个文档），拆分后重试")
+            else:
+                data = _extract_json_object(result_text)
+                items = data.get("results") if data else None
+        except Exception as e:
+            logger.warning(f"批量LLM请求失败（{len(batch)} 个文档）: {str(e)}，拆分后重试")
+
+        if not isinstance(items, list):
+            middle = len(batch) // 2
+            return await self._parse_packed(contents, batch[:middle], content_type) + await self._parse_packed(contents, batch[middle:], content_type)
+
+        by_id = {}
+        for item in items:
+            if isinstance(item, dict) and isinstance(item.get("id"), int) and isinstance(item.get("result"), (dict, list)):
+                by_id[item["id"]] = item["result"]
+
+        results = []
+        for position, index in enumerate(batch):
+            if position in by_id:
+                results.append(self._process_batch_item(contents[index], content_type, by_id[position]))
+            else:
+                logger.warning(f"批量响应缺少文档 {position} 的结果，单独解析")
+                results.append(await self.parse_text(contents[index], content_type))
+        return results
+
+    def _process_batch_item(self, content: str, content_type: str, item: Any) -> Dict[str, Any]:
+        """将批量响应中单个文档的结果转换为与parse_text一致的格式"""
+        result_text = json.dumps(item, ensure_ascii=False)
+        if content_type == "roadmap":
+            return {"success": True, "content_type": "roadmap", "content": item, "raw_response": result_text}
+        content_processors = {
+            "workflow": self._process_workflow_response,
+            "rule": self._process_rule_response,
+            "document": self._process_document_response,
+            "generic": self._process_generic_response,
+        }
+        processor = content_processors.get(content_type, self._process_generic_response)
+        return processor(content, result_text)
+
+    def _save_batch_log(self, content_type: str, messages: List[Dict[str, str]], result_text: str) -> None:
+        """保存批量请求和响应，便于调试"""
+        try:
+            timestamp_dir = self.get_temp_dir("llm_logs")
+            suffix = str(time.time_ns())
+            with open(os.path.join(timestamp_dir, f"batch_request_{suffix}.txt"), "w", encoding="utf-8") as f:
+                f.write(f"内容类型: {content_type}\n\n系统提示:\n{messages[0]['content']}\n\n用户提示:\n{messages[1]['content']}")
+            with open(os.path.join(timestamp_dir, f"batch_response_{suffix}.txt"), "w", encoding="utf-8") as f:
+                f.write(result_text or "")
+        except OSError as e:
+            logger.warning(f"⚠️ 无法保存批量LLM日志: {str(e)}")
+
     def _process_workflow_response(self, content: str, result_text: str) -> Dict[str, Any]:
         """处理工作流响应"""
         try:
@@ -400,6 +574,7 @@ class LLMParser(BaseParser):
         同步方法，解析文本内容
 
         这是一个适配方法，允许在同步上下文中使用LLM解析器。
+        协程在LLM运行时的事件循环线程中执行，调用方所在线程是否已有事件循环都不受影响。
         LLMParser总是使用LLM服务进行解析，保持职责单一。
 
         Args:
@@ -409,22 +584,6 @@ class LLMParser(BaseParser):
         Returns:
             解析结果
         """
-        import asyncio
-
-        import nest_asyncio
-
-        # 尝试安装和启用nest_asyncio，允许在同步上下文中运行异步代码
-        try:
-            nest_asyncio.apply()
-        except Exception as e:
-            logger.error(f"无法启用nest_asyncio: {str(e)}，LLM解析可能无法在同步上下文中工作")
-            return {
-                "success": False,
-                "error": f"环境配置错误，无法启用nest_asyncio: {str(e)}",
-                "content_type": content_type or "generic",
-                "content_preview": content[:100] + "..." if len(content) > 100 else content,
-            }
-
         try:
             logger.info("使用LLM服务进行解析")
 
@@ -446,9 +605,7 @@ class LLMParser(BaseParser):
             except Exception as e:
                 logger.warning(f"⚠️ 无法保存LLM请求内容: {str(e)}")
 
-            # 使用asyncio运行异步函数
-            loop = asyncio.get_event_loop()
-            result = loop.run_until_complete(self.parse_text(content, content_type))
+            result = run_sync(self.parse_text(content, content_type))
 
             # 保存响应内容
             response_file = os.path.join(timestamp_dir, f"response_{timestamp_unix}.txt")
@@ -4,10 +4,10 @@
 使用正则表达式进行简单内容解析的实现。
 """
 
-import re
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Optional, Pattern
 
 from src.parsing.base_parser import BaseParser
+from src.parsing.parsers.extraction import compile_patterns, scan_markdown
 
 
 class RegexParser(BaseParser):
@@ -27,12 +27,12 @@ class RegexParser(BaseParser):
         """
         super().__init__(config)
 
-        # 内容类型到解析模式的映射
+        # 内容类型到编译后解析模式的映射（同一进程内每个模式只编译一次）
         self.patterns = {
-            "rule": self._get_rule_patterns(),
-            "document": self._get_document_patterns(),
-            "generic": self._get_generic_patterns(),
-            "code": self._get_code_patterns(),
+            "rule": compile_patterns(self._get_rule_patterns()),
+            "document": compile_patterns(self._get_document_patterns()),
+            "generic": compile_patterns(self._get_generic_patterns()),
+            "code": compile_patterns(self._get_code_patterns()),
         }
 
     def parse_text(self, content: str, content_type: Optional[str] = None) -> Dict[str, Any]:
@@ -110,42 +110,27 @@ class RegexParser(BaseParser):
             "comments": r"(#|//|/\*).*",
         }
 
-    def _parse_rule(self, content: str, patterns: Dict[str, str]) -> Dict[str, Any]:
+    def _parse_rule(self, content: str, patterns: Dict[str, Pattern]) -> Dict[str, Any]:
         """
         解析规则内容
 
         Args:
             content: 规则内容
-            patterns: 正则表达式模式
+            patterns: 编译后的正则表达式模式
 
         Returns:
             解析结果
         """
-        # 提取Front Matter
-        front_matter = {}
-        front_matter_match = re.search(patterns["front_matter"], content, re.DOTALL)
-        if front_matter_match:
-            front_matter_text = front_matter_match.group(1)
-            for line in front_matter_text.split("\n"):
-                if ":" in line:
-                    key, value = line.split(":", 1)
-                    front_matter[key.strip()] = value.strip()
-
-        # 提取标题
-        title = ""
-        title_match = re.search(patterns["title"], content, re.MULTILINE)
-        if title_match:
-            title = title_match.group(1)
-
-        # 提取章节
-        sections = []
-        for match in re.finditer(patterns["sections"], content, re.MULTILINE):
-            sections.append(match.group(1))
+        # 单遍扫描提取Front Matter、标题和章节
+        structure = scan_markdown(content)
+        front_matter = structure.front_matter
+        title = structure.title
+        sections = structure.sections
 
         # 提取示例
         examples = []
-        for match in re.finditer(patterns["examples"], content, re.DOTALL):
-            examples.append(match.group(1))
+        if "<example" in content:
+            examples = [match.group(1) for match in patterns["examples"].finditer(content)]
 
         return {
             "success": True,
@@ -163,44 +148,28 @@ class RegexParser(BaseParser):
             },
         }
 
-    def _parse_document(self, content: str, patterns: Dict[str, str]) -> Dict[str, Any]:
+    def _parse_document(self, content: str, patterns: Dict[str, Pattern]) -> Dict[str, Any]:
         """
         解析文档内容
 
         Args:
             content: 文档内容
-            patterns: 正则表达式模式
+            patterns: 编译后的正则表达式模式
 
         Returns:
             解析结果
         """
-        # 提取标题
-        title = ""
-        title_match = re.search(patterns["title"], content, re.MULTILINE)
-        if title_match:
-            title = title_match.group(1)
-
-        # 提取标题结构
-        headings = []
-        for match in re.finditer(patterns["headings"], content, re.MULTILINE):
-            level = len(match.group(1))  # '#' 的数量表示标题级别
-            heading_text = match.group(2)
-            headings.append({"level": level, "text": heading_text})
+        # 单遍扫描提取标题结构和代码块
+        structure = scan_markdown(content)
+        title = structure.title
+        headings = structure.headings
+        code_blocks = structure.code_blocks
 
         # 提取链接
-        links = []
-        for match in re.finditer(patterns["links"], content):
-            links.append({"text": match.group(1), "url": match.group(2)})
+        links = [{"text": match.group(1), "url": match.group(2)} for match in patterns["links"].finditer(content)]
 
         # 提取图片
-        images = []
-        for match in re.finditer(patterns["images"], content):
-            images.append({"alt": match.group(1), "url": match.group(2)})
-
-        # 提取代码块
-        code_blocks = []
-        for match in re.finditer(patterns["code_blocks"], content, re.DOTALL):
-            code_blocks.append({"language": match.group(1), "code": match.group(2)})
+        images = [{"alt": match.group(1), "url": match.group(2)} for match in patterns["images"].finditer(content)]
 
         return {
             "success": True,
@@ -217,25 +186,25 @@ class RegexParser(BaseParser):
             },
         }
 
-    def _parse_generic(self, content: str, patterns: Dict[str, str]) -> Dict[str, Any]:
+    def _parse_generic(self, content: str, patterns: Dict[str, Pattern]) -> Dict[str, Any]:
         """
         解析通用内容
 
         Args:
             content: 通用内容
-            patterns: 正则表达式模式
+            patterns: 编译后的正则表达式模式
 
         Returns:
             解析结果
         """
         # 提取URL
-        urls = re.findall(patterns["urls"], content)
+        urls = patterns["urls"].findall(content)
 
         # 提取电子邮件
-        emails = re.findall(patterns["emails"], content)
+        emails = patterns["emails"].findall(content)
 
         # 提取日期
-        dates = re.findall(patterns["dates"], content)
+        dates = patterns["dates"].findall(content)
 
         # 计算基本统计信息
         lines = content.split("\n")
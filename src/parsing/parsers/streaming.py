@@ -0,0 +1,425 @@
+"""
+流式响应解析
+
+边接收LLM输出边增量解析JSON：
+- 每个值（对象、数组、标量）解析完成时立即按Schema检查结构，
+  一旦确定违反预期结构就停止接收，不再为后续token付费
+- 通过上下文中注册的监听器报告接收进度，CLI无需在各层之间传递回调
+
+响应约定为一个JSON对象，可以包裹在代码块中，前面的说明文字不能包含花括号。
+"""
+
+import contextlib
+import json
+import logging
+import re
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, FrozenSet, Iterator, List, Optional, Tuple, Union
+
+from src.parsing.parsers.tiered_parser import STRUCTURED_TYPES
+from src.validation.core.schema_registry import get_schema_registry
+
+logger = logging.getLogger(__name__)
+
+Path = Tuple[Union[str, int], ...]
+
+# 字符串内容中不需要特殊处理的字符
+_STRING_CHARS = re.compile(r'[^"\\]*')
+# 数字和true/false/null字面量的字符
+_LITERAL_CHARS = re.compile(r"[-+.0-9a-zA-Z]*")
+_LITERAL_START = frozenset("-0123456789tfn")
+_WHITESPACE = frozenset(" \t\r\n")
+_CONTAINER_TYPES = frozenset({"object", "array"})
+
+# 解析器状态
+_KEY_OR_END = "key_or_end"
+_KEY = "key"
+_COLON = "colon"
+_VALUE = "value"
+_VALUE_OR_END = "value_or_end"
+_COMMA_OR_END = "comma_or_end"
+
+
+class StreamAbortError(Exception):
+    """流式响应已确定无法得到有效结果"""
+
+    def __init__(self, message: str, path: Path = (), text: str = ""):
+        """
+        Args:
+            message: 错误信息
+            path: 出错值的路径
+            text: 终止前已接收的响应文本
+        """
+        super().__init__(message)
+        self.path = path
+        self.text = text
+
+
+def format_path(path: Path) -> str:
+    """把值路径格式化为epics[0].stories[1]形式"""
+    text = ""
+    for part in path:
+        text += f"[{part}]" if isinstance(part, int) else (f".{part}" if text else str(part))
+    return text or "$"
+
+
+@dataclass
+class _Frame:
+    container: Union[Dict[str, Any], List[Any]]
+    path: Path
+    state: str
+    key: Optional[str] = None
+
+
+class IncrementalJSONParser:
+    """增量JSON解析器
+
+    按块输入文本，返回每个块中解析完成的值。跳过根对象之前的文本（如代码块标记），
+    根对象结束后忽略剩余内容。
+    """
+
+    def __init__(self):
+        """初始化解析器"""
+        self._stack: List[_Frame] = []
+        self._token: List[str] = []
+        self._token_kind: Optional[str] = None
+        self._escape = False
+        self._is_key = False
+        self.done = False
+        self.value: Optional[Dict[str, Any]] = None
+
+    @property
+    def started(self) -> bool:
+        """是否已进入根对象"""
+        return self.value is not None
+
+    def feed(self, text: str) -> List[Tuple[Path, Any]]:
+        """输入一块文本
+
+        Args:
+            text: 新接收的文本
+
+        Returns:
+            List[Tuple[Path, Any]]: 本块中解析完成的(路径, 值)，子值先于所在容器
+
+        Raises:
+            StreamAbortError: JSON语法错误
+        """
+        completed: List[Tuple[Path, Any]] = []
+        i, n = 0, len(text)
+        while i < n and not self.done:
+            if self._token_kind == "string":
+                i = self._read_string(text, i, completed)
+                continue
+            if self._token_kind == "literal":
+                match = _LITERAL_CHARS.match(text, i)
+                self._token.append(match.group())
+                i = match.end()
+                if i < n:
+                    self._finish_literal(completed)
+                continue
+
+            char = text[i]
+            if self.value is None:
+                # 根对象之前的内容
+                if char == "{":
+                    self.value = {}
+                    self._stack.append(_Frame(self.value, (), _KEY_OR_END))
+                i += 1
+                continue
+            if char in _WHITESPACE:
+                i += 1
+                continue
+            if char in _LITERAL_START and self._in_value_position():
+                self._token_kind = "literal"
+                continue
+            self._structural(char, completed)
+            i += 1
+        return completed
+
+    def _error(self, message: str) -> StreamAbortError:
+        frame = self._stack[-1] if self._stack else None
+        return StreamAbortError(f"JSON语法错误: {message}", frame.path if frame else ())
+
+    def _in_value_position(self) -> bool:
+        frame = self._stack[-1]
+        return frame.state == _VALUE if isinstance(frame.container, dict) else frame.state in (_VALUE, _VALUE_OR_END)
+
+    def _child_path(self, frame: _Frame) -> Path:
+        return frame.path + ((frame.key,) if isinstance(frame.container, dict) else (len(frame.container),))
+
+    def _structural(self, char: str, completed: List[Tuple[Path, Any]]) -> None:
+        frame = self._stack[-1]
+        is_object = isinstance(frame.container, dict)
+        if char in "{[":
+            if not self._in_value_position():
+                raise self._error(f"意外的 {char!r}")
+            container: Union[Dict[str, Any], List[Any]] = {} if char == "{" else []
+            path = self._child_path(frame)
+            self._attach(frame, container)
+            self._stack.append(_Frame(container, path, _KEY_OR_END if char == "{" else _VALUE_OR_END))
+        elif char in "}]":
+            if is_object != (char == "}") or frame.state not in (_KEY_OR_END, _VALUE_OR_END, _COMMA_OR_END):
+                raise self._error(f"意外的 {char!r}")
+            self._stack.pop()
+            completed.append((frame.path, frame.container))
+            if not self._stack:
+                self.done = True
+        elif char == ",":
+            if frame.state != _COMMA_OR_END:
+                raise self._error("意外的 ','")
+            frame.state = _KEY if is_object else _VALUE
+        elif char == ":":
+            if frame.state != _COLON:
+                raise self._error("意外的 ':'")
+            frame.state = _VALUE
+        elif char == '"':
+            self._is_key = is_object and frame.state in (_KEY_OR_END, _KEY)
+            if not self._is_key and not self._in_value_position():
+                raise self._error("意外的字符串")
+            self._token_kind = "string"
+        else:
+            raise self._error(f"意外的字符 {char!r}")
+
+    def _attach(self, frame: _Frame, value: Any) -> None:
+        if isinstance(frame.container, dict):
+            frame.container[frame.key] = value
+        else:
+            frame.container.append(value)
+        frame.state = _COMMA_OR_END
+
+    def _add_value(self, value: Any, completed: List[Tuple[Path, Any]]) -> None:
+        frame = self._stack[-1]
+        completed.append((self._child_path(frame), value))
+        self._attach(frame, value)
+
+    def _read_string(self, text: str, i: int, completed: List[Tuple[Path, Any]]) -> int:
+        n = len(text)
+        while i < n:
+            if self._escape:
+                self._token.append(text[i])
+                self._escape = False
+                i += 1
+                continue
+            match = _STRING_CHARS.match(text, i)
+            self._token.append(match.group())
+            i = match.end()
+            if i == n:
+                break
+            char = text[i]
+            i += 1
+            if char == "\\":
+                self._token.append(char)
+                self._escape = True
+                continue
+
+            raw = '"' + "".join(self._token) + '"'
+            self._token, self._token_kind = [], None
+            try:
+                value = json.loads(raw)
+            except ValueError as e:
+                raise self._error(f"无效的字符串 {raw[:40]!r}: {e}")
+            if self._is_key:
+                frame = self._stack[-1]
+                frame.key, frame.state = value, _COLON
+            else:
+                self._add_value(value, completed)
+            break
+        return i
+
+    def _finish_literal(self, completed: List[Tuple[Path, Any]]) -> None:
+        raw = "".join(self._token)
+        self._token, self._token_kind = [], None
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            raise self._error(f"无效的字面量 {raw!r}")
+        self._add_value(value, completed)
+
+
+def _json_type(value: Any) -> str:
+    if isinstance(value, dict):
+        return "object"
+    if isinstance(value, list):
+        return "array"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, int):
+        return "integer"
+    if isinstance(value, float):
+        return "number"
+    return "null"
+
+
+class StructureGuard:
+    """按JSON Schema检查流式解析出的值的结构
+
+    只检查对象/数组与其他类型之间的不匹配：字段名、枚举值等问题可以在解析完成后修复，
+    而本应是数组的位置出现字符串，后续内容无论如何都无法得到有效结构。
+    """
+
+    def __init__(self, schema: Dict[str, Any]):
+        """
+        Args:
+            schema: JSON Schema
+        """
+        self._types: Dict[Tuple[str, ...], FrozenSet[str]] = {}
+        self._collect(schema, ())
+
+    @classmethod
+    def for_content_type(cls, content_type: Optional[str]) -> Optional["StructureGuard"]:
+        """获取内容类型对应的结构检查器，非结构化类型返回None"""
+        schema_name = STRUCTURED_TYPES.get(content_type or "")
+        if not schema_name:
+            return None
+        return cls(get_schema_registry().get_schema(schema_name))
+
+    def _collect(self, schema: Dict[str, Any], pattern: Tuple[str, ...]) -> None:
+        types = schema.get("type")
+        if types:
+            self._types[pattern] = frozenset([types] if isinstance(types, str) else types)
+        for key, sub_schema in (schema.get("properties") or {}).items():
+            if isinstance(sub_schema, dict):
+                self._collect(sub_schema, pattern + (key,))
+        items = schema.get("items")
+        if isinstance(items, dict):
+            self._collect(items, pattern + ("*",))
+
+    def check(self, path: Path, value: Any) -> None:
+        """检查一个解析完成的值
+
+        Raises:
+            StreamAbortError: 值的结构与Schema不符
+        """
+        expected = self._types.get(tuple("*" if isinstance(part, int) else part for part in path))
+        if not expected:
+            return
+        actual = _json_type(value)
+        if actual in expected or (actual == "integer" and "number" in expected):
+            return
+        if actual in _CONTAINER_TYPES or expected <= _CONTAINER_TYPES:
+            raise StreamAbortError(f"{format_path(path)} 应为 {'/'.join(sorted(expected))}，实际为 {actual}", path)
+
+
+@dataclass
+class StreamProgress:
+    """流式响应的接收进度"""
+
+    content_type: str
+    chars: int = 0
+    # 已解析完成的列表项（如epic、story、task）
+    items: int = 0
+    last_path: str = ""
+    started_at: float = field(default_factory=time.monotonic)
+    finished: bool = False
+
+    @property
+    def elapsed(self) -> float:
+        """已用时间（秒）"""
+        return time.monotonic() - self.started_at
+
+
+ProgressListener = Callable[[StreamProgress], None]
+
+_progress_listener: ContextVar[Optional[ProgressListener]] = ContextVar("stream_progress_listener", default=None)
+
+
+@contextlib.contextmanager
+def report_stream_progress(listener: ProgressListener) -> Iterator[None]:
+    """在当前上下文中注册流式进度监听器
+
+    上下文会随协程传递到事件循环和LLM运行时线程，监听器在接收数据的线程中调用
+
+    Args:
+        listener: 进度回调
+    """
+    token = _progress_listener.set(listener)
+    try:
+        yield
+    finally:
+        _progress_listener.reset(token)
+
+
+async def collect_stream(chunks: AsyncIterator[str], content_type: Optional[str] = None) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """接收流式响应，边接收边解析和检查结构
+
+    Args:
+        chunks: 响应文本块
+        content_type: 内容类型，结构化类型会按对应Schema检查
+
+    Returns:
+        Tuple[str, Optional[Dict[str, Any]]]: (完整响应文本, 解析出的JSON对象，响应不是完整JSON时为None)
+
+    Raises:
+        StreamAbortError: 响应已确定违反预期结构，此时已停止接收
+    """
+    content_type = content_type or "generic"
+    guard = StructureGuard.for_content_type(content_type)
+    parser: Optional[IncrementalJSONParser] = IncrementalJSONParser()
+    listener = _progress_listener.get()
+    progress = StreamProgress(content_type)
+    parts: List[str] = []
+
+    try:
+        async for chunk in chunks:
+            parts.append(chunk)
+            progress.chars += len(chunk)
+            if parser is not None and not parser.done:
+                try:
+                    completed = parser.feed(chunk)
+                except StreamAbortError:
+                    # 只有结构化类型的处理依赖JSON响应，其他类型不因语法问题终止
+                    if guard is not None:
+                        raise
+                    parser, completed = None, []
+                for path, value in completed:
+                    if guard is not None:
+                        guard.check(path, value)
+                    if path and isinstance(path[-1], int) and isinstance(value, dict):
+                        progress.items += 1
+                        progress.last_path = format_path(path)
+            if listener:
+                listener(progress)
+    except StreamAbortError as e:
+        e.text = "".join(parts)
+        logger.warning(f"流式响应违反预期结构，已在 {progress.chars} 个字符后终止: {e}")
+        raise
+    finally:
+        # 提前退出时关闭上游，取消请求
+        aclose = getattr(chunks, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+    progress.finished = True
+    if listener:
+        listener(progress)
+    logger.info(f"流式响应完成: {progress.chars} 个字符，{progress.items} 项，用时 {progress.elapsed:.1f}s")
+    return "".join(parts), parser.value if parser is not None and parser.done else None
+
+
+async def stream_completion(llm_service: Any, messages: List[Dict[str, str]], content_type: Optional[str] = None, **kwargs: Any) -> str:
+    """通过LLM服务的流式接口获取响应文本
+
+    Args:
+        llm_service: 提供stream_chat_completion的LLM服务
+        messages: 消息列表
+        content_type: 内容类型
+        **kwargs: 传递给stream_chat_completion的参数
+
+    Returns:
+        str: 完整响应文本
+
+    Raises:
+        StreamAbortError: 响应已确定违反预期结构
+    """
+    text, _ = await collect_stream(llm_service.stream_chat_completion(messages, **kwargs), content_type)
+    return text
+
+
+def supports_streaming(llm_service: Any) -> bool:
+    """LLM服务是否提供流式接口"""
+    return callable(getattr(llm_service, "stream_chat_completion", None))
@@ -0,0 +1,305 @@
+"""
+分层解析器
+
+本地优先的解析实现：先用正则或结构化解析器解析，按目标结构评估置信度，
+只有置信度不足的内容才分批交给LLM解析。
+"""
+
+import json
+import logging
+import os
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import yaml
+
+from src.core.config import get_config
+from src.parsing.base_parser import BaseParser
+from src.parsing.parsers.regex_parser import RegexParser
+from src.validation.core.schema_registry import get_schema_registry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIDENCE_THRESHOLD = 0.8
+
+# 由YAML/JSON结构化解析的内容类型 -> 对应的Schema名称
+STRUCTURED_TYPES = {"roadmap": "roadmap", "workflow": "workflow"}
+
+# 每个Schema错误扣除的置信度
+_SCHEMA_ERROR_PENALTY = 0.1
+
+# LLMParser对这些类型只从原文提取front matter、标题和目录，不使用模型输出，升级只会多一次请求
+LOCAL_ONLY_TYPES = frozenset({"rule", "document"})
+
+
+def parse_structured(content: str, content_type: str) -> Dict[str, Any]:
+    """将YAML/JSON内容解析为结构化数据
+
+    Args:
+        content: 文本内容
+        content_type: 内容类型，如'roadmap'、'workflow'
+
+    Returns:
+        Dict[str, Any]: 解析结果，格式与LLMParser的结构化结果一致
+    """
+    try:
+        data = json.loads(content) if content.lstrip().startswith("{") else yaml.safe_load(content)
+    except (ValueError, yaml.YAMLError) as e:
+        return {"success": False, "error": f"结构化解析失败: {str(e)}", "content_type": content_type}
+    if not isinstance(data, dict):
+        return {"success": False, "error": "内容不是对象结构", "content_type": content_type}
+    return {"success": True, "content_type": content_type, "content": data}
+
+
+def _schema_confidence(schema_name: str, data: Any) -> float:
+    """按Schema错误数量计算置信度"""
+    _, errors = get_schema_registry().validate(schema_name, data)
+    return max(0.0, 1.0 - _SCHEMA_ERROR_PENALTY * len(errors))
+
+
+def _score_rule(result: Dict[str, Any]) -> float:
+    front_matter = result.get("front_matter") or {}
+    checks = [
+        # 规则的适用说明
+        (0.4, bool(front_matter.get("description"))),
+        # 规则的适用范围
+        (0.2, any(key in front_matter for key in ("globs", "alwaysApply", "type"))),
+        # 正文结构
+        (0.2, bool(result.get("title") or result.get("sections"))),
+    ]
+    record = {
+        "id": front_matter.get("id") or result.get("title"),
+        "name": front_matter.get("title") or result.get("title"),
+        "type": front_matter.get("type"),
+        "description": front_matter.get("description"),
+        "content": result.get("content"),
+    }
+    record = {key: value for key, value in record.items() if value}
+    checks.append((0.2, get_schema_registry().validate("rule", record)[0]))
+    return sum(weight for weight, passed in checks if passed)
+
+
+def _score_document(result: Dict[str, Any]) -> float:
+    headings = (result.get("structure") or {}).get("headings") or []
+    checks = [
+        (0.5, bool(result.get("title"))),
+        (0.3, len(headings) > 1),
+        (0.2, bool((result.get("content") or "").strip())),
+    ]
+    return sum(weight for weight, passed in checks if passed)
+
+
+def _score_roadmap(result: Dict[str, Any]) -> float:
+    data = result.get("content")
+    # milestone等非标准结构需要LLM转换为epic-story-task
+    if not isinstance(data, dict) or not isinstance(data.get("epics"), list) or not data["epics"]:
+        return 0.0
+    return _schema_confidence("roadmap", data)
+
+
+def _score_workflow(result: Dict[str, Any]) -> float:
+    data = result.get("content")
+    if not isinstance(data, dict) or not data.get("stages"):
+        return 0.0
+    return _schema_confidence("workflow", data)
+
+
+_SCORERS: Dict[str, Callable[[Dict[str, Any]], float]] = {
+    "rule": _score_rule,
+    "document": _score_document,
+    "roadmap": _score_roadmap,
+    "workflow": _score_workflow,
+}
+
+
+def score_confidence(result: Dict[str, Any], content_type: str) -> float:
+    """评估本地解析结果相对目标结构的置信度
+
+    Args:
+        result: 正则或结构化解析器的结果
+        content_type: 内容类型
+
+    Returns:
+        float: 0到1之间的置信度，无专门评分规则的类型只要解析成功即为1
+    """
+    if not result or not result.get("success"):
+        return 0.0
+    scorer = _SCORERS.get(content_type)
+    return round(scorer(result), 3) if scorer else 1.0
+
+
+class TieredParser(BaseParser):
+    """
+    分层解析器
+
+    本地解析结果置信度达到阈值时直接返回，否则升级到LLM解析。
+    规则和文档始终使用本地结果；LLM不可用或解析失败时保留本地结果。
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        初始化分层解析器
+
+        Args:
+            config: 配置参数，可包含provider、confidence_threshold以及LLM批量解析参数
+        """
+        super().__init__(config)
+
+        self.config = config or {}
+        default_threshold = get_config().get("content_parsing.confidence_threshold", DEFAULT_CONFIDENCE_THRESHOLD)
+        self.threshold = float(self.config.get("confidence_threshold", default_threshold))
+        self.regex_parser = RegexParser(self.config)
+        self._llm_parser = None
+        self.stats = {"local": 0, "escalated": 0, "escalation_failed": 0}
+
+    @property
+    def llm_parser(self):
+        """按需创建LLM解析器，只有需要升级时才初始化LLM服务"""
+        if self._llm_parser is None:
+            from src.parsing.parsers.llm_parser import LLMParser
+
+            self._llm_parser = LLMParser({**self.config, "provider": self.config.get("provider", "openai")})
+        return self._llm_parser
+
+    def parse_local(self, content: str, content_type: Optional[str] = None) -> Dict[str, Any]:
+        """只使用本地解析器解析并评估置信度
+
+        Args:
+            content: 待解析的文本内容
+            content_type: 内容类型
+
+        Returns:
+            Dict[str, Any]: 解析结果，附带confidence和parsed_by字段
+        """
+        content_type = content_type or "generic"
+        if content_type in STRUCTURED_TYPES:
+            result = parse_structured(content, content_type)
+            result["parsed_by"] = "structured"
+        else:
+            result = self.regex_parser.parse_text(content, content_type)
+            result["parsed_by"] = "regex"
+        result["confidence"] = score_confidence(result, content_type)
+        return result
+
+    def needs_escalation(self, result: Dict[str, Any], content_type: Optional[str] = None) -> bool:
+        """判断本地结果是否需要升级到LLM（LLM无法改进的类型不升级）"""
+        if (content_type or result.get("content_type")) in LOCAL_ONLY_TYPES:
+            return False
+        return result.get("confidence", 0.0) < self.threshold
+
+    async def parse_text(self, content: str, content_type: Optional[str] = None) -> Dict[str, Any]:
+        """
+        分层解析文本内容
+
+        Args:
+            content: 待解析的文本内容
+            content_type: 内容类型，如'rule'、'document'等
+
+        Returns:
+            解析结果
+        """
+        return (await self.parse_many([content], content_type))[0]
+
+    async def parse_many(self, contents: Sequence[str], content_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        批量分层解析
+
+        先全部本地解析，再把低置信度的内容通过LLMParser.parse_batch打包交给LLM
+
+        Args:
+            contents: 文本内容列表
+            content_type: 内容类型
+
+        Returns:
+            List[Dict[str, Any]]: 与contents顺序一致的解析结果
+        """
+        results = [self.parse_local(content, content_type) for content in contents]
+        pending = [index for index, result in enumerate(results) if self.needs_escalation(result, content_type)]
+        self.stats["local"] += len(results) - len(pending)
+        if not pending:
+            return results
+
+        logger.info(f"{len(pending)}/{len(results)} 个内容置信度低于 {self.threshold}，升级到LLM解析")
+        try:
+            llm_parser = self.llm_parser
+        except Exception as e:
+            logger.warning(f"LLM解析器不可用，保留本地解析结果: {str(e)}")
+            self.stats["escalation_failed"] += len(pending)
+            return results
+
+        try:
+            llm_results = await llm_parser.parse_batch([contents[index] for index in pending], content_type)
+        except Exception as e:
+            logger.warning(f"LLM批量解析失败，保留本地解析结果: {str(e)}")
+            self.stats["escalation_failed"] += len(pending)
+            return results
+
+        for index, llm_result in zip(pending, llm_results):
+            if not llm_result or not llm_result.get("success"):
+                logger.warning(f"LLM解析失败，保留本地解析结果: {(llm_result or {}).get('error')}")
+                self.stats["escalation_failed"] += 1
+                continue
+            llm_result["parsed_by"] = "llm"
+            llm_result["local_confidence"] = results[index]["confidence"]
+            results[index] = llm_result
+            self.stats["escalated"] += 1
+        return results
+
+    async def parse_files(self, file_paths: Sequence[str], content_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        批量分层解析文件
+
+        Args:
+            file_paths: 文件路径列表
+            content_type: 内容类型，为None时按扩展名检测
+
+        Returns:
+            List[Dict[str, Any]]: 与file_paths顺序一致的解析结果
+        """
+        groups: Dict[str, List[int]] = {}
+        contents = []
+        for index, file_path in enumerate(file_paths):
+            with open(file_path, "r", encoding="utf-8") as f:
+                contents.append(f.read())
+            groups.setdefault(content_type or self._detect_content_type(file_path), []).append(index)
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(file_paths)
+        for group_type, indexes in groups.items():
+            for index, result in zip(indexes, await self.parse_many([contents[i] for i in indexes], group_type)):
+                file_path = file_paths[index]
+                result["_file_info"] = {
+                    "path": file_path,
+                    "name": os.path.basename(file_path),
+                    "extension": os.path.splitext(file_path)[1],
+                    "directory": os.path.dirname(file_path),
+                }
+                results[index] = result
+        return results
+
+    def parse(self, content: str, content_type: Optional[str] = None) -> Dict[str, Any]:
+        """
+        同步方法，分层解析文本内容
+
+        Args:
+            content: 待解析的文本内容
+            content_type: 内容类型
+
+        Returns:
+            解析结果
+        """
+        result = self.parse_local(content, content_type)
+        if not self.needs_escalation(result):
+            self.stats["local"] += 1
+            return result
+
+        try:
+            llm_result = self.llm_parser.parse(content, content_type)
+        except Exception as e:
+            llm_result = {"success": False, "error": str(e)}
+        if not llm_result.get("success"):
+            logger.warning(f"LLM解析失败，保留本地解析结果: {llm_result.get('error')}")
+            self.stats["escalation_failed"] += 1
+            return result
+        llm_result["parsed_by"] = "llm"
+        llm_result["local_confidence"] = result["confidence"]
+        self.stats["escalated"] += 1
+        return llm_result
@@ -15,7 +15,11 @@ from typing import Any, Dict, Optional, Tuple
 
 import yaml
 
+from src.core.config import get_config
+from src.llm.runtime import run_sync
 from src.llm.service_factory import create_llm_service
+from src.parsing.parsers.streaming import StreamAbortError, stream_completion, supports_streaming
+from src.parsing.parsers.tiered_parser import DEFAULT_CONFIDENCE_THRESHOLD, parse_structured, score_confidence
 from src.validation.roadmap_validation import RoadmapValidator
 
 logger = logging.getLogger(__name__)
@@ -26,13 +30,14 @@ TEMP_ROOT = os.path.join(PROJECT_ROOT, "temp")
 
 
 class RoadmapProcessor:
-    """路线图数据处理器 - 仅使用LLM解析"""
+    """路线图数据处理器 - 结构良好的内容本地解析，其余使用LLM解析"""
 
     def __init__(self):
         """初始化路线图处理器"""
-        # 创建LLM服务实例
-        config = {"provider": "openai", "format": "yaml", "content_type": "roadmap"}
-        self.llm_service = create_llm_service("openai", config)
+        # LLM服务在首次需要时创建
+        self._llm_service = None
+        self.confidence_threshold = float(get_config().get("content_parsing.confidence_threshold", DEFAULT_CONFIDENCE_THRESHOLD))
+        self.stream = bool(get_config().get("content_parsing.stream", True))
 
         # 初始化验证器
         try:
@@ -73,6 +78,38 @@ class RoadmapProcessor:
 8. 将结果以JSON格式返回，不要包含任何解释性文本
 9. 确保输出的JSON格式完全符合要求的结构"""
 
+    @property
+    def llm_service(self):
+        """按需创建LLM服务实例"""
+        if self._llm_service is None:
+            config = {"provider": "openai", "format": "yaml", "content_type": "roadmap"}
+            self._llm_service = create_llm_service("openai", config)
+        return self._llm_service
+
+    def parse_local(self, content: str) -> Optional[Dict[str, Any]]:
+        """本地解析已是epic-story-task结构的路线图
+
+        Args:
+            content: 路线图YAML/JSON内容
+
+        Returns:
+            Optional[Dict[str, Any]]: 置信度达到阈值时返回处理后的数据，否则返回None
+        """
+        result = parse_structured(content, "roadmap")
+        if not result["success"]:
+            return None
+
+        data = self.fix_priority_format(self.fix_field_mapping(result["content"]))
+        confidence = score_confidence(result, "roadmap")
+        if confidence < self.confidence_threshold:
+            logger.info(f"路线图本地解析置信度 {confidence} 低于阈值 {self.confidence_threshold}，使用LLM解析")
+            return None
+
+        if "metadata" not in data:
+            data["metadata"] = {"title": data.get("title", "路线图"), "version": "1.0", "description": data.get("description", "")}
+        logger.info(f"✅ 路线图结构完整，本地解析（置信度 {confidence}）")
+        return self.fix_empty_status(data)
+
     def get_temp_file(self, filename: str) -> str:
         """获取临时文件路径"""
         if not self._timestamp_dir:
@@ -85,7 +122,11 @@ class RoadmapProcessor:
         return os.path.join(self._timestamp_dir, filename)
 
     async def parse_roadmap(self, content: str) -> Dict[str, Any]:
-        """使用LLM解析路线图内容"""
+        """解析路线图内容，本地解析置信度不足时使用LLM"""
+        local_data = self.parse_local(content)
+        if local_data is not None:
+            return local_data
+
         # 保存原始内容用于调试
         debug_file = self.get_temp_file("original_yaml_content.yaml")
         try:
@@ -125,16 +166,20 @@ class RoadmapProcessor:
         # 调用LLM服务
         try:
             logger.info("🚀 开始调用LLM服务...")
-            response = await self.llm_service.chat_completion(messages)
-            logger.info("✅ LLM服务调用成功")
-
-            # 处理响应
-            if hasattr(response, "choices") and hasattr(response.choices[0], "message"):
-                # OpenAI API的原生对象格式
-                result_text = response.choices[0].message.content
+            if self.stream and supports_streaming(self.llm_service):
+                # 边接收边检查结构，确定不符合路线图结构时提前终止
+                result_text = await stream_completion(self.llm_service, messages, "roadmap")
             else:
-                # 字典格式的响应
-                result_text = response["choices"][0]["message"]["content"]
+                response = await self.llm_service.chat_completion(messages)
+
+                # 处理响应
+                if hasattr(response, "choices") and hasattr(response.choices[0], "message"):
+                    # OpenAI API的原生对象格式
+                    result_text = response.choices[0].message.content
+                else:
+                    # 字典格式的响应
+                    result_text = response["choices"][0]["message"]["content"]
+            logger.info("✅ LLM服务调用成功")
 
             # 保存LLM完整原始响应以便调试
             raw_response_file = self.get_temp_file("llm_response_result.json")
@@ -183,6 +228,15 @@ class RoadmapProcessor:
                 logger.warning(f"⚠️ LLM解析成功但验证失败: {len(errors)}个错误, {len(warnings)}个警告")
                 return processed_data
 
+        except StreamAbortError as e:
+            partial_file = self.get_temp_file("llm_response_aborted.txt")
+            try:
+                with open(partial_file, "w", encoding="utf-8") as f:
+                    f.write(e.text)
+                logger.info(f"📝 已保存终止前的LLM响应到: {partial_file}")
+            except Exception as write_err:
+                logger.warning(f"⚠️ 无法保存终止前的LLM响应: {str(write_err)}")
+            return self._generate_error_result(f"LLM响应不符合路线图结构，已提前终止: {str(e)}")
         except Exception as e:
             return self._handle_exception(e)
 
@@ -374,18 +428,8 @@ class RoadmapProcessor:
             with open(file_path, "r", encoding="utf-8") as f:
                 content = f.read()
 
-            # 获取或创建事件循环
-            try:
-                loop = asyncio.get_event_loop()
-            except RuntimeError:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-
-            # 使用事件循环运行异步函数
-            if loop.is_running():
-                result = loop.run_until_complete(self.parse_roadmap(content))
-            else:
-                result = asyncio.run(self.parse_roadmap(content))
+            # 协程在LLM运行时线程中执行，调用方是否已有事件循环都不影响
+            result = run_sync(self.parse_roadmap(content))
 
             logger.info("文件处理成功")
             return result
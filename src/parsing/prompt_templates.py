@@ -4,7 +4,7 @@
 提供各种内容类型的提示模板。
 """
 
-from typing import Dict
+from typing import Dict, Sequence
 
 # 提示模板字典
 _PROMPT_TEMPLATES = {
@@ -175,6 +175,22 @@ Input Data:
 """,
 }
 
+# 批量解析提示模板：多个文档打包到一次请求中
+_BATCH_PROMPT_TEMPLATE = """下面共有 {count} 个待解析的文档。每个文档以 <<<DOC id=编号>>> 开始，以 <<<END id=编号>>> 结束。
+请对每个文档分别独立完成以下任务（任务说明中的内容占位指每个文档自身的内容）：
+
+{instructions}
+
+只返回一个JSON对象，结构如下：
+{{"results": [{{"id": 文档编号, "result": 该文档按上述任务得到的JSON结果}}]}}
+results中每个文档对应一项，id与文档标记中的编号一致，不要遗漏文档，不要输出JSON以外的任何内容。
+
+{documents}
+"""
+
+# 批量提示中替代单个文档内容的占位说明
+BATCH_CONTENT_PLACEHOLDER = "（见下方各文档）"
+
 # 系统提示字典
 _SYSTEM_PROMPTS = {
     "workflow": """你是一个专业的工作流分析专家。你的任务是：
@@ -244,6 +260,36 @@ def get_prompt_template(content_type: str) -> str:
     return _PROMPT_TEMPLATES.get(content_type, _PROMPT_TEMPLATES["generic"])
 
 
+def format_batch_document(doc_id: int, content: str) -> str:
+    """
+    格式化批量提示中的单个文档
+
+    Args:
+        doc_id: 文档编号
+        content: 文档内容
+
+    Returns:
+        带分隔标记的文档文本
+    """
+    return f"<<<DOC id={doc_id}>>>\n{content}\n<<<END id={doc_id}>>>"
+
+
+def get_batch_prompt(content_type: str, contents: Sequence[str]) -> str:
+    """
+    生成批量解析提示
+
+    Args:
+        content_type: 内容类型，如'rule'、'document'等
+        contents: 文档内容列表，编号为其下标
+
+    Returns:
+        批量提示字符串
+    """
+    instructions = get_prompt_template(content_type).format(content=BATCH_CONTENT_PLACEHOLDER).strip()
+    documents = "\n\n".join(format_batch_document(doc_id, content) for doc_id, content in enumerate(contents))
+    return _BATCH_PROMPT_TEMPLATE.format(count=len(contents), instructions=instructions, documents=documents)
+
+
 def get_system_prompt(content_type: str) -> str:
     """
     获取指定内容类型的系统提示
@@ -4,6 +4,7 @@
 处理规则的数据库存储、检索和删除操作
 """
 
+import json
 import logging
 from typing import Any, Dict, List, Optional
 
@@ -27,7 +28,7 @@ class RuleDBOperations:
             session: 数据库会话，用于规则存储
         """
         self.session = session
-        self.rule_repository = RuleRepository(session) if session else None
+        self.rule_repository = RuleRepository() if session else None
         self._db_available = bool(session)
 
     def save_rule(self, rule: Rule, overwrite: bool = False) -> Optional[Rule]:
@@ -47,22 +48,22 @@ class RuleDBOperations:
 
         try:
             # 检查规则是否已存在
-            existing_rule = self.rule_repository.get_by_id(rule.id)
+            existing_rule = self.rule_repository.get_by_id(self.session, rule.id)
             if existing_rule and not overwrite:
                 logger.warning(f"规则已存在，未启用覆盖模式: {rule.id}")
                 return Rule.parse_obj(existing_rule.to_pydantic().dict())
 
             # 保存规则到数据库
             if existing_rule:
-                # 更新现有规则
-                updated_rule = self.rule_repository.update(rule.id, rule.dict(exclude={"items", "examples"}))
-                # 更新规则与其条目和示例的关联
-                self.rule_repository.update_rule_with_relations(
+                # 更新现有规则及其条目和示例的关联
+                updated_rule = self.rule_repository.update_rule_with_relations(
+                    self.session,
                     rule.id,
-                    rule.dict(exclude={"items", "examples"}),
+                    self._prepare_rule_data(rule),
                     [item.dict() for item in rule.items],
                     [example.dict() for example in rule.examples],
                 )
+                self.session.commit()
                 logger.info(f"规则更新成功: {rule.id}")
                 return Rule.parse_obj(updated_rule.to_pydantic().dict())
             else:
@@ -73,14 +74,17 @@ class RuleDBOperations:
                     items_data = [item.dict() for item in rule.items]
                     examples_data = [example.dict() for example in rule.examples]
 
-                    new_rule = self.rule_repository.create_rule(db_rule_data, items_data, examples_data)
+                    new_rule = self.rule_repository.create_rule(self.session, db_rule_data, items_data, examples_data)
+                    self.session.commit()
                     logger.info(f"规则创建成功: {rule.id}")
                     return Rule.parse_obj(new_rule.to_pydantic().dict())
                 except Exception as e:
+                    self.session.rollback()
                     logger.error(f"创建规则失败: {str(e)}")
                     # 由于无法存储到数据库，返回None
                     return None
         except SQLAlchemyError as e:
+            self.session.rollback()
             logger.error(f"数据库操作错误: {str(e)}")
             # 标记数据库不可用
             self._db_available = False
@@ -104,7 +108,7 @@ class RuleDBOperations:
             return None
 
         try:
-            rule_entity = self.rule_repository.get_by_id(rule_id)
+            rule_entity = self.rule_repository.get_by_id(self.session, rule_id)
             if not rule_entity:
                 logger.warning(f"规则不存在: {rule_id}")
                 return None
@@ -133,9 +137,9 @@ class RuleDBOperations:
         try:
             # 根据规则类型获取规则
             if rule_type:
-                rule_entities = self.rule_repository.get_by_type(rule_type)
+                rule_entities = self.rule_repository.get_by_type(self.session, rule_type)
             else:
-                rule_entities = self.rule_repository.get_all()
+                rule_entities = self.rule_repository.get_all(self.session)
 
             # 将数据库实体转换为Pydantic模型
             rules = []
@@ -166,13 +170,15 @@ class RuleDBOperations:
             return False
 
         try:
-            success = self.rule_repository.delete(rule_id)
+            success = self.rule_repository.delete(self.session, rule_id)
+            self.session.commit()
             if success:
                 logger.info(f"规则删除成功: {rule_id}")
             else:
                 logger.warning(f"规则删除失败: {rule_id}")
             return success
         except Exception as e:
+            self.session.rollback()
             logger.error(f"删除规则时出错: {str(e)}")
             return False
 
@@ -189,13 +195,13 @@ class RuleDBOperations:
         return {
             "id": rule.id,
             "name": rule.name,
-            "type": rule.type,
+            "type": getattr(rule.type, "value", rule.type),
             "description": rule.description,
             "content": rule.content,
-            "globs": rule.globs if rule.globs else [],
+            "globs": json.dumps(rule.globs or []),
             "always_apply": rule.always_apply,
             "author": rule.metadata.author if rule.metadata and rule.metadata.author else "系统",
             "version": rule.metadata.version if rule.metadata and rule.metadata.version else "1.0.0",
-            "tags": rule.metadata.tags if rule.metadata and rule.metadata.tags else [],
-            "dependencies": rule.metadata.dependencies if rule.metadata and rule.metadata.dependencies else [],
+            "tags": json.dumps(rule.metadata.tags if rule.metadata and rule.metadata.tags else []),
+            "dependencies": json.dumps(rule.metadata.dependencies if rule.metadata and rule.metadata.dependencies else []),
         }
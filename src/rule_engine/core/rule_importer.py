@@ -9,6 +9,7 @@ import logging
 from pathlib import Path
 from typing import Any, Dict, Optional, Union
 
+from src.llm.runtime import run_sync
 from src.models.rule_model import Rule
 from src.parsing.processors.rule_processor import RuleProcessor
 from src.rule_engine.exporters.rule_exporter import export_rule_to_yaml
@@ -35,7 +36,7 @@ def import_rule_from_file(file_path: str, parser_type: Optional[str] = None, mod
     logger.info(f"从文件导入规则: {file_path}")
 
     # 使用规则处理器解析文件
-    rule_dict = rule_processor.process_rule_file(file_path)
+    rule_dict = run_sync(rule_processor.process_rule_file(file_path))
 
     # 将字典转换为Pydantic模型
     rule = Rule(**rule_dict)
@@ -88,7 +89,7 @@ def import_rule_from_content(
     logger.info(f"从内容导入规则, 上下文: {context}")
 
     # 使用规则处理器解析内容
-    rule_dict = rule_processor.process_rule_text(content)
+    rule_dict = run_sync(rule_processor.process_rule_text(content))
 
     # 将字典转换为Pydantic模型
     rule = Rule(**rule_dict)
@@ -13,9 +13,13 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 
 try:
-    from jinja2 import Template
+    from jinja2 import Environment
+
+    from src.templates.core.template_cache import get_template_cache
 
     JINJA2_AVAILABLE = True
+    # 与 jinja2.Template(...) 默认配置一致的共享环境
+    _RULE_ENV = Environment()
 except ImportError:
     JINJA2_AVAILABLE = False
 
@@ -204,7 +208,7 @@ class RuleGenerator:
         # 尝试使用Jinja2，如果不可用则使用简单替换
         if JINJA2_AVAILABLE:
             try:
-                template = Template(template_content)
+                template = get_template_cache().get_template(_RULE_ENV, template_content)
                 return template.render(**variables)
             except Exception as e:
                 logger.warning(f"Jinja2渲染失败，回退到简单替换: {e}")
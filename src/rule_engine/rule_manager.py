@@ -10,10 +10,12 @@ from typing import Any, Dict, List, Optional, Union
 from sqlalchemy.exc import OperationalError, SQLAlchemyError
 from sqlalchemy.orm import Session
 
+from src.core.config import get_config
 from src.db import get_session_factory
 from src.models.rule_model import Example, Rule, RuleItem, RuleMetadata
 from src.rule_engine.core.rule_db_operations import RuleDBOperations
 from src.rule_engine.core.rule_importer import export_rule_to_format, import_rule_from_content, import_rule_from_file
+from src.utils.rule_index import RuleMatch, get_rule_index
 
 logger = logging.getLogger(__name__)
 
@@ -86,11 +88,13 @@ class RuleManager:
         # 如果数据库不可用，仅返回内存中的规则
         if not self._db_available or not self.db_ops:
             logger.info(f"数据库不可用，规则将仅在内存中使用: {rule.id}")
+            get_rule_index().upsert(rule)
             return rule
 
         # 保存规则到数据库
-        saved_rule = self.db_ops.save_rule(rule, overwrite)
-        return saved_rule if saved_rule else rule
+        saved_rule = self.db_ops.save_rule(rule, overwrite) or rule
+        get_rule_index().upsert(saved_rule)
+        return saved_rule
 
     def import_rule_from_content(
         self,
@@ -121,11 +125,13 @@ class RuleManager:
         # 如果数据库不可用，仅返回内存中的规则
         if not self._db_available or not self.db_ops:
             logger.info(f"数据库不可用，规则将仅在内存中使用: {rule.id}")
+            get_rule_index().upsert(rule)
             return rule
 
         # 保存规则到数据库
-        saved_rule = self.db_ops.save_rule(rule, overwrite)
-        return saved_rule if saved_rule else rule
+        saved_rule = self.db_ops.save_rule(rule, overwrite) or rule
+        get_rule_index().upsert(saved_rule)
+        return saved_rule
 
     def export_rule(self, rule_id: str, format_type: str = "yaml", output_path: Optional[str] = None) -> Union[str, Dict[str, Any]]:
         """
@@ -194,7 +200,33 @@ class RuleManager:
         """
         if self._db_available and self.db_ops:
             # 从数据库删除规则
-            return self.db_ops.delete_rule(rule_id)
+            deleted = self.db_ops.delete_rule(rule_id)
+            if deleted:
+                get_rule_index().remove(rule_id)
+            return deleted
         else:
             logger.warning(f"数据库不可用，无法删除规则: {rule_id}")
             return False
+
+    def find_applicable_rules(self, file_path: Optional[str] = None, context: Optional[str] = None, top_k: Optional[int] = None) -> List[RuleMatch]:
+        """
+        查找适用的规则
+
+        路径匹配使用内存中的glob索引；上下文匹配比较规则名称、描述与上下文的嵌入向量，
+        嵌入服务不可用时只返回路径匹配的结果
+
+        Args:
+            file_path: 当前文件路径
+            context: 当前任务或请求的描述
+            top_k: 语义匹配最多返回的规则数
+
+        Returns:
+            匹配结果列表，先是始终应用和glob匹配的规则，再是语义相近的规则
+        """
+        index = get_rule_index()
+        if self._db_available and self.db_ops and index.is_stale(float(get_config().get("rule_engine.index_refresh_interval", 60.0))):
+            try:
+                index.replace(self.db_ops.list_rules())
+            except Exception as e:
+                logger.warning(f"加载规则索引失败，使用已有索引: {str(e)}")
+        return index.match(file_path, context, top_k)
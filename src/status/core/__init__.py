@@ -4,9 +4,11 @@
 包含状态服务的核心组件和逻辑。
 """
 
+from src.status.core.event_bus import DeliveryMode, OverflowPolicy, StatusEventBus
 from src.status.core.health_calculator import HealthCalculator
 from src.status.core.project_state import ProjectState
 from src.status.core.provider_manager import ProviderManager
+from src.status.core.status_cache import StatusSnapshotCache
 from src.status.core.subscriber_manager import SubscriberManager
 
 __all__ = [
@@ -14,4 +16,8 @@ __all__ = [
     "SubscriberManager",
     "HealthCalculator",
     "ProjectState",
+    "StatusSnapshotCache",
+    "StatusEventBus",
+    "DeliveryMode",
+    "OverflowPolicy",
 ]
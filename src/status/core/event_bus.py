@@ -0,0 +1,433 @@
+"""
+状态事件总线模块
+
+为状态订阅者提供非阻塞分发：每个订阅者拥有独立的待处理队列，
+支持同步、线程池和asyncio三种投递方式，并对同一实体的突发事件进行合并。
+"""
+
+import asyncio
+import atexit
+import inspect
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class DeliveryMode(str, Enum):
+    """订阅者投递方式"""
+
+    SYNC = "sync"  # 在发布线程中直接调用
+    THREAD = "thread"  # 在线程池中调用
+    ASYNCIO = "asyncio"  # 在事件总线的事件循环线程中调用
+
+
+class OverflowPolicy(str, Enum):
+    """队列满时的处理策略"""
+
+    DROP_OLDEST = "drop_oldest"  # 丢弃最早的待处理事件
+    BLOCK = "block"  # 阻塞发布者直到队列有空位或超时
+
+
+@dataclass
+class StatusEvent:
+    """待投递的状态事件
+
+    Attributes:
+        key: 合并键，相同键的待处理事件会被合并
+        args: 传递给订阅者回调的位置参数
+        enqueued_at: 首次入队时间，用于计算投递延迟
+        coalesced: 被合并进该事件的后续事件数量
+    """
+
+    key: Hashable
+    args: Tuple[Any, ...]
+    enqueued_at: float = field(default_factory=time.monotonic)
+    coalesced: int = 0
+
+
+MergeFunc = Callable[[StatusEvent, StatusEvent], Tuple[Any, ...]]
+
+
+class SubscriberChannel:
+    """单个订阅者的投递通道
+
+    维护该订阅者的待处理队列和投递指标。同一通道内的事件按入队顺序串行投递，
+    不同通道之间互不阻塞。
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[..., Any],
+        mode: DeliveryMode,
+        bus: "StatusEventBus",
+        max_pending: int = 1000,
+        overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        coalesce: bool = True,
+        merge: Optional[MergeFunc] = None,
+    ):
+        self.name = name
+        self.handler = handler
+        self.mode = DeliveryMode(mode)
+        self.max_pending = max(1, max_pending)
+        self.overflow = OverflowPolicy(overflow)
+        self.coalesce = coalesce
+        self._merge = merge
+        self._bus = bus
+        self._pending: "OrderedDict[Hashable, StatusEvent]" = OrderedDict()
+        self._cond = threading.Condition()
+        self._scheduled = False
+        self._closed = False
+        self._seq = 0
+
+        # 投递指标
+        self.delivered = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.errors = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+        self._latency_last = 0.0
+
+    def put(self, event: StatusEvent, timeout: Optional[float] = None) -> bool:
+        """投递事件到通道
+
+        Args:
+            event: 状态事件
+            timeout: BLOCK 策略下等待队列空位的最长时间（秒）
+
+        Returns:
+            bool: 事件是否被接受（合并也视为接受）
+        """
+        if self._closed:
+            return False
+
+        if self.mode == DeliveryMode.SYNC:
+            self._deliver(event)
+            return True
+
+        with self._cond:
+            if self.coalesce and event.key in self._pending:
+                existing = self._pending[event.key]
+                if self._merge:
+                    existing.args = self._merge(existing, event)
+                else:
+                    existing.args = event.args
+                existing.coalesced += 1
+                self.coalesced += 1
+                return True
+
+            if len(self._pending) >= self.max_pending:
+                if self.overflow == OverflowPolicy.BLOCK:
+                    deadline = None if timeout is None else time.monotonic() + timeout
+                    while len(self._pending) >= self.max_pending and not self._closed:
+                        remaining = None if deadline is None else deadline - time.monotonic()
+                        if remaining is not None and remaining <= 0:
+                            self.dropped += 1
+                            logger.warning(f"订阅者 {self.name} 队列已满，事件被丢弃")
+                            return False
+                        self._cond.wait(remaining)
+                else:
+                    self._pending.popitem(last=False)
+                    self.dropped += 1
+                    logger.warning(f"订阅者 {self.name} 队列已满，丢弃最早的事件")
+
+            key = event.key if self.coalesce else (event.key, self._next_seq())
+            self._pending[key] = event
+            need_schedule = not self._scheduled
+            self._scheduled = True
+
+        if need_schedule:
+            self._bus._schedule(self)
+        return True
+
+    def _next_seq(self) -> int:
+        self._seq += 1
+        return self._seq
+
+    def _pop(self) -> Optional[StatusEvent]:
+        """取出下一个待处理事件，队列为空时标记通道空闲"""
+        with self._cond:
+            if not self._pending:
+                self._scheduled = False
+                self._cond.notify_all()
+                return None
+            _, event = self._pending.popitem(last=False)
+            self._cond.notify_all()
+            return event
+
+    def drain(self) -> None:
+        """在工作线程中串行投递所有待处理事件"""
+        while True:
+            event = self._pop()
+            if event is None:
+                return
+            self._deliver(event)
+
+    async def drain_async(self) -> None:
+        """在事件循环中串行投递所有待处理事件"""
+        loop = asyncio.get_running_loop()
+        while True:
+            event = self._pop()
+            if event is None:
+                return
+            try:
+                if inspect.iscoroutinefunction(self.handler):
+                    await self.handler(*event.args)
+                else:
+                    await loop.run_in_executor(None, self.handler, *event.args)
+                self._record_success(event)
+            except Exception as e:
+                self._record_error(e)
+
+    def _deliver(self, event: StatusEvent) -> None:
+        try:
+            result = self.handler(*event.args)
+            if inspect.isawaitable(result):
+                self._bus.run_coroutine(result)
+            self._record_success(event)
+        except Exception as e:
+            self._record_error(e)
+
+    def _record_success(self, event: StatusEvent) -> None:
+        latency = time.monotonic() - event.enqueued_at
+        with self._cond:
+            self.delivered += 1
+            self._latency_total += latency
+            self._latency_last = latency
+            self._latency_max = max(self._latency_max, latency)
+
+    def _record_error(self, error: Exception) -> None:
+        with self._cond:
+            self.errors += 1
+        logger.error(f"通知订阅者 {self.name} 状态变更时出错: {error}")
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """等待通道处理完所有待处理事件
+
+        Args:
+            timeout: 最长等待时间（秒）
+
+        Returns:
+            bool: 是否在超时前处理完毕
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._scheduled:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self) -> None:
+        """关闭通道，丢弃后续事件"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """获取通道投递指标
+
+        Returns:
+            Dict[str, Any]: 队列深度、投递数、合并数、丢弃数、错误数和延迟（毫秒）
+        """
+        with self._cond:
+            avg = self._latency_total / self.delivered if self.delivered else 0.0
+            return {
+                "mode": self.mode.value,
+                "pending": len(self._pending),
+                "delivered": self.delivered,
+                "coalesced": self.coalesced,
+                "dropped": self.dropped,
+                "errors": self.errors,
+                "latency_avg_ms": round(avg * 1000, 3),
+                "latency_max_ms": round(self._latency_max * 1000, 3),
+                "latency_last_ms": round(self._latency_last * 1000, 3),
+            }
+
+
+class StatusEventBus:
+    """状态事件总线
+
+    管理所有订阅者通道，负责把通道调度到线程池或事件循环线程上执行。
+    """
+
+    def __init__(
+        self,
+        default_mode: DeliveryMode = DeliveryMode.THREAD,
+        max_workers: int = 4,
+        max_pending: int = 1000,
+        overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+    ):
+        """初始化事件总线
+
+        Args:
+            default_mode: 未指定投递方式时使用的默认方式
+            max_workers: 线程池投递的最大线程数
+            max_pending: 每个订阅者的最大待处理事件数
+            overflow: 队列满时的处理策略
+        """
+        self.default_mode = DeliveryMode(default_mode)
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max_pending
+        self.overflow = OverflowPolicy(overflow)
+        self._channels: Dict[str, SubscriberChannel] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        atexit.register(self.shutdown)
+
+    def add_channel(
+        self,
+        name: str,
+        handler: Callable[..., Any],
+        mode: Optional[DeliveryMode] = None,
+        coalesce: bool = True,
+        merge: Optional[MergeFunc] = None,
+        max_pending: Optional[int] = None,
+    ) -> SubscriberChannel:
+        """为订阅者创建投递通道
+
+        Args:
+            name: 通道名称（唯一）
+            handler: 订阅者回调
+            mode: 投递方式，默认使用总线的默认方式
+            coalesce: 是否合并同一键的待处理事件
+            merge: 自定义合并函数，返回合并后的回调参数
+            max_pending: 最大待处理事件数，默认使用总线配置
+
+        Returns:
+            SubscriberChannel: 新建的通道
+        """
+        channel = SubscriberChannel(
+            name,
+            handler,
+            mode or self.default_mode,
+            self,
+            max_pending=max_pending or self.max_pending,
+            overflow=self.overflow,
+            coalesce=coalesce,
+            merge=merge,
+        )
+        with self._lock:
+            old = self._channels.pop(name, None)
+            self._channels[name] = channel
+        if old:
+            old.close()
+        return channel
+
+    def remove_channel(self, name: str) -> bool:
+        """移除投递通道
+
+        Args:
+            name: 通道名称
+
+        Returns:
+            bool: 是否移除成功
+        """
+        with self._lock:
+            channel = self._channels.pop(name, None)
+        if channel:
+            channel.close()
+            return True
+        return False
+
+    def publish(self, name: str, event: StatusEvent) -> bool:
+        """向指定通道发布事件
+
+        Args:
+            name: 通道名称
+            event: 状态事件
+
+        Returns:
+            bool: 事件是否被接受
+        """
+        with self._lock:
+            channel = self._channels.get(name)
+        if channel is None:
+            logger.warning(f"未找到订阅者通道: {name}")
+            return False
+        return channel.put(event)
+
+    def _schedule(self, channel: SubscriberChannel) -> None:
+        """调度通道的排空任务"""
+        try:
+            if channel.mode == DeliveryMode.ASYNCIO:
+                asyncio.run_coroutine_threadsafe(channel.drain_async(), self._ensure_loop())
+            else:
+                self._ensure_executor().submit(channel.drain)
+        except RuntimeError as e:
+            # 解释器退出阶段无法再提交任务，退化为同步投递
+            logger.debug(f"无法调度订阅者 {channel.name}，改为同步投递: {e}")
+            channel.drain()
+
+    def _ensure_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="status-dispatch")
+            return self._executor
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(target=self._loop.run_forever, name="status-dispatch-loop", daemon=True)
+                self._loop_thread.start()
+            return self._loop
+
+    def run_coroutine(self, coro) -> None:
+        """在总线事件循环上执行同步投递中返回的协程"""
+        asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """等待所有通道处理完待处理事件
+
+        Args:
+            timeout: 最长等待时间（秒）
+
+        Returns:
+            bool: 是否全部处理完毕
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            channels = list(self._channels.values())
+        for channel in channels:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not channel.wait_idle(remaining):
+                return False
+        return True
+
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """获取所有通道的投递指标
+
+        Returns:
+            Dict[str, Dict[str, Any]]: 通道名称到指标的映射
+        """
+        with self._lock:
+            channels = list(self._channels.items())
+        return {name: channel.get_metrics() for name, channel in channels}
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """关闭事件总线，尽量投递完剩余事件
+
+        Args:
+            timeout: 等待剩余事件投递的最长时间（秒）
+        """
+        if not self.flush(timeout):
+            logger.warning("状态事件总线关闭时仍有未投递的事件")
+        with self._lock:
+            executor, self._executor = self._executor, None
+            loop, self._loop = self._loop, None
+        if executor:
+            executor.shutdown(wait=False)
+        if loop:
+            loop.call_soon_threadsafe(loop.stop)
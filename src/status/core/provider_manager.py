@@ -5,8 +5,10 @@
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Callable, Dict, List, Optional, Set, Union
 
+from src.status.core.status_cache import StatusSnapshotCache
 from src.status.interfaces import IStatusProvider
 
 logger = logging.getLogger(__name__)
@@ -89,9 +91,16 @@ class ProviderManager:
     管理状态提供者的注册和获取。
     """
 
-    def __init__(self):
-        """初始化提供者管理器"""
+    def __init__(self, snapshot_cache: Optional[StatusSnapshotCache] = None, max_workers: int = 4):
+        """初始化提供者管理器
+
+        Args:
+            snapshot_cache: 可选的状态快照缓存，不提供时每次都重新计算
+            max_workers: 并行计算过期领域状态时的最大线程数
+        """
         self._providers: Dict[str, IStatusProvider] = {}
+        self.snapshot_cache = snapshot_cache
+        self.max_workers = max(1, max_workers)
 
     def register_provider(self, domain: str, provider: Union[IStatusProvider, Callable[[], Any]]) -> None:
         """注册状态提供者
@@ -123,6 +132,8 @@ class ProviderManager:
         """
         if domain in self._providers:
             del self._providers[domain]
+            if self.snapshot_cache:
+                self.snapshot_cache.invalidate(domain)
             logger.info(f"已注销状态提供者: {domain}")
             return True
         return False
@@ -138,34 +149,88 @@ class ProviderManager:
         """
         return domain in self._providers
 
-    def get_status(self, domain: str) -> Optional[Any]:
+    def get_status(self, domain: str, use_cache: bool = True) -> Optional[Any]:
         """获取指定领域的状态
 
         Args:
             domain: 领域名称
+            use_cache: 是否允许使用快照缓存
 
         Returns:
             状态数据或None（如果不存在）
         """
         provider = self._providers.get(domain)
-        if provider:
-            return provider.get_status()
-        return None
+        if not provider:
+            return None
+
+        if use_cache and self.snapshot_cache:
+            hit, status = self.snapshot_cache.get(domain)
+            if hit:
+                return status
+
+        status = provider.get_status()
+        if self.snapshot_cache:
+            self.snapshot_cache.set(domain, status)
+        return status
 
-    def get_all_status(self) -> Dict[str, Any]:
+    def get_all_status(self, use_cache: bool = True) -> Dict[str, Any]:
         """获取所有领域的状态
 
+        未过期的领域直接读取快照，过期的领域并行重新计算。
+
+        Args:
+            use_cache: 是否允许使用快照缓存
+
         Returns:
             领域名称到状态数据的映射
         """
+        domains = list(self._providers.keys())
         result = {}
-        for domain, provider in self._providers.items():
-            try:
-                result[domain] = provider.get_status()
-            except Exception as e:
-                logger.error(f"获取领域 '{domain}' 状态时出错: {e}")
-                result[domain] = {"error": str(e), "domain": domain}
-        return result
+
+        if use_cache and self.snapshot_cache:
+            stale = set(self.snapshot_cache.stale_domains(domains))
+            for domain in domains:
+                if domain not in stale:
+                    hit, status = self.snapshot_cache.get(domain)
+                    if hit:
+                        result[domain] = status
+                    else:
+                        stale.add(domain)
+        else:
+            stale = set(domains)
+
+        to_compute = [d for d in domains if d in stale]
+        if len(to_compute) > 1 and self.max_workers > 1:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(to_compute)), thread_name_prefix="status-provider") as executor:
+                computed = dict(zip(to_compute, executor.map(self._compute_status, to_compute)))
+        else:
+            computed = {domain: self._compute_status(domain) for domain in to_compute}
+
+        result.update(computed)
+        # 保持领域注册顺序
+        return {domain: result[domain] for domain in domains if domain in result}
+
+    def _compute_status(self, domain: str) -> Any:
+        """调用提供者计算领域状态并写入快照
+
+        Args:
+            domain: 领域名称
+
+        Returns:
+            状态数据，出错时返回错误信息
+        """
+        provider = self._providers.get(domain)
+        if provider is None:
+            return {"error": "提供者已注销", "domain": domain}
+        try:
+            status = provider.get_status()
+        except Exception as e:
+            logger.error(f"获取领域 '{domain}' 状态时出错: {e}")
+            return {"error": str(e), "domain": domain}
+
+        if self.snapshot_cache:
+            self.snapshot_cache.set(domain, status)
+        return status
 
     def get_domains(self) -> List[str]:
         """获取所有可用的领域名称
@@ -0,0 +1,131 @@
+"""
+状态快照缓存模块
+
+按领域缓存状态提供者的概览结果，支持TTL过期和基于状态变更事件的主动失效。
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.status.interfaces import IStatusSubscriber
+
+logger = logging.getLogger(__name__)
+
+
+class StatusSnapshotCache(IStatusSubscriber):
+    """状态快照缓存
+
+    保存每个领域最近一次计算出的状态概览。作为订阅者注册到 SubscriberManager 后，
+    任何领域的状态变更都会使该领域的快照立即失效，其余领域继续命中缓存。
+    """
+
+    def __init__(self, ttl: float = 5.0):
+        """初始化快照缓存
+
+        Args:
+            ttl: 快照有效期（秒），小于等于0时禁用缓存
+        """
+        self.ttl = ttl
+        self._snapshots: Dict[str, Tuple[float, Any]] = {}
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        """缓存是否启用"""
+        return self.ttl > 0
+
+    def get(self, domain: str) -> Tuple[bool, Any]:
+        """读取领域快照
+
+        Args:
+            domain: 领域名称
+
+        Returns:
+            Tuple[bool, Any]: (是否命中, 快照数据)
+        """
+        if not self.enabled:
+            return False, None
+
+        with self._lock:
+            entry = self._snapshots.get(domain)
+            if entry is None or time.monotonic() - entry[0] > self.ttl:
+                self.misses += 1
+                return False, None
+            self.hits += 1
+            return True, _copy_snapshot(entry[1])
+
+    def set(self, domain: str, status: Any) -> None:
+        """写入领域快照
+
+        出错的状态（包含error字段）不缓存，下次读取时重新计算。
+
+        Args:
+            domain: 领域名称
+            status: 状态数据
+        """
+        if not self.enabled:
+            return
+        if isinstance(status, dict) and "error" in status:
+            return
+
+        with self._lock:
+            self._snapshots[domain] = (time.monotonic(), _copy_snapshot(status))
+
+    def stale_domains(self, domains: Iterable[str]) -> List[str]:
+        """筛选快照缺失或已过期的领域
+
+        Args:
+            domains: 待检查的领域名称
+
+        Returns:
+            List[str]: 需要重新计算的领域
+        """
+        if not self.enabled:
+            return list(domains)
+
+        now = time.monotonic()
+        with self._lock:
+            return [d for d in domains if d not in self._snapshots or now - self._snapshots[d][0] > self.ttl]
+
+    def invalidate(self, domain: Optional[str] = None) -> None:
+        """使快照失效
+
+        Args:
+            domain: 领域名称，为None时清空所有快照
+        """
+        with self._lock:
+            if domain is None:
+                self._snapshots.clear()
+            else:
+                self._snapshots.pop(domain, None)
+        logger.debug(f"状态快照已失效: {domain or '全部'}")
+
+    def on_status_changed(self, domain: str, entity_id: str, old_status: str, new_status: str, data: Dict[str, Any]) -> None:
+        """状态变更时使对应领域的快照失效"""
+        self.invalidate(domain)
+
+    def on_status_broadcast(self, status_type: str, status: Any) -> None:
+        """函数式订阅回调，用于 health/project_state 等广播频道"""
+        self.invalidate(status_type)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计信息
+
+        Returns:
+            Dict[str, Any]: 命中次数、未命中次数和当前缓存的领域
+        """
+        with self._lock:
+            return {"ttl": self.ttl, "hits": self.hits, "misses": self.misses, "domains": list(self._snapshots.keys())}
+
+
+def _copy_snapshot(status: Any) -> Any:
+    """浅拷贝快照，避免调用方修改缓存中的数据"""
+    if isinstance(status, dict):
+        return dict(status)
+    if isinstance(status, list):
+        return list(status)
+    return status
@@ -8,6 +8,7 @@ import logging
 import uuid
 from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
+from src.status.core.event_bus import DeliveryMode, StatusEvent, StatusEventBus
 from src.status.interfaces import IStatusSubscriber
 
 logger = logging.getLogger(__name__)
@@ -16,37 +17,49 @@ logger = logging.getLogger(__name__)
 class SubscriberManager:
     """状态订阅者管理器
 
-    管理状态订阅者的注册和通知。
+    管理状态订阅者的注册和通知。提供事件总线时，订阅者通过各自的队列异步投递，
+    状态写入无需等待订阅者处理完成。
     """
 
-    def __init__(self):
-        """初始化订阅者管理器"""
+    def __init__(self, event_bus: Optional[StatusEventBus] = None):
+        """初始化订阅者管理器
+
+        Args:
+            event_bus: 可选的状态事件总线，不提供时在调用线程中直接通知订阅者
+        """
         # 存储状态订阅者
         self._subscribers: List[IStatusSubscriber] = []
         # 存储函数式订阅者 {subscription_id: (status_type, callback)}
         self._function_subscribers: Dict[str, Tuple[str, Callable[[str, Any], None]]] = {}
+        self.event_bus = event_bus
 
-    def register_subscriber(self, subscriber: IStatusSubscriber) -> None:
+    def register_subscriber(self, subscriber: IStatusSubscriber, delivery_mode: Optional[DeliveryMode] = None) -> None:
         """注册状态订阅者
 
         Args:
             subscriber: 状态订阅者
+            delivery_mode: 投递方式，默认使用事件总线的默认方式
         """
         self._subscribers.append(subscriber)
+        if self.event_bus:
+            self.event_bus.add_channel(_subscriber_channel_name(subscriber), subscriber.on_status_changed, delivery_mode, merge=_merge_status_change)
         logger.info(f"已注册状态订阅者: {subscriber.__class__.__name__}")
 
-    def subscribe(self, status_type: str, callback: Callable[[str, Any], None]) -> str:
+    def subscribe(self, status_type: str, callback: Callable[[str, Any], None], delivery_mode: Optional[DeliveryMode] = None) -> str:
         """订阅状态更新
 
         Args:
             status_type: 状态类型
             callback: 回调函数，接收status_type和status两个参数
+            delivery_mode: 投递方式，默认使用事件总线的默认方式
 
         Returns:
             str: 订阅ID
         """
         subscription_id = str(uuid.uuid4())
         self._function_subscribers[subscription_id] = (status_type, callback)
+        if self.event_bus:
+            self.event_bus.add_channel(subscription_id, callback, delivery_mode)
         logger.debug(f"已订阅状态更新: {status_type}, ID: {subscription_id}")
         return subscription_id
 
@@ -61,6 +74,8 @@ class SubscriberManager:
         """
         if subscription_id in self._function_subscribers:
             status_type, _ = self._function_subscribers.pop(subscription_id)
+            if self.event_bus:
+                self.event_bus.remove_channel(subscription_id)
             logger.debug(f"已取消状态订阅: {status_type}, ID: {subscription_id}")
             return True
         return False
@@ -72,9 +87,14 @@ class SubscriberManager:
             status_type: 状态类型
             status: 状态数据
         """
+        entity_id = status.get("entity_id") if isinstance(status, dict) else None
+
         # 通知函数式订阅者
         for subscription_id, (subscribed_type, callback) in list(self._function_subscribers.items()):
             if subscribed_type == status_type:
+                if self.event_bus:
+                    self.event_bus.publish(subscription_id, StatusEvent(key=(status_type, entity_id), args=(status_type, status)))
+                    continue
                 try:
                     callback(status_type, status)
                 except Exception as e:
@@ -91,7 +111,11 @@ class SubscriberManager:
             data: 操作结果或附加数据
         """
         # 通知接口订阅者
-        for subscriber in self._subscribers:
+        for subscriber in list(self._subscribers):
+            if self.event_bus:
+                args = (domain, entity_id, old_status, new_status, data)
+                self.event_bus.publish(_subscriber_channel_name(subscriber), StatusEvent(key=(domain, entity_id), args=args))
+                continue
             try:
                 subscriber.on_status_changed(domain, entity_id, old_status, new_status, data)
             except Exception as e:
@@ -103,6 +127,29 @@ class SubscriberManager:
         # 同时通知通用状态变更频道
         self.notify_subscribers("status_changed", notify_data)
 
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """等待所有待处理的通知投递完成
+
+        Args:
+            timeout: 最长等待时间（秒）
+
+        Returns:
+            bool: 是否全部投递完成
+        """
+        if not self.event_bus:
+            return True
+        return self.event_bus.flush(timeout)
+
+    def get_dispatch_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """获取各订阅者的投递指标
+
+        Returns:
+            Dict[str, Dict[str, Any]]: 通道名称到指标的映射，未启用事件总线时为空
+        """
+        if not self.event_bus:
+            return {}
+        return self.event_bus.get_metrics()
+
     def get_subscribers(self) -> List[IStatusSubscriber]:
         """获取所有订阅者
 
@@ -110,3 +157,15 @@ class SubscriberManager:
             List[IStatusSubscriber]: 订阅者列表
         """
         return self._subscribers
+
+
+def _subscriber_channel_name(subscriber: IStatusSubscriber) -> str:
+    """生成接口订阅者的通道名称"""
+    return f"{subscriber.__class__.__name__}:{id(subscriber)}"
+
+
+def _merge_status_change(existing: StatusEvent, incoming: StatusEvent) -> Tuple[Any, ...]:
+    """合并同一实体的状态变更：保留最早的旧状态，采用最新的新状态和数据"""
+    domain, entity_id, old_status, _, _ = existing.args
+    _, _, _, new_status, data = incoming.args
+    return (domain, entity_id, old_status, new_status, data)
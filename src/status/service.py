@@ -71,13 +71,33 @@ class StatusService:
         """
         return self.provider_manager.unregister_provider(domain)
 
-    def register_subscriber(self, subscriber: IStatusSubscriber) -> None:
+    def register_subscriber(self, subscriber: IStatusSubscriber, delivery_mode: Optional[str] = None) -> None:
         """注册状态订阅者
 
         Args:
             subscriber: 状态订阅者实例
+            delivery_mode: 投递方式（sync/thread/asyncio），默认使用配置的分发模式
         """
-        self.subscriber_manager.register_subscriber(subscriber)
+        self.subscriber_manager.register_subscriber(subscriber, delivery_mode)
+
+    def flush_notifications(self, timeout: Optional[float] = None) -> bool:
+        """等待所有待处理的订阅者通知投递完成
+
+        Args:
+            timeout: 最长等待时间（秒）
+
+        Returns:
+            bool: 是否全部投递完成
+        """
+        return self.subscriber_manager.flush(timeout)
+
+    def get_dispatch_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """获取订阅者投递指标（队列深度、合并数、丢弃数和延迟）
+
+        Returns:
+            Dict[str, Dict[str, Any]]: 通道名称到指标的映射
+        """
+        return self.subscriber_manager.get_dispatch_metrics()
 
     def get_status(self, status_type: Optional[str] = None) -> Dict[str, Any]:
         """获取指定类型或所有状态
@@ -182,17 +202,31 @@ class StatusService:
         """
         return get_domain_status(self.provider_manager, domain, entity_id)
 
-    def get_system_status(self, detailed: bool = False) -> Dict[str, Any]:
+    def get_system_status(self, detailed: bool = False, refresh: bool = False) -> Dict[str, Any]:
         """获取整体系统状态 (聚合所有 Provider)
 
+        未过期的领域快照直接复用，过期的领域并行重新计算。
+
         Args:
             detailed: 是否包含详细信息
+            refresh: 是否忽略快照缓存强制重新计算
 
         Returns:
             Dict[str, Any]: 系统状态
         """
+        if refresh:
+            self.invalidate_status_cache()
         return get_system_status(self.provider_manager, detailed)
 
+    def invalidate_status_cache(self, domain: Optional[str] = None) -> None:
+        """使状态快照失效
+
+        Args:
+            domain: 领域名称，为None时使所有领域失效
+        """
+        if self.provider_manager.snapshot_cache:
+            self.provider_manager.snapshot_cache.invalidate(domain)
+
     def list_providers(self) -> List[str]:
         """列出所有已注册的提供者
 
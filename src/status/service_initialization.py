@@ -7,9 +7,11 @@
 import logging
 from typing import Optional
 
+from src.status.core.event_bus import DeliveryMode, StatusEventBus
 from src.status.core.health_calculator import HealthCalculator
 from src.status.core.project_state import ProjectState
 from src.status.core.provider_manager import ProviderManager
+from src.status.core.status_cache import StatusSnapshotCache
 from src.status.core.subscriber_manager import SubscriberManager
 from src.status.interfaces import IStatusProvider
 from src.status.providers.task_provider import get_task_status_summary
@@ -52,14 +54,51 @@ def initialize_components():
         tuple: 包含(provider_manager, subscriber_manager, health_calculator, project_state)的元组
     """
     logger.info("初始化状态服务核心组件...")
-    provider_manager = ProviderManager()
-    subscriber_manager = SubscriberManager()
+    settings = _load_status_settings()
+    snapshot_cache = StatusSnapshotCache(ttl=settings["cache_ttl"])
+    provider_manager = ProviderManager(snapshot_cache=snapshot_cache, max_workers=settings["max_workers"])
+
+    # 非同步模式下订阅者通过事件总线异步投递，状态写入无需等待订阅者
+    event_bus = None
+    if settings["dispatch_mode"] != DeliveryMode.SYNC.value:
+        event_bus = StatusEventBus(
+            default_mode=settings["dispatch_mode"],
+            max_workers=settings["dispatch_workers"],
+            max_pending=settings["dispatch_max_pending"],
+        )
+    subscriber_manager = SubscriberManager(event_bus=event_bus)
+
+    # 状态变更事件驱动快照失效，必须同步执行以保证写后读一致
+    subscriber_manager.register_subscriber(snapshot_cache, delivery_mode=DeliveryMode.SYNC)
+    for status_type in ("health", "project_state"):
+        subscriber_manager.subscribe(status_type, snapshot_cache.on_status_broadcast, delivery_mode=DeliveryMode.SYNC)
     health_calculator = HealthCalculator()
     project_state = ProjectState()
 
     return provider_manager, subscriber_manager, health_calculator, project_state
 
 
+def _load_status_settings():
+    """读取状态服务的缓存和分发配置
+
+    Returns:
+        dict: 包含cache_ttl、max_workers、dispatch_mode、dispatch_workers和dispatch_max_pending
+    """
+    settings = {"cache_ttl": 5.0, "max_workers": 4, "dispatch_mode": "thread", "dispatch_workers": 4, "dispatch_max_pending": 1000}
+    try:
+        from src.core.config import get_config
+
+        config = get_config()
+        settings["cache_ttl"] = float(config.get("status.cache_ttl", settings["cache_ttl"]))
+        settings["max_workers"] = int(config.get("status.max_workers", settings["max_workers"]))
+        settings["dispatch_mode"] = str(config.get("status.dispatch_mode", settings["dispatch_mode"]))
+        settings["dispatch_workers"] = int(config.get("status.dispatch_workers", settings["dispatch_workers"]))
+        settings["dispatch_max_pending"] = int(config.get("status.dispatch_max_pending", settings["dispatch_max_pending"]))
+    except Exception as e:
+        logger.warning(f"读取状态服务配置失败，使用默认值: {e}")
+    return settings
+
+
 def register_default_providers(provider_manager, health_calculator, project_state):
     """注册默认的状态提供者
 
@@ -33,7 +33,8 @@ def get_domain_status(provider_manager, domain: str, entity_id: Optional[str] =
         logger.info(f"调用状态提供者: domain={domain}, entity_id={entity_id}, provider类型={type(provider).__name__}")
 
         # 调用提供者的 get_status 方法
-        status_data = provider.get_status(entity_id) if entity_id else provider.get_status()
+        # 领域概览走快照缓存，实体级查询直接访问提供者
+        status_data = provider.get_status(entity_id) if entity_id else provider_manager.get_status(domain)
 
         # 记录返回的状态数据
         logger.info(f"提供者返回的状态数据: {status_data}")
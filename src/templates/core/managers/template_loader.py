@@ -4,22 +4,32 @@
 负责从文件系统加载模板并转换为标准格式
 """
 
+import hashlib
 import json
 import logging
 import os
 import uuid
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
 from sqlalchemy.orm import Session
 
 from src.db.repositories.template_repository import TemplateRepository, TemplateVariableRepository
 from src.models import Template as TemplateModel
+from src.models.db import Template as DBTemplate
+from src.models.db import TemplateVariable as DBTemplateVariable
 
 from .template_utils import load_template_from_file, normalize_template_id
 
 logger = logging.getLogger(__name__)
 
+# 支持的模板文件扩展名
+TEMPLATE_EXTENSIONS = (".md", ".jinja", ".j2", ".template")
+
+# 变更文件数达到该阈值时使用进程池解析
+PARALLEL_PARSE_THRESHOLD = 32
+
 
 class TemplateLoader:
     """模板加载器，负责从文件系统加载模板"""
@@ -60,7 +70,7 @@ class TemplateLoader:
 
         for root, _, files in os.walk(directory):
             for file in files:
-                if file.endswith((".md", ".jinja", ".j2", ".template")):
+                if file.endswith(TEMPLATE_EXTENSIONS):
                     file_path = os.path.join(root, file)
                     try:
                         # 加载并处理单个模板
@@ -74,61 +84,152 @@ class TemplateLoader:
         logger.info(f"从目录 {directory} 加载了 {count} 个模板")
         return count
 
-    def _load_single_template(self, file_path: str) -> TemplateModel:
+    def sync_templates_from_directory(self, directory: str, max_workers: Optional[int] = None, index_path: Optional[str] = None) -> Dict[str, int]:
         """
-        加载单个模板文件
+        增量同步目录中的模板到数据库
+
+        根据文件指纹（修改时间、大小和内容哈希）只解析新增或变更的文件，
+        变更较多时使用进程池并行解析，所有写入在一个事务中完成，并删除源文件已不存在的模板。
 
         Args:
-            file_path: 模板文件路径
+            directory: 模板目录路径
+            max_workers: 解析进程数，None表示由系统决定
+            index_path: 指纹索引文件路径，默认保存在 agent_work_dir/cache 下
 
         Returns:
-            加载的模板对象
+            同步统计，包含added、updated、unchanged、removed、failed和total
         """
-        template_data = load_template_from_file(file_path)
-        template_id = template_data.get("id") or normalize_template_id(template_data["name"])
+        if not directory or not os.path.exists(directory):
+            raise ValueError(f"模板目录不存在: {directory}")
 
-        # 确保始终有一个有效的ID
-        if not template_id or template_id.strip() == "":
-            # 使用文件名作为ID
-            template_id = os.path.splitext(os.path.basename(file_path))[0]
+        directory = os.path.abspath(directory)
+        index_path = index_path or _default_index_path()
+        index = _read_index(index_path)
+        previous = index.get(directory, {})
+        current: Dict[str, Dict[str, Any]] = {}
+        stats = {"added": 0, "updated": 0, "unchanged": 0, "removed": 0, "failed": 0, "total": 0}
+
+        # 1. 扫描文件并比较指纹
+        changed: List[Tuple[str, str, str]] = []
+        for rel_path, file_path, stat in _scan_template_files(directory):
+            entry = previous.get(rel_path)
+            if entry and entry.get("mtime_ns") == stat.st_mtime_ns and entry.get("size") == stat.st_size:
+                current[rel_path] = entry
+                continue
+
+            digest = _file_digest(file_path)
+            if entry and entry.get("sha256") == digest:
+                current[rel_path] = {**entry, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+                continue
+            changed.append((rel_path, file_path, digest))
+            current[rel_path] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": digest}
+
+        # 2. 指纹未变但数据库中已缺失的模板（如数据库被重建）需要重新加载
+        changed_paths = {rel_path for rel_path, _, _ in changed}
+        unchanged = {rel_path: entry for rel_path, entry in current.items() if rel_path not in changed_paths}
+        existing_ids = self._existing_template_ids([entry["template_id"] for entry in unchanged.values() if entry.get("template_id")])
+        for rel_path, entry in unchanged.items():
+            if entry.get("template_id") not in existing_ids:
+                changed.append((rel_path, os.path.join(directory, rel_path), entry.get("sha256", "")))
+        # 按文件路径统计未变模板：不需要重新解析的文件才算未变，解析失败的文件计入 failed
+        reparsed_paths = {rel_path for rel_path, _, _ in changed}
+        unchanged_count = sum(1 for rel_path in current if rel_path not in reparsed_paths)
+
+        # 3. 解析变更文件
+        parsed = self._parse_changed_files([c[1] for c in changed], max_workers)
+        upserts: Dict[str, Tuple[Dict[str, Any], List[Dict[str, Any]]]] = {}
+        for (rel_path, file_path, digest), result in zip(changed, parsed):
+            if isinstance(result, Exception):
+                logger.error(f"加载模板 {file_path} 失败: {result}")
+                stats["failed"] += 1
+                # 保留旧指纹，下次继续重试
+                if rel_path in previous:
+                    current[rel_path] = previous[rel_path]
+                else:
+                    current.pop(rel_path, None)
+                continue
+            db_template_data, variables_data = result
+            upserts[db_template_data["id"]] = (db_template_data, variables_data)
+            current[rel_path] = {**current[rel_path], "sha256": digest or _file_digest(file_path), "template_id": db_template_data["id"]}
+
+        # 4. 源文件已删除的模板
+        live_ids = {entry.get("template_id") for entry in current.values()}
+        removed_ids = {entry.get("template_id") for rel, entry in previous.items() if rel not in current} - live_ids - {None}
+
+        # 5. 单事务批量写入
+        added, updated = self._bulk_write(upserts, removed_ids)
+        stats.update(added=added, updated=updated, removed=len(removed_ids), unchanged=unchanged_count, total=len(current))
+
+        index[directory] = current
+        _write_index(index_path, index)
+        logger.info(
+            f"同步模板目录 {directory}: 新增 {added}，更新 {updated}，删除 {len(removed_ids)}，未变 {stats['unchanged']}，失败 {stats['failed']}"
+        )
+        return stats
+
+    def _existing_template_ids(self, template_ids: List[str]) -> set:
+        """一次查询返回数据库中已存在的模板ID"""
+        if not template_ids:
+            return set()
+        rows = self.session.query(DBTemplate.id).filter(DBTemplate.id.in_(template_ids)).all()
+        return {row[0] for row in rows}
+
+    def _parse_changed_files(self, file_paths: List[str], max_workers: Optional[int]) -> List[Any]:
+        """解析变更文件，返回 (模板数据, 变量数据) 或异常"""
+        if len(file_paths) >= PARALLEL_PARSE_THRESHOLD:
+            try:
+                with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                    return list(executor.map(_parse_template_file_safe, file_paths, chunksize=8))
+            except Exception as e:
+                logger.warning(f"进程池解析模板失败，改为串行解析: {e}")
+        return [_parse_template_file_safe(path) for path in file_paths]
+
+    def _bulk_write(self, upserts: Dict[str, Tuple[Dict[str, Any], List[Dict[str, Any]]]], removed_ids: set) -> Tuple[int, int]:
+        """在一个事务中写入变更的模板并删除已移除的模板
 
-            # 如果文件名不合适，使用UUID
-            if not template_id or template_id.strip() == "":
-                template_id = f"template_{str(uuid.uuid4())[:8]}"
+        Returns:
+            (新增数量, 更新数量)
+        """
+        if not upserts and not removed_ids:
+            return 0, 0
+
+        try:
+            existing = {}
+            target_ids = list(upserts.keys()) + list(removed_ids)
+            for db_template in self.session.query(DBTemplate).filter(DBTemplate.id.in_(target_ids)).all():
+                existing[db_template.id] = db_template
+
+            created_at = {tid: tpl.created_at for tid, tpl in existing.items()}
+            for db_template in existing.values():
+                self.session.delete(db_template)
+            self.session.flush()
+
+            now = datetime.now().isoformat()
+            for template_id, (db_template_data, variables_data) in upserts.items():
+                db_template_data = {**db_template_data, "created_at": created_at.get(template_id) or now, "updated_at": now}
+                db_template = DBTemplate(**db_template_data)
+                db_template.variables = [DBTemplateVariable(**var_data) for var_data in variables_data]
+                self.session.add(db_template)
+
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+
+        updated = len([tid for tid in upserts if tid in existing])
+        return len(upserts) - updated, updated
 
-        metadata = template_data.pop("metadata", {})
-        template_metadata = {
-            "author": metadata.get("author", "未知"),
-            "version": metadata.get("version", "1.0.0"),
-            "tags": json.dumps(metadata.get("tags", [])),
-            "created_at": datetime.now(),
-            "updated_at": datetime.now(),
-        }
+    def _load_single_template(self, file_path: str) -> TemplateModel:
+        """
+        加载单个模板文件
 
-        # 准备模板数据
-        db_template_data = {
-            "id": template_id,
-            "name": template_data.get("name") or template_id,
-            "description": template_data.get("description", ""),
-            "type": template_data.get("type", "general"),
-            "content": template_data.get("content", ""),
-            "example": template_data.get("example", ""),
-            **template_metadata,
-        }
+        Args:
+            file_path: 模板文件路径
 
-        # 准备变量数据
-        variables_data = []
-        for var in template_data.get("variables", []):
-            var_data = {
-                "id": var.get("id") or str(uuid.uuid4()),
-                "name": var.get("name"),
-                "type": var.get("type"),
-                "description": var.get("description", ""),
-                "default_value": json.dumps(var.get("default")) if var.get("default") is not None else None,
-                "required": var.get("required", True),
-                "enum_values": json.dumps(var.get("enum_values")) if var.get("enum_values") else None,
-            }
-            variables_data.append(var_data)
+        Returns:
+            加载的模板对象
+        """
+        db_template_data, variables_data = _parse_template_file(file_path)
 
         # 保存到数据库
         db_template = self.template_repo.create_template(db_template_data, variables_data)
@@ -209,3 +310,134 @@ class TemplateLoader:
 
         # 返回Pydantic模型
         return db_template.to_pydantic()
+
+
+def _parse_template_file(file_path: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    解析模板文件为数据库记录数据
+
+    Args:
+        file_path: 模板文件路径
+
+    Returns:
+        (模板数据, 变量数据列表)
+    """
+    template_data = load_template_from_file(file_path)
+    template_id = template_data.get("id") or normalize_template_id(template_data["name"])
+
+    # 确保始终有一个有效的ID
+    if not template_id or template_id.strip() == "":
+        # 使用文件名作为ID
+        template_id = os.path.splitext(os.path.basename(file_path))[0]
+
+        # 如果文件名不合适，使用UUID
+        if not template_id or template_id.strip() == "":
+            template_id = f"template_{str(uuid.uuid4())[:8]}"
+
+    metadata = template_data.pop("metadata", {})
+    template_metadata = {
+        "author": metadata.get("author", "未知"),
+        "version": metadata.get("version", "1.0.0"),
+        "tags": json.dumps(metadata.get("tags", [])),
+        "created_at": datetime.now(),
+        "updated_at": datetime.now(),
+    }
+
+    # 准备模板数据
+    db_template_data = {
+        "id": template_id,
+        "name": template_data.get("name") or template_id,
+        "description": template_data.get("description", ""),
+        "type": template_data.get("type", "general"),
+        "content": template_data.get("content", ""),
+        "example": template_data.get("example", ""),
+        **template_metadata,
+    }
+
+    # 准备变量数据
+    variables_data = []
+    for var in template_data.get("variables", []):
+        var_data = {
+            "id": var.get("id") or str(uuid.uuid4()),
+            "name": var.get("name"),
+            "type": var.get("type"),
+            "description": var.get("description", ""),
+            "default_value": json.dumps(var.get("default")) if var.get("default") is not None else None,
+            "required": var.get("required", True),
+            "enum_values": json.dumps(var.get("enum_values")) if var.get("enum_values") else None,
+        }
+        variables_data.append(var_data)
+
+    return db_template_data, variables_data
+
+
+def _parse_template_file_safe(file_path: str) -> Any:
+    """解析模板文件，出错时返回异常对象而不是抛出（供进程池使用）"""
+    try:
+        return _parse_template_file(file_path)
+    except Exception as e:
+        return e
+
+
+def _scan_template_files(directory: str):
+    """遍历目录下的模板文件
+
+    Yields:
+        (相对路径, 绝对路径, 文件状态)
+    """
+    stack = [directory]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith(TEMPLATE_EXTENSIONS) and entry.is_file():
+                        yield os.path.relpath(entry.path, directory), entry.path, entry.stat()
+        except OSError as e:
+            logger.warning(f"无法读取目录 {current}: {e}")
+
+
+def _file_digest(file_path: str) -> str:
+    """计算文件内容的SHA-256哈希"""
+    sha = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def _default_index_path() -> str:
+    """默认的模板指纹索引路径"""
+    try:
+        from src.core.config import get_config
+
+        config = get_config()
+        project_root = config.get("paths.project_root", os.getcwd())
+        agent_work_dir = config.get("paths.agent_work_dir", ".ai")
+    except Exception:
+        project_root, agent_work_dir = os.getcwd(), ".ai"
+    return os.path.join(project_root, agent_work_dir, "cache", "template_index.json")
+
+
+def _read_index(index_path: str) -> Dict[str, Dict[str, Any]]:
+    """读取指纹索引，文件不存在或损坏时返回空索引"""
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_index(index_path: str, index: Dict[str, Dict[str, Any]]) -> None:
+    """原子写入指纹索引"""
+    try:
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        tmp_path = f"{index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False)
+        os.replace(tmp_path, index_path)
+    except OSError as e:
+        logger.warning(f"写入模板指纹索引失败: {e}")
@@ -5,7 +5,9 @@
 """
 
 import logging
-from typing import Dict, List, Optional
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, MutableMapping, Optional
 
 from sqlalchemy.orm import Session
 
@@ -14,6 +16,93 @@ from src.models import Template as TemplateModel
 
 logger = logging.getLogger(__name__)
 
+# 模板缓存默认容量
+DEFAULT_CACHE_SIZE = 512
+
+
+class TemplateLRUCache(MutableMapping):
+    """有容量上限的模板缓存
+
+    按最近使用顺序淘汰，接口与字典一致；模板更新或删除时由 TemplateUpdater 调用 invalidate 失效。
+    """
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE):
+        self.max_size = max(1, max_size)
+        self._data: "OrderedDict[str, TemplateModel]" = OrderedDict()
+        self._versions: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    def __getitem__(self, template_id: str) -> TemplateModel:
+        with self._lock:
+            value = self._data[template_id]
+            self._data.move_to_end(template_id)
+            return value
+
+    def __setitem__(self, template_id: str, template: TemplateModel) -> None:
+        self.put(template_id, template)
+
+    def __delitem__(self, template_id: str) -> None:
+        with self._lock:
+            del self._data[template_id]
+            self._versions.pop(template_id, None)
+
+    def __contains__(self, template_id: object) -> bool:
+        with self._lock:
+            return template_id in self._data
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._data.keys()))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def put(self, template_id: str, template: TemplateModel, version: Any = None) -> None:
+        """写入缓存
+
+        Args:
+            template_id: 模板ID
+            template: 模板模型
+            version: 可选的版本标记（如数据库中的更新时间）
+        """
+        with self._lock:
+            self._data[template_id] = template
+            self._data.move_to_end(template_id)
+            self._versions[template_id] = version
+            while len(self._data) > self.max_size:
+                evicted, _ = self._data.popitem(last=False)
+                self._versions.pop(evicted, None)
+
+    def get_if_current(self, template_id: str, version: Any) -> Optional[TemplateModel]:
+        """仅当缓存版本与给定版本一致时返回缓存的模板
+
+        Args:
+            template_id: 模板ID
+            version: 期望的版本标记
+
+        Returns:
+            缓存的模板，版本不一致或未缓存时返回None
+        """
+        with self._lock:
+            if template_id not in self._data or version is None or self._versions.get(template_id) != version:
+                return None
+            self._data.move_to_end(template_id)
+            return self._data[template_id]
+
+    def invalidate(self, template_id: Optional[str] = None) -> None:
+        """使缓存失效
+
+        Args:
+            template_id: 模板ID，为None时清空全部缓存
+        """
+        with self._lock:
+            if template_id is None:
+                self._data.clear()
+                self._versions.clear()
+            else:
+                self._data.pop(template_id, None)
+                self._versions.pop(template_id, None)
+
 
 class TemplateSearcher:
     """模板查询器，负责查询和搜索模板"""
@@ -23,6 +112,7 @@ class TemplateSearcher:
         session: Session,
         template_repo: TemplateRepository,
         variable_repo: TemplateVariableRepository,
+        cache_size: int = DEFAULT_CACHE_SIZE,
     ):
         """
         初始化模板查询器
@@ -31,11 +121,13 @@ class TemplateSearcher:
             session: 数据库会话
             template_repo: 模板仓库
             variable_repo: 模板变量仓库
+            cache_size: 模板缓存容量
         """
         self.session = session
         self.template_repo = template_repo
         self.variable_repo = variable_repo
-        self.templates_cache: Dict[str, TemplateModel] = {}
+        self.templates_cache = TemplateLRUCache(cache_size)
+        self._indexes_checked = False
 
     def get_template(self, template_id: str) -> Optional[TemplateModel]:
         """
@@ -52,7 +144,7 @@ class TemplateSearcher:
             return self.templates_cache[template_id]
 
         # 从数据库获取
-        db_template = self.template_repo.get_by_id(template_id)
+        db_template = self.template_repo.get_by_id(self.session, template_id)
         if db_template:
             template_model = db_template.to_pydantic()
             self.templates_cache[template_id] = template_model
@@ -61,61 +153,80 @@ class TemplateSearcher:
         logger.debug(f"未找到模板: {template_id}")
         return None
 
-    def get_all_templates(self) -> List[TemplateModel]:
+    def get_all_templates(self, limit: Optional[int] = None, offset: int = 0) -> List[TemplateModel]:
         """
         获取所有模板
 
+        Args:
+            limit: 返回数量上限，None表示不限制
+            offset: 跳过的记录数
+
         Returns:
             模板列表
         """
-        # 从数据库获取所有模板
-        db_templates = self.template_repo.get_all()
+        templates = self.search_templates(limit=limit, offset=offset)
+        logger.debug(f"获取到所有模板，共 {len(templates)} 个")
+        return templates
+
+    def search_templates(
+        self,
+        query: str = None,
+        tags: List[str] = None,
+        template_type: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[TemplateModel]:
+        """
+        搜索模板
+
+        关键词、类型和标签条件均在数据库中筛选，只转换当前页的模板。
+
+        Args:
+            query: 搜索关键词，匹配名称和描述
+            tags: 标签列表，匹配任意一个
+            template_type: 模板类型
+            limit: 返回数量上限，None表示不限制
+            offset: 跳过的记录数
+
+        Returns:
+            匹配的模板列表
+        """
+        self._ensure_indexes()
+        db_templates = self.template_repo.search(self.session, query=query, template_type=template_type, tags=tags, limit=limit, offset=offset)
+        logger.debug(f"搜索模板 (query={query}, type={template_type}, tags={tags})，找到 {len(db_templates)} 个")
 
-        # 转换为Pydantic模型并更新缓存
         templates = []
         for db_template in db_templates:
-            template_model = db_template.to_pydantic()
-            self.templates_cache[template_model.id] = template_model
+            template_model = self._to_model(db_template)
             templates.append(template_model)
-
-        logger.debug(f"获取到所有模板，共 {len(templates)} 个")
         return templates
 
-    def search_templates(self, query: str = None, tags: List[str] = None) -> List[TemplateModel]:
+    def search_templates_page(
+        self,
+        query: str = None,
+        tags: List[str] = None,
+        template_type: Optional[str] = None,
+        page: int = 1,
+        page_size: int = 50,
+    ) -> Dict[str, Any]:
         """
-        搜索模板
+        分页搜索模板
 
         Args:
             query: 搜索关键词
             tags: 标签列表
+            template_type: 模板类型
+            page: 页码，从1开始
+            page_size: 每页数量
 
         Returns:
-            匹配的模板列表
+            包含items、total、page和page_size的字典
         """
-        # 如果有标签，使用标签搜索
-        if tags:
-            db_templates = self.template_repo.search_by_tags(tags)
-            logger.debug(f"按标签搜索 {tags}，找到 {len(db_templates)} 个模板")
-        else:
-            # 否则获取所有模板
-            db_templates = self.template_repo.get_all()
-            logger.debug(f"获取所有模板，共 {len(db_templates)} 个")
-
-        # 转换为Pydantic模型
-        templates = [t.to_pydantic() for t in db_templates]
-
-        # 如果有关键词，在Python中筛选（可以根据需要改为数据库筛选）
-        if query:
-            query = query.lower()
-            filtered_templates = [t for t in templates if query in t.name.lower() or (t.description and query in t.description.lower())]
-            logger.debug(f"按关键词 '{query}' 筛选后剩余 {len(filtered_templates)} 个模板")
-            templates = filtered_templates
-
-        # 更新缓存
-        for template in templates:
-            self.templates_cache[template.id] = template
-
-        return templates
+        page = max(1, page)
+        page_size = max(1, page_size)
+        total = self.template_repo.count_search(self.session, query=query, template_type=template_type, tags=tags)
+        items = self.search_templates(query, tags, template_type, limit=page_size, offset=(page - 1) * page_size)
+        return {"items": items, "total": total, "page": page, "page_size": page_size}
 
     def get_templates_by_type(self, template_type: str) -> List[TemplateModel]:
         """
@@ -127,21 +238,29 @@ class TemplateSearcher:
         Returns:
             指定类型的模板列表
         """
-        db_templates = self.template_repo.get_by_type(template_type)
-
-        # 转换为Pydantic模型并更新缓存
-        templates = []
-        for db_template in db_templates:
-            template_model = db_template.to_pydantic()
-            self.templates_cache[template_model.id] = template_model
-            templates.append(template_model)
-
+        templates = self.search_templates(template_type=template_type)
         logger.debug(f"按类型 '{template_type}' 获取到 {len(templates)} 个模板")
         return templates
 
+    def _to_model(self, db_template: Any) -> TemplateModel:
+        """转换为Pydantic模型，优先复用缓存中更新时间一致的模型"""
+        cached = self.templates_cache.get_if_current(db_template.id, db_template.updated_at)
+        if cached is not None:
+            return cached
+        template_model = db_template.to_pydantic()
+        self.templates_cache.put(template_model.id, template_model, db_template.updated_at)
+        return template_model
+
+    def _ensure_indexes(self) -> None:
+        """首次搜索时为旧数据库补建索引"""
+        if self._indexes_checked:
+            return
+        self._indexes_checked = True
+        self.template_repo.ensure_indexes(self.session)
+
     def clear_cache(self) -> None:
         """
         清除模板缓存
         """
-        self.templates_cache.clear()
+        self.templates_cache.invalidate()
         logger.debug("已清除模板缓存")
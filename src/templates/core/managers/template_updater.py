@@ -8,7 +8,7 @@ import json
 import logging
 import uuid
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, MutableMapping, Optional
 
 from sqlalchemy.orm import Session
 
@@ -26,6 +26,7 @@ class TemplateUpdater:
         session: Session,
         template_repo: TemplateRepository,
         variable_repo: TemplateVariableRepository,
+        templates_cache: Optional[MutableMapping[str, TemplateModel]] = None,
     ):
         """
         初始化模板更新器
@@ -34,10 +35,21 @@ class TemplateUpdater:
             session: 数据库会话
             template_repo: 模板仓库
             variable_repo: 模板变量仓库
+            templates_cache: 可选的模板缓存，模板更新或删除时使对应条目失效
         """
         self.session = session
         self.template_repo = template_repo
         self.variable_repo = variable_repo
+        self.templates_cache = templates_cache
+
+    def _invalidate_cache(self, template_id: str) -> None:
+        """使模板缓存中的条目失效"""
+        if self.templates_cache is None:
+            return
+        if hasattr(self.templates_cache, "invalidate"):
+            self.templates_cache.invalidate(template_id)
+        else:
+            self.templates_cache.pop(template_id, None)
 
     def update_template(self, template_id: str, template_data: Dict[str, Any]) -> Optional[TemplateModel]:
         """
@@ -51,7 +63,7 @@ class TemplateUpdater:
             更新后的模板对象，如果未找到则返回None
         """
         # 获取现有模板
-        db_template = self.template_repo.get_by_id(template_id)
+        db_template = self.template_repo.get_by_id(self.session, template_id)
         if not db_template:
             logger.warning(f"未找到要更新的模板: {template_id}")
             return None
@@ -73,10 +85,11 @@ class TemplateUpdater:
                 update_data[key] = value
 
         # 更新更新时间
-        update_data["updated_at"] = datetime.now()
+        update_data["updated_at"] = datetime.now().isoformat()
 
         # 更新模板
-        updated_template = self.template_repo.update(template_id, update_data)
+        updated_template = self.template_repo.update(self.session, template_id, update_data)
+        self._invalidate_cache(template_id)
 
         # 处理变量更新
         if "variables" in template_data:
@@ -100,7 +113,7 @@ class TemplateUpdater:
             db_template: 数据库模板对象
         """
         # 获取现有变量
-        existing_variables = self.variable_repo.get_by_template(template_id)
+        existing_variables = self.variable_repo.get_by_template(self.session, template_id)
         existing_var_dict = {var.id: var for var in existing_variables}
 
         # 处理每个变量
@@ -116,7 +129,7 @@ class TemplateUpdater:
                     "required": var_data.get("required", existing_var_dict[var_id].required),
                     "enum_values": json.dumps(var_data.get("enum_values")) if "enum_values" in var_data else existing_var_dict[var_id].enum_values,
                 }
-                self.variable_repo.update(var_id, var_update)
+                self.variable_repo.update(self.session, var_id, var_update)
             else:
                 # 添加新变量
                 self._add_new_template_variable(var_data, db_template)
@@ -139,7 +152,7 @@ class TemplateUpdater:
             "required": var_data.get("required", True),
             "enum_values": json.dumps(var_data.get("enum_values")) if var_data.get("enum_values") else None,
         }
-        created_var = self.variable_repo.create(new_var)
+        created_var = self.variable_repo.create(self.session, new_var)
 
         # 关联到模板
         if created_var:
@@ -157,7 +170,8 @@ class TemplateUpdater:
         """
         try:
             # 删除模板会级联删除相关的变量
-            result = self.template_repo.delete(template_id)
+            result = self.template_repo.delete(self.session, template_id)
+            self._invalidate_cache(template_id)
 
             if result:
                 logger.info(f"成功删除模板: {template_id}")
@@ -12,7 +12,9 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Set, Tuple
 
 import yaml
-from jinja2 import Environment, exceptions, meta
+from jinja2 import exceptions, meta
+
+from src.templates.core.template_cache import get_template_cache
 
 logger = logging.getLogger(__name__)
 
@@ -27,9 +29,8 @@ def extract_variables_from_template(template_content: str) -> Set[str]:
     Returns:
         变量名集合
     """
-    env = Environment()
     try:
-        ast = env.parse(template_content)
+        ast = get_template_cache().parse(template_content)
         variables = meta.find_undeclared_variables(ast)
         return variables
     except exceptions.TemplateSyntaxError as e:
@@ -46,9 +47,8 @@ def validate_template_syntax(template_content: str) -> bool:
     Returns:
         语法是否正确
     """
-    env = Environment()
     try:
-        env.parse(template_content)
+        get_template_cache().parse(template_content)
         return True
     except exceptions.TemplateSyntaxError:
         return False
@@ -64,9 +64,8 @@ def get_syntax_error_details(template_content: str) -> Optional[Dict[str, Any]]:
     Returns:
         错误详情，如果没有错误则返回None
     """
-    env = Environment()
     try:
-        env.parse(template_content)
+        get_template_cache().parse(template_content)
         return None
     except exceptions.TemplateSyntaxError as e:
         return {
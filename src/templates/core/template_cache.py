@@ -0,0 +1,250 @@
+"""
+模板编译缓存模块
+
+按模板内容哈希缓存Jinja2解析结果和编译后的模板对象，并支持磁盘字节码缓存，
+使同一模板在批量生成时只解析、编译一次。
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from jinja2 import BytecodeCache, Environment, FileSystemBytecodeCache
+from jinja2 import Template as JinjaTemplate
+from jinja2 import exceptions, nodes
+
+logger = logging.getLogger(__name__)
+
+# 仅用于语法解析的共享环境（与 jinja2 默认配置一致）
+_PARSE_ENV = Environment()
+
+
+def content_hash(content: str) -> str:
+    """计算模板内容哈希
+
+    Args:
+        content: 模板内容
+
+    Returns:
+        str: SHA-256十六进制摘要
+    """
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def environment_fingerprint(env: Environment) -> str:
+    """计算影响编译结果的环境配置指纹
+
+    配置相同的不同环境实例可以共享磁盘上的字节码。
+
+    Args:
+        env: Jinja2环境
+
+    Returns:
+        str: 环境指纹
+    """
+    settings = (
+        env.block_start_string,
+        env.block_end_string,
+        env.variable_start_string,
+        env.variable_end_string,
+        env.comment_start_string,
+        env.comment_end_string,
+        env.line_statement_prefix,
+        env.line_comment_prefix,
+        env.trim_blocks,
+        env.lstrip_blocks,
+        env.newline_sequence,
+        env.keep_trailing_newline,
+        repr(env.autoescape) if not callable(env.autoescape) else getattr(env.autoescape, "__qualname__", "callable"),
+        tuple(sorted(env.filters)),
+        tuple(sorted(env.tests)),
+        tuple(sorted(env.extensions)),
+    )
+    return hashlib.sha256(repr(settings).encode("utf-8")).hexdigest()[:16]
+
+
+class TemplateCompileCache:
+    """模板编译缓存
+
+    两级缓存：内存中按 (环境, 内容哈希) 保存编译后的模板对象并按LRU淘汰；
+    可选的磁盘字节码缓存按 (环境指纹, 内容哈希) 保存编译产物，跨进程复用。
+    """
+
+    def __init__(self, max_size: int = 256, bytecode_cache: Optional[BytecodeCache] = None):
+        """初始化模板编译缓存
+
+        Args:
+            max_size: 内存中最多缓存的模板数量
+            bytecode_cache: 可选的Jinja2字节码缓存
+        """
+        self.max_size = max(1, max_size)
+        self.bytecode_cache = bytecode_cache
+        self._templates: "OrderedDict[Tuple[int, str], Tuple[weakref.ref, JinjaTemplate]]" = OrderedDict()
+        self._asts: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_template(self, env: Environment, content: str) -> JinjaTemplate:
+        """获取编译后的模板，等价于 env.from_string(content)
+
+        Args:
+            env: Jinja2环境
+            content: 模板内容
+
+        Returns:
+            JinjaTemplate: 编译后的模板
+
+        Raises:
+            TemplateSyntaxError: 模板语法错误
+        """
+        digest = content_hash(content)
+        key = (id(env), digest)
+
+        with self._lock:
+            entry = self._templates.get(key)
+            if entry is not None and entry[0]() is env:
+                self._templates.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        template = self._compile(env, content, digest)
+
+        with self._lock:
+            self._templates[key] = (weakref.ref(env), template)
+            self._templates.move_to_end(key)
+            while len(self._templates) > self.max_size:
+                self._templates.popitem(last=False)
+        return template
+
+    def _compile(self, env: Environment, content: str, digest: str) -> JinjaTemplate:
+        """编译模板，优先从字节码缓存加载"""
+        code = None
+        bucket = None
+        if self.bytecode_cache is not None:
+            try:
+                bucket = self.bytecode_cache.get_bucket(env, f"{environment_fingerprint(env)}:{digest}", None, content)
+                code = bucket.code
+            except Exception as e:
+                logger.debug(f"读取模板字节码缓存失败: {e}")
+                bucket = None
+
+        if code is None:
+            # 以 name=None 编译，保持与 from_string 相同的自动转义行为
+            code = env.compile(content)
+            if bucket is not None:
+                try:
+                    bucket.code = code
+                    self.bytecode_cache.set_bucket(bucket)
+                except Exception as e:
+                    logger.debug(f"写入模板字节码缓存失败: {e}")
+
+        return env.template_class.from_code(env, code, env.make_globals(None), None)
+
+    def parse(self, content: str) -> nodes.Template:
+        """解析模板语法树，供变量提取和语法校验使用
+
+        Args:
+            content: 模板内容
+
+        Returns:
+            nodes.Template: 模板语法树
+
+        Raises:
+            TemplateSyntaxError: 模板语法错误
+        """
+        digest = content_hash(content)
+        with self._lock:
+            cached = self._asts.get(digest)
+            if cached is not None:
+                self._asts.move_to_end(digest)
+                self.hits += 1
+                if isinstance(cached, exceptions.TemplateSyntaxError):
+                    raise cached
+                return cached
+            self.misses += 1
+
+        try:
+            result = _PARSE_ENV.parse(content)
+        except exceptions.TemplateSyntaxError as e:
+            result = e
+
+        with self._lock:
+            self._asts[digest] = result
+            while len(self._asts) > self.max_size:
+                self._asts.popitem(last=False)
+
+        if isinstance(result, exceptions.TemplateSyntaxError):
+            raise result
+        return result
+
+    def clear(self) -> None:
+        """清空内存缓存（磁盘字节码缓存一并清理）"""
+        with self._lock:
+            self._templates.clear()
+            self._asts.clear()
+        if self.bytecode_cache is not None:
+            self.bytecode_cache.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计信息
+
+        Returns:
+            Dict[str, Any]: 命中、未命中次数和缓存条目数
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "templates": len(self._templates),
+                "asts": len(self._asts),
+                "bytecode_cache": self.bytecode_cache is not None,
+            }
+
+
+_template_cache: Optional[TemplateCompileCache] = None
+_template_cache_lock = threading.Lock()
+
+
+def get_template_cache() -> TemplateCompileCache:
+    """获取全局模板编译缓存实例
+
+    Returns:
+        TemplateCompileCache: 全局缓存实例
+    """
+    global _template_cache
+    if _template_cache is None:
+        with _template_cache_lock:
+            if _template_cache is None:
+                _template_cache = _create_template_cache()
+    return _template_cache
+
+
+def _create_template_cache() -> TemplateCompileCache:
+    """根据配置创建模板编译缓存"""
+    max_size, use_bytecode, bytecode_dir = 256, True, None
+    try:
+        from src.core.config import get_config
+
+        config = get_config()
+        max_size = int(config.get("templates.compile_cache_size", max_size))
+        use_bytecode = bool(config.get("templates.bytecode_cache", use_bytecode))
+        bytecode_dir = config.get("templates.bytecode_cache_dir") or None
+    except Exception as e:
+        logger.warning(f"读取模板缓存配置失败，使用默认值: {e}")
+
+    bytecode_cache = None
+    if use_bytecode:
+        try:
+            if bytecode_dir:
+                os.makedirs(bytecode_dir, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(bytecode_dir, pattern="__vibe_jinja_%s.cache")
+        except Exception as e:
+            logger.warning(f"初始化模板字节码缓存失败，仅使用内存缓存: {e}")
+
+    return TemplateCompileCache(max_size=max_size, bytecode_cache=bytecode_cache)
@@ -16,6 +16,7 @@ from jinja2 import select_autoescape
 
 from ..models.template import Template, TemplateVariable
 from .managers.template_utils import get_syntax_error_details, validate_template_syntax
+from .template_cache import get_template_cache
 
 logger = logging.getLogger(__name__)
 
@@ -63,7 +64,7 @@ class TemplateEngine:
             error_details = get_syntax_error_details(template_string)
             raise ValueError(f"模板语法错误: {error_details['message']} at line {error_details['line']}")
 
-        template = self.env.from_string(template_string)
+        template = get_template_cache().get_template(self.env, template_string)
         return template.render(**variables)
 
     def render_template(self, template: Template, variables: Dict[str, Any]) -> str:
@@ -35,14 +35,14 @@ class TemplateManager:
         self.session = session
         self.templates_dir = templates_dir
 
-        # 初始化仓库
-        self.template_repo = TemplateRepository(session)
-        self.variable_repo = TemplateVariableRepository(session)
+        # 初始化仓库（无状态，调用时传入会话）
+        self.template_repo = TemplateRepository()
+        self.variable_repo = TemplateVariableRepository()
 
         # 初始化子模块
         self.loader = TemplateLoader(session, self.template_repo, self.variable_repo)
         self.searcher = TemplateSearcher(session, self.template_repo, self.variable_repo)
-        self.updater = TemplateUpdater(session, self.template_repo, self.variable_repo)
+        self.updater = TemplateUpdater(session, self.template_repo, self.variable_repo, templates_cache=self.searcher.templates_cache)
         self.exporter = TemplateExporter(session, self.template_repo, self.variable_repo)
 
         # 缓存引用
@@ -56,14 +56,30 @@ class TemplateManager:
         """
         从目录加载所有模板到数据库
 
+        按文件指纹增量同步，只重新解析变更的文件，并清理源文件已删除的模板。
+
         Args:
             directory: 模板目录，如果为None则使用初始化时设置的目录
 
         Returns:
-            加载的模板数量
+            目录中的模板数量
+        """
+        return self.sync_templates_from_directory(directory)["total"]
+
+    def sync_templates_from_directory(self, directory: str = None) -> Dict[str, int]:
+        """
+        增量同步模板目录并返回统计信息
+
+        Args:
+            directory: 模板目录，如果为None则使用初始化时设置的目录
+
+        Returns:
+            同步统计，包含added、updated、unchanged、removed、failed和total
         """
         directory = directory or self.templates_dir
-        return self.loader.load_templates_from_directory(directory)
+        stats = self.loader.sync_templates_from_directory(directory)
+        self.searcher.clear_cache()
+        return stats
 
     def get_template(self, template_id: str) -> Optional[TemplateModel]:
         """
@@ -77,14 +93,18 @@ class TemplateManager:
         """
         return self.searcher.get_template(template_id)
 
-    def get_all_templates(self) -> List[TemplateModel]:
+    def get_all_templates(self, limit: Optional[int] = None, offset: int = 0) -> List[TemplateModel]:
         """
         获取所有模板
 
+        Args:
+            limit: 返回数量上限，None表示不限制
+            offset: 跳过的记录数
+
         Returns:
             模板列表
         """
-        return self.searcher.get_all_templates()
+        return self.searcher.get_all_templates(limit=limit, offset=offset)
 
     def add_template(self, template: TemplateModel) -> TemplateModel:
         """
@@ -112,10 +132,7 @@ class TemplateManager:
         Returns:
             更新后的模板对象，如果未找到则返回None
         """
-        result = self.updater.update_template(template_id, template_data)
-        if result:
-            self.templates_cache[template_id] = result
-        return result
+        return self.updater.update_template(template_id, template_data)
 
     def delete_template(self, template_id: str) -> bool:
         """
@@ -127,23 +144,53 @@ class TemplateManager:
         Returns:
             是否成功删除
         """
-        result = self.updater.delete_template(template_id)
-        if result and template_id in self.templates_cache:
-            del self.templates_cache[template_id]
-        return result
-
-    def search_templates(self, query: str = None, tags: List[str] = None) -> List[TemplateModel]:
+        return self.updater.delete_template(template_id)
+
+    def search_templates(
+        self,
+        query: str = None,
+        tags: List[str] = None,
+        template_type: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[TemplateModel]:
         """
         搜索模板
 
         Args:
             query: 搜索关键词
             tags: 标签列表
+            template_type: 模板类型
+            limit: 返回数量上限，None表示不限制
+            offset: 跳过的记录数
 
         Returns:
             匹配的模板列表
         """
-        return self.searcher.search_templates(query, tags)
+        return self.searcher.search_templates(query, tags, template_type=template_type, limit=limit, offset=offset)
+
+    def search_templates_page(
+        self,
+        query: str = None,
+        tags: List[str] = None,
+        template_type: Optional[str] = None,
+        page: int = 1,
+        page_size: int = 50,
+    ) -> Dict[str, Any]:
+        """
+        分页搜索模板
+
+        Args:
+            query: 搜索关键词
+            tags: 标签列表
+            template_type: 模板类型
+            page: 页码，从1开始
+            page_size: 每页数量
+
+        Returns:
+            包含items、total、page和page_size的字典
+        """
+        return self.searcher.search_templates_page(query, tags, template_type=template_type, page=page, page_size=page_size)
 
     def get_templates_by_type(self, template_type: str) -> List[TemplateModel]:
         """
@@ -15,6 +15,7 @@ from jinja2 import Template as Jinja2Template
 from jinja2.exceptions import TemplateSyntaxError, UndefinedError
 
 from src.models import Template
+from src.templates.core.template_cache import get_template_cache
 
 from .base_generator import TemplateGenerator
 
@@ -152,8 +153,8 @@ class RegexTemplateGenerator(TemplateGenerator):
             template_content = self._fix_command_template(template_content)
 
         try:
-            # 编译Jinja2模板
-            jinja_template = self.env.from_string(template_content)
+            # 编译Jinja2模板（按内容哈希缓存）
+            jinja_template = get_template_cache().get_template(self.env, template_content)
 
             # 渲染模板
             content = jinja_template.render(**prepared_variables)
@@ -3,17 +3,20 @@
 """
 数据库备份恢复工具模块
 
-提供数据库实体的备份和恢复功能，支持JSON和SQLite格式。
+提供数据库实体的备份和恢复功能，支持JSON、流式压缩JSONL和SQLite格式。
 """
 
+import gzip
+import hashlib
 import json
 import logging
 import os
-import shutil
 from abc import ABC, abstractmethod
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Type
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Type
 
+from sqlalchemy import Date, DateTime, Time, inspect, select
 from sqlalchemy.orm import Session
 
 # 导入配置管理器
@@ -23,9 +26,203 @@ from src.db.repository import Repository
 # 移除 get_db_path 的导入
 # from src.models.db.init_db import get_db_path
 from src.utils.file_utils import ensure_directory_exists, read_json_file, write_json_file
+from src.utils.sqlite_backup import SQLiteSnapshotStore, online_backup, online_restore
 
 logger = logging.getLogger(__name__)
 
+# 流式备份文件后缀和清单文件名
+JSONL_SUFFIX = ".jsonl.gz"
+MANIFEST_FILE = "manifest.json"
+BACKUP_FORMAT_VERSION = 1
+
+
+def _load_backup_settings() -> Dict[str, int]:
+    """读取备份配置"""
+    settings = {"chunk_size": 1000, "compress_level": 6, "max_workers": 4}
+    try:
+        config = get_config()
+        for key in settings:
+            settings[key] = int(config.get(f"backup.{key}", settings[key]))
+    except Exception as e:
+        logger.warning(f"读取备份配置失败，使用默认值: {e}")
+    return settings
+
+
+def _json_default(value: Any) -> Any:
+    """序列化JSON不支持的列值"""
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return value.hex()
+    return str(value)
+
+
+class _HashingWriter:
+    """写入时同步计算SHA-256的文件包装器"""
+
+    def __init__(self, fileobj):
+        self._fileobj = fileobj
+        self._sha = hashlib.sha256()
+
+    def write(self, data: bytes) -> int:
+        self._sha.update(data)
+        return self._fileobj.write(data)
+
+    def flush(self) -> None:
+        self._fileobj.flush()
+
+    def hexdigest(self) -> str:
+        return self._sha.hexdigest()
+
+
+def file_checksum(file_path: str) -> str:
+    """计算文件的SHA-256校验和
+
+    Args:
+        file_path: 文件路径
+
+    Returns:
+        str: 十六进制校验和
+    """
+    sha = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def iter_jsonl_records(file_path: str, chunk_size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+    """分块读取压缩JSONL备份文件
+
+    Args:
+        file_path: 备份文件路径
+        chunk_size: 每块的记录数
+
+    Yields:
+        List[Dict[str, Any]]: 一块记录
+    """
+    chunk: List[Dict[str, Any]] = []
+    with gzip.open(file_path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            chunk.append(json.loads(line))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def read_backup_manifest(backup_dir: str, verify: bool = True) -> Dict[str, Any]:
+    """读取流式备份清单
+
+    Args:
+        backup_dir: 备份目录
+        verify: 是否校验各归档文件的校验和
+
+    Returns:
+        Dict[str, Any]: 清单内容
+
+    Raises:
+        ValueError: 清单不存在或校验失败
+    """
+    manifest_path = os.path.join(backup_dir, MANIFEST_FILE)
+    if not os.path.isfile(manifest_path):
+        raise ValueError(f"备份清单不存在: {manifest_path}")
+
+    manifest = read_json_file(manifest_path)
+    if verify:
+        for entity_type, entry in manifest.get("entities", {}).items():
+            file_path = os.path.join(backup_dir, entry["file"])
+            if not os.path.isfile(file_path) or file_checksum(file_path) != entry.get("sha256"):
+                raise ValueError(f"备份文件校验失败: {entity_type} ({entry['file']})")
+    return manifest
+
+
+def _coerce_value(column: Any, value: Any) -> Any:
+    """把备份中的字符串时间还原为列类型对应的值"""
+    if not isinstance(value, str):
+        return value
+    try:
+        if isinstance(column.type, DateTime):
+            return datetime.fromisoformat(value)
+        if isinstance(column.type, Date):
+            return date.fromisoformat(value)
+        if isinstance(column.type, Time):
+            return time.fromisoformat(value)
+    except ValueError:
+        pass
+    return value
+
+
+def bulk_upsert_records(session: Session, model_class: Type, chunks: Iterable[List[Dict[str, Any]]], force: bool = False) -> Dict[str, int]:
+    """
+    分块批量写入实体记录
+
+    每块用一次IN查询找出已存在的主键，新记录通过 bulk_insert_mappings 插入，
+    已存在的记录在force=True时通过 bulk_update_mappings 更新，否则跳过；每块单独提交，
+    失败的块回滚后继续处理后续块。
+
+    Args:
+        session: 数据库会话
+        model_class: 模型类（需为单列主键）
+        chunks: 记录块，键为列名
+        force: 是否覆盖已存在的记录
+
+    Returns:
+        Dict[str, int]: imported、updated、skipped和failed数量
+    """
+    mapper = inspect(model_class)
+    if len(mapper.primary_key) != 1:
+        raise ValueError(f"批量恢复仅支持单列主键: {model_class.__name__}")
+    pk_column = mapper.primary_key[0]
+    pk_key = mapper.get_property_by_column(pk_column).key
+    # 备份按列名导出，bulk mappings 需要属性名
+    columns = {column.name: (key, column) for key, column in mapper.columns.items() if column.table is mapper.local_table}
+
+    stats = {"imported": 0, "updated": 0, "skipped": 0, "failed": 0}
+    for chunk in chunks:
+        rows = []
+        for record in chunk:
+            row = {columns[name][0]: _coerce_value(columns[name][1], value) for name, value in record.items() if name in columns}
+            if row.get(pk_key) is None:
+                stats["failed"] += 1
+                continue
+            rows.append(row)
+        if not rows:
+            continue
+
+        try:
+            ids = [row[pk_key] for row in rows]
+            existing = {row[0] for row in session.execute(select(pk_column).where(pk_column.in_(ids)))}
+            inserts = [row for row in rows if row[pk_key] not in existing]
+            updates = [row for row in rows if row[pk_key] in existing] if force else []
+
+            if inserts:
+                session.bulk_insert_mappings(model_class, inserts)
+            if updates:
+                session.bulk_update_mappings(model_class, updates)
+            session.commit()
+
+            stats["imported"] += len(inserts)
+            stats["updated"] += len(updates)
+            stats["skipped"] += len(rows) - len(inserts) - len(updates)
+        except Exception as e:
+            session.rollback()
+            stats["failed"] += len(rows)
+            logger.error(f"批量恢复 {model_class.__name__} 失败（{len(rows)} 条）: {str(e)}")
+
+    return stats
+
+
+def _dependency_order(entity_types: Iterable[str], table_names: Dict[str, str]) -> List[str]:
+    """按外键依赖顺序排列实体类型，被引用的表先恢复"""
+    from src.models.db import Base
+
+    position = {table.name: i for i, table in enumerate(Base.metadata.sorted_tables)}
+    return sorted(entity_types, key=lambda entity_type: position.get(table_names.get(entity_type), len(position)))
+
 
 class EntityBackupRestoreHandler(ABC):
     """实体备份恢复处理器基类"""
@@ -50,7 +247,7 @@ class EntityBackupRestoreHandler(ABC):
         if not database_url.startswith("sqlite:///"):
             raise ValueError("Database backup/restore currently only supports SQLite databases.")
 
-        db_path = database_url[len("sqlite:///")]
+        db_path = database_url[len("sqlite:///") :]
         if not os.path.isabs(db_path):
             project_root = config_manager.get("paths.project_root", os.getcwd())
             db_path = os.path.abspath(os.path.join(project_root, db_path))
@@ -75,6 +272,18 @@ class EntityBackupRestoreHandler(ABC):
         """
         pass
 
+    def get_model_class(self, session: Session) -> Type:
+        """
+        获取实体对应的模型类，流式备份按模型的表结构逐行导出
+
+        Args:
+            session: 数据库会话
+
+        Returns:
+            Type: SQLAlchemy模型类
+        """
+        return self.get_repository(session).model_class
+
     def backup(self, session: Session, output_path: str, format: str = "json") -> Dict[str, Any]:
         """
         备份指定类型的实体
@@ -82,7 +291,7 @@ class EntityBackupRestoreHandler(ABC):
         Args:
             session: 数据库会话
             output_path: 输出路径
-            format: 输出格式，支持json和sqlite
+            format: 输出格式，支持json、jsonl（流式压缩）、sqlite和snapshot（增量快照）
 
         Returns:
             Dict[str, Any]: 备份结果统计
@@ -91,8 +300,12 @@ class EntityBackupRestoreHandler(ABC):
 
         if format == "json":
             return self._backup_to_json(session, output_path)
+        elif format == "jsonl":
+            return self._backup_to_jsonl(session, output_path)
         elif format == "sqlite":
             return self._backup_to_sqlite(session, output_path)
+        elif format == "snapshot":
+            return self._backup_to_snapshot(session, output_path)
         else:
             raise ValueError(f"不支持的备份格式: {format}")
 
@@ -103,7 +316,7 @@ class EntityBackupRestoreHandler(ABC):
         Args:
             session: 数据库会话
             input_path: 输入路径
-            format: 输入格式，支持json和sqlite
+            format: 输入格式，支持json、jsonl（流式压缩）、sqlite和snapshot（增量快照目录）
             force: 是否强制覆盖已存在的数据
 
         Returns:
@@ -113,8 +326,12 @@ class EntityBackupRestoreHandler(ABC):
 
         if format == "json":
             return self._restore_from_json(session, input_path, force)
+        elif format == "jsonl":
+            return self._restore_from_jsonl(session, input_path, force)
         elif format == "sqlite":
             return self._restore_from_sqlite(session, input_path, force)
+        elif format == "snapshot":
+            return self._restore_from_snapshot(session, input_path, force)
         else:
             raise ValueError(f"不支持的恢复格式: {format}")
 
@@ -159,6 +376,58 @@ class EntityBackupRestoreHandler(ABC):
         self.logger.info(f"成功备份 {count} 个 {self.entity_type} 实体到 {output_path}")
         return result
 
+    def _backup_to_jsonl(
+        self, session: Session, output_path: str, chunk_size: Optional[int] = None, compress_level: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        将实体流式备份为单个压缩JSONL文件
+
+        按块读取表中的行并逐行写入 <entity_type>.jsonl.gz，内存占用与表大小无关。
+
+        Args:
+            session: 数据库会话
+            output_path: 输出目录
+            chunk_size: 每次从数据库读取的行数
+            compress_level: gzip压缩级别
+
+        Returns:
+            Dict[str, Any]: 备份结果统计，包含文件名、行数和校验和
+        """
+        settings = _load_backup_settings()
+        chunk_size = chunk_size or settings["chunk_size"]
+        compress_level = compress_level or settings["compress_level"]
+
+        table = self.get_model_class(session).__table__
+        ensure_directory_exists(output_path)
+        file_name = f"{self.entity_type}{JSONL_SUFFIX}"
+        file_path = os.path.join(output_path, file_name)
+        tmp_path = f"{file_path}.tmp"
+
+        count = 0
+        stmt = select(table).execution_options(yield_per=chunk_size)
+        with open(tmp_path, "wb") as raw:
+            writer = _HashingWriter(raw)
+            with gzip.GzipFile(filename="", mode="wb", fileobj=writer, compresslevel=compress_level, mtime=0) as gz:
+                for partition in session.execute(stmt).mappings().partitions():
+                    lines = [json.dumps(dict(row), default=_json_default, ensure_ascii=False) for row in partition]
+                    gz.write(("\n".join(lines) + "\n").encode("utf-8"))
+                    count += len(lines)
+        os.replace(tmp_path, file_path)
+
+        result = {
+            "entity_type": self.entity_type,
+            "format": "jsonl",
+            "table": table.name,
+            "file": file_name,
+            "count": count,
+            "sha256": writer.hexdigest(),
+            "output_path": output_path,
+            "timestamp": datetime.now().isoformat(),
+        }
+
+        self.logger.info(f"成功流式备份 {count} 个 {self.entity_type} 实体到 {file_path}")
+        return result
+
     def _backup_to_sqlite(self, session: Session, output_path: str) -> Dict[str, Any]:
         """
         将实体备份为SQLite格式
@@ -173,14 +442,45 @@ class EntityBackupRestoreHandler(ABC):
         # 获取原始数据库路径
         db_path = self._get_db_path_from_config()
 
-        # 复制数据库文件
-        shutil.copy2(db_path, output_path)
+        # 使用在线备份API，备份期间数据库仍可写入
+        backup_info = online_backup(db_path, output_path)
 
-        result = {"entity_type": self.entity_type, "format": "sqlite", "output_path": output_path, "timestamp": datetime.now().isoformat()}
+        result = {
+            "entity_type": self.entity_type,
+            "format": "sqlite",
+            "output_path": output_path,
+            "pages": backup_info["pages"],
+            "timestamp": datetime.now().isoformat(),
+        }
 
         self.logger.info(f"成功备份数据库到 {output_path}")
         return result
 
+    def _backup_to_snapshot(self, session: Session, output_path: str) -> Dict[str, Any]:
+        """
+        将数据库备份为增量快照
+
+        Args:
+            session: 数据库会话
+            output_path: 快照目录
+
+        Returns:
+            Dict[str, Any]: 备份结果统计
+        """
+        db_path = self._get_db_path_from_config()
+        snapshot = SQLiteSnapshotStore(output_path).create_snapshot(db_path)
+
+        result = {
+            "entity_type": self.entity_type,
+            "format": "snapshot",
+            "output_path": output_path,
+            "snapshot": snapshot,
+            "timestamp": datetime.now().isoformat(),
+        }
+
+        self.logger.info(f"成功创建数据库快照 {snapshot['id']} ({snapshot['type']})")
+        return result
+
     def _restore_from_json(self, session: Session, input_path: str, force: bool = False) -> Dict[str, Any]:
         """
         从JSON格式恢复实体
@@ -201,7 +501,7 @@ class EntityBackupRestoreHandler(ABC):
             return self._restore_json_file(repo, input_path, force)
         elif os.path.isdir(input_path):
             # 目录
-            return self._restore_json_directory(repo, input_path, force)
+            return self._restore_json_directory(session, input_path, force)
         else:
             raise ValueError(f"输入路径不存在: {input_path}")
 
@@ -272,12 +572,14 @@ class EntityBackupRestoreHandler(ABC):
             self.logger.error(f"恢复JSON文件失败: {file_path}, 错误: {str(e)}")
             raise
 
-    def _restore_json_directory(self, repo: Repository, dir_path: str, force: bool = False) -> Dict[str, Any]:
+    def _restore_json_directory(self, session: Session, dir_path: str, force: bool = False) -> Dict[str, Any]:
         """
         恢复目录中的所有JSON文件
 
+        文件按块读取后批量写入，每块只查询一次已存在的ID。
+
         Args:
-            repo: 实体仓库
+            session: 数据库会话
             dir_path: 目录路径
             force: 是否强制覆盖已存在的数据
 
@@ -291,19 +593,23 @@ class EntityBackupRestoreHandler(ABC):
         if not files:
             raise ValueError(f"目录中没有找到JSON文件: {dir_path}")
 
-        imported = 0
-        updated = 0
-        skipped = 0
+        chunk_size = _load_backup_settings()["chunk_size"]
+        unreadable = [0]
 
-        for file_name in files:
-            file_path = os.path.join(dir_path, file_name)
-            try:
-                result = self._restore_json_file(repo, file_path, force)
-                imported += result.get("imported", 0)
-                updated += result.get("updated", 0)
-                skipped += result.get("skipped", 0)
-            except Exception as e:
-                self.logger.error(f"恢复文件失败: {file_path}, 错误: {str(e)}")
+        def read_chunks() -> Iterator[List[Dict[str, Any]]]:
+            for i in range(0, len(files), chunk_size):
+                chunk = []
+                for file_name in files[i : i + chunk_size]:
+                    file_path = os.path.join(dir_path, file_name)
+                    try:
+                        chunk.append(read_json_file(file_path))
+                    except Exception as e:
+                        unreadable[0] += 1
+                        self.logger.error(f"恢复文件失败: {file_path}, 错误: {str(e)}")
+                yield chunk
+
+        stats = bulk_upsert_records(session, self.get_model_class(session), read_chunks(), force)
+        imported, updated, skipped = stats["imported"], stats["updated"], stats["skipped"]
 
         result = {
             "entity_type": self.entity_type,
@@ -312,6 +618,7 @@ class EntityBackupRestoreHandler(ABC):
             "imported": imported,
             "updated": updated,
             "skipped": skipped,
+            "failed": stats["failed"] + unreadable[0],
             "total": imported + updated + skipped,
             "timestamp": datetime.now().isoformat(),
         }
@@ -319,6 +626,41 @@ class EntityBackupRestoreHandler(ABC):
         self.logger.info(f"目录恢复结果: 导入={imported}, 更新={updated}, 跳过={skipped}")
         return result
 
+    def _restore_from_jsonl(self, session: Session, input_path: str, force: bool = False) -> Dict[str, Any]:
+        """
+        从流式压缩JSONL备份恢复实体
+
+        Args:
+            session: 数据库会话
+            input_path: 备份文件路径，或包含 <entity_type>.jsonl.gz 的备份目录
+            force: 是否强制覆盖已存在的数据
+
+        Returns:
+            Dict[str, Any]: 恢复结果统计
+        """
+        file_path = input_path
+        if os.path.isdir(input_path):
+            file_path = os.path.join(input_path, f"{self.entity_type}{JSONL_SUFFIX}")
+        if not os.path.isfile(file_path):
+            raise ValueError(f"输入路径不存在: {file_path}")
+
+        chunks = iter_jsonl_records(file_path, _load_backup_settings()["chunk_size"])
+        stats = bulk_upsert_records(session, self.get_model_class(session), chunks, force)
+
+        result = {
+            "entity_type": self.entity_type,
+            "format": "jsonl",
+            "file": file_path,
+            **stats,
+            "total": stats["imported"] + stats["updated"] + stats["skipped"],
+            "timestamp": datetime.now().isoformat(),
+        }
+
+        self.logger.info(
+            f"恢复 {self.entity_type}: 导入={stats['imported']}, 更新={stats['updated']}, 跳过={stats['skipped']}, 失败={stats['failed']}"
+        )
+        return result
+
     def _restore_from_sqlite(self, session: Session, input_path: str, force: bool = False) -> Dict[str, Any]:
         """
         从SQLite格式恢复实体
@@ -345,17 +687,42 @@ class EntityBackupRestoreHandler(ABC):
             if not os.path.exists(backup_dir):
                 os.makedirs(backup_dir)
             auto_backup = os.path.join(backup_dir, f"db_before_restore_{timestamp}.backup")
-            shutil.copy2(db_path, auto_backup)
+            online_backup(db_path, auto_backup)
             self.logger.info(f"已创建现有数据库备份: {auto_backup}")
 
-        # 复制备份文件到数据库位置
-        shutil.copy2(input_path, db_path)
+        # 通过备份API写回数据库，已打开的连接不会读到被替换的文件
+        online_restore(input_path, db_path)
 
         result = {"entity_type": self.entity_type, "format": "sqlite", "input_path": input_path, "timestamp": datetime.now().isoformat()}
 
         self.logger.info(f"成功从 {input_path} 恢复数据库")
         return result
 
+    def _restore_from_snapshot(self, session: Session, input_path: str, force: bool = False, snapshot_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        从增量快照恢复数据库
+
+        Args:
+            session: 数据库会话
+            input_path: 快照目录
+            force: 是否强制覆盖已存在的数据
+            snapshot_id: 快照ID，None表示最新快照
+
+        Returns:
+            Dict[str, Any]: 恢复结果统计
+        """
+        store = SQLiteSnapshotStore(input_path)
+        restored_path = os.path.join(input_path, ".restore.db")
+        try:
+            snapshot = store.restore_snapshot(restored_path, snapshot_id)
+            result = self._restore_from_sqlite(session, restored_path, force)
+        finally:
+            if os.path.exists(restored_path):
+                os.remove(restored_path)
+
+        result.update({"format": "snapshot", "input_path": input_path, "snapshot": snapshot})
+        return result
+
 
 # 实体类型到处理器的映射
 ENTITY_HANDLERS = {}
@@ -430,7 +797,7 @@ def restore_entity(session: Session, entity_type: str, input_path: str, format:
     return handler.restore(session, input_path, format, force)
 
 
-def backup_all_entities(session: Session, output_dir: str, format: str = "json") -> Dict[str, Any]:
+def backup_all_entities(session: Session, output_dir: str, format: str = "json", max_workers: Optional[int] = None) -> Dict[str, Any]:
     """
     备份所有实体
 
@@ -438,10 +805,14 @@ def backup_all_entities(session: Session, output_dir: str, format: str = "json")
         session: 数据库会话
         output_dir: 输出目录
         format: 输出格式
+        max_workers: jsonl格式下并行导出的线程数
 
     Returns:
         Dict[str, Any]: 备份结果统计
     """
+    if format == "jsonl":
+        return _backup_all_streaming(session, output_dir, max_workers)
+
     results = {}
 
     for entity_type, handler_class in ENTITY_HANDLERS.items():
@@ -465,10 +836,66 @@ def backup_all_entities(session: Session, output_dir: str, format: str = "json")
     }
 
 
+def _backup_all_streaming(session: Session, output_dir: str, max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    并行流式备份所有实体，并写入带校验和的清单
+
+    每种实体类型在独立的会话和线程中导出为一个压缩JSONL文件。
+
+    Args:
+        session: 数据库会话，用于获取数据库连接
+        output_dir: 输出目录
+        max_workers: 并行导出的线程数
+
+    Returns:
+        Dict[str, Any]: 备份结果统计
+    """
+    ensure_directory_exists(output_dir)
+    bind = session.get_bind()
+    max_workers = max_workers or _load_backup_settings()["max_workers"]
+
+    def export(entity_type: str, handler_class: Type[EntityBackupRestoreHandler]) -> Dict[str, Any]:
+        with Session(bind=bind) as worker_session:
+            return handler_class(entity_type)._backup_to_jsonl(worker_session, output_dir)
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="backup-export") as executor:
+        futures = {entity_type: executor.submit(export, entity_type, handler_class) for entity_type, handler_class in ENTITY_HANDLERS.items()}
+        for entity_type, future in futures.items():
+            try:
+                results[entity_type] = future.result()
+            except Exception as e:
+                logger.error(f"备份实体类型 {entity_type} 失败: {str(e)}")
+                results[entity_type] = {"error": str(e)}
+
+    manifest = {
+        "version": BACKUP_FORMAT_VERSION,
+        "format": "jsonl",
+        "created_at": datetime.now().isoformat(),
+        "entities": {
+            entity_type: {key: result[key] for key in ("file", "table", "count", "sha256")}
+            for entity_type, result in results.items()
+            if "error" not in result
+        },
+    }
+    write_json_file(os.path.join(output_dir, MANIFEST_FILE), manifest)
+
+    return {
+        "entity_types": list(ENTITY_HANDLERS.keys()),
+        "format": "jsonl",
+        "output_dir": output_dir,
+        "manifest": MANIFEST_FILE,
+        "results": results,
+        "timestamp": manifest["created_at"],
+    }
+
+
 def restore_all_entities(session: Session, input_dir: str, format: str = "json", force: bool = False) -> Dict[str, Any]:
     """
     恢复所有实体
 
+    实体类型按外键依赖顺序恢复，被引用的表先写入。jsonl格式会先校验备份清单中的校验和。
+
     Args:
         session: 数据库会话
         input_dir: 输入目录
@@ -480,9 +907,27 @@ def restore_all_entities(session: Session, input_dir: str, format: str = "json",
     """
     results = {}
 
+    manifest_entities = {}
+    if format == "jsonl":
+        manifest_entities = read_backup_manifest(input_dir).get("entities", {})
+
+    table_names = {}
     for entity_type, handler_class in ENTITY_HANDLERS.items():
         try:
-            entity_input_path = os.path.join(input_dir, entity_type)
+            table_names[entity_type] = handler_class(entity_type).get_model_class(session).__table__.name
+        except Exception:
+            table_names[entity_type] = manifest_entities.get(entity_type, {}).get("table")
+
+    for entity_type in _dependency_order(ENTITY_HANDLERS.keys(), table_names):
+        handler_class = ENTITY_HANDLERS[entity_type]
+        try:
+            if format == "jsonl":
+                if entity_type not in manifest_entities:
+                    logger.warning(f"备份清单中没有实体类型 {entity_type}")
+                    continue
+                entity_input_path = os.path.join(input_dir, manifest_entities[entity_type]["file"])
+            else:
+                entity_input_path = os.path.join(input_dir, entity_type)
 
             if not os.path.exists(entity_input_path):
                 logger.warning(f"实体类型 {entity_type} 的输入路径不存在: {entity_input_path}")
@@ -0,0 +1,163 @@
+"""
+glob模式前缀树
+
+把大量glob模式按不含通配符的前缀路径段组织成前缀树，节点内再按扩展名分桶，
+匹配路径时只检查可能匹配的预编译模式。匹配语义与fnmatch.fnmatch一致（*可以跨越路径分隔符）。
+"""
+
+import fnmatch
+import functools
+import json
+import re
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Set, Tuple
+
+# glob中的通配字符
+_WILDCARD_CHARS = frozenset("*?[]")
+
+
+@functools.lru_cache(maxsize=4096)
+def compile_glob(pattern: str) -> Pattern[str]:
+    """编译glob模式，相同模式只编译一次"""
+    return re.compile(fnmatch.translate(pattern))
+
+
+def _extension(text: str) -> Optional[str]:
+    """最后一个路径段中最后一个点之后的部分，没有点时为None"""
+    name = text.rsplit("/", 1)[-1]
+    return name.rsplit(".", 1)[1] if "." in name else None
+
+
+def _split_pattern(pattern: str) -> Tuple[List[str], Optional[str]]:
+    """拆分glob模式
+
+    Returns:
+        Tuple[List[str], Optional[str]]: (不含通配符的前缀路径段, 匹配路径必然具有的扩展名)
+    """
+    segments = pattern.split("/")
+    prefix = []
+    for segment in segments:
+        if _WILDCARD_CHARS.intersection(segment):
+            break
+        prefix.append(segment)
+    # 模式以字面量结尾，匹配的路径也必然以它结尾
+    tail = len(pattern)
+    while tail > 0 and pattern[tail - 1] not in _WILDCARD_CHARS:
+        tail -= 1
+    return prefix, _extension(pattern[tail:])
+
+
+def parse_globs(globs: Any) -> List[str]:
+    """解析glob列表，兼容数据库中保存的JSON字符串和逗号分隔的字符串
+
+    Args:
+        globs: glob列表或字符串
+
+    Returns:
+        List[str]: glob模式列表
+    """
+    globs = globs or []
+    if isinstance(globs, str):
+        try:
+            globs = json.loads(globs)
+        except ValueError:
+            globs = [part.strip() for part in globs.split(",")]
+    if isinstance(globs, str):
+        globs = [globs]
+    return [pattern for pattern in globs if isinstance(pattern, str) and pattern]
+
+
+class _TrieNode:
+    __slots__ = ("children", "buckets")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        # 扩展名 -> 键 -> 该键在此节点的编译模式
+        self.buckets: Dict[Optional[str], Dict[str, List[Pattern[str]]]] = {}
+
+
+class GlobTrie:
+    """按路径段组织的glob匹配器"""
+
+    def __init__(self):
+        """初始化匹配器"""
+        self._root = _TrieNode()
+        # 键 -> 模式所在的(前缀路径段, 扩展名)，用于删除
+        self._locations: Dict[str, Set[Tuple[Tuple[str, ...], Optional[str]]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def add(self, key: str, patterns: Iterable[str]) -> None:
+        """添加（或替换）一个键的glob模式
+
+        Args:
+            key: 键，如规则ID
+            patterns: glob模式列表
+        """
+        self.remove(key)
+        locations = set()
+        for pattern in patterns:
+            prefix, extension = _split_pattern(pattern)
+            node = self._root
+            for segment in prefix:
+                node = node.children.setdefault(segment, _TrieNode())
+            node.buckets.setdefault(extension, {}).setdefault(key, []).append(compile_glob(pattern))
+            locations.add((tuple(prefix), extension))
+        if locations:
+            self._locations[key] = locations
+
+    def remove(self, key: str) -> bool:
+        """删除一个键的全部模式
+
+        Returns:
+            bool: 键是否存在
+        """
+        locations = self._locations.pop(key, None)
+        if locations is None:
+            return False
+        for prefix, extension in locations:
+            nodes = [self._root]
+            for segment in prefix:
+                child = nodes[-1].children.get(segment)
+                if child is None:
+                    # 节点已随同一键的其他模式一起清理
+                    break
+                nodes.append(child)
+            if len(nodes) <= len(prefix):
+                continue
+            bucket = nodes[-1].buckets.get(extension)
+            if bucket is not None:
+                bucket.pop(key, None)
+                if not bucket:
+                    del nodes[-1].buckets[extension]
+            # 清理空节点
+            for parent, segment, node in zip(reversed(nodes[:-1]), reversed(prefix), reversed(nodes[1:])):
+                if node.children or node.buckets:
+                    break
+                del parent.children[segment]
+        return True
+
+    def match(self, path: str) -> Set[str]:
+        """查找模式匹配路径的键
+
+        Args:
+            path: 文件路径
+
+        Returns:
+            Set[str]: 匹配的键
+        """
+        extension = _extension(path)
+        matched: Set[str] = set()
+        node: Optional[_TrieNode] = self._root
+        segments = iter(path.split("/"))
+        while node is not None:
+            for bucket_key in (extension, None) if extension is not None else (None,):
+                bucket = node.buckets.get(bucket_key)
+                if not bucket:
+                    continue
+                for key, patterns in bucket.items():
+                    if key not in matched and any(pattern.match(path) for pattern in patterns):
+                        matched.add(key)
+            segment = next(segments, None)
+            node = node.children.get(segment) if segment is not None else None
+        return matched
@@ -0,0 +1,397 @@
+"""
+规则适用性索引
+
+回答"哪些规则适用于这个路径/上下文"：
+- glob模式放在前缀树中（见src.utils.glob_trie），路径查询只检查可能匹配的预编译模式
+- 规则的嵌入向量按文本哈希缓存并持久化，上下文查询是一次矩阵乘法
+- 规则导入、删除时增量更新，不需要重新加载全部规则
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from src.core.config import get_config
+from src.utils.glob_trie import GlobTrie, parse_globs
+
+logger = logging.getLogger(__name__)
+
+Embedder = Callable[[List[str]], List[List[float]]]
+
+EMBEDDING_CACHE_VERSION = 1
+
+DEFAULT_SEMANTIC_TOP_K = 5
+DEFAULT_SEMANTIC_MIN_SCORE = 0.35
+
+# 上下文查询向量的缓存条数
+_QUERY_CACHE_SIZE = 256
+
+# 未设置嵌入函数的标记，首次语义查询时创建默认嵌入函数
+_UNSET: Any = object()
+
+
+def embedding_text(rule: Any) -> str:
+    """用于计算规则嵌入向量的文本"""
+    return "\n".join(part for part in (getattr(rule, "name", None), getattr(rule, "description", None)) if part).strip()
+
+
+@dataclass
+class RuleMatch:
+    """规则匹配结果"""
+
+    rule: Any
+    # always: 始终应用；glob: 文件模式匹配；semantic: 与上下文语义相近
+    reason: str
+    score: float = 1.0
+
+    @property
+    def rule_id(self) -> str:
+        """规则ID"""
+        return self.rule.id
+
+
+@dataclass(frozen=True)
+class RuleEntry:
+    """规则的索引快照，用于不能长期持有的规则对象（如会话关闭后会失效的数据库实体）"""
+
+    id: str
+    name: str = ""
+    description: str = ""
+    globs: Tuple[str, ...] = ()
+    always_apply: bool = False
+
+    @classmethod
+    def from_rule(cls, rule: Any) -> "RuleEntry":
+        """从规则对象创建快照"""
+        return cls(
+            id=rule.id,
+            name=getattr(rule, "name", None) or "",
+            description=getattr(rule, "description", None) or "",
+            globs=tuple(parse_globs(getattr(rule, "globs", None))),
+            always_apply=bool(getattr(rule, "always_apply", False)),
+        )
+
+
+class EmbeddingCache:
+    """按文本哈希缓存嵌入向量（归一化），可持久化到JSON文件"""
+
+    def __init__(self, path: Optional[str] = None, model: str = ""):
+        """
+        Args:
+            path: 缓存文件路径，为None时只在内存中缓存
+            model: 嵌入模型标识，模型不同的缓存互不复用
+        """
+        self.path = path
+        self.model = model
+        self._lock = threading.Lock()
+        self._vectors: Dict[str, np.ndarray] = self._load()
+
+    def key(self, text: str) -> str:
+        """文本的缓存键"""
+        return hashlib.sha1(f"{self.model}\0{text}".encode("utf-8")).hexdigest()
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        """获取文本的向量"""
+        return self._vectors.get(self.key(text))
+
+    def put_many(self, texts: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        """保存一批向量并写入缓存文件"""
+        with self._lock:
+            for text, vector in zip(texts, vectors):
+                self._vectors[self.key(text)] = _normalize(vector)
+            self._save()
+
+    def _load(self) -> Dict[str, np.ndarray]:
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"读取规则嵌入缓存失败: {e}")
+            return {}
+        if data.get("version") != EMBEDDING_CACHE_VERSION or data.get("model") != self.model:
+            return {}
+        return {key: np.asarray(vector, dtype=np.float32) for key, vector in (data.get("vectors") or {}).items()}
+
+    def _save(self) -> None:
+        """原子写入缓存文件"""
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                vectors = {key: [round(float(x), 6) for x in vector] for key, vector in self._vectors.items()}
+                json.dump({"version": EMBEDDING_CACHE_VERSION, "model": self.model, "vectors": vectors}, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"写入规则嵌入缓存失败: {e}")
+
+
+def _normalize(vector: Sequence[float]) -> np.ndarray:
+    array = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(array)
+    return array / norm if norm > 0 else array
+
+
+def default_embedder() -> Optional[Embedder]:
+    """使用配置的LLM服务创建同步嵌入函数，服务不可用时返回None"""
+    try:
+        from src.llm.runtime import run_sync
+        from src.llm.service_factory import create_llm_service
+
+        service = create_llm_service("openai")
+    except Exception as e:
+        logger.info(f"嵌入服务不可用，规则语义匹配已禁用: {e}")
+        return None
+    return lambda texts: run_sync(service.create_embeddings(texts))
+
+
+class RuleIndex:
+    """规则适用性索引
+
+    规则对象需要有id、name、description、globs、always_apply属性（Pydantic模型或数据库实体均可），
+    匹配结果中返回原对象。
+    """
+
+    def __init__(self, embedder: Optional[Embedder] = _UNSET, cache_path: Optional[str] = None):
+        """初始化索引
+
+        Args:
+            embedder: 批量计算嵌入向量的函数，默认在首次语义查询时按配置创建，为None时禁用语义匹配
+            cache_path: 嵌入向量缓存文件，为None时只在内存中缓存
+        """
+        config = get_config()
+        self._embedder = embedder
+        self._embeddings = EmbeddingCache(cache_path, f"{config.get('ai.embedding_model', '')}:{config.get('ai.embedding_dimension', '')}")
+        self._lock = threading.RLock()
+        self._rules: Dict[str, Any] = {}
+        # 规则ID -> 加入顺序，匹配结果按此排序
+        self._order: Dict[str, int] = {}
+        self._sequence = 0
+        self._always: Set[str] = set()
+        self._globs = GlobTrie()
+        # 语义匹配矩阵，规则变化后在下次语义查询时重建
+        self._matrix: Optional[np.ndarray] = None
+        self._matrix_rules: List[Any] = []
+        # 每次规则变化加一，用于判断锁外计算的矩阵是否过期
+        self._version = 0
+        self._queries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self.loaded_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    def __contains__(self, rule_id: str) -> bool:
+        return rule_id in self._rules
+
+    def replace(self, rules: Iterable[Any]) -> None:
+        """用完整的规则列表重建索引"""
+        with self._lock:
+            self._rules, self._order, self._always = {}, {}, set()
+            self._globs = GlobTrie()
+            for rule in rules:
+                self._add(rule)
+            self._invalidate()
+            self.loaded_at = time.monotonic()
+
+    def upsert(self, rule: Any) -> None:
+        """添加或更新一条规则"""
+        with self._lock:
+            self._add(rule)
+            self._invalidate()
+
+    def remove(self, rule_id: str) -> bool:
+        """删除一条规则
+
+        Returns:
+            bool: 规则是否在索引中
+        """
+        with self._lock:
+            if self._rules.pop(rule_id, None) is None:
+                return False
+            self._order.pop(rule_id, None)
+            self._always.discard(rule_id)
+            self._globs.remove(rule_id)
+            self._invalidate()
+            return True
+
+    def is_stale(self, max_age: float) -> bool:
+        """索引是否从未完整加载或加载时间超过max_age秒"""
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > max_age
+
+    def _invalidate(self) -> None:
+        self._version += 1
+        self._matrix, self._matrix_rules = None, []
+
+    def _add(self, rule: Any) -> None:
+        rule_id = rule.id
+        if rule_id not in self._order:
+            self._sequence += 1
+            self._order[rule_id] = self._sequence
+        self._rules[rule_id] = rule
+        if getattr(rule, "always_apply", False):
+            self._always.add(rule_id)
+        else:
+            self._always.discard(rule_id)
+        self._globs.add(rule_id, parse_globs(getattr(rule, "globs", None)))
+
+    def match_path(self, file_path: str) -> List[RuleMatch]:
+        """查找适用于文件的规则（始终应用的规则和glob匹配的规则）
+
+        Args:
+            file_path: 文件路径
+
+        Returns:
+            List[RuleMatch]: 按规则加入顺序排列的匹配结果
+        """
+        with self._lock:
+            matched = self._always | self._globs.match(file_path)
+            return [
+                RuleMatch(self._rules[rule_id], "always" if rule_id in self._always else "glob")
+                for rule_id in sorted(matched, key=self._order.__getitem__)
+            ]
+
+    def match_context(
+        self, context: str, top_k: Optional[int] = None, min_score: Optional[float] = None, exclude: Iterable[str] = ()
+    ) -> List[RuleMatch]:
+        """查找与上下文语义相近的规则
+
+        规则向量在规则变化后的首次查询时批量计算并缓存；相同的上下文文本只计算一次向量。
+        计算向量时不持有索引锁，路径查询不会被网络请求阻塞
+
+        Args:
+            context: 上下文文本，如当前任务或用户请求
+            top_k: 最多返回的规则数
+            min_score: 最低余弦相似度
+            exclude: 不参与语义匹配的规则ID
+
+        Returns:
+            List[RuleMatch]: 按相似度降序排列的匹配结果，嵌入服务不可用时为空
+        """
+        config = get_config()
+        top_k = top_k if top_k is not None else int(config.get("rule_engine.semantic_top_k", DEFAULT_SEMANTIC_TOP_K))
+        min_score = min_score if min_score is not None else float(config.get("rule_engine.semantic_min_score", DEFAULT_SEMANTIC_MIN_SCORE))
+        context = context.strip()
+        if not context or top_k <= 0:
+            return []
+
+        embedder = self._get_embedder()
+        if embedder is None:
+            return []
+        try:
+            query = self._query_vector(context, embedder)
+            matrix, rules = self._semantic_matrix(embedder)
+        except Exception as e:
+            logger.warning(f"计算嵌入向量失败，跳过规则语义匹配: {e}")
+            return []
+        if not rules:
+            return []
+
+        excluded = set(exclude)
+        scores = matrix @ query
+        results = []
+        for position in np.argsort(-scores):
+            score = float(scores[position])
+            if score < min_score or len(results) >= top_k:
+                break
+            if rules[position].id not in excluded:
+                results.append(RuleMatch(rules[position], "semantic", round(score, 4)))
+        return results
+
+    def match(
+        self, file_path: Optional[str] = None, context: Optional[str] = None, top_k: Optional[int] = None, min_score: Optional[float] = None
+    ) -> List[RuleMatch]:
+        """一次查询适用于路径和上下文的规则
+
+        Args:
+            file_path: 文件路径
+            context: 上下文文本
+            top_k: 语义匹配最多返回的规则数
+            min_score: 语义匹配的最低相似度
+
+        Returns:
+            List[RuleMatch]: 先是路径匹配的规则，再是语义相近的其他规则
+        """
+        if file_path:
+            matches = self.match_path(file_path)
+        else:
+            with self._lock:
+                matches = [RuleMatch(self._rules[rule_id], "always") for rule_id in sorted(self._always, key=self._order.__getitem__)]
+        if context:
+            matches += self.match_context(context, top_k, min_score, exclude=[match.rule_id for match in matches])
+        return matches
+
+    def _get_embedder(self) -> Optional[Embedder]:
+        if self._embedder is _UNSET:
+            embedder = default_embedder()
+            with self._lock:
+                if self._embedder is _UNSET:
+                    self._embedder = embedder
+        return self._embedder
+
+    def _query_vector(self, context: str, embedder: Embedder) -> np.ndarray:
+        with self._lock:
+            vector = self._queries.get(context)
+            if vector is not None:
+                self._queries.move_to_end(context)
+                return vector
+        vector = _normalize(embedder([context])[0])
+        with self._lock:
+            self._queries[context] = vector
+            if len(self._queries) > _QUERY_CACHE_SIZE:
+                self._queries.popitem(last=False)
+        return vector
+
+    def _semantic_matrix(self, embedder: Embedder) -> Tuple[Optional[np.ndarray], List[Any]]:
+        """有描述的规则的向量矩阵（每行已归一化）和对应的规则
+
+        缺少的向量在锁外一次批量计算；计算期间规则有变化时用计算开始时的规则快照回答本次查询，
+        下次查询再重建矩阵
+        """
+        with self._lock:
+            if self._matrix is not None:
+                return self._matrix, self._matrix_rules
+            version = self._version
+            rules = sorted(self._rules.values(), key=lambda rule: self._order[rule.id])
+        texts = [embedding_text(rule) for rule in rules]
+        rules = [rule for rule, text in zip(rules, texts) if text]
+        texts = [text for text in texts if text]
+
+        missing = sorted({text for text in texts if self._embeddings.get(text) is None})
+        if missing:
+            logger.info(f"计算 {len(missing)} 条规则的嵌入向量")
+            self._embeddings.put_many(missing, embedder(missing))
+        matrix = np.vstack([self._embeddings.get(text) for text in texts]) if texts else None
+
+        with self._lock:
+            if self._version == version:
+                self._matrix, self._matrix_rules = matrix, rules
+        return matrix, rules
+
+
+_rule_index: Optional[RuleIndex] = None
+_rule_index_lock = threading.Lock()
+
+
+def get_rule_index() -> RuleIndex:
+    """获取规则适用性索引单例
+
+    Returns:
+        RuleIndex: 索引实例，嵌入向量缓存到配置的rule_engine.embedding_cache文件
+    """
+    global _rule_index
+    if _rule_index is None:
+        with _rule_index_lock:
+            if _rule_index is None:
+                _rule_index = RuleIndex(cache_path=get_config().get("rule_engine.embedding_cache"))
+    return _rule_index
@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SQLite在线备份模块
+
+基于SQLite页级备份API提供在线一致性备份与恢复，按步复制页面并在步间让出锁，
+数据库在备份期间仍可被其他进程写入；另提供按页差异的增量快照，定时备份只保存变更的页面。
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import struct
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from src.utils.file_utils import ensure_directory_exists
+
+logger = logging.getLogger(__name__)
+
+# 进度回调：(已复制页数, 总页数)
+ProgressCallback = Callable[[int, int], None]
+
+# 页面摘要长度（字节）
+PAGE_DIGEST_SIZE = 16
+
+# 增量快照中的页面记录头：页号(uint32)
+_PAGE_HEADER = struct.Struct(">I")
+
+INDEX_FILE = "index.json"
+HASHES_FILE = "hashes.bin"
+
+
+def _load_sqlite_backup_settings() -> Dict[str, Any]:
+    """读取在线备份配置"""
+    settings: Dict[str, Any] = {"page_step": 256, "step_sleep": 0.005, "max_chain": 24}
+    try:
+        from src.core.config import get_config
+
+        config = get_config()
+        for key, default in settings.items():
+            settings[key] = type(default)(config.get(f"backup.{key}", default))
+    except Exception as e:
+        logger.warning(f"读取备份配置失败，使用默认值: {e}")
+    return settings
+
+
+def get_sqlite_db_path() -> str:
+    """
+    从配置中获取SQLite数据库文件路径
+
+    Returns:
+        str: 数据库文件绝对路径
+
+    Raises:
+        ValueError: 未配置数据库或不是SQLite数据库
+    """
+    from src.core.config import get_config
+
+    config = get_config()
+    database_url = config.get("database.url")
+    if not database_url:
+        raise ValueError("Database URL not found in configuration.")
+    if not database_url.startswith("sqlite:///"):
+        raise ValueError("Online backup currently only supports SQLite databases.")
+
+    db_path = database_url[len("sqlite:///") :]
+    if not os.path.isabs(db_path):
+        db_path = os.path.abspath(os.path.join(config.get("paths.project_root", os.getcwd()), db_path))
+    return db_path
+
+
+def _connect_source(db_path: str) -> sqlite3.Connection:
+    """打开备份源数据库，不存在时报错而不是创建空库"""
+    if not os.path.isfile(db_path):
+        raise FileNotFoundError(f"数据库文件不存在: {db_path}")
+    return sqlite3.connect(db_path)
+
+
+def _copy_pages(
+    source: sqlite3.Connection,
+    target: sqlite3.Connection,
+    pages: Optional[int],
+    sleep: Optional[float],
+    progress: Optional[ProgressCallback],
+) -> int:
+    """按步复制页面，返回总页数"""
+    settings = _load_sqlite_backup_settings()
+    pages = settings["page_step"] if pages is None else pages
+    sleep = settings["step_sleep"] if sleep is None else sleep
+    total_pages = [0]
+
+    def on_progress(status: int, remaining: int, total: int) -> None:
+        total_pages[0] = total
+        if progress:
+            progress(total - remaining, total)
+
+    source.backup(target, pages=pages, progress=on_progress, sleep=sleep)
+    return total_pages[0]
+
+
+def online_backup(
+    db_path: str,
+    output_path: str,
+    pages: Optional[int] = None,
+    sleep: Optional[float] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> Dict[str, Any]:
+    """
+    在线备份SQLite数据库
+
+    使用页级备份API生成一致的副本。每步复制 pages 个页面后休眠 sleep 秒，
+    其间其他连接可以继续写入；若源库在备份中被修改，SQLite会自动重新复制。
+
+    Args:
+        db_path: 源数据库路径
+        output_path: 备份文件路径
+        pages: 每步复制的页数，<=0表示一次复制全部
+        sleep: 步间休眠秒数
+        progress: 进度回调
+
+    Returns:
+        Dict[str, Any]: 备份结果，包含页数和文件大小
+    """
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+    ensure_directory_exists(output_dir)
+    tmp_path = f"{output_path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    source = _connect_source(db_path)
+    target = sqlite3.connect(tmp_path)
+    try:
+        total_pages = _copy_pages(source, target, pages, sleep, progress)
+    finally:
+        target.close()
+        source.close()
+    os.replace(tmp_path, output_path)
+
+    logger.info(f"在线备份数据库 {db_path} 到 {output_path}，共 {total_pages} 页")
+    return {"source": db_path, "output_path": output_path, "pages": total_pages, "size": os.path.getsize(output_path)}
+
+
+def online_restore(
+    backup_path: str,
+    db_path: str,
+    pages: Optional[int] = None,
+    sleep: Optional[float] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> Dict[str, Any]:
+    """
+    在线恢复SQLite数据库
+
+    通过备份API把备份内容写入目标数据库，写入遵循SQLite锁协议，
+    已打开的其他连接会看到一致的恢复结果，而不是被替换掉的文件。
+
+    Args:
+        backup_path: 备份文件路径
+        db_path: 目标数据库路径
+        pages: 每步复制的页数
+        sleep: 步间休眠秒数
+        progress: 进度回调
+
+    Returns:
+        Dict[str, Any]: 恢复结果
+    """
+    db_dir = os.path.dirname(os.path.abspath(db_path))
+    ensure_directory_exists(db_dir)
+
+    source = _connect_source(backup_path)
+    target = sqlite3.connect(db_path)
+    try:
+        total_pages = _copy_pages(source, target, pages, sleep, progress)
+    finally:
+        target.close()
+        source.close()
+
+    logger.info(f"从 {backup_path} 在线恢复数据库到 {db_path}，共 {total_pages} 页")
+    return {"input_path": backup_path, "db_path": db_path, "pages": total_pages}
+
+
+def _page_size(db_path: str) -> int:
+    """读取数据库页大小"""
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("PRAGMA page_size").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _iter_pages(file_path: str, page_size: int):
+    """按页读取数据库文件"""
+    with open(file_path, "rb") as f:
+        page_no = 0
+        for page in iter(lambda: f.read(page_size), b""):
+            yield page_no, page
+            page_no += 1
+
+
+def _digest(page: bytes) -> bytes:
+    return hashlib.blake2b(page, digest_size=PAGE_DIGEST_SIZE).digest()
+
+
+class SQLiteSnapshotStore:
+    """SQLite增量快照存储
+
+    目录中保存一个压缩的全量快照和其后的增量快照链，每个增量快照只记录与上一快照相比
+    发生变化的页面。hashes.bin 保存最新状态的页面摘要，生成新快照时无需回读历史快照。
+    链长度超过 max_chain 时自动生成新的全量快照。
+    """
+
+    def __init__(self, snapshot_dir: str, max_chain: Optional[int] = None):
+        """
+        初始化快照存储
+
+        Args:
+            snapshot_dir: 快照目录
+            max_chain: 两个全量快照之间最多的增量快照数
+        """
+        self.snapshot_dir = snapshot_dir
+        self.max_chain = max_chain if max_chain is not None else _load_sqlite_backup_settings()["max_chain"]
+        ensure_directory_exists(snapshot_dir)
+
+    def list_snapshots(self) -> List[Dict[str, Any]]:
+        """
+        列出所有快照
+
+        Returns:
+            List[Dict[str, Any]]: 按时间排序的快照信息
+        """
+        return list(self._read_index()["snapshots"])
+
+    def create_snapshot(
+        self,
+        db_path: str,
+        full: bool = False,
+        pages: Optional[int] = None,
+        sleep: Optional[float] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Dict[str, Any]:
+        """
+        创建快照
+
+        先通过在线备份得到一致的临时副本，再与上一快照的页面摘要比较，只保存变化的页面。
+
+        Args:
+            db_path: 源数据库路径
+            full: 是否强制生成全量快照
+            pages: 在线备份每步复制的页数
+            sleep: 在线备份步间休眠秒数
+            progress: 在线备份进度回调
+
+        Returns:
+            Dict[str, Any]: 快照信息
+        """
+        index = self._read_index()
+        snapshot_id = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        tmp_copy = os.path.join(self.snapshot_dir, f".{snapshot_id}.db")
+
+        try:
+            online_backup(db_path, tmp_copy, pages=pages, sleep=sleep, progress=progress)
+            page_size = _page_size(tmp_copy)
+            previous_hashes = self._read_hashes()
+            chain_length = self._chain_length(index["snapshots"])
+
+            if full or not index["snapshots"] or index.get("page_size") != page_size or chain_length >= self.max_chain:
+                entry, hashes = self._write_full(snapshot_id, tmp_copy, page_size)
+            else:
+                entry, hashes = self._write_incremental(snapshot_id, tmp_copy, page_size, previous_hashes)
+        finally:
+            if os.path.exists(tmp_copy):
+                os.remove(tmp_copy)
+
+        self._write_hashes(hashes)
+        index["page_size"] = page_size
+        index["snapshots"].append(entry)
+        self._write_index(index)
+
+        logger.info(f"创建{('全量' if entry['type'] == 'full' else '增量')}快照 {snapshot_id}: {entry['changed_pages']}/{entry['page_count']} 页")
+        return entry
+
+    def restore_snapshot(self, output_path: str, snapshot_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        把快照还原为完整的数据库文件
+
+        Args:
+            output_path: 输出数据库文件路径
+            snapshot_id: 快照ID，None表示最新快照
+
+        Returns:
+            Dict[str, Any]: 还原的快照信息
+
+        Raises:
+            ValueError: 快照不存在
+        """
+        index = self._read_index()
+        snapshots = index["snapshots"]
+        if not snapshots:
+            raise ValueError(f"快照目录中没有快照: {self.snapshot_dir}")
+
+        position = len(snapshots) - 1
+        if snapshot_id is not None:
+            ids = [s["id"] for s in snapshots]
+            if snapshot_id not in ids:
+                raise ValueError(f"快照不存在: {snapshot_id}")
+            position = ids.index(snapshot_id)
+
+        base = max(i for i in range(position + 1) if snapshots[i]["type"] == "full")
+        target = snapshots[position]
+        page_size = index["page_size"]
+        tmp_path = f"{output_path}.tmp"
+        ensure_directory_exists(os.path.dirname(os.path.abspath(output_path)))
+
+        with open(tmp_path, "wb") as out:
+            with gzip.open(os.path.join(self.snapshot_dir, snapshots[base]["file"]), "rb") as src:
+                for chunk in iter(lambda: src.read(1024 * 1024), b""):
+                    out.write(chunk)
+            for snapshot in snapshots[base + 1 : position + 1]:
+                with gzip.open(os.path.join(self.snapshot_dir, snapshot["file"]), "rb") as src:
+                    for page_no, page in _read_page_records(src, page_size):
+                        out.seek(page_no * page_size)
+                        out.write(page)
+            out.truncate(target["page_count"] * page_size)
+        os.replace(tmp_path, output_path)
+
+        logger.info(f"还原快照 {target['id']} 到 {output_path}（应用 {position - base} 个增量快照）")
+        return target
+
+    def _write_full(self, snapshot_id: str, copy_path: str, page_size: int):
+        """写入全量快照"""
+        file_name = f"{snapshot_id}.full.gz"
+        hashes = []
+        with gzip.open(os.path.join(self.snapshot_dir, file_name), "wb", compresslevel=6) as out:
+            for _, page in _iter_pages(copy_path, page_size):
+                hashes.append(_digest(page))
+                out.write(page)
+        entry = self._entry(snapshot_id, "full", file_name, len(hashes), len(hashes))
+        return entry, hashes
+
+    def _write_incremental(self, snapshot_id: str, copy_path: str, page_size: int, previous_hashes: List[bytes]):
+        """写入只包含变更页面的增量快照"""
+        file_name = f"{snapshot_id}.pages.gz"
+        hashes = []
+        changed = 0
+        with gzip.open(os.path.join(self.snapshot_dir, file_name), "wb", compresslevel=6) as out:
+            for page_no, page in _iter_pages(copy_path, page_size):
+                digest = _digest(page)
+                hashes.append(digest)
+                if page_no < len(previous_hashes) and previous_hashes[page_no] == digest:
+                    continue
+                out.write(_PAGE_HEADER.pack(page_no))
+                out.write(page)
+                changed += 1
+        entry = self._entry(snapshot_id, "incremental", file_name, len(hashes), changed)
+        return entry, hashes
+
+    def _entry(self, snapshot_id: str, snapshot_type: str, file_name: str, page_count: int, changed_pages: int) -> Dict[str, Any]:
+        return {
+            "id": snapshot_id,
+            "type": snapshot_type,
+            "file": file_name,
+            "page_count": page_count,
+            "changed_pages": changed_pages,
+            "size": os.path.getsize(os.path.join(self.snapshot_dir, file_name)),
+            "created_at": datetime.now().isoformat(),
+        }
+
+    @staticmethod
+    def _chain_length(snapshots: List[Dict[str, Any]]) -> int:
+        """最近一个全量快照之后的增量快照数"""
+        length = 0
+        for snapshot in reversed(snapshots):
+            if snapshot["type"] == "full":
+                break
+            length += 1
+        return length
+
+    def _read_index(self) -> Dict[str, Any]:
+        path = os.path.join(self.snapshot_dir, INDEX_FILE)
+        if not os.path.isfile(path):
+            return {"page_size": None, "snapshots": []}
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_index(self, index: Dict[str, Any]) -> None:
+        path = os.path.join(self.snapshot_dir, INDEX_FILE)
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, indent=2)
+        os.replace(f"{path}.tmp", path)
+
+    def _read_hashes(self) -> List[bytes]:
+        path = os.path.join(self.snapshot_dir, HASHES_FILE)
+        if not os.path.isfile(path):
+            return []
+        with open(path, "rb") as f:
+            data = f.read()
+        return [data[i : i + PAGE_DIGEST_SIZE] for i in range(0, len(data), PAGE_DIGEST_SIZE)]
+
+    def _write_hashes(self, hashes: List[bytes]) -> None:
+        path = os.path.join(self.snapshot_dir, HASHES_FILE)
+        with open(f"{path}.tmp", "wb") as f:
+            f.write(b"".join(hashes))
+        os.replace(f"{path}.tmp", path)
+
+
+def _read_page_records(fileobj, page_size: int):
+    """读取增量快照中的 (页号, 页面) 记录"""
+    while True:
+        header = fileobj.read(_PAGE_HEADER.size)
+        if not header:
+            return
+        (page_no,) = _PAGE_HEADER.unpack(header)
+        yield page_no, fileobj.read(page_size)
@@ -7,6 +7,7 @@
 from src.validation.core.base_validator import BaseValidator, ValidationResult
 from src.validation.core.roadmap_validator import RoadmapCoreValidator
 from src.validation.core.rule_validator import RuleValidator
+from src.validation.core.schema_registry import SchemaRegistry, get_schema_registry
 from src.validation.core.template_validator import TemplateValidator
 from src.validation.core.validator import Validator
 from src.validation.core.yaml_validator import YamlValidator
@@ -19,4 +20,6 @@ __all__ = [
     "TemplateValidator",
     "RoadmapCoreValidator",
     "Validator",
+    "SchemaRegistry",
+    "get_schema_registry",
 ]
@@ -8,7 +8,9 @@ import logging
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional, Tuple, Union
 
-from jsonschema import ValidationError, validate
+from jsonschema import SchemaError
+
+from src.validation.core.schema_registry import get_schema_registry
 
 logger = logging.getLogger(__name__)
 
@@ -82,6 +84,8 @@ class BaseValidator(ABC):
         """
         使用JSON Schema验证数据结构
 
+        Schema只在首次使用时编译，之后复用；返回全部错误而不是第一个
+
         Args:
             data: 要验证的数据
             schema: JSON Schema定义
@@ -90,10 +94,10 @@ class BaseValidator(ABC):
             Tuple[bool, List[str]]: (是否验证通过, 错误信息列表)
         """
         try:
-            validate(instance=data, schema=schema)
-            return True, []
-        except ValidationError as e:
-            return False, [str(e)]
+            return get_schema_registry().validate(schema, data)
+        except SchemaError as e:
+            self.logger.error(f"Schema定义无效: {e.message}")
+            return False, [f"Schema定义无效: {e.message}"]
         except Exception as e:
             self.logger.error(f"Schema验证失败: {str(e)}")
             return False, [f"Schema验证失败: {str(e)}"]
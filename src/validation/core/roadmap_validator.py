@@ -9,8 +9,8 @@ import os
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 import yaml
-from jsonschema import Draft7Validator, ValidationError
 
+from src.validation.core.schema_registry import get_schema_registry
 from src.validation.core.validator import Validator
 
 logger = logging.getLogger(__name__)
@@ -30,7 +30,7 @@ class RoadmapCoreValidator(Validator):
         self.schema = schema
 
         if self.schema:
-            self.validator = Draft7Validator(self.schema)
+            self.validator = get_schema_registry().validator_for(self.schema)
         else:
             self.validator = None
 
@@ -0,0 +1,341 @@
+"""
+Schema注册表模块
+
+每个Schema只检查和编译一次，之后复用编译好的验证器；
+验证时通过iter_errors收集全部错误，并支持在进程池中批量验证大量文档或整个目录
+"""
+
+import glob
+import hashlib
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import yaml
+from jsonschema import Draft7Validator, ValidationError
+
+from src.core.config import get_config
+
+logger = logging.getLogger(__name__)
+
+# 单个文档的验证结果：(是否通过, 错误信息列表)
+SchemaResult = Tuple[bool, List[str]]
+
+# 自定义结构描述中直接对应JSON Schema的关键字
+_STRUCTURE_KEYWORDS = ("enum", "pattern", "format", "minLength", "maxLength", "minimum", "maximum", "minItems", "maxItems")
+
+_IDENTITY_CACHE_SIZE = 256
+
+_SCHEMA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "schema")
+
+
+def structure_to_json_schema(structure: Dict[str, Any]) -> Dict[str, Any]:
+    """将YAML模式文件中的structure描述转换为JSON Schema
+
+    带默认值的必填字段会被验证器自动补全，因此不作为必填项
+
+    Args:
+        structure: 字段名到字段描述的映射
+
+    Returns:
+        Dict[str, Any]: 对象类型的JSON Schema
+    """
+    properties = {}
+    required = []
+    for name, spec in (structure or {}).items():
+        if not isinstance(spec, dict):
+            continue
+        properties[name] = _field_to_json_schema(spec)
+        if spec.get("required") is True and "default" not in spec:
+            required.append(name)
+    schema: Dict[str, Any] = {"type": "object", "properties": properties, "additionalProperties": True}
+    if required:
+        schema["required"] = required
+    return schema
+
+
+def _field_to_json_schema(spec: Dict[str, Any]) -> Dict[str, Any]:
+    schema: Dict[str, Any] = {}
+    field_type = spec.get("type")
+    if field_type and field_type != "any":
+        schema["type"] = field_type
+    for keyword in _STRUCTURE_KEYWORDS:
+        if keyword in spec:
+            schema[keyword] = spec[keyword]
+    if isinstance(spec.get("items"), dict):
+        schema["items"] = _field_to_json_schema(spec["items"])
+    if isinstance(spec.get("properties"), dict):
+        schema.update({key: value for key, value in structure_to_json_schema(spec["properties"]).items() if key != "type"})
+    return schema
+
+
+def load_schema_file(schema_path: str) -> Dict[str, Any]:
+    """加载YAML模式文件并转换为JSON Schema
+
+    Args:
+        schema_path: 模式文件路径
+
+    Returns:
+        Dict[str, Any]: JSON Schema
+    """
+    with open(schema_path, "r", encoding="utf-8") as f:
+        data = yaml.safe_load(f) or {}
+    return to_json_schema(data)
+
+
+def to_json_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """将structure格式的模式转换为JSON Schema，已是JSON Schema时原样返回"""
+    if isinstance(schema, dict) and isinstance(schema.get("structure"), dict):
+        return structure_to_json_schema(schema["structure"])
+    return schema
+
+
+def format_error(error: ValidationError) -> str:
+    """格式化单个验证错误"""
+    path = ".".join(str(p) for p in error.absolute_path) if error.absolute_path else "根节点"
+    return f"路径 '{path}': {error.message}"
+
+
+def _fingerprint(schema: Dict[str, Any]) -> str:
+    return hashlib.sha1(json.dumps(schema, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _builtin_roadmap_schema() -> Dict[str, Any]:
+    from src.validation.schema.roadmap_schema import get_roadmap_schema
+
+    return get_roadmap_schema()
+
+
+def _builtin_workflow_schema() -> Dict[str, Any]:
+    from src.validation.core.workflow_validator import WorkflowValidator
+
+    return WorkflowValidator().workflow_schema
+
+
+# 内置Schema：名称 -> 加载函数
+BUILTIN_SCHEMAS: Dict[str, Callable[[], Dict[str, Any]]] = {
+    "roadmap": _builtin_roadmap_schema,
+    "rule": lambda: load_schema_file(os.path.join(_SCHEMA_DIR, "rule_schema.yaml")),
+    "template": lambda: load_schema_file(os.path.join(_SCHEMA_DIR, "template_schema.yaml")),
+    "workflow": _builtin_workflow_schema,
+    "workflow_definition": lambda: load_schema_file(os.path.join(_SCHEMA_DIR, "workflow_schema.yaml")),
+}
+
+
+class SchemaRegistry:
+    """编译后Schema验证器的注册表"""
+
+    def __init__(self):
+        """初始化注册表"""
+        self._loaders: Dict[str, Callable[[], Dict[str, Any]]] = dict(BUILTIN_SCHEMAS)
+        self._schemas: Dict[str, Dict[str, Any]] = {}
+        self._compiled: Dict[str, Draft7Validator] = {}
+        # id(schema) -> (schema, validator)，保留schema引用保证id不被复用
+        self._by_identity: Dict[int, Tuple[Any, Draft7Validator]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, schema: Dict[str, Any]) -> None:
+        """注册（或替换）命名Schema
+
+        Args:
+            name: Schema名称
+            schema: JSON Schema或structure格式的模式
+        """
+        with self._lock:
+            self._loaders[name] = lambda: schema
+            self._schemas.pop(name, None)
+
+    def names(self) -> List[str]:
+        """获取所有已注册的Schema名称"""
+        return sorted(self._loaders)
+
+    def get_schema(self, name: str) -> Dict[str, Any]:
+        """获取命名Schema（JSON Schema形式）
+
+        Raises:
+            KeyError: Schema未注册
+        """
+        with self._lock:
+            schema = self._schemas.get(name)
+            if schema is None:
+                if name not in self._loaders:
+                    raise KeyError(f"未注册的Schema: {name}")
+                schema = self._schemas[name] = to_json_schema(self._loaders[name]())
+            return schema
+
+    def validator_for(self, schema: Dict[str, Any]) -> Draft7Validator:
+        """获取Schema的编译验证器，相同内容的Schema只检查和编译一次
+
+        Args:
+            schema: JSON Schema或structure格式的模式
+
+        Returns:
+            Draft7Validator: 编译后的验证器
+
+        Raises:
+            jsonschema.SchemaError: Schema本身无效
+        """
+        # 同一个Schema对象直接命中，避免每次序列化计算指纹
+        cached = self._by_identity.get(id(schema))
+        if cached is not None and cached[0] is schema:
+            return cached[1]
+
+        json_schema = to_json_schema(schema)
+        key = _fingerprint(json_schema)
+        validator = self._compiled.get(key)
+        if validator is None:
+            Draft7Validator.check_schema(json_schema)
+            validator = Draft7Validator(json_schema)
+        with self._lock:
+            validator = self._compiled.setdefault(key, validator)
+            if len(self._by_identity) >= _IDENTITY_CACHE_SIZE:
+                # 调用方每次传入新字典时不无限增长
+                self._by_identity.clear()
+            self._by_identity[id(schema)] = (schema, validator)
+        return validator
+
+    def get_validator(self, name: str) -> Draft7Validator:
+        """获取命名Schema的编译验证器"""
+        return self.validator_for(self.get_schema(name))
+
+    def validate(self, schema: Any, data: Any) -> SchemaResult:
+        """验证单个文档，收集全部错误
+
+        Args:
+            schema: Schema名称或Schema定义
+            data: 要验证的数据
+
+        Returns:
+            SchemaResult: (是否通过, 按路径排序的错误信息列表)
+        """
+        validator = self.get_validator(schema) if isinstance(schema, str) else self.validator_for(schema)
+        errors = sorted(validator.iter_errors(data), key=lambda e: [str(p) for p in e.absolute_path])
+        return not errors, [format_error(error) for error in errors]
+
+    def validate_many(self, schema: Any, documents: Sequence[Any], max_workers: Optional[int] = None) -> List[SchemaResult]:
+        """批量验证文档，数量较多时在进程池中并行
+
+        Args:
+            schema: Schema名称或Schema定义
+            documents: 文档列表
+            max_workers: 最大进程数，默认读取配置
+
+        Returns:
+            List[SchemaResult]: 与documents顺序一致的结果
+        """
+        schema = self.get_schema(schema) if isinstance(schema, str) else to_json_schema(schema)
+        chunks = self._chunks(list(documents), max_workers)
+        if len(chunks) <= 1:
+            return _validate_chunk(schema, chunks[0] if chunks else [])
+        with ProcessPoolExecutor(max_workers=len(chunks)) as executor:
+            parts = executor.map(_validate_chunk, [schema] * len(chunks), chunks)
+            return [result for part in parts for result in part]
+
+    def validate_files(self, schema: Any, paths: Iterable[str], max_workers: Optional[int] = None) -> Dict[str, SchemaResult]:
+        """批量加载并验证YAML/JSON文件，解析和验证都在工作进程中完成
+
+        Args:
+            schema: Schema名称或Schema定义
+            paths: 文件路径
+            max_workers: 最大进程数，默认读取配置
+
+        Returns:
+            Dict[str, SchemaResult]: 文件路径到验证结果的映射
+        """
+        schema = self.get_schema(schema) if isinstance(schema, str) else to_json_schema(schema)
+        paths = list(paths)
+        chunks = self._chunks(paths, max_workers)
+        if len(chunks) <= 1:
+            results = _validate_file_chunk(schema, chunks[0] if chunks else [])
+        else:
+            with ProcessPoolExecutor(max_workers=len(chunks)) as executor:
+                parts = executor.map(_validate_file_chunk, [schema] * len(chunks), chunks)
+                results = [result for part in parts for result in part]
+        return dict(zip(paths, results))
+
+    def validate_directory(
+        self,
+        schema: Any,
+        directory: str,
+        patterns: Sequence[str] = ("*.yaml", "*.yml", "*.json"),
+        recursive: bool = True,
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, SchemaResult]:
+        """验证目录下的所有文档
+
+        Args:
+            schema: Schema名称或Schema定义
+            directory: 目录路径
+            patterns: 文件名模式
+            recursive: 是否包含子目录
+            max_workers: 最大进程数，默认读取配置
+
+        Returns:
+            Dict[str, SchemaResult]: 文件路径到验证结果的映射
+        """
+        paths = set()
+        for pattern in patterns:
+            full_pattern = os.path.join(directory, "**", pattern) if recursive else os.path.join(directory, pattern)
+            paths.update(glob.glob(full_pattern, recursive=recursive))
+        return self.validate_files(schema, sorted(paths), max_workers)
+
+    def _chunks(self, items: List[Any], max_workers: Optional[int]) -> List[List[Any]]:
+        """按进程数切分，数量低于阈值时不使用进程池"""
+        config = get_config()
+        if max_workers is None:
+            max_workers = int(config.get("validation.max_workers", os.cpu_count() or 1))
+        threshold = int(config.get("validation.parallel_threshold", 200))
+        if not items:
+            return []
+        if max_workers <= 1 or len(items) < threshold:
+            return [items]
+        size = -(-len(items) // max_workers)
+        return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def _validate_chunk(schema: Dict[str, Any], documents: List[Any]) -> List[SchemaResult]:
+    """验证一组文档（可在工作进程中执行，每个进程只编译一次Schema）"""
+    registry = get_schema_registry()
+    return [registry.validate(schema, document) for document in documents]
+
+
+def _load_document(path: str) -> Any:
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".json"):
+            return json.load(f)
+        return yaml.safe_load(f)
+
+
+def _validate_file_chunk(schema: Dict[str, Any], paths: List[str]) -> List[SchemaResult]:
+    """加载并验证一组文件（可在工作进程中执行）"""
+    registry = get_schema_registry()
+    results = []
+    for path in paths:
+        try:
+            document = _load_document(path)
+        except Exception as e:
+            results.append((False, [f"加载文件失败: {str(e)}"]))
+            continue
+        results.append(registry.validate(schema, document))
+    return results
+
+
+_registry: Optional[SchemaRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_schema_registry() -> SchemaRegistry:
+    """获取Schema注册表单例
+
+    Returns:
+        SchemaRegistry: 注册表实例
+    """
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = SchemaRegistry()
+    return _registry
@@ -99,14 +99,16 @@ class YamlValidator(BaseValidator):
         Returns:
             验证结果
         """
-        # 基本实现，子类应重写此方法进行更详细的验证
         result = ValidationResult(True, data=data)
 
         if not self.schema:
             return result
 
-        # 这里应该实现具体的模式验证逻辑
-        # 例如检查必填字段、类型验证等
+        # structure格式的模式在注册表中转换并编译一次
+        is_valid, errors = self.validate_schema(data, self.schema)
+        if not is_valid:
+            result.is_valid = False
+            result.add_messages(errors)
 
         return result
 
@@ -0,0 +1,279 @@
+"""
+工作流阶段图编译模块
+
+把工作流定义的阶段编译为内存中的有向无环图：拓扑顺序、依赖位集和先决条件谓词。
+编译结果按工作流定义版本缓存，工作流或阶段更新时自动失效，
+使阶段导航（下一阶段、会话进度）不再需要逐阶段访问数据库。
+"""
+
+import heapq
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from src.models.db import Stage, WorkflowDefinition
+
+logger = logging.getLogger(__name__)
+
+# 先决条件谓词：接收会话上下文，返回是否满足
+Predicate = Callable[[Dict[str, Any]], bool]
+
+# 未设置权重的阶段排在最后
+DEFAULT_STAGE_WEIGHT = 999
+
+
+def compile_prerequisites(prerequisites: Optional[Dict[str, Any]]) -> Optional[Predicate]:
+    """将先决条件字典编译为谓词
+
+    所有键都必须存在于上下文中且值相等
+
+    Args:
+        prerequisites: 先决条件字典
+
+    Returns:
+        谓词函数，没有先决条件时返回None
+    """
+    if not prerequisites:
+        return None
+    items = tuple(prerequisites.items())
+
+    def predicate(context: Dict[str, Any]) -> bool:
+        if not context:
+            return False
+        for key, value in items:
+            if key not in context or context[key] != value:
+                return False
+        return True
+
+    return predicate
+
+
+class WorkflowGraph:
+    """编译后的工作流阶段图"""
+
+    def __init__(self, workflow_id: str, version: Any, stages: List[Dict[str, Any]]):
+        """编译阶段图
+
+        Args:
+            workflow_id: 工作流ID
+            version: 工作流定义版本（用于缓存校验）
+            stages: 阶段字典列表，按定义顺序排列
+        """
+        self.workflow_id = workflow_id
+        self.version = version
+        self.stages: List[Dict[str, Any]] = [stage for stage in stages if stage.get("id")]
+        self._by_id: Dict[str, Dict[str, Any]] = {stage["id"]: stage for stage in self.stages}
+
+        # 每个阶段（以及依赖中引用但未定义的阶段）分配一个位
+        self.index: Dict[str, int] = {}
+        for stage in self.stages:
+            self._bit(stage["id"])
+        self.dep_masks: Dict[str, int] = {}
+        for stage in self.stages:
+            mask = 0
+            for dep_id in stage.get("depends_on") or []:
+                mask |= self._bit(dep_id)
+            self.dep_masks[stage["id"]] = mask
+
+        self.predicates: Dict[str, Optional[Predicate]] = {stage["id"]: compile_prerequisites(stage.get("prerequisites")) for stage in self.stages}
+        self.order: List[str] = self._topological_order()
+        self._weights = {stage["id"]: stage.get("weight") if stage.get("weight") is not None else DEFAULT_STAGE_WEIGHT for stage in self.stages}
+
+    def _bit(self, stage_id: str) -> int:
+        if stage_id not in self.index:
+            self.index[stage_id] = len(self.index)
+        return 1 << self.index[stage_id]
+
+    def _topological_order(self) -> List[str]:
+        """按依赖关系计算拓扑顺序，同层按定义顺序；存在环时剩余阶段按定义顺序追加"""
+        position = {stage["id"]: i for i, stage in enumerate(self.stages)}
+        dependents: Dict[str, List[str]] = {stage_id: [] for stage_id in position}
+        indegree = {stage_id: 0 for stage_id in position}
+        for stage in self.stages:
+            for dep_id in set(stage.get("depends_on") or []):
+                if dep_id in dependents and dep_id != stage["id"]:
+                    dependents[dep_id].append(stage["id"])
+                    indegree[stage["id"]] += 1
+
+        ready = [(position[stage_id], stage_id) for stage_id, degree in indegree.items() if degree == 0]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            _, stage_id = heapq.heappop(ready)
+            order.append(stage_id)
+            for child in dependents[stage_id]:
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    heapq.heappush(ready, (position[child], child))
+
+        if len(order) < len(self.stages):
+            remaining = [stage["id"] for stage in self.stages if stage["id"] not in set(order)]
+            logger.warning(f"工作流 {self.workflow_id} 的阶段依赖存在环: {remaining}")
+            order.extend(remaining)
+        return order
+
+    def __len__(self) -> int:
+        return len(self.stages)
+
+    def __contains__(self, stage_id: str) -> bool:
+        return stage_id in self._by_id
+
+    def get_stage(self, stage_id: str) -> Optional[Dict[str, Any]]:
+        """根据ID获取阶段字典"""
+        return self._by_id.get(stage_id)
+
+    def first_stage(self) -> Optional[Dict[str, Any]]:
+        """获取拓扑顺序中的第一个阶段"""
+        return self._by_id[self.order[0]] if self.order else None
+
+    def mask(self, stage_ids: Optional[Iterable[str]]) -> int:
+        """将阶段ID集合转换为位集，未知阶段忽略"""
+        result = 0
+        for stage_id in stage_ids or []:
+            bit = self.index.get(stage_id)
+            if bit is not None:
+                result |= 1 << bit
+        return result
+
+    def next_stages(
+        self,
+        current_stage_id: Optional[str],
+        completed_stage_ids: Optional[Iterable[str]] = None,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """计算可进入的下一阶段
+
+        依赖都已完成（当前阶段视为已完成）且先决条件满足的阶段可进入
+
+        Args:
+            current_stage_id: 当前阶段ID
+            completed_stage_ids: 已完成阶段ID列表
+            context: 会话上下文
+
+        Returns:
+            按权重排序的阶段字典列表
+        """
+        completed = set(completed_stage_ids or [])
+        done = self.mask(completed) | self.mask([current_stage_id] if current_stage_id else [])
+        context = context or {}
+
+        candidates = []
+        for stage in self.stages:
+            stage_id = stage["id"]
+            if stage_id == current_stage_id or stage_id in completed:
+                continue
+            required = self.dep_masks[stage_id]
+            if required & done != required:
+                continue
+            predicate = self.predicates[stage_id]
+            if predicate is not None and not predicate(context):
+                continue
+            candidates.append(stage)
+
+        candidates.sort(key=lambda s: self._weights[s["id"]])
+        return candidates
+
+    def progress(self, current_stage_id: Optional[str], completed_stage_ids: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """计算会话进度
+
+        Args:
+            current_stage_id: 当前阶段ID
+            completed_stage_ids: 已完成阶段ID列表
+
+        Returns:
+            进度信息字典，阶段按拓扑顺序排列并带有status字段
+        """
+        completed = set(completed_stage_ids or [])
+        completed_list, pending_list = [], []
+        current = None
+        for stage_id in self.order:
+            stage = self._by_id[stage_id]
+            if stage_id in completed:
+                completed_list.append({**stage, "status": "COMPLETED"})
+            elif stage_id == current_stage_id:
+                current = {**stage, "status": "ACTIVE"}
+            else:
+                pending_list.append({**stage, "status": "PENDING"})
+
+        total = len(self.stages)
+        return {
+            "current_stage": current,
+            "total_stages": total,
+            "completed_count": len(completed_list),
+            "completed_stages": completed_list,
+            "pending_stages": pending_list,
+            "progress_percentage": (len(completed_list) / total * 100) if total > 0 else 0,
+        }
+
+
+def workflow_version(workflow: WorkflowDefinition) -> Any:
+    """获取工作流定义的版本标识"""
+    return workflow.updated_at.isoformat() if workflow.updated_at else None
+
+
+def _stage_dicts(session: Session, workflow: WorkflowDefinition) -> List[Dict[str, Any]]:
+    """加载工作流的阶段，没有阶段记录时使用定义中的stages_data"""
+    from src.db.repositories.stage_repository import StageRepository
+
+    stages = StageRepository().get_by_workflow_id(session, workflow.id)
+    if stages:
+        return [stage.to_dict() for stage in stages]
+    return [dict(stage) for stage in workflow.stages_data or [] if isinstance(stage, dict)]
+
+
+_graph_cache: Dict[str, WorkflowGraph] = {}
+_cache_lock = threading.Lock()
+
+
+def get_workflow_graph(session: Session, workflow: WorkflowDefinition) -> WorkflowGraph:
+    """获取工作流的编译阶段图，版本未变化时复用缓存
+
+    Args:
+        session: 数据库会话
+        workflow: 工作流定义
+
+    Returns:
+        WorkflowGraph: 编译后的阶段图
+    """
+    version = workflow_version(workflow)
+    with _cache_lock:
+        graph = _graph_cache.get(workflow.id)
+    if graph is not None and graph.version == version:
+        return graph
+
+    graph = WorkflowGraph(workflow.id, version, _stage_dicts(session, workflow))
+    with _cache_lock:
+        _graph_cache[workflow.id] = graph
+    logger.debug(f"已编译工作流 {workflow.id} 的阶段图（{len(graph)} 个阶段）")
+    return graph
+
+
+def invalidate_workflow_graph(workflow_id: Optional[str] = None) -> None:
+    """使阶段图缓存失效
+
+    Args:
+        workflow_id: 工作流ID，为None时清空全部缓存
+    """
+    with _cache_lock:
+        if workflow_id is None:
+            _graph_cache.clear()
+        else:
+            _graph_cache.pop(workflow_id, None)
+
+
+@event.listens_for(WorkflowDefinition, "after_update")
+@event.listens_for(WorkflowDefinition, "after_delete")
+def _on_workflow_changed(mapper, connection, target) -> None:
+    invalidate_workflow_graph(target.id)
+
+
+@event.listens_for(Stage, "after_insert")
+@event.listens_for(Stage, "after_update")
+@event.listens_for(Stage, "after_delete")
+def _on_stage_changed(mapper, connection, target) -> None:
+    # 阶段变化不会更新工作流的updated_at，需要单独失效
+    if target.workflow_id:
+        invalidate_workflow_graph(target.workflow_id)
@@ -8,10 +8,11 @@
 
 # 导入所有需要公开的函数
 from src.workflow.service.base import get_workflow_file_path, get_workflows_directory
+from src.workflow.service.catalog import WorkflowCatalog, get_workflow_catalog
 from src.workflow.service.create import create_workflow
 from src.workflow.service.delete import delete_workflow
 from src.workflow.service.get import get_workflow, get_workflow_by_id, get_workflow_by_name, get_workflow_by_type, view_workflow
-from src.workflow.service.list import list_workflows
+from src.workflow.service.list import list_workflow_summaries, list_workflows
 from src.workflow.service.sync import sync_workflow_to_db
 from src.workflow.service.update import update_workflow
 from src.workflow.service.validate import validate_workflow_files
@@ -21,8 +22,12 @@ __all__ = [
     # 基础函数
     "get_workflows_directory",
     "get_workflow_file_path",
+    # 目录索引
+    "WorkflowCatalog",
+    "get_workflow_catalog",
     # 查询函数
     "list_workflows",
+    "list_workflow_summaries",
     "get_workflow",
     "get_workflow_by_id",
     "get_workflow_by_name",
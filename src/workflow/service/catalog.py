@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+工作流目录索引
+
+维护工作流目录的摘要索引（ID、名称、类型、阶段摘要），按文件修改时间校验并持久化到磁盘，
+完整定义按需加载。名称和ID建有三元组索引，用于子串模糊匹配。
+"""
+
+import copy
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from src.utils.file_utils import ensure_directory_exists, read_json_file
+
+logger = logging.getLogger(__name__)
+
+# 索引文件名（位于工作流目录，以点开头避免被当作工作流）
+CATALOG_FILENAME = ".workflow_catalog.json"
+
+CATALOG_VERSION = 1
+
+
+def _trigrams(text: str) -> Set[str]:
+    """计算字符串的三元组集合（调用方负责转小写）"""
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def summarize_workflow(workflow_data: Dict[str, Any], filename: str) -> Dict[str, Any]:
+    """提取工作流摘要
+
+    Args:
+        workflow_data: 工作流定义
+        filename: 文件名
+
+    Returns:
+        Dict[str, Any]: 摘要信息
+    """
+    stages = workflow_data.get("stages") or []
+    return {
+        "id": workflow_data.get("id"),
+        "name": workflow_data.get("name") or "",
+        "type": workflow_data.get("type") or "",
+        "description": workflow_data.get("description") or "",
+        "stage_count": len(stages),
+        "stages": [{"id": stage.get("id"), "name": stage.get("name")} for stage in stages if isinstance(stage, dict)],
+        "filename": filename,
+    }
+
+
+class WorkflowCatalog:
+    """工作流目录索引"""
+
+    def __init__(self, workflows_dir: str, persist: bool = True, cache_size: int = 64):
+        """初始化目录索引
+
+        Args:
+            workflows_dir: 工作流目录
+            persist: 是否将索引持久化到磁盘
+            cache_size: 完整定义的内存缓存条数
+        """
+        self.workflows_dir = workflows_dir
+        self.persist = persist
+        self.cache_size = cache_size
+        self.index_path = os.path.join(workflows_dir, CATALOG_FILENAME)
+        self._lock = threading.RLock()
+        # 文件名 -> {"mtime_ns", "size", "summary"}，summary为None表示文件无法解析
+        self._files: Dict[str, Dict[str, Any]] = self._load_index()
+        self._entries: List[Dict[str, Any]] = []
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._any_by_id: Dict[str, Dict[str, Any]] = {}
+        self._trigram_index: Dict[str, Set[int]] = {}
+        self._definitions: "OrderedDict[str, Tuple[Tuple[int, int], Dict[str, Any]]]" = OrderedDict()
+        self._rebuild()
+
+    def refresh(self) -> bool:
+        """按修改时间校验索引，只重新解析变化的文件
+
+        Returns:
+            bool: 索引是否发生变化
+        """
+        with self._lock:
+            ensure_directory_exists(self.workflows_dir)
+            seen = set()
+            changed = False
+            with os.scandir(self.workflows_dir) as it:
+                for entry in it:
+                    if not entry.name.endswith(".json") or entry.name.startswith(".") or not entry.is_file():
+                        continue
+                    seen.add(entry.name)
+                    stat = entry.stat()
+                    cached = self._files.get(entry.name)
+                    if cached and (cached["mtime_ns"], cached["size"]) == (stat.st_mtime_ns, stat.st_size):
+                        continue
+                    stamp = (stat.st_mtime_ns, stat.st_size)
+                    self._files[entry.name] = {"mtime_ns": stamp[0], "size": stamp[1], "summary": self._summarize(entry.path, entry.name, stamp)}
+                    changed = True
+
+            for filename in set(self._files) - seen:
+                del self._files[filename]
+                changed = True
+
+            if changed:
+                self._rebuild()
+                self._save_index()
+            return changed
+
+    def _summarize(self, path: str, filename: str, stamp: Tuple[int, int]) -> Optional[Dict[str, Any]]:
+        try:
+            workflow_data = read_json_file(path)
+        except Exception as e:
+            logger.error(f"读取工作流文件失败 {filename}: {str(e)}")
+            return None
+        if not isinstance(workflow_data, dict):
+            logger.error(f"工作流文件格式无效: {filename}")
+            return None
+        # 顺便缓存完整定义，首次列出后按名称查找不必再次解析
+        self._remember_definition(filename, stamp, workflow_data)
+        return summarize_workflow(workflow_data, filename)
+
+    def _rebuild(self) -> None:
+        """根据文件摘要重建有效条目和查找索引"""
+        entries, by_id, any_by_id = [], {}, {}
+        for filename in sorted(self._files):
+            summary = self._files[filename].get("summary")
+            if not summary:
+                continue
+            workflow_id = summary.get("id")
+            if not workflow_id:
+                logger.warning(f"工作流文件缺少ID: {filename}")
+                continue
+            any_by_id.setdefault(workflow_id, summary)
+            if filename != f"{workflow_id}.json":
+                # 文件名与ID不一致的多是删除或重命名后的遗留文件，不列出
+                logger.warning(f"工作流文件名与ID不匹配: {filename} 包含ID {workflow_id}")
+                continue
+            by_id[workflow_id] = summary
+            entries.append(summary)
+
+        trigram_index: Dict[str, Set[int]] = {}
+        for position, summary in enumerate(entries):
+            for text in (str(summary["id"]).lower(), str(summary["name"]).lower()):
+                for gram in _trigrams(text):
+                    trigram_index.setdefault(gram, set()).add(position)
+
+        self._entries, self._by_id, self._any_by_id, self._trigram_index = entries, by_id, any_by_id, trigram_index
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """获取所有有效工作流的摘要
+
+        Returns:
+            List[Dict[str, Any]]: 摘要列表（按文件名排序）
+        """
+        with self._lock:
+            self.refresh()
+            return list(self._entries)
+
+    def get_summary(self, workflow_id: str) -> Optional[Dict[str, Any]]:
+        """通过ID获取摘要，包括文件名与ID不一致的文件"""
+        with self._lock:
+            self.refresh()
+            return self._by_id.get(workflow_id) or self._any_by_id.get(workflow_id)
+
+    def find_by_name(self, name: str) -> Optional[Dict[str, Any]]:
+        """通过名称精确查找摘要"""
+        with self._lock:
+            self.refresh()
+            return next((summary for summary in self._entries if summary["name"] == name), None)
+
+    def find_by_type(self, workflow_type: str) -> List[Dict[str, Any]]:
+        """通过类型查找摘要"""
+        with self._lock:
+            self.refresh()
+            return [summary for summary in self._entries if summary["type"] == workflow_type]
+
+    def search(self, query: str, field: str) -> List[Dict[str, Any]]:
+        """按子串查找摘要（不区分大小写）
+
+        id和name字段先用三元组索引筛选候选，其他字段逐条比较
+
+        Args:
+            query: 查询字符串
+            field: 字段名（id、name、description、type）
+
+        Returns:
+            List[Dict[str, Any]]: 匹配的摘要（按文件名排序）
+        """
+        query = query.lower()
+        with self._lock:
+            self.refresh()
+            candidates = self._entries
+            if field in ("id", "name") and len(query) >= 3:
+                positions = None
+                for gram in _trigrams(query):
+                    postings = self._trigram_index.get(gram, set())
+                    positions = postings if positions is None else positions & postings
+                    if not positions:
+                        return []
+                candidates = [self._entries[i] for i in sorted(positions)]
+            return [summary for summary in candidates if query in str(summary.get(field) or "").lower()]
+
+    def load(self, workflow_id: str) -> Optional[Dict[str, Any]]:
+        """按需加载完整的工作流定义
+
+        Args:
+            workflow_id: 工作流ID
+
+        Returns:
+            Optional[Dict[str, Any]]: 工作流定义副本，不存在时返回None
+        """
+        with self._lock:
+            summary = self.get_summary(workflow_id)
+            if not summary:
+                return None
+            filename = summary["filename"]
+            path = os.path.join(self.workflows_dir, filename)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return None
+            stamp = (stat.st_mtime_ns, stat.st_size)
+
+            cached = self._definitions.get(filename)
+            if cached and cached[0] == stamp:
+                self._definitions.move_to_end(filename)
+                return copy.deepcopy(cached[1])
+
+            try:
+                workflow_data = read_json_file(path)
+            except Exception as e:
+                logger.error(f"读取工作流文件失败 {filename}: {str(e)}")
+                return None
+            self._remember_definition(filename, stamp, workflow_data)
+            return copy.deepcopy(workflow_data)
+
+    def _remember_definition(self, filename: str, stamp: Tuple[int, int], workflow_data: Dict[str, Any]) -> None:
+        self._definitions[filename] = (stamp, workflow_data)
+        self._definitions.move_to_end(filename)
+        while len(self._definitions) > self.cache_size:
+            self._definitions.popitem(last=False)
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        if not self.persist:
+            return {}
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != CATALOG_VERSION:
+            return {}
+        return data.get("files", {})
+
+    def _save_index(self) -> None:
+        """原子写入索引文件"""
+        if not self.persist:
+            return
+        tmp_path = f"{self.index_path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": CATALOG_VERSION, "files": self._files}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            logger.warning(f"写入工作流索引失败: {e}")
+
+
+_catalogs: Dict[str, WorkflowCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_workflow_catalog(workflows_dir: Optional[str] = None) -> WorkflowCatalog:
+    """获取工作流目录索引（每个目录一个实例）
+
+    Args:
+        workflows_dir: 工作流目录，默认使用配置的工作流目录
+
+    Returns:
+        WorkflowCatalog: 目录索引
+    """
+    if workflows_dir is None:
+        from src.workflow.service.base import get_workflows_directory
+
+        workflows_dir = get_workflows_directory()
+    key = os.path.abspath(workflows_dir)
+    with _catalogs_lock:
+        catalog = _catalogs.get(key)
+        if catalog is None:
+            catalog = _catalogs[key] = WorkflowCatalog(key)
+        return catalog
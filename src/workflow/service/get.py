@@ -7,12 +7,9 @@
 """
 
 import logging
-import os
 from typing import Any, Dict, List, Optional
 
-from src.utils.file_utils import file_exists, read_json_file
-from src.workflow.service.base import get_workflow_file_path, get_workflows_directory
-from src.workflow.service.list import list_workflows
+from src.workflow.service.catalog import get_workflow_catalog
 from src.workflow.service.sync import sync_workflow_to_db
 
 logger = logging.getLogger(__name__)
@@ -29,31 +26,13 @@ def get_workflow(workflow_id: str, verbose: bool = False) -> Optional[Dict[str,
     Returns:
         Optional[Dict[str, Any]]: 工作流数据（字典形式）
     """
-    workflows_dir = get_workflows_directory()
+    workflow_data = get_workflow_catalog().load(workflow_id)
+    if workflow_data is None:
+        return None
 
-    # 尝试直接通过ID查找
-    workflow_path = os.path.join(workflows_dir, f"{workflow_id}.json")
-    if file_exists(workflow_path):
-        workflow_data = read_json_file(workflow_path)
-        # 同步到数据库
-        sync_workflow_to_db(workflow_data, verbose)
-        return workflow_data
-
-    # 如果直接查找失败，则遍历所有工作流查找
-    for filename in os.listdir(workflows_dir):
-        if filename.endswith(".json"):
-            try:
-                workflow_path = os.path.join(workflows_dir, filename)
-                workflow_data = read_json_file(workflow_path)
-                if workflow_data.get("id") == workflow_id:
-                    # 同步到数据库
-                    sync_workflow_to_db(workflow_data, verbose)
-                    return workflow_data
-            except Exception as e:
-                if verbose:
-                    logger.error(f"读取工作流文件失败 {filename}: {str(e)}")
-
-    return None
+    # 同步到数据库
+    sync_workflow_to_db(workflow_data, verbose)
+    return workflow_data
 
 
 def get_workflow_by_id(workflow_id: str) -> Optional[Dict[str, Any]]:
@@ -79,15 +58,16 @@ def get_workflow_by_name(name: str) -> Optional[Dict[str, Any]]:
     Returns:
         Optional[Dict[str, Any]]: 工作流数据（字典形式）
     """
-    workflows = list_workflows()
-
-    for workflow in workflows:
-        if workflow.get("name") == name:
-            # 同步到数据库
-            sync_workflow_to_db(workflow)
-            return workflow
+    catalog = get_workflow_catalog()
+    summary = catalog.find_by_name(name)
+    if not summary:
+        return None
 
-    return None
+    workflow = catalog.load(summary["id"])
+    if workflow is not None:
+        # 同步到数据库
+        sync_workflow_to_db(workflow)
+    return workflow
 
 
 def get_workflow_by_type(workflow_type: str) -> List[Dict[str, Any]]:
@@ -100,8 +80,9 @@ def get_workflow_by_type(workflow_type: str) -> List[Dict[str, Any]]:
     Returns:
         List[Dict[str, Any]]: 符合指定类型的工作流列表
     """
-    workflows = list_workflows()
-    return [workflow for workflow in workflows if workflow.get("type") == workflow_type]
+    catalog = get_workflow_catalog()
+    workflows = (catalog.load(summary["id"]) for summary in catalog.find_by_type(workflow_type))
+    return [workflow for workflow in workflows if workflow is not None]
 
 
 def view_workflow(workflow_id: str) -> Optional[Dict[str, Any]]:
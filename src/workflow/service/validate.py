@@ -50,7 +50,8 @@ def validate_workflow_files(workflow_dir: str = None, auto_fix: bool = False) ->
 
     # 遍历所有工作流文件
     for filename in os.listdir(workflow_dir):
-        if not filename.endswith(".json"):
+        # 跳过隐藏文件（如工作流目录索引）
+        if not filename.endswith(".json") or filename.startswith("."):
             continue
 
         file_path = os.path.join(workflow_dir, filename)
@@ -10,7 +10,7 @@ import logging
 import re
 from typing import Any, Dict, Optional
 
-from src.workflow.service import get_workflow, get_workflow_by_id, get_workflow_by_name, list_workflows
+from src.workflow.service import get_workflow, get_workflow_by_id, get_workflow_by_name, get_workflow_catalog, list_workflows
 
 logger = logging.getLogger(__name__)
 
@@ -65,66 +65,61 @@ def get_workflow_fuzzy(identifier: str) -> Optional[Dict[str, Any]]:
         logger.info(f"通过名称精确匹配找到工作流: {workflow.get('name')} (ID: {workflow.get('id')})")
         return workflow
 
-    # 如果直接匹配失败，继续模糊匹配
+    # 如果直接匹配失败，继续模糊匹配（只在摘要索引上匹配，命中后才加载完整定义）
     logger.debug(f"未找到精确匹配，开始进行模糊匹配: '{identifier}'")
-    workflows = list_workflows()
+    catalog = get_workflow_catalog()
+    summaries = catalog.entries()
 
-    if not workflows:
+    if not summaries:
         logger.warning("数据库中没有找到任何工作流定义")
         return None
 
     # 先尝试ID部分匹配
-    for workflow in workflows:
-        workflow_id = workflow.get("id", "").lower()
-        if workflow_id and identifier.lower() in workflow_id:
-            logger.info(f"通过ID部分匹配找到工作流: {workflow.get('name', '未命名')} (ID: {workflow.get('id')})")
-            return workflow
+    matches = catalog.search(identifier, "id")
+    if matches:
+        logger.info(f"通过ID部分匹配找到工作流: {matches[0].get('name') or '未命名'} (ID: {matches[0].get('id')})")
+        return catalog.load(matches[0]["id"])
 
     # 然后尝试名称部分匹配
-    matching_workflows = []
-    for workflow in workflows:
-        workflow_name = workflow.get("name", "").lower()
-        if workflow_name and identifier.lower() in workflow_name:
-            matching_workflows.append(workflow)
+    matching_workflows = catalog.search(identifier, "name")
 
     # 如果有多个匹配的工作流，选择名称最相似的一个
     if matching_workflows:
         if len(matching_workflows) == 1:
             logger.info(f"通过名称部分匹配找到工作流: {matching_workflows[0].get('name')} (ID: {matching_workflows[0].get('id')})")
-            return matching_workflows[0]
+            return catalog.load(matching_workflows[0]["id"])
         else:
             # 如果有多个匹配，选择名称完全相等的，或者最短的那个（最精确的匹配）
             for wf in matching_workflows:
                 if wf.get("name", "").lower() == identifier.lower():
                     logger.info(f"多个匹配中找到名称完全匹配的工作流: {wf.get('name')} (ID: {wf.get('id')})")
-                    return wf
+                    return catalog.load(wf["id"])
 
             # 没有完全匹配，选择第一个
             logger.warning(f"找到多个匹配的工作流，选择第一个: {matching_workflows[0].get('name')} (ID: {matching_workflows[0].get('id')})")
-            return matching_workflows[0]
+            return catalog.load(matching_workflows[0]["id"])
 
     # 最后尝试描述匹配
-    for workflow in workflows:
-        description = workflow.get("description", "").lower()
-        if description and identifier.lower() in description:
-            logger.info(f"通过描述匹配找到工作流: {workflow.get('name', '未命名')} (ID: {workflow.get('id')})")
-            return workflow
+    matches = catalog.search(identifier, "description")
+    if matches:
+        logger.info(f"通过描述匹配找到工作流: {matches[0].get('name') or '未命名'} (ID: {matches[0].get('id')})")
+        return catalog.load(matches[0]["id"])
 
     # 查找类型匹配
-    for workflow in workflows:
-        workflow_type = workflow.get("type", "").lower()
+    for summary in summaries:
+        workflow_type = summary.get("type", "").lower()
         if workflow_type and identifier.lower() == workflow_type:
-            logger.info(f"通过类型匹配找到工作流: {workflow.get('name', '未命名')} (ID: {workflow.get('id')})")
-            return workflow
+            logger.info(f"通过类型匹配找到工作流: {summary.get('name') or '未命名'} (ID: {summary.get('id')})")
+            return catalog.load(summary["id"])
 
     # 输出详细错误信息
     logger.warning(f"未找到匹配的工作流: '{identifier}'")
     logger.debug("可用的工作流列表:")
-    for wf in workflows:
-        logger.debug(f"- {wf.get('name', '未命名')} (ID: {wf.get('id')}, 类型: {wf.get('type', '未知')})")
+    for wf in summaries:
+        logger.debug(f"- {wf.get('name') or '未命名'} (ID: {wf.get('id')}, 类型: {wf.get('type') or '未知'})")
 
-    workflow_names = [wf.get("name", "未命名") for wf in workflows]
-    workflow_ids = [wf.get("id", "") for wf in workflows]
+    workflow_names = [wf.get("name") or "未命名" for wf in summaries]
+    workflow_ids = [wf.get("id", "") for wf in summaries]
 
     error_message = f"找不到ID或名称为 '{identifier}' 的工作流，请检查拼写是否正确。"
     error_message += f"\n可用的工作流: {', '.join(workflow_names)}"
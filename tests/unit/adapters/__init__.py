@@ -0,0 +1 @@
+"""适配器测试包"""
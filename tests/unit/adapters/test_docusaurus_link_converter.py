@@ -0,0 +1,84 @@
+"""
+Docusaurus链接转换单元测试
+
+测试单遍链接改写、增量文件映射和基于内容哈希的资源发布
+"""
+
+import os
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from adapters.docusaurus.converter import asset_store
+from adapters.docusaurus.converter.link_converter import LinkConverter
+
+
+@pytest.fixture
+def vault(tmp_path):
+    """创建包含笔记和图片资源的Obsidian目录"""
+    root = tmp_path / "vault"
+    (root / "guide").mkdir(parents=True)
+    (root / "assets").mkdir()
+    (root / "guide" / "setup.md").write_text("# Setup\n", encoding="utf-8")
+    (root / "index.md").write_text("# Home\n", encoding="utf-8")
+    (root / "assets" / "logo.png").write_bytes(b"png-bytes")
+    (root / "assets" / "copy.png").write_bytes(b"png-bytes")
+    return root
+
+
+class TestLinkConverter:
+    """链接转换器测试类"""
+
+    def test_links_and_embeds_in_one_pass(self, vault, tmp_path):
+        converter = LinkConverter(vault, tmp_path / "site")
+
+        result = converter.convert_links("见 [[setup#Step One|安装]] ![[logo.png]] [[missing]]", Path("index.md"))
+
+        assert "[安装](guide/setup#step-one)" in result
+        assert "![logo.png](/assets/logo.png)" in result
+        assert "(链接不存在)" in result
+
+    def test_mapping_cache_only_rescans_changed_directories(self, vault, tmp_path):
+        site = tmp_path / "site"
+        LinkConverter(vault, site).build_file_mapping()
+
+        (vault / "guide" / "install.md").write_text("# Install\n", encoding="utf-8")
+        converter = LinkConverter(vault, site)
+        with patch("adapters.docusaurus.converter.file_mapping.os.scandir", wraps=os.scandir) as scandir:
+            mapping = converter.build_file_mapping()
+
+        assert scandir.call_count == 1
+        assert set(mapping) == {"setup", "install", "index"}
+
+        converter.update_file_mapping(added=["guide/new.md"], removed=["guide/setup.md"])
+        assert "new" in converter.file_mapping and "setup" not in converter.file_mapping
+
+    def test_unchanged_assets_are_not_copied_again(self, vault, tmp_path):
+        site = tmp_path / "site"
+        converter = LinkConverter(vault, site)
+        with patch.object(asset_store.shutil, "copy2", wraps=shutil.copy2) as copy:
+            for _ in range(20):
+                converter.convert_links("![[logo.png]] ![[copy.png]]", Path("index.md"))
+            converter.save_caches()
+
+            # 新的转换器从资源清单恢复状态
+            LinkConverter(vault, site).convert_links("![[logo.png]]", Path("index.md"))
+
+        # 内容相同的第二个资源以硬链接保存
+        assert copy.call_count == 1
+        assert (site / "assets" / "copy.png").read_bytes() == b"png-bytes"
+
+    def test_changed_asset_is_republished(self, vault, tmp_path):
+        site = tmp_path / "site"
+        converter = LinkConverter(vault, site)
+        converter.convert_links("![[logo.png]] ![[copy.png]]", Path("index.md"))
+        converter.save_caches()
+
+        (vault / "assets" / "logo.png").write_bytes(b"new-bytes")
+        LinkConverter(vault, site).convert_links("![[logo.png]]", Path("index.md"))
+
+        assert (site / "assets" / "logo.png").read_bytes() == b"new-bytes"
+        # 硬链接的副本不受影响
+        assert (site / "assets" / "copy.png").read_bytes() == b"png-bytes"
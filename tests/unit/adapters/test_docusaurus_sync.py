@@ -0,0 +1,85 @@
+"""
+Docusaurus增量同步单元测试
+
+测试基于同步清单的增量转换、链接依赖和受影响目录的索引重建
+"""
+
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from adapters.docusaurus.sync import docusaurus_sync as sync_module
+from adapters.docusaurus.sync.docusaurus_sync import DocusaurusSync
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    """创建Obsidian源目录和Docusaurus目标目录"""
+    source = tmp_path / "vault"
+    (source / "guide").mkdir(parents=True)
+    (source / "api").mkdir()
+    (source / "guide" / "intro.md").write_text("---\ntitle: Intro\n---\n见 [[setup]]\n", encoding="utf-8")
+    (source / "guide" / "setup.md").write_text("---\ntitle: Setup\n---\n安装步骤\n", encoding="utf-8")
+    (source / "api" / "ref.md").write_text("---\ntitle: Ref\n---\n接口说明\n", encoding="utf-8")
+    return source, tmp_path / "site"
+
+
+class TestDocusaurusSync:
+    """Docusaurus增量同步测试类"""
+
+    def test_second_sync_converts_nothing(self, dirs):
+        source, target = dirs
+        first = DocusaurusSync(str(source), str(target)).sync_all()
+        assert first["added"] == 3
+
+        sync = DocusaurusSync(str(source), str(target))
+        with patch.object(sync.link_converter, "convert_links") as convert:
+            stats = sync.sync_all()
+
+        convert.assert_not_called()
+        assert stats == {"added": 0, "updated": 0, "deleted": 0, "unchanged": 3}
+
+    def test_links_are_converted_on_the_calling_thread(self, dirs):
+        source, target = dirs
+        sync = DocusaurusSync(str(source), str(target), max_workers=4)
+        convert = sync.link_converter.convert_links
+        threads = []
+
+        def record(content, file_path):
+            threads.append(threading.current_thread())
+            if file_path.name == "setup.md":
+                raise ValueError("转换失败")
+            return convert(content, file_path)
+
+        with patch.object(sync_module, "IO_BATCH_SIZE", 2), patch.object(sync.link_converter, "convert_links", side_effect=record):
+            stats = sync.sync_all()
+
+        assert threads == [threading.current_thread()] * 3
+        assert stats["added"] == 2
+        assert not (target / "guide" / "setup.md").exists()
+
+    def test_only_changed_note_and_its_directory_index(self, dirs):
+        source, target = dirs
+        DocusaurusSync(str(source), str(target)).sync_all()
+        (source / "api" / "ref.md").write_text("---\ntitle: Ref\n---\n新的接口说明\n", encoding="utf-8")
+
+        sync = DocusaurusSync(str(source), str(target))
+        with patch.object(sync.index_generator, "generate_index_for_directory", wraps=sync.index_generator.generate_index_for_directory) as gen:
+            stats = sync.sync_all()
+
+        assert stats["updated"] == 1
+        assert [call.args[0].name for call in gen.call_args_list] == ["api"]
+        assert "新的接口说明" in (target / "api" / "ref.md").read_text(encoding="utf-8")
+
+    def test_renamed_link_target_reconverts_dependents(self, dirs):
+        source, target = dirs
+        DocusaurusSync(str(source), str(target)).sync_all()
+        (source / "guide" / "setup.md").rename(source / "api" / "setup.md")
+
+        stats = DocusaurusSync(str(source), str(target)).sync_all()
+
+        assert stats["added"] == 1
+        assert stats["deleted"] == 1
+        assert stats["updated"] == 1
+        assert "../api/setup" in (target / "guide" / "intro.md").read_text(encoding="utf-8")
@@ -0,0 +1,118 @@
+"""
+文件监控批量合并单元测试
+
+测试事件合并规则、重命名识别以及批次投递
+"""
+
+from watchdog.events import FileCreatedEvent, FileDeletedEvent, FileModifiedEvent, FileMovedEvent
+
+from adapters.docusaurus.sync.docusaurus_sync import DocusaurusSync
+from adapters.obsidian.sync.file_watcher import ChangeBatch, ChangeCoalescer, DocFileHandler
+
+
+class TestChangeCoalescer:
+    """变更合并器测试类"""
+
+    def test_event_sequences_collapse(self, tmp_path):
+        coalescer = ChangeCoalescer(str(tmp_path))
+        coalescer.add("a.md", "created")
+        coalescer.add("a.md", "modified")
+        coalescer.add("tmp.md", "created")
+        coalescer.add("tmp.md", "deleted")
+        coalescer.add("b.md", "deleted")
+        coalescer.add("b.md", "created")
+        coalescer.add("c.md", "modified")
+        coalescer.add("c.md", "deleted")
+
+        batch = coalescer.flush()
+
+        assert batch.created == {"a.md"}
+        assert batch.modified == {"b.md"}
+        assert batch.deleted == {"c.md"}
+        assert not batch.moved
+        assert coalescer.flush().is_empty()
+
+    def test_chained_moves_merge(self, tmp_path):
+        coalescer = ChangeCoalescer(str(tmp_path))
+        coalescer.add("a.md", "moved", "b.md")
+        coalescer.add("b.md", "moved", "dir/c.md")
+        coalescer.add("x.md", "moved", "y.md")
+        coalescer.add("y.md", "moved", "x.md")
+
+        batch = coalescer.flush()
+
+        assert batch.moved == {"a.md": "dir/c.md"}
+        assert batch.modified == {"x.md"}
+
+    def test_delete_and_create_with_same_content_is_rename(self, tmp_path):
+        (tmp_path / "old.md").write_text("# 内容", encoding="utf-8")
+        coalescer = ChangeCoalescer(str(tmp_path))
+        coalescer.add("old.md", "modified")
+        coalescer.flush()
+
+        (tmp_path / "old.md").rename(tmp_path / "new.md")
+        coalescer.add("old.md", "deleted")
+        coalescer.add("new.md", "created")
+        batch = coalescer.flush()
+
+        assert batch.moved == {"old.md": "new.md"}
+        assert not batch.created and not batch.deleted and not batch.modified
+
+
+class TestDocFileHandler:
+    """文档文件处理器批量投递测试类"""
+
+    def test_storm_is_delivered_as_one_batch(self, tmp_path):
+        batches = []
+        handler = DocFileHandler(str(tmp_path), batch_callback=batches.append, debounce_seconds=60)
+        for i in range(50):
+            path = str(tmp_path / f"n{i}.md")
+            handler.on_any_event(FileCreatedEvent(path))
+            handler.on_any_event(FileModifiedEvent(path))
+        handler.on_any_event(FileCreatedEvent(str(tmp_path / "image.png")))
+        handler.on_any_event(FileMovedEvent(str(tmp_path / "n0.md"), str(tmp_path / "m0.md")))
+
+        handler.close()
+
+        assert len(batches) == 1
+        assert len(batches[0].created) == 50
+        assert "m0.md" in batches[0].created
+
+    def test_per_file_callback_fallback(self, tmp_path):
+        events = []
+        handler = DocFileHandler(str(tmp_path), lambda path, kind: events.append((path, kind)), debounce_seconds=60, max_workers=2)
+        handler.on_any_event(FileMovedEvent(str(tmp_path / "a.md"), str(tmp_path / "b.md")))
+        handler.on_any_event(FileDeletedEvent(str(tmp_path / "c.md")))
+
+        handler.close()
+
+        assert sorted(events) == [("a.md", "deleted"), ("b.md", "created"), ("c.md", "deleted")]
+
+    def test_timer_flushes_without_further_events(self, tmp_path):
+        batches = []
+        handler = DocFileHandler(str(tmp_path), batch_callback=batches.append, debounce_seconds=0.05)
+        handler.on_any_event(FileModifiedEvent(str(tmp_path / "a.md")))
+
+        handler._timer.join(2)
+
+        assert batches and batches[0].modified == {"a.md"}
+
+
+class TestDocusaurusSyncChanges:
+    """Docusaurus批量同步测试类"""
+
+    def test_rename_updates_dependent_links(self, tmp_path):
+        vault, site = tmp_path / "vault", tmp_path / "site"
+        (vault / "dir").mkdir(parents=True)
+        (vault / "target.md").write_text("# 目标\n", encoding="utf-8")
+        (vault / "source.md").write_text("见 [[target]]\n", encoding="utf-8")
+        sync = DocusaurusSync(str(vault), str(site))
+        sync.sync_all()
+
+        (vault / "target.md").rename(vault / "dir" / "target.md")
+        stats = sync.sync_changes(ChangeBatch(moved={"target.md": "dir/target.md"}))
+
+        assert stats["deleted"] == 1
+        assert not (site / "target.md").exists()
+        assert (site / "dir" / "target.md").exists()
+        assert "dir/target" in (site / "source.md").read_text(encoding="utf-8")
@@ -0,0 +1,91 @@
+"""
+GitDiagram项目扫描器单元测试
+
+测试 .gitignore 规则匹配、并发扫描、扫描缓存和文件树折叠
+"""
+
+import subprocess
+from unittest.mock import patch
+
+from adapters.gitdiagram.scanner import IgnoreRules, ProjectScanner, render_file_tree
+
+
+def _touch(path, content=""):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+
+
+class TestIgnoreRules:
+    """忽略规则测试类"""
+
+    def test_gitignore_semantics(self):
+        rules = IgnoreRules(["*.log", "!keep.log", "/build", "docs/**/*.tmp", "cache/"])
+
+        assert rules.match("a/b/debug.log", False) is True
+        assert rules.match("a/keep.log", False) is False
+        assert rules.match("build", True) is True
+        assert rules.match("src/build", True) is None
+        assert rules.match("docs/x/y/z.tmp", False) is True
+        assert rules.match("cache", False) is None
+        assert rules.match("src/cache", True) is True
+
+
+class TestProjectScanner:
+    """项目扫描器测试类"""
+
+    def test_scan_respects_nested_gitignore_and_defaults(self, tmp_path):
+        _touch(tmp_path / ".gitignore", "*.secret\n")
+        _touch(tmp_path / "src" / "main.py")
+        _touch(tmp_path / "src" / "main.pyc")
+        _touch(tmp_path / "src" / "key.secret")
+        _touch(tmp_path / "node_modules" / "lib" / "index.js")
+        _touch(tmp_path / "pkg" / ".gitignore", "generated/\n!important.secret\n")
+        _touch(tmp_path / "pkg" / "generated" / "out.py")
+        _touch(tmp_path / "pkg" / "important.secret")
+
+        paths = ProjectScanner(str(tmp_path), max_workers=4, cache_path="").scan()
+
+        assert paths == [".gitignore", "pkg/.gitignore", "pkg/important.secret", "src/main.py"]
+
+    def test_cache_keyed_by_head_and_dirty_files(self, tmp_path):
+        git = ["git", "-c", "user.name=t", "-c", "user.email=t@t"]
+        _touch(tmp_path / "a.py")
+        subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+        subprocess.run(git + ["add", "."], cwd=tmp_path, check=True)
+        subprocess.run(git + ["commit", "-qm", "init"], cwd=tmp_path, check=True)
+
+        scanner = ProjectScanner(str(tmp_path))
+        assert scanner.scan() == ["a.py"]
+        with patch.object(scanner, "_walk") as walk:
+            assert scanner.scan() == ["a.py"]
+        walk.assert_not_called()
+
+        # 新文件改变未提交文件集合，缓存失效
+        _touch(tmp_path / "b.py")
+        assert scanner.scan() == ["a.py", "b.py"]
+
+
+class TestRenderFileTree:
+    """文件树渲染测试类"""
+
+    def test_small_tree_is_unchanged(self):
+        paths = ["a.py", "src/b.py"]
+        assert render_file_tree(paths, max_lines=10) == "a.py\nsrc/b.py"
+
+    def test_huge_subtrees_are_summarized_within_budget(self):
+        paths = ["README.md", "src/app.py"] + [f"vendor/pkg{i}/mod{j}.js" for i in range(50) for j in range(20)]
+
+        tree = render_file_tree(sorted(paths), max_lines=20, max_files_per_dir=10)
+        lines = tree.splitlines()
+
+        assert len(lines) <= 20
+        assert "README.md" in lines and "src/app.py" in lines
+        assert any(line.startswith("vendor/ … (1000 个文件") for line in lines)
+
+    def test_files_per_directory_cap(self):
+        paths = [f"data/{i:03}.json" for i in range(30)]
+
+        lines = render_file_tree(paths, max_files_per_dir=5).splitlines()
+
+        assert len(lines) == 6
+        assert lines[-1].startswith("data/ … (其余 25 个文件")
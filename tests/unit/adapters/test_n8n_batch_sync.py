@@ -0,0 +1,122 @@
+"""
+n8n批量同步单元测试
+
+测试连接池会话、重试配置以及变量和凭证的批量同步
+"""
+
+import asyncio
+import json
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+
+from adapters.n8n.client.async_http_client import N8nAsyncHttpClient
+from adapters.n8n.client.credential_client import N8nCredentialClient
+from adapters.n8n.client.http_client import N8nHttpClient
+from adapters.n8n.client.variable_client import N8nVariableClient, plan_variable_changes, sync_variables_async
+
+
+def _response(payload, status=200):
+    response = MagicMock()
+    response.status_code = status
+    response.content = json.dumps(payload).encode()
+    response.json.return_value = payload
+    return response
+
+
+def _client_with(responses):
+    """创建会话请求被替换为固定响应的HTTP客户端"""
+    client = N8nHttpClient("http://n8n.local", "key")
+    calls = []
+
+    def fake_request(method, url, json=None, timeout=None):
+        calls.append((method, url.replace("http://n8n.local/", ""), json))
+        return _response(responses.get((method, url.replace("http://n8n.local/", "")), {}))
+
+    client.session.request = fake_request
+    return client, calls
+
+
+class TestN8nHttpClient:
+    """n8n HTTP客户端测试类"""
+
+    def test_session_is_pooled_with_retries(self):
+        client = N8nHttpClient("http://n8n.local", "key", pool_size=7, max_retries=4)
+        adapter = client.session.get_adapter("http://n8n.local/api")
+
+        assert adapter._pool_maxsize == 7
+        assert adapter.max_retries.total == 4
+        assert "POST" not in adapter.max_retries.allowed_methods
+        assert client.session.headers["X-N8N-API-KEY"] == "key"
+
+    def test_patch_is_supported(self):
+        client, calls = _client_with({})
+        client.make_request("PATCH", "api/v1/variables/1", {"value": "x"})
+
+        assert calls == [("PATCH", "api/v1/variables/1", {"value": "x"})]
+
+
+class TestBatchSync:
+    """批量同步测试类"""
+
+    def test_plan_only_sends_changed_variables(self):
+        remote = [{"id": 1, "key": "A", "value": "1"}, {"id": 2, "key": "B", "value": "old"}]
+        creates, updates, unchanged = plan_variable_changes(remote, {"A": 1, "B": "new", "C": {"x": 1}})
+
+        assert creates == [{"key": "C", "value": '{"x": 1}'}]
+        assert updates == [("2", {"key": "B", "value": "new"})]
+        assert unchanged == ["A"]
+
+    def test_sync_variables_fetches_remote_state_once(self):
+        remote = {"data": [{"id": 1, "key": "A", "value": "1"}, {"id": 2, "key": "B", "value": "old"}], "nextCursor": None}
+        client, calls = _client_with(
+            {("GET", "api/v1/variables"): remote, ("POST", "api/v1/variables"): {"id": 3}, ("PATCH", "api/v1/variables/2"): {"id": 2}}
+        )
+
+        results = N8nVariableClient(client).sync_variables({"A": "1", "B": "new", "C": "c"})
+
+        assert results == {"A": True, "B": True, "C": True}
+        assert [c[0] for c in calls].count("GET") == 1
+        assert sorted(c[0] for c in calls) == ["GET", "PATCH", "POST"]
+
+    def test_sync_credentials_matches_by_name(self):
+        remote = [{"id": 5, "name": "github"}]
+        client, calls = _client_with(
+            {("GET", "api/v1/credentials"): remote, ("PUT", "api/v1/credentials/5"): {"id": 5}, ("POST", "api/v1/credentials"): {"id": 6}}
+        )
+
+        results = N8nCredentialClient(client).sync_credentials(
+            [{"name": "github", "type": "githubApi", "data": {"token": "t"}}, {"name": "slack", "type": "slackApi", "data": {}}]
+        )
+
+        assert results == {"github": True, "slack": True}
+        assert ("PUT", "api/v1/credentials/5", {"name": "github", "type": "githubApi", "data": {"token": "t"}}) in calls
+
+    def test_async_sync_retries_transient_errors(self):
+        attempts = {"PATCH": 0, "POST": 0}
+
+        def handler(request):
+            if request.method == "GET":
+                return httpx.Response(200, json=[{"id": 1, "key": "A", "value": "old"}])
+            attempts[request.method] += 1
+            if attempts[request.method] == 1:
+                return httpx.Response(503)
+            return httpx.Response(200, json={"id": 1})
+
+        async def run():
+            async with N8nAsyncHttpClient("http://n8n.local", "key", backoff_factor=0, transport=httpx.MockTransport(handler)) as client:
+                return await sync_variables_async(client, {"A": "new", "B": "1"})
+
+        # 幂等的PATCH会重试，已发出的POST不会重试
+        assert asyncio.run(run()) == {"A": True, "B": False}
+        assert attempts == {"PATCH": 2, "POST": 1}
+
+    def test_async_request_raises_http_error(self):
+        async def run():
+            transport = httpx.MockTransport(lambda request: httpx.Response(404))
+            async with N8nAsyncHttpClient("http://n8n.local", "key", transport=transport) as client:
+                await client.make_request("GET", "api/v1/variables/x")
+
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(run())
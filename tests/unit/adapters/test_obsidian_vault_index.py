@@ -0,0 +1,85 @@
+"""
+Obsidian库索引单元测试
+
+测试基于库索引的链接、段落引用校验以及磁盘缓存
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from adapters.obsidian.checker import checker as checker_module
+from adapters.obsidian.checker import vault_index as vault_index_module
+from adapters.obsidian.checker.checker import ObsidianSyntaxChecker
+from adapters.obsidian.checker.vault_index import DEFAULT_CACHE_NAME, VaultIndex
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """把默认缓存目录指向临时目录"""
+    directory = tmp_path / "cache"
+    monkeypatch.setattr(vault_index_module, "_default_cache_dir", lambda: str(directory))
+    return directory
+
+
+@pytest.fixture
+def vault(tmp_path):
+    """创建测试库"""
+    vault = tmp_path / "vault"
+    (vault / "notes" / "deep").mkdir(parents=True)
+    (vault / "assets").mkdir()
+    (vault / "assets" / "logo.png").write_bytes(b"png")
+    (vault / "notes" / "target.md").write_text(
+        "---\ntitle: t\n---\n# 概述\n\n## Setup  Guide\n\n段落 ^block-1\n\n```\n# 不是标题\n```\n", encoding="utf-8"
+    )
+    (vault / "notes" / "deep" / "source.md").write_text(
+        "---\ntitle: s\n---\n[[target]] [[target#setup guide]] [[target#^block-1]] ![[logo.png]]\n[[target#不是标题]] [[missing]]\n",
+        encoding="utf-8",
+    )
+    return vault
+
+
+class TestVaultIndex:
+    """库索引测试类"""
+
+    def test_directory_check_validates_links_and_sections_in_memory(self, vault):
+        checker = ObsidianSyntaxChecker(str(vault))
+
+        with patch.object(checker_module, "resolve_link_path") as probe:
+            issues = checker.check_directory(vault)
+
+        probe.assert_not_called()
+        warnings = issues["notes/deep/source.md"]["warnings"]
+        assert sorted(w["type"] for w in warnings) == ["broken_link", "broken_section"]
+        assert "不是标题" in next(w["message"] for w in warnings if w["type"] == "broken_section")
+
+    def test_unchanged_notes_are_not_reread(self, vault):
+        VaultIndex.build(vault)
+
+        with patch("adapters.obsidian.checker.vault_index.extract_anchors") as extract:
+            index = VaultIndex.build(vault)
+
+        extract.assert_not_called()
+        assert index.has_anchor(vault / "notes" / "target.md", "概述")
+
+    def test_cache_is_written_outside_the_vault_by_default(self, vault, cache_dir):
+        VaultIndex.build(vault)
+
+        assert not (vault / DEFAULT_CACHE_NAME).exists()
+        assert len(list(cache_dir.glob("*.json"))) == 1
+
+    def test_cache_in_vault_is_opt_in(self, vault, cache_dir):
+        checker = ObsidianSyntaxChecker(str(vault), index_cache_in_vault=True)
+        checker.build_index()
+
+        assert (vault / DEFAULT_CACHE_NAME).exists()
+        assert not cache_dir.exists()
+
+    def test_parallel_check_matches_serial(self, vault):
+        checker = ObsidianSyntaxChecker(str(vault), index_cache_path="")
+        serial = checker.check_directory(vault, workers=1)
+
+        with patch.object(checker_module, "PARALLEL_CHECK_THRESHOLD", 1):
+            parallel = checker.check_directory(vault, workers=2)
+
+        assert parallel == serial
@@ -0,0 +1 @@
+"""Cursor集成单元测试"""
@@ -0,0 +1,165 @@
+"""
+Cursor命令执行引擎单元测试
+
+测试并发执行、输出捕获隔离、超时、取消和进度回调
+"""
+
+import asyncio
+import importlib
+import os
+import sys
+import threading
+import time
+
+import click
+import pytest
+
+
+@pytest.fixture
+def import_cursor_module(monkeypatch):
+    """导入时会创建CLI和LLM服务的模块，没有配置OpenAI密钥时使用测试密钥"""
+    if not os.getenv("OPENAI_API_KEY"):
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    return importlib.import_module
+
+
+@pytest.fixture
+def engine_class(import_cursor_module):
+    return import_cursor_module("src.cursor.execution_engine").CommandExecutionEngine
+
+
+class FakeHandler:
+    """按命令名称执行的模拟处理器"""
+
+    def __init__(self):
+        self.barrier = threading.Barrier(3, timeout=5)
+
+    def handle_command(self, command):
+        name, _, arg = command.lstrip("/").partition(" ")
+        if name == "echo":
+            # 让三个命令同时处于执行中，验证输出不会串线
+            self.barrier.wait()
+            for _ in range(50):
+                print(arg)
+            print(f"err-{arg}", file=sys.stderr)
+            return {"success": True, "result": arg}
+        if name == "sleep":
+            time.sleep(float(arg))
+            return {"success": True, "result": "slept"}
+        raise ValueError(command)
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class TestCommandExecutionEngine:
+    """命令执行引擎测试"""
+
+    def test_parallel_commands_capture_own_output(self, engine_class):
+        engine = engine_class(FakeHandler(), max_workers=3, timeout=10)
+
+        async def main():
+            return await asyncio.gather(*(engine.execute(f"/echo {word}") for word in ("a", "b", "c")))
+
+        try:
+            results = run(main())
+        finally:
+            engine.shutdown(wait=True)
+
+        for word, result in zip(("a", "b", "c"), results):
+            assert result["success"] is True
+            assert result["result"] == word
+            assert result["stdout"] == f"{word}\n" * 50
+            assert result["stderr"] == f"err-{word}\n"
+
+    def test_timeout_returns_error_without_blocking(self, engine_class):
+        engine = engine_class(FakeHandler(), max_workers=2, timeout=0.2)
+        try:
+            started = time.monotonic()
+            result = run(engine.execute("/sleep 1"))
+            assert time.monotonic() - started < 0.9
+        finally:
+            engine.shutdown(wait=True)
+
+        assert result["success"] is False
+        assert result["error_type"] == "TimeoutError"
+        assert engine.running == 0
+
+    def test_progress_reported_while_running(self, engine_class):
+        engine = engine_class(FakeHandler(), max_workers=1, timeout=5, progress_interval=0.05)
+        reports = []
+
+        async def progress(elapsed, total, message):
+            reports.append((elapsed, total))
+
+        try:
+            result = run(engine.execute("/sleep 0.3", progress=progress))
+        finally:
+            engine.shutdown(wait=True)
+
+        assert result["success"] is True
+        assert len(reports) >= 2
+        assert all(total == 5 for _, total in reports)
+        assert reports == sorted(reports)
+
+    def test_cancel_propagates(self, engine_class):
+        engine = engine_class(FakeHandler(), max_workers=1, timeout=5)
+
+        async def main():
+            task = asyncio.ensure_future(engine.execute("/sleep 0.5"))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                return "cancelled"
+
+        try:
+            assert run(main()) == "cancelled"
+        finally:
+            engine.shutdown(wait=True)
+        assert engine.running == 0
+
+
+class TestClickCommandIsolation:
+    """Click命令参数隔离测试"""
+
+    def test_execute_click_command_does_not_touch_argv(self, import_cursor_module):
+        @click.group()
+        def cli():
+            pass
+
+        @cli.command()
+        @click.argument("value")
+        def show(value):
+            click.echo(f"value={value}")
+            return value
+
+        CursorCommandHandler = import_cursor_module("src.cursor.command.handler").CursorCommandHandler
+        handler = CursorCommandHandler.__new__(CursorCommandHandler)
+        handler.cli = cli
+        original_argv = list(sys.argv)
+
+        result = handler._execute_click_command("show", ["x"])
+
+        assert result == {"success": True, "result": "x"}
+        assert sys.argv == original_argv
+
+
+class TestServerModule:
+    """MCP服务器模块测试"""
+
+    def test_server_module_compiles(self, project_root):
+        path = project_root / "src" / "cursor" / "server.py"
+
+        compile(path.read_text(encoding="utf-8"), str(path), "exec")
+
+    def test_server_module_imports(self, import_cursor_module):
+        if not hasattr(import_cursor_module("mcp.server").Server, "list_tools"):
+            pytest.skip("已安装的mcp版本不提供Server.list_tools")
+
+        server = import_cursor_module("src.cursor.server")
+
+        assert callable(server.main)
+        assert server.server.name == "vibecopilot-server"
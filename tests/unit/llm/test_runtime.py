@@ -0,0 +1,178 @@
+"""
+LLM运行时测试模块
+
+测试共享客户端、跨事件循环的并发限制、令牌桶限流、流式请求以及同步桥接
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.llm.runtime import LLMRuntime, ProviderLimiter, TokenBucket
+
+
+class FakeClient:
+    """记录关闭的客户端"""
+
+    def __init__(self):
+        self.closed = False
+
+    async def aclose(self):
+        self.closed = True
+
+
+@pytest.fixture
+def runtime():
+    runtime = LLMRuntime()
+    yield runtime
+    runtime.shutdown()
+
+
+class TestTokenBucket:
+    """令牌桶测试"""
+
+    def test_waits_for_refill(self):
+        async def take():
+            bucket = TokenBucket(rate=50, capacity=2)
+            start = time.monotonic()
+            for _ in range(4):
+                await bucket.acquire()
+            return time.monotonic() - start
+
+        # 前两个令牌是突发容量，后两个需要约40ms补充
+        assert 0.03 <= asyncio.run(take()) < 0.5
+
+    def test_amount_capped_at_capacity(self):
+        async def take():
+            bucket = TokenBucket(rate=1000, capacity=10)
+            await bucket.acquire(10_000)
+
+        asyncio.run(asyncio.wait_for(take(), timeout=1))
+
+
+class TestLLMRuntime:
+    """运行时测试"""
+
+    def test_clients_are_pooled_and_closed(self, runtime):
+        created = []
+
+        def factory():
+            created.append(FakeClient())
+            return created[-1]
+
+        first = runtime.get_client(("fake", "a"), factory)
+        assert runtime.get_client(("fake", "a"), factory) is first
+        assert runtime.get_client(("fake", "b"), factory) is not first
+
+        runtime.run_sync(asyncio.sleep(0))
+        runtime.shutdown()
+
+        assert [client.closed for client in created] == [True, True]
+
+    def test_concurrency_limited_across_event_loops(self, runtime, monkeypatch):
+        monkeypatch.setattr(ProviderLimiter, "from_config", classmethod(lambda cls, provider: cls(semaphore=asyncio.Semaphore(2))))
+        active, peak = [0], [0]
+        lock = threading.Lock()
+
+        async def request():
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            await asyncio.sleep(0.02)
+            with lock:
+                active[0] -= 1
+            return threading.current_thread().name
+
+        async def caller():
+            return await asyncio.gather(*(runtime.call("fake", request) for _ in range(3)))
+
+        # 每个线程各自运行一个事件循环，共享同一个提供者限制
+        results = []
+        threads = [threading.Thread(target=lambda: results.extend(asyncio.run(caller()))) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(results) == 9
+        assert set(results) == {"llm-runtime"}
+        assert peak[0] == 2
+
+    def test_run_sync(self, runtime):
+        async def add(a, b):
+            await asyncio.sleep(0)
+            return a + b
+
+        assert runtime.run_sync(add(1, 2)) == 3
+
+        # 在已有事件循环的协程里同步调用也不会嵌套事件循环
+        async def nested():
+            return runtime.run_sync(add(3, 4))
+
+        assert asyncio.run(nested()) == 7
+
+    def test_run_sync_in_runtime_thread_raises(self, runtime):
+        async def inner():
+            coro = asyncio.sleep(0)
+            try:
+                runtime.run_sync(coro)
+            finally:
+                coro.close()
+
+        with pytest.raises(RuntimeError):
+            runtime.run_sync(inner())
+
+    def test_stream_from_other_loop(self, runtime):
+        async def open_stream():
+            for i in range(3):
+                await asyncio.sleep(0)
+                yield (i, threading.current_thread().name)
+
+        async def consume():
+            return [chunk async for chunk in runtime.stream("fake", open_stream)]
+
+        assert asyncio.run(consume()) == [(0, "llm-runtime"), (1, "llm-runtime"), (2, "llm-runtime")]
+
+    def test_stream_stopped_early_cancels_request(self, runtime):
+        closed = threading.Event()
+
+        async def open_stream():
+            try:
+                while True:
+                    yield "chunk"
+                    await asyncio.sleep(0.001)
+            finally:
+                closed.set()
+
+        async def consume():
+            stream = runtime.stream("fake", open_stream)
+            async for _ in stream:
+                break
+            await stream.aclose()
+
+        asyncio.run(consume())
+
+        assert closed.wait(1)
+
+    def test_stream_errors_propagate(self, runtime):
+        async def open_stream():
+            yield "chunk"
+            raise ValueError("boom")
+
+        async def consume():
+            return [chunk async for chunk in runtime.stream("fake", open_stream)]
+
+        with pytest.raises(ValueError, match="boom"):
+            asyncio.run(consume())
+
+    def test_errors_propagate(self, runtime):
+        async def fail():
+            raise ValueError("boom")
+
+        async def caller():
+            return await runtime.call("fake", fail)
+
+        with pytest.raises(ValueError, match="boom"):
+            asyncio.run(caller())
@@ -0,0 +1,94 @@
+"""
+编译提取引擎测试模块
+
+测试模式只编译一次以及单遍扫描的Front Matter、标题、章节和代码块提取
+"""
+
+import re
+
+from src.parsing.parsers.extraction import compile_patterns, scan_markdown
+from src.parsing.parsers.regex_parser import RegexParser
+
+RULE_TEXT = """
+---
+description: 测试规则
+globs: *.py
+---
+# 规则标题
+
+## 第一节
+```markdown
+# 代码块里的标题
+## 代码块里的章节
+```
+
+### 小节
+## 第二节
+  ```python
+  print("hi")
+  ```
+"""
+
+
+class TestCompilePatterns:
+    """模式编译测试"""
+
+    def test_patterns_compiled_once(self):
+        first = RegexParser().patterns
+        second = RegexParser().patterns
+
+        assert first["rule"]["examples"] is second["rule"]["examples"]
+        assert first["document"]["links"] is second["document"]["links"]
+
+    def test_flags_per_pattern(self):
+        patterns = compile_patterns({"title": r"^#\s+(.+)$", "urls": r"https?://\S+"})
+
+        assert patterns["title"].search("正文\n# 标题").group(1) == "标题"
+        assert not patterns["urls"].flags & re.MULTILINE
+
+
+class TestScanMarkdown:
+    """单遍扫描测试"""
+
+    def test_extracts_structure_in_one_pass(self):
+        structure = scan_markdown(RULE_TEXT)
+
+        assert structure.front_matter == {"description": "测试规则", "globs": "*.py"}
+        assert structure.title == "规则标题"
+        assert structure.sections == ["## 第一节", "## 第二节"]
+        assert [(h["level"], h["text"]) for h in structure.headings] == [(1, "规则标题"), (2, "第一节"), (3, "小节"), (2, "第二节")]
+        assert structure.code_blocks == [
+            {"language": "markdown", "code": "# 代码块里的标题\n## 代码块里的章节\n"},
+            {"language": "python", "code": '  print("hi")\n'},
+        ]
+
+    def test_front_matter_only_at_start(self):
+        structure = scan_markdown("# 标题\n\n---\nkey: value\n---\n")
+
+        assert structure.front_matter == {}
+        assert structure.title == "标题"
+
+    def test_first_line_and_empty_blocks(self):
+        structure = scan_markdown("# 首行标题\n```\n```\n```sh\nunclosed")
+
+        assert structure.title == "首行标题"
+        assert structure.code_blocks == [{"language": "", "code": ""}]
+
+    def test_front_matter_disabled(self):
+        structure = scan_markdown("---\ntitle: x\n---\n# 标题", front_matter=False)
+
+        assert structure.front_matter == {}
+        assert structure.title == "标题"
+
+    def test_parser_results(self):
+        parser = RegexParser()
+
+        rule = parser.parse_text(RULE_TEXT, "rule")
+        assert rule["front_matter"]["description"] == "测试规则"
+        assert rule["sections"] == ["## 第一节", "## 第二节"]
+        assert rule["examples"] == []
+
+        document = parser.parse_text(RULE_TEXT + "\n[链接](https://a.b) ![图](x.png)\n", "document")
+        assert document["metadata"]["code_block_count"] == 2
+        assert document["elements"]["images"] == [{"alt": "图", "url": "x.png"}]
+        assert [h["text"] for h in document["structure"]["headings"]] == ["规则标题", "第一节", "小节", "第二节"]
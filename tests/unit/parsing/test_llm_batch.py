@@ -0,0 +1,117 @@
+"""
+LLM批量解析测试模块
+
+测试按token预算打包、一次请求解析多个文档、缺失结果逐个回退以及截断时拆分重试
+"""
+
+import asyncio
+import json
+import re
+
+import pytest
+
+from src.parsing.parsers import llm_parser as llm_parser_module
+from src.parsing.parsers.llm_parser import LLMParser, estimate_tokens, pack_batches
+
+DOC_MARKER = re.compile(r"<<<DOC id=(\d+)>>>\n(.*?)\n<<<END id=\1>>>", re.DOTALL)
+
+
+class FakeLLMService:
+    """按提示内容生成响应的LLM服务"""
+
+    def __init__(self, drop_ids=(), truncate_above=None):
+        self.requests = []
+        self.drop_ids = set(drop_ids)
+        self.truncate_above = truncate_above
+
+    async def chat_completion(self, messages, **kwargs):
+        prompt = messages[-1]["content"]
+        documents = DOC_MARKER.findall(prompt)
+        self.requests.append(len(documents) or 1)
+        if not documents:
+            name = re.search(r"工作流: (wf\d+)", prompt).group(1)
+            return self._response(json.dumps({"stages": [{"id": name}]}))
+        if self.truncate_above and len(documents) > self.truncate_above:
+            return self._response('{"results": [', finish_reason="length")
+        results = [
+            {"id": int(doc_id), "result": {"stages": [{"id": body.split("工作流:")[-1].strip()}]}}
+            for doc_id, body in documents
+            if int(doc_id) not in self.drop_ids
+        ]
+        return self._response("```json\n" + json.dumps({"results": results}, ensure_ascii=False) + "\n```")
+
+    @staticmethod
+    def _response(content, finish_reason="stop"):
+        return {"choices": [{"message": {"content": content}, "finish_reason": finish_reason}]}
+
+
+@pytest.fixture
+def make_parser(monkeypatch, tmp_path):
+    monkeypatch.setattr(llm_parser_module, "TEMP_ROOT", str(tmp_path))
+
+    def factory(service, **config):
+        monkeypatch.setattr(llm_parser_module, "create_llm_service", lambda provider, cfg: service)
+        return LLMParser(config)
+
+    return factory
+
+
+def contents(count):
+    return [f"工作流: wf{i}" for i in range(count)]
+
+
+class TestPackBatches:
+    """按预算打包测试"""
+
+    def test_budget_and_document_limit(self):
+        docs = ["短文档"] * 5 + ["长" * 500] + ["短文档"] * 2
+        small = estimate_tokens("<<<DOC id=0>>>\n短文档\n<<<END id=0>>>")
+
+        batches = pack_batches(docs, token_budget=small * 3 + 1, max_documents=10)
+
+        assert batches == [[0, 1, 2], [3, 4], [5], [6, 7]]
+        assert pack_batches(docs[:5], token_budget=10000, max_documents=2) == [[0, 1], [2, 3], [4]]
+
+
+class TestParseBatch:
+    """批量解析测试"""
+
+    def test_many_documents_one_request(self, make_parser):
+        service = FakeLLMService()
+        parser = make_parser(service, batch_max_documents=10)
+
+        results = asyncio.run(parser.parse_batch(contents(6), "workflow"))
+
+        assert service.requests == [6]
+        assert [r["content"]["stages"][0]["id"] for r in results] == [f"wf{i}" for i in range(6)]
+        assert all(r["success"] for r in results)
+
+    def test_missing_result_falls_back_per_document(self, make_parser):
+        service = FakeLLMService(drop_ids={1})
+        parser = make_parser(service)
+
+        results = asyncio.run(parser.parse_batch(contents(3), "workflow"))
+
+        assert service.requests == [3, 1]
+        assert results[1]["content"]["stages"][0]["id"] == "wf1"
+
+    def test_truncated_response_is_split(self, make_parser):
+        service = FakeLLMService(truncate_above=2)
+        parser = make_parser(service, batch_max_documents=8)
+
+        results = asyncio.run(parser.parse_batch(contents(8), "workflow"))
+
+        assert service.requests == [8, 4, 2, 2, 4, 2, 2]
+        assert [r["content"]["stages"][0]["id"] for r in results] == [f"wf{i}" for i in range(8)]
+
+
+class TestSyncParse:
+    """同步解析测试"""
+
+    def test_parse_inside_running_loop(self, make_parser):
+        parser = make_parser(FakeLLMService())
+
+        async def caller():
+            return parser.parse("工作流: wf7", "workflow")
+
+        assert asyncio.run(caller())["content"]["stages"][0]["id"] == "wf7"
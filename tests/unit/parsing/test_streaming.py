@@ -0,0 +1,187 @@
+"""
+流式响应解析测试模块
+
+测试增量JSON解析、按Schema提前终止以及LLM解析器和路线图处理器的流式模式
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from src.parsing.parsers import llm_parser as llm_parser_module
+from src.parsing.parsers.llm_parser import LLMParser
+from src.parsing.parsers.streaming import IncrementalJSONParser, StreamAbortError, StructureGuard, collect_stream, report_stream_progress
+from src.parsing.processors.roadmap_processor import RoadmapProcessor
+
+ROADMAP = {
+    "metadata": {"title": '路线"图\\', "version": 1.5},
+    "epics": [
+        {"title": "核心", "stories": [{"title": "故事", "tasks": [{"title": "任务", "status": "todo", "done": False, "hours": -2e1, "note": None}]}]}
+    ],
+}
+
+# stories应为数组，之后的内容不应再被接收
+MALFORMED_ROADMAP = (
+    '```json\n{"metadata": {"title": "x"}, "epics": [{"title": "e", "stories": "待定"}, ' + ", ".join(['{"title": "more"}'] * 50) + "]}\n```"
+)
+
+
+class FakeStreamingService:
+    """按固定大小分块返回响应的流式LLM服务"""
+
+    def __init__(self, text, chunk_size=8):
+        self.text = text
+        self.chunk_size = chunk_size
+        self.sent = 0
+        self.closed = False
+
+    async def stream_chat_completion(self, messages, **kwargs):
+        try:
+            for start in range(0, len(self.text), self.chunk_size):
+                self.sent += 1
+                yield self.text[start : start + self.chunk_size]
+        finally:
+            self.closed = True
+
+    async def chat_completion(self, messages, **kwargs):
+        raise AssertionError("流式模式不应调用chat_completion")
+
+
+def chunks(text, size):
+    async def generate():
+        for start in range(0, len(text), size):
+            yield text[start : start + size]
+
+    return generate()
+
+
+class TestIncrementalJSONParser:
+    """增量JSON解析测试"""
+
+    @pytest.mark.parametrize("size", [1, 2, 5, 64, 100000])
+    def test_same_result_for_any_chunking(self, size):
+        text = "结果如下：\n```json\n" + json.dumps(ROADMAP, ensure_ascii=False, indent=2) + "\n```\n"
+        parser = IncrementalJSONParser()
+        completed = []
+        for start in range(0, len(text), size):
+            completed.extend(parser.feed(text[start : start + size]))
+
+        assert parser.done
+        assert parser.value == ROADMAP
+        paths = [path for path, _ in completed]
+        # 子值先于所在容器完成
+        assert paths.index(("epics", 0, "stories", 0, "tasks", 0)) < paths.index(("epics", 0, "stories", 0)) < paths.index(("epics",))
+        assert paths[-1] == ()
+
+    @pytest.mark.parametrize("text", ['{"a" 1}', '{"a": 1,}', '{"a": tru}', '{"a": [1 2]}', '{"a": {]}', "{1: 2}"])
+    def test_syntax_errors(self, text):
+        with pytest.raises(StreamAbortError):
+            IncrementalJSONParser().feed(text)
+
+    def test_text_before_root_is_skipped(self):
+        parser = IncrementalJSONParser()
+        parser.feed("没有JSON")
+        assert not parser.started
+        parser.feed('{"a": [1, "b"]} 多余内容 {')
+        assert parser.done and parser.value == {"a": [1, "b"]}
+
+
+class TestStructureGuard:
+    """结构检查测试"""
+
+    def test_only_structural_mismatches_abort(self):
+        guard = StructureGuard.for_content_type("roadmap")
+
+        # 枚举值、标量类型问题可以在解析后修复
+        guard.check(("epics", 0, "stories", 0, "priority"), "P1")
+        guard.check(("metadata", "version"), 2)
+        guard.check(("epics", 0, "stories", 0, "tasks", 0, "estimated_hours"), "3h")
+        guard.check(("unknown",), "x")
+        with pytest.raises(StreamAbortError, match=r"epics\[0\]\.stories"):
+            guard.check(("epics", 0, "stories"), "待定")
+        with pytest.raises(StreamAbortError):
+            guard.check(("metadata", "title"), {"text": "x"})
+
+    def test_unstructured_types_have_no_guard(self):
+        assert StructureGuard.for_content_type("rule") is None
+
+
+class TestCollectStream:
+    """流式接收测试"""
+
+    def test_aborts_early_and_reports_progress(self):
+        updates = []
+        service = FakeStreamingService(MALFORMED_ROADMAP)
+
+        with report_stream_progress(lambda progress: updates.append(progress.chars)):
+            with pytest.raises(StreamAbortError) as error:
+                asyncio.run(collect_stream(service.stream_chat_completion([]), "roadmap"))
+
+        assert service.closed
+        assert service.sent < len(MALFORMED_ROADMAP) // service.chunk_size / 4
+        assert error.value.text == MALFORMED_ROADMAP[: service.sent * service.chunk_size]
+        assert updates == sorted(updates) and len(updates) == service.sent - 1
+
+    def test_progress_counts_items(self):
+        updates = []
+
+        with report_stream_progress(updates.append):
+            text, value = asyncio.run(collect_stream(chunks(json.dumps(ROADMAP), 7), "roadmap"))
+
+        assert value == ROADMAP and json.loads(text) == ROADMAP
+        assert updates[-1].finished
+        assert updates[-1].items == 3
+        assert updates[-1].last_path == "epics[0]"
+
+    def test_non_json_response_for_unstructured_type(self):
+        text, value = asyncio.run(collect_stream(chunks("规则 {不是JSON} 的说明", 3), "rule"))
+
+        assert text == "规则 {不是JSON} 的说明"
+        assert value is None
+
+
+class TestStreamingParsers:
+    """解析器流式模式测试"""
+
+    @pytest.fixture
+    def make_parser(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(llm_parser_module, "TEMP_ROOT", str(tmp_path))
+
+        def factory(service, **config):
+            monkeypatch.setattr(llm_parser_module, "create_llm_service", lambda provider, cfg: service)
+            return LLMParser(config)
+
+        return factory
+
+    def test_llm_parser_streams(self, make_parser):
+        parser = make_parser(FakeStreamingService(json.dumps(ROADMAP)))
+
+        result = asyncio.run(parser.parse_text("路线图", "roadmap"))
+
+        assert result["success"] and result["content"] == ROADMAP
+
+    def test_llm_parser_abort(self, make_parser):
+        service = FakeStreamingService(MALFORMED_ROADMAP)
+        parser = make_parser(service)
+
+        result = asyncio.run(parser.parse_text("路线图", "roadmap"))
+
+        assert result["success"] is False
+        assert result["aborted"] is True
+        assert service.closed
+
+    def test_stream_disabled(self, make_parser):
+        assert make_parser(FakeStreamingService(""), stream=False).stream is False
+
+    def test_roadmap_processor_abort(self, monkeypatch, tmp_path):
+        from src.parsing.processors import roadmap_processor
+
+        monkeypatch.setattr(roadmap_processor, "TEMP_ROOT", str(tmp_path))
+        processor = RoadmapProcessor()
+        processor._llm_service = FakeStreamingService(MALFORMED_ROADMAP)
+
+        data = asyncio.run(processor.parse_roadmap("milestones:\n  - title: M1\n"))
+
+        assert data["metadata"]["error"] is True
+        assert "已提前终止" in data["metadata"]["description"]
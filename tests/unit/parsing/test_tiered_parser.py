@@ -0,0 +1,148 @@
+"""
+分层解析器测试模块
+
+测试置信度评估、只有低置信度内容才升级到LLM、规则和文档不升级以及LLM失败时保留本地结果
+"""
+
+import asyncio
+
+import pytest
+import yaml
+
+from src.parsing.parser_factory import create_parser
+from src.parsing.parsers.tiered_parser import TieredParser, parse_structured, score_confidence
+
+WELL_FORMED_RULE = """---
+description: 编辑Python文件时遵循的规范
+globs: *.py
+alwaysApply: false
+---
+# Python规范
+
+## 命名
+使用snake_case。
+"""
+
+LOOSE_RULE = "写代码的时候注意一下格式，别太乱。"
+
+MILESTONES = "milestones:\n  - title: M1\n"
+
+ROADMAP = {
+    "metadata": {"title": "路线图", "version": "1.0"},
+    "epics": [{"name": "核心", "stories": [{"title": "故事", "priority": "P1", "tasks": [{"title": "任务", "status": "todo"}]}]}],
+}
+
+
+class FakeLLMParser:
+    """记录调用的LLM解析器"""
+
+    def __init__(self, fail=False):
+        self.calls = []
+        self.batches = []
+        self.fail = fail
+
+    async def parse_text(self, content, content_type=None):
+        self.calls.append(content)
+        if self.fail:
+            raise RuntimeError("LLM不可用")
+        return {"success": True, "content_type": content_type, "content": content, "title": "LLM标题"}
+
+    async def parse_batch(self, contents, content_type=None):
+        self.batches.append(len(contents))
+        return [await self.parse_text(content, content_type) for content in contents]
+
+
+@pytest.fixture
+def parser():
+    return TieredParser({"confidence_threshold": 0.8})
+
+
+class TestConfidence:
+    """置信度评估测试"""
+
+    def test_rule_scores(self, parser):
+        assert parser.parse_local(WELL_FORMED_RULE, "rule")["confidence"] == pytest.approx(1.0)
+        assert parser.parse_local(LOOSE_RULE, "rule")["confidence"] < 0.8
+
+    def test_roadmap_requires_epics(self):
+        # name字段和P1优先级各算一个Schema错误
+        assert score_confidence(parse_structured(yaml.safe_dump(ROADMAP, allow_unicode=True), "roadmap"), "roadmap") == pytest.approx(0.8)
+        milestones = parse_structured("milestones:\n  - title: M1\n", "roadmap")
+        assert score_confidence(milestones, "roadmap") == 0.0
+        assert parse_structured("- just\n- a list\n", "roadmap")["success"] is False
+
+    def test_failed_result_scores_zero(self):
+        assert score_confidence({"success": False}, "rule") == 0.0
+        assert score_confidence({"success": True}, "generic") == 1.0
+
+
+class TestRoadmapProcessor:
+    """路线图本地解析测试"""
+
+    def test_well_formed_roadmap_skips_llm(self):
+        from src.parsing.processors.roadmap_processor import RoadmapProcessor
+
+        processor = RoadmapProcessor()
+        data = asyncio.run(processor.parse_roadmap(yaml.safe_dump(ROADMAP, allow_unicode=True)))
+
+        assert data["epics"][0]["title"] == "核心"
+        assert data["epics"][0]["stories"][0]["priority"] == "high"
+        assert processor._llm_service is None
+
+    def test_milestone_roadmap_needs_llm(self):
+        from src.parsing.processors.roadmap_processor import RoadmapProcessor
+
+        assert RoadmapProcessor().parse_local("milestones:\n  - title: M1\n") is None
+
+
+class TestEscalation:
+    """升级到LLM测试"""
+
+    def test_only_low_confidence_escalated_in_one_batch(self, parser):
+        llm = FakeLLMParser()
+        parser._llm_parser = llm
+        roadmap = yaml.safe_dump(ROADMAP, allow_unicode=True)
+        contents = [roadmap, MILESTONES, roadmap, MILESTONES + "1", MILESTONES + "2"]
+
+        results = asyncio.run(parser.parse_many(contents, "roadmap"))
+
+        assert [r["parsed_by"] for r in results] == ["structured", "llm", "structured", "llm", "llm"]
+        assert llm.calls == [MILESTONES, MILESTONES + "1", MILESTONES + "2"]
+        assert llm.batches == [3]
+        assert parser.stats == {"local": 2, "escalated": 3, "escalation_failed": 0}
+
+    def test_rules_and_documents_never_escalated(self, parser):
+        llm = FakeLLMParser()
+        parser._llm_parser = llm
+
+        rule = asyncio.run(parser.parse_text(LOOSE_RULE, "rule"))
+        document = asyncio.run(parser.parse_text("随便写的一段话", "document"))
+
+        assert rule["parsed_by"] == document["parsed_by"] == "regex"
+        assert rule["confidence"] < 0.8
+        assert llm.calls == []
+
+    def test_llm_failure_keeps_local_result(self, parser):
+        parser._llm_parser = FakeLLMParser(fail=True)
+
+        result = asyncio.run(parser.parse_text(MILESTONES, "roadmap"))
+
+        assert result["parsed_by"] == "structured"
+        assert result["success"] is True
+        assert parser.stats["escalation_failed"] == 1
+
+    def test_parse_files_groups_by_type(self, parser, tmp_path):
+        parser._llm_parser = FakeLLMParser()
+        rule_file = tmp_path / "style.mdc"
+        rule_file.write_text(WELL_FORMED_RULE, encoding="utf-8")
+        doc_file = tmp_path / "notes.md"
+        doc_file.write_text("# 笔记\n\n## 一\n内容\n", encoding="utf-8")
+
+        results = asyncio.run(parser.parse_files([str(rule_file), str(doc_file)]))
+
+        assert [r["content_type"] for r in results] == ["rule", "document"]
+        assert results[1]["_file_info"]["name"] == "notes.md"
+        assert parser._llm_parser.calls == []
+
+    def test_factory_backend(self):
+        assert isinstance(create_parser("rule", "tiered"), TieredParser)
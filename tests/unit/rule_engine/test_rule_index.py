@@ -0,0 +1,349 @@
+"""
+规则适用性索引测试模块
+
+测试glob前缀树与fnmatch结果一致、增量更新、嵌入向量缓存和语义匹配，以及规则仓库按文件查询
+"""
+
+import fnmatch
+import json
+import os
+import random
+import threading
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.db.repositories.rule_repository import RuleRepository
+from src.models.db import Base
+from src.models.db import Rule as RuleEntity
+from src.models.rule_model import Rule, RuleItem
+from src.utils import rule_index as rule_index_module
+from src.utils.glob_trie import GlobTrie, parse_globs
+from src.utils.rule_index import RuleIndex
+
+PATTERNS = [
+    "*.py",
+    "src/*.py",
+    "src/**/*.py",
+    "src/api/*",
+    "src/api/users.py",
+    "tests/test_*.py",
+    "*/README.md",
+    "docs/*.md",
+    "*.md",
+    "src/[ab]*/*.ts",
+    "src/a?i/*.py",
+    "*",
+    "Makefile",
+    "*/Makefile",
+    "/abs/*.py",
+    "src/*.test.js",
+    "*.tar.gz",
+    "config/*.y*ml",
+]
+
+PATHS = [
+    "main.py",
+    "src/main.py",
+    "src/api/users.py",
+    "src/api/v1/users.py",
+    "src/api/schema.json",
+    "src/app/index.ts",
+    "src/beta/index.ts",
+    "src/core/index.ts",
+    "tests/test_rules.py",
+    "tests/unit/test_rules.py",
+    "README.md",
+    "docs/README.md",
+    "docs/guide/intro.md",
+    "Makefile",
+    "build/Makefile",
+    "/abs/tool.py",
+    "src/util.test.js",
+    "dist/pkg.tar.gz",
+    "config/app.yaml",
+    "config/app.yml",
+    "noext",
+    ".hidden",
+    "src/.env",
+]
+
+
+def make_rule(rule_id, globs=(), always_apply=False, name="", description=""):
+    return SimpleNamespace(
+        id=rule_id, globs=globs if isinstance(globs, str) else list(globs), always_apply=always_apply, name=name or rule_id, description=description
+    )
+
+
+class FakeEmbedder:
+    """按关键词生成向量的嵌入函数"""
+
+    KEYWORDS = ["数据库", "接口", "测试", "文档"]
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return [[text.count(keyword) + 0.01 for keyword in self.KEYWORDS] for text in texts]
+
+
+class TestGlobTrie:
+    """glob前缀树测试"""
+
+    def test_matches_fnmatch(self):
+        trie = GlobTrie()
+        for i, pattern in enumerate(PATTERNS):
+            trie.add(str(i), [pattern])
+
+        for path in PATHS:
+            expected = {str(i) for i, pattern in enumerate(PATTERNS) if fnmatch.fnmatch(path, pattern)}
+            assert trie.match(path) == expected, path
+
+    def test_random_patterns_match_fnmatch(self):
+        rng = random.Random(7)
+        segments = ["src", "api", "tests", "docs", "*", "?pi", "[st]*", "a*"]
+        names = ["*.py", "*.md", "index.ts", "*", "test_*.py", "users.py", "*.y*ml"]
+        trie = GlobTrie()
+        patterns = {}
+        for i in range(300):
+            pattern = "/".join(rng.choice(segments) for _ in range(rng.randint(0, 3))) + "/" + rng.choice(names)
+            patterns[str(i)] = [pattern.lstrip("/")]
+            trie.add(str(i), patterns[str(i)])
+
+        for path in PATHS:
+            expected = {key for key, (pattern,) in patterns.items() if fnmatch.fnmatch(path, pattern)}
+            assert trie.match(path) == expected, path
+
+    def test_add_replaces_and_remove_prunes(self):
+        trie = GlobTrie()
+        trie.add("r1", ["src/*.py", "src/*.md", "src/api/users.py"])
+        trie.add("r2", ["src/*.py"])
+        assert trie.match("src/api/users.py") == {"r1", "r2"}
+
+        trie.add("r1", ["docs/*.md"])
+        assert trie.match("src/api/users.py") == {"r2"}
+        assert trie.match("docs/a.md") == {"r1"}
+
+        assert trie.remove("r1") and trie.remove("r2")
+        assert not trie.remove("r2")
+        assert len(trie) == 0 and trie.match("src/a.py") == set()
+
+    def test_parse_globs(self):
+        assert parse_globs('["*.py", "*.md"]') == ["*.py", "*.md"]
+        assert parse_globs("*.py, *.md") == ["*.py", "*.md"]
+        assert parse_globs(None) == []
+        assert parse_globs(["*.py", ""]) == ["*.py"]
+
+
+class TestRuleIndexPath:
+    """路径匹配测试"""
+
+    def test_always_and_glob_in_insertion_order(self):
+        index = RuleIndex(embedder=None)
+        index.replace([make_rule("python", ["*.py"]), make_rule("global", always_apply=True), make_rule("docs", '["docs/*.md"]')])
+
+        assert [(m.rule_id, m.reason) for m in index.match_path("src/main.py")] == [("python", "glob"), ("global", "always")]
+        assert [m.rule_id for m in index.match_path("docs/guide.md")] == ["global", "docs"]
+        assert [m.rule_id for m in index.match()] == ["global"]
+
+    def test_incremental_upsert_and_remove(self):
+        index = RuleIndex(embedder=None)
+        index.replace([make_rule("python", ["*.py"])])
+
+        index.upsert(make_rule("api", ["src/api/*"]))
+        assert [m.rule_id for m in index.match_path("src/api/users.py")] == ["python", "api"]
+
+        index.upsert(make_rule("python", ["*.pyi"]))
+        assert [m.rule_id for m in index.match_path("src/api/users.py")] == ["api"]
+
+        assert index.remove("api")
+        assert not index.remove("api")
+        assert index.match_path("src/api/users.py") == []
+        assert "python" in index and len(index) == 1
+
+    def test_staleness(self):
+        index = RuleIndex(embedder=None)
+        assert index.is_stale(60)
+        index.replace([])
+        assert not index.is_stale(60)
+        assert index.is_stale(-1)
+
+    def test_many_rules_match_fnmatch(self):
+        rng = random.Random(1)
+        extensions = ["py", "ts", "md"]
+        rules = [make_rule(f"r{i}", [f"src/module{i % 50}/*.{rng.choice(extensions)}", f"pkg{i}/**/*.py"]) for i in range(1000)]
+        index = RuleIndex(embedder=None)
+        index.replace(rules)
+
+        for path in ("src/module3/a.py", "pkg7/sub/x.py", "src/module9/readme.md", "other/file.py"):
+            expected = {r.id for r in rules if any(fnmatch.fnmatch(path, g) for g in r.globs)}
+            assert {m.rule_id for m in index.match_path(path)} == expected
+
+
+class TestRuleIndexSemantic:
+    """语义匹配测试"""
+
+    def test_context_ranking_and_exclusion(self):
+        embedder = FakeEmbedder()
+        index = RuleIndex(embedder=embedder)
+        index.replace(
+            [
+                make_rule("db", ["*.sql"], description="数据库迁移和数据库访问规范"),
+                make_rule("api", description="接口设计规范"),
+                make_rule("tests", description="测试编写规范"),
+            ]
+        )
+
+        matches = index.match_context("修改数据库查询", top_k=2, min_score=0.5)
+        assert [(m.rule_id, m.reason) for m in matches] == [("db", "semantic")]
+        assert matches[0].score > 0.9
+
+        combined = index.match(file_path="schema.sql", context="修改数据库查询", min_score=0.5)
+        assert [(m.rule_id, m.reason) for m in combined] == [("db", "glob")]
+
+    def test_embeddings_computed_once_and_incrementally(self):
+        embedder = FakeEmbedder()
+        index = RuleIndex(embedder=embedder)
+        index.replace([make_rule("db", description="数据库规范"), make_rule("api", description="接口规范")])
+
+        index.match_context("数据库")
+        index.match_context("数据库")
+        assert len(embedder.calls) == 2
+
+        index.upsert(make_rule("docs", description="文档规范"))
+        assert index.match_context("文档", min_score=0.5)[0].rule_id == "docs"
+        assert embedder.calls[2:] == [["文档"], ["docs\n文档规范"]]
+
+    def test_cache_persisted_between_instances(self, tmp_path):
+        cache_path = str(tmp_path / "cache" / "embeddings.json")
+        rules = [make_rule("db", description="数据库规范"), make_rule("api", description="接口规范")]
+
+        first = FakeEmbedder()
+        index = RuleIndex(embedder=first, cache_path=cache_path)
+        index.replace(rules)
+        index.match_context("接口")
+        assert len(json.load(open(cache_path, encoding="utf-8"))["vectors"]) == 2
+
+        second = FakeEmbedder()
+        index = RuleIndex(embedder=second, cache_path=cache_path)
+        index.replace(rules)
+        assert index.match_context("接口", min_score=0.5)[0].rule_id == "api"
+        assert second.calls == [["接口"]]
+
+    def test_embedder_unavailable_or_failing(self):
+        index = RuleIndex(embedder=None)
+        index.replace([make_rule("db", description="数据库规范")])
+        assert index.match_context("数据库") == []
+
+        def failing(texts):
+            raise RuntimeError("服务不可用")
+
+        index = RuleIndex(embedder=failing)
+        index.replace([make_rule("db", ["*.sql"], description="数据库规范")])
+        assert index.match_context("数据库") == []
+        assert [m.rule_id for m in index.match("a.sql", "数据库")] == ["db"]
+
+    def test_path_matching_not_blocked_by_embedding(self):
+        started, release = threading.Event(), threading.Event()
+
+        def slow(texts):
+            started.set()
+            assert release.wait(5)
+            return FakeEmbedder()(texts)
+
+        index = RuleIndex(embedder=slow)
+        index.replace([make_rule("db", ["*.sql"], description="数据库规范")])
+        worker = threading.Thread(target=index.match_context, args=("数据库",))
+        worker.start()
+        try:
+            assert started.wait(5)
+            finished = threading.Event()
+            threading.Thread(target=lambda: (index.match_path("a.sql"), finished.set())).start()
+            assert finished.wait(2)
+        finally:
+            release.set()
+            worker.join(5)
+
+
+class TestRuleRepositoryForFile:
+    """规则仓库按文件查询测试"""
+
+    @pytest.fixture
+    def db_session(self):
+        engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        yield session
+        session.close()
+
+    @staticmethod
+    def _rule_data(rule_id, globs, always_apply=False):
+        return {
+            "id": rule_id,
+            "name": rule_id,
+            "type": "agent",
+            "description": rule_id,
+            "globs": json.dumps(globs),
+            "always_apply": always_apply,
+            "content": "",
+            "author": "test",
+        }
+
+    def test_get_for_file_and_incremental_updates(self, db_session):
+        db_session.add_all([RuleEntity(**self._rule_data("python", ["*.py"])), RuleEntity(**self._rule_data("global", [], always_apply=True))])
+        db_session.flush()
+        repo = RuleRepository()
+
+        assert [r.id for r in repo.get_for_file(db_session, "src/main.py")] == ["python", "global"]
+
+        repo.create(db_session, self._rule_data("api", ["src/api/*"]))
+        assert [r.id for r in repo.get_for_file(db_session, "src/api/users.py")] == ["python", "global", "api"]
+
+        repo.update(db_session, "python", {"globs": json.dumps(["*.pyi"])})
+        assert [r.id for r in repo.get_for_file(db_session, "src/api/users.py")] == ["global", "api"]
+
+        assert repo.delete(db_session, "global")
+        assert [r.id for r in repo.get_for_file(db_session, "src/api/users.py")] == ["api"]
+        assert repo.get_for_file(db_session, "README.md") == []
+
+
+class TestRuleManagerApplicableRules:
+    """规则管理器查找适用规则测试"""
+
+    @pytest.fixture
+    def manager(self, monkeypatch):
+        # 导入规则管理器会创建LLM解析器，没有配置OpenAI密钥时使用测试密钥
+        if not os.getenv("OPENAI_API_KEY"):
+            monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        from src.rule_engine.rule_manager import RuleManager
+
+        monkeypatch.setattr(rule_index_module, "_rule_index", RuleIndex(embedder=None))
+        engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        session.add(RuleEntity(**TestRuleRepositoryForFile._rule_data("python", ["*.py"])))
+        session.commit()
+        yield RuleManager(session)
+        session.close()
+
+    def test_rules_loaded_from_database(self, manager):
+        assert manager._db_available
+
+        assert [(m.rule_id, m.reason) for m in manager.find_applicable_rules("src/a.py")] == [("python", "glob")]
+
+    def test_saved_and_deleted_rules(self, manager):
+        rule = Rule(id="docs", name="文档", type="agent", description="文档规范", globs=["*.md"], content="", items=[RuleItem(content="标题")])
+
+        assert manager.db_ops.save_rule(rule).id == "docs"
+        assert [m.rule_id for m in manager.find_applicable_rules("README.md")] == ["docs"]
+
+        updated = rule.model_copy(update={"globs": ["docs/*.md"], "items": [RuleItem(content="目录")]})
+        assert manager.db_ops.save_rule(updated, overwrite=True).items[0].content == "目录"
+        assert [r.id for r in manager.list_rules()] == ["python", "docs"]
+
+        assert manager.delete_rule("docs")
+        assert manager.find_applicable_rules("docs/guide.md") == []
+        assert [r.id for r in manager.list_rules()] == ["python"]
@@ -0,0 +1 @@
+"""状态服务测试包"""
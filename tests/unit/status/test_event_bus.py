@@ -0,0 +1,105 @@
+"""
+测试状态事件总线
+
+验证 SubscriberManager 在事件总线模式下的非阻塞投递、事件合并和背压限制
+"""
+
+import asyncio
+import threading
+
+from src.status.core.event_bus import DeliveryMode, OverflowPolicy, StatusEvent, StatusEventBus
+from src.status.core.subscriber_manager import SubscriberManager
+from src.status.interfaces import IStatusSubscriber
+
+
+class RecordingSubscriber(IStatusSubscriber):
+    """记录收到的状态变更，可选地阻塞直到放行"""
+
+    def __init__(self, gate=None):
+        self.gate = gate
+        self.events = []
+
+    def on_status_changed(self, domain, entity_id, old_status, new_status, data):
+        if self.gate:
+            self.gate.wait(5)
+        self.events.append((domain, entity_id, old_status, new_status))
+
+
+class TestStatusEventBus:
+    """状态事件总线测试类"""
+
+    def test_slow_subscriber_does_not_block_publisher(self):
+        """测试慢订阅者不会阻塞状态写入"""
+        gate = threading.Event()
+        manager = SubscriberManager(event_bus=StatusEventBus(default_mode=DeliveryMode.THREAD))
+        slow = RecordingSubscriber(gate)
+        manager.register_subscriber(slow)
+
+        manager.notify_status_changed("task", "T1", "todo", "in_progress", {})
+        assert slow.events == []
+
+        gate.set()
+        assert manager.flush(timeout=5)
+        assert slow.events == [("task", "T1", "todo", "in_progress")]
+
+    def test_burst_on_same_entity_is_coalesced(self):
+        """测试同一实体的突发变更被合并为一次投递"""
+        gate = threading.Event()
+        manager = SubscriberManager(event_bus=StatusEventBus())
+        subscriber = RecordingSubscriber(gate)
+        manager.register_subscriber(subscriber)
+
+        manager.notify_status_changed("task", "T0", "todo", "done", {})
+        for old, new in [("todo", "in_progress"), ("in_progress", "review"), ("review", "done")]:
+            manager.notify_status_changed("task", "T1", old, new, {})
+
+        gate.set()
+        assert manager.flush(timeout=5)
+        assert subscriber.events == [("task", "T0", "todo", "done"), ("task", "T1", "todo", "done")]
+        metrics = next(iter(manager.get_dispatch_metrics().values()))
+        assert metrics["delivered"] == 2
+        assert metrics["coalesced"] == 2
+
+    def test_sync_subscriber_runs_inline(self):
+        """测试同步订阅者在发布线程中执行"""
+        manager = SubscriberManager(event_bus=StatusEventBus())
+        subscriber = RecordingSubscriber()
+        manager.register_subscriber(subscriber, delivery_mode=DeliveryMode.SYNC)
+
+        manager.notify_status_changed("task", "T1", "todo", "done", {})
+
+        assert subscriber.events == [("task", "T1", "todo", "done")]
+
+    def test_asyncio_delivery(self):
+        """测试asyncio投递方式支持协程回调"""
+        received = []
+
+        async def callback(status_type, status):
+            await asyncio.sleep(0)
+            received.append((status_type, status["entity_id"]))
+
+        manager = SubscriberManager(event_bus=StatusEventBus())
+        manager.subscribe("task", callback, delivery_mode=DeliveryMode.ASYNCIO)
+        manager.notify_subscribers("task", {"entity_id": "T1"})
+
+        assert manager.flush(timeout=5)
+        assert received == [("task", "T1")]
+
+    def test_drop_oldest_when_queue_full(self):
+        """测试队列满时丢弃最早的事件"""
+        gate = threading.Event()
+        bus = StatusEventBus(max_pending=2, overflow=OverflowPolicy.DROP_OLDEST)
+        delivered = []
+        channel = bus.add_channel("blocked", lambda value: (gate.wait(5), delivered.append(value)))
+
+        # 第一个事件被工作线程取走并阻塞，其余事件在队列中排队
+        channel.put(StatusEvent(key="a", args=(0,)))
+        while channel.get_metrics()["pending"]:
+            pass
+        for i in range(1, 5):
+            channel.put(StatusEvent(key=f"k{i}", args=(i,)))
+
+        gate.set()
+        assert bus.flush(timeout=5)
+        assert delivered == [0, 3, 4]
+        assert channel.get_metrics()["dropped"] == 2
@@ -0,0 +1,107 @@
+"""
+测试状态快照缓存
+
+验证 ProviderManager 的TTL快照缓存和基于状态变更事件的失效机制
+"""
+
+import time
+
+import pytest
+
+from src.status.core.provider_manager import ProviderManager
+from src.status.core.status_cache import StatusSnapshotCache
+from src.status.core.subscriber_manager import SubscriberManager
+
+
+class CountingProvider:
+    """记录调用次数的函数式提供者"""
+
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return {"value": self.value}
+
+
+@pytest.fixture
+def managers():
+    """创建带快照缓存的提供者管理器和订阅者管理器"""
+    cache = StatusSnapshotCache(ttl=60)
+    provider_manager = ProviderManager(snapshot_cache=cache, max_workers=4)
+    subscriber_manager = SubscriberManager()
+    subscriber_manager.register_subscriber(cache)
+    return provider_manager, subscriber_manager, cache
+
+
+class TestStatusSnapshotCache:
+    """状态快照缓存测试类"""
+
+    def test_repeated_reads_hit_cache(self, managers):
+        """测试重复读取不会重新计算"""
+        provider_manager, _, _ = managers
+        task, roadmap = CountingProvider("t"), CountingProvider("r")
+        provider_manager.register_provider("task", task)
+        provider_manager.register_provider("roadmap", roadmap)
+
+        first = provider_manager.get_all_status()
+        second = provider_manager.get_all_status()
+
+        assert first == second
+        assert list(second.keys()) == ["task", "roadmap"]
+        assert task.calls == 1
+        assert roadmap.calls == 1
+
+    def test_status_change_invalidates_domain(self, managers):
+        """测试状态变更只使对应领域失效"""
+        provider_manager, subscriber_manager, _ = managers
+        task, roadmap = CountingProvider("t"), CountingProvider("r")
+        provider_manager.register_provider("task", task)
+        provider_manager.register_provider("roadmap", roadmap)
+        provider_manager.get_all_status()
+
+        subscriber_manager.notify_status_changed("task", "T1", "todo", "done", {})
+        provider_manager.get_all_status()
+
+        assert task.calls == 2
+        assert roadmap.calls == 1
+
+    def test_ttl_expiry(self):
+        """测试快照过期后重新计算"""
+        cache = StatusSnapshotCache(ttl=0.01)
+        provider_manager = ProviderManager(snapshot_cache=cache)
+        task = CountingProvider("t")
+        provider_manager.register_provider("task", task)
+
+        provider_manager.get_status("task")
+        time.sleep(0.02)
+        provider_manager.get_status("task")
+
+        assert task.calls == 2
+
+    def test_errors_are_not_cached(self, managers):
+        """测试出错的领域不会被缓存"""
+        provider_manager, _, cache = managers
+        calls = []
+
+        def failing():
+            calls.append(1)
+            raise RuntimeError("boom")
+
+        provider_manager.register_provider("broken", failing)
+        result = provider_manager.get_all_status()
+        provider_manager.get_all_status()
+
+        assert "error" in result["broken"]
+        assert len(calls) == 2
+        assert "broken" not in cache.get_stats()["domains"]
+
+    def test_cached_snapshot_is_copied(self, managers):
+        """测试调用方修改返回值不会污染缓存"""
+        provider_manager, _, _ = managers
+        provider_manager.register_provider("task", CountingProvider("t"))
+
+        provider_manager.get_status("task")["value"] = "mutated"
+
+        assert provider_manager.get_status("task")["value"] == "t"
@@ -0,0 +1,112 @@
+"""
+状态同步发件箱单元测试
+
+测试同一实体变更的合并、批量发送、失败重试以及重启后继续发送
+"""
+
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from adapters.status_sync.services.outbox_flusher import StatusSyncOutboxFlusher
+from adapters.status_sync.services.status_subscriber import StatusSyncSubscriber
+from src.db.repositories.status_sync_outbox_repository import StatusSyncOutboxRepository
+from src.models.db import Base
+from src.models.db.status_sync_outbox import StatusSyncOutbox
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """创建基于文件的数据库，后台线程和测试共享"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'outbox.db'}")
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture
+def adapter():
+    """创建模拟的n8n适配器"""
+    adapter = MagicMock()
+    adapter.sync_variables.side_effect = lambda variables: {key: True for key in variables}
+    return adapter
+
+
+class TestStatusSyncOutbox:
+    """状态同步发件箱测试类"""
+
+    def test_updates_for_same_entity_are_coalesced(self, session_factory, adapter):
+        session = session_factory()
+        subscriber = StatusSyncSubscriber(session, n8n_adapter=adapter, auto_start=False)
+        for old, new in [("todo", "in_progress"), ("in_progress", "review"), ("review", "done")]:
+            subscriber.on_status_changed("roadmap", "S1", old, new, {"name": "故事1"})
+        subscriber.on_status_changed("roadmap", "S2", "todo", "done", {})
+        subscriber.on_status_changed("unknown", "X", "a", "b", {})
+
+        entries = StatusSyncOutboxRepository().claim_due(session, 10)
+
+        assert len(entries) == 2
+        s1 = next(e for e in entries if e["entity_id"] == "S1")
+        assert (s1["old_status"], s1["status"], s1["version"]) == ("todo", "done", 3)
+        adapter.sync_variables.assert_not_called()
+
+    def test_enqueue_does_not_touch_caller_transaction(self, session_factory, adapter):
+        session = session_factory()
+        subscriber = StatusSyncSubscriber(session, n8n_adapter=adapter, auto_start=False)
+        # 调用方会话中尚未提交的修改
+        session.add(StatusSyncOutbox(id="pending", domain="roadmap", entity_id="pending", status="todo", context="{}", version=1, attempts=0))
+
+        subscriber.on_status_changed("roadmap", "S1", "todo", "done", {})
+        session.rollback()
+
+        check = session_factory()
+        assert {e["id"] for e in StatusSyncOutboxRepository().claim_due(check, 10)} == {"roadmap:S1"}
+        check.close()
+
+    def test_flush_sends_one_batch_and_clears_outbox(self, session_factory, adapter):
+        session = session_factory()
+        subscriber = StatusSyncSubscriber(session, n8n_adapter=adapter, auto_start=False)
+        subscriber.on_status_changed("roadmap", "S1", "todo", "done", {"name": "故事1"})
+        subscriber.on_status_changed("workflow", "W1", "draft", "active", {})
+
+        stats = subscriber.flusher.flush_once()
+
+        assert stats == {"sent": 2, "failed": 0}
+        adapter.sync_variables.assert_called_once()
+        assert set(adapter.sync_variables.call_args[0][0]) == {"ROADMAP_STATUS_UPDATE", "SYSTEM_STATUS_UPDATE"}
+        assert StatusSyncOutboxRepository().pending_count(session) == 0
+
+    def test_failures_are_retried_with_backoff_and_survive_restart(self, session_factory):
+        session = session_factory()
+        repo = StatusSyncOutboxRepository()
+        repo.enqueue(session, "roadmap", "S1", "todo", "done", {})
+
+        failing = StatusSyncOutboxFlusher(session_factory, lambda entries: {e["id"]: "n8n不可用" for e in entries}, retry_base=60)
+        assert failing.flush_once() == {"sent": 0, "failed": 1}
+        # 退避期间不会再次领取
+        assert failing.flush_once() == {"sent": 0, "failed": 0}
+
+        # 新的状态变更重置退避，由"重启"后的发送器送出
+        repo.enqueue(session, "roadmap", "S1", "done", "closed", {})
+        delivered = []
+        restarted = StatusSyncOutboxFlusher(session_factory, lambda entries: delivered.extend(entries) or {})
+        assert restarted.flush_once() == {"sent": 1, "failed": 0}
+        assert delivered[0]["status"] == "closed"
+        assert repo.pending_count(session) == 0
+
+    def test_background_thread_delivers_without_blocking(self, session_factory, adapter):
+        session = session_factory()
+        subscriber = StatusSyncSubscriber(session, n8n_adapter=adapter)
+        subscriber.flusher.flush_interval = 0.05
+        try:
+            subscriber.on_status_changed("roadmap", "S1", "todo", "done", {})
+            for _ in range(100):
+                if StatusSyncOutboxRepository().pending_count(session_factory()) == 0:
+                    break
+                time.sleep(0.02)
+        finally:
+            subscriber.close()
+
+        assert adapter.sync_variables.called
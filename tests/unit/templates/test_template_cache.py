@@ -0,0 +1,70 @@
+"""
+模板编译缓存单元测试
+
+测试模板按内容哈希只编译一次，以及字节码缓存的复用
+"""
+
+from unittest.mock import patch
+
+import pytest
+from jinja2 import Environment, FileSystemBytecodeCache
+from jinja2.exceptions import TemplateSyntaxError
+
+from src.templates.core.template_cache import TemplateCompileCache
+
+
+class TestTemplateCompileCache:
+    """模板编译缓存测试类"""
+
+    def test_same_content_compiled_once(self):
+        """测试相同内容只编译一次"""
+        cache = TemplateCompileCache()
+        env = Environment()
+
+        with patch.object(env, "compile", wraps=env.compile) as compile_mock:
+            results = [cache.get_template(env, "Hello {{ name }}").render(name=str(i)) for i in range(5)]
+
+        assert results == [f"Hello {i}" for i in range(5)]
+        assert compile_mock.call_count == 1
+        assert cache.get_stats()["hits"] == 4
+
+    def test_templates_are_scoped_per_environment(self):
+        """测试不同环境的过滤器互不影响"""
+        cache = TemplateCompileCache()
+        upper_env, lower_env = Environment(), Environment()
+        upper_env.filters["shout"] = str.upper
+        lower_env.filters["shout"] = str.lower
+
+        assert cache.get_template(upper_env, "{{ v|shout }}").render(v="Hi") == "HI"
+        assert cache.get_template(lower_env, "{{ v|shout }}").render(v="Hi") == "hi"
+
+    def test_lru_eviction(self):
+        """测试超过容量后淘汰最久未使用的模板"""
+        cache = TemplateCompileCache(max_size=2)
+        env = Environment()
+        for content in ["a{{x}}", "b{{x}}", "c{{x}}"]:
+            cache.get_template(env, content)
+
+        assert cache.get_stats()["templates"] == 2
+
+    def test_parse_caches_syntax_errors(self):
+        """测试语法错误也会被缓存并重复抛出"""
+        cache = TemplateCompileCache()
+
+        for _ in range(2):
+            with pytest.raises(TemplateSyntaxError):
+                cache.parse("{% if %}")
+
+        assert cache.get_stats()["misses"] == 1
+
+    def test_bytecode_cache_shared_across_instances(self, tmp_path):
+        """测试字节码缓存可以跨缓存实例复用"""
+        content = "{% for i in items %}{{ i }}{% endfor %}"
+        TemplateCompileCache(bytecode_cache=FileSystemBytecodeCache(str(tmp_path))).get_template(Environment(), content)
+
+        env = Environment()
+        cache = TemplateCompileCache(bytecode_cache=FileSystemBytecodeCache(str(tmp_path)))
+        with patch.object(env, "compile", wraps=env.compile) as compile_mock:
+            assert cache.get_template(env, content).render(items=[1, 2]) == "12"
+
+        assert compile_mock.call_count == 0
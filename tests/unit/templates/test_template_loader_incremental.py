@@ -0,0 +1,125 @@
+"""
+模板增量加载单元测试
+
+测试基于文件指纹的增量同步、并行解析和已删除模板的清理
+"""
+
+import os
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.db.repositories.template_repository import TemplateRepository, TemplateVariableRepository
+from src.models.db import Base, Template
+from src.templates.core.managers import template_loader
+from src.templates.core.managers.template_loader import TemplateLoader
+
+
+def _write_template(path, template_id, body="# {{ title }}"):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"---\ntitle: {template_id}\ntype: doc\n---\n\n{body}\n")
+
+
+@pytest.fixture
+def session():
+    """创建内存数据库会话"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def loader(session):
+    """创建模板加载器"""
+    return TemplateLoader(session, TemplateRepository(), TemplateVariableRepository())
+
+
+@pytest.fixture
+def templates_dir(tmp_path):
+    """创建包含两个模板的目录"""
+    directory = tmp_path / "templates"
+    (directory / "sub").mkdir(parents=True)
+    _write_template(directory / "a.md", "tpl-a")
+    _write_template(directory / "sub" / "b.j2", "tpl-b")
+    return directory
+
+
+class TestIncrementalTemplateLoader:
+    """模板增量加载测试类"""
+
+    def test_initial_sync_loads_all_templates(self, loader, session, templates_dir, tmp_path):
+        stats = loader.sync_templates_from_directory(str(templates_dir), index_path=str(tmp_path / "index.json"))
+
+        assert stats["added"] == 2
+        assert stats["total"] == 2
+        assert {t.id for t in session.query(Template).all()} == {"tpl-a", "tpl-b"}
+
+    def test_unchanged_files_are_not_parsed_again(self, loader, templates_dir, tmp_path):
+        index_path = str(tmp_path / "index.json")
+        loader.sync_templates_from_directory(str(templates_dir), index_path=index_path)
+
+        with patch.object(template_loader, "_parse_template_file") as mock_parse:
+            stats = loader.sync_templates_from_directory(str(templates_dir), index_path=index_path)
+
+        mock_parse.assert_not_called()
+        assert stats["unchanged"] == 2
+        assert stats["added"] == stats["updated"] == 0
+
+    def test_unchanged_count_excludes_failed_and_duplicate_id_files(self, loader, templates_dir, tmp_path):
+        index_path = str(tmp_path / "index.json")
+        # 两个文件共用同一个模板ID，都需要解析，不应计入未变
+        _write_template(templates_dir / "a_copy.md", "tpl-a")
+        stats = loader.sync_templates_from_directory(str(templates_dir), index_path=index_path)
+        assert stats["unchanged"] == 0
+
+        # 解析失败的文件恢复旧指纹后计入 failed，而不是 unchanged
+        (templates_dir / "sub" / "b.j2").write_bytes(b"\xff\xfe\x00")
+        stats = loader.sync_templates_from_directory(str(templates_dir), index_path=index_path)
+        assert stats["failed"] == 1
+        assert stats["unchanged"] == 2
+        assert stats["total"] == 3
+
+    def test_changed_and_deleted_files(self, loader, session, templates_dir, tmp_path):
+        index_path = str(tmp_path / "index.json")
+        loader.sync_templates_from_directory(str(templates_dir), index_path=index_path)
+        created_at = session.get(Template, "tpl-a").created_at
+
+        _write_template(templates_dir / "a.md", "tpl-a", body="# 新内容 {{ title }}")
+        os.remove(templates_dir / "sub" / "b.j2")
+        stats = loader.sync_templates_from_directory(str(templates_dir), index_path=index_path)
+        session.expire_all()
+
+        assert stats["updated"] == 1
+        assert stats["removed"] == 1
+        assert session.get(Template, "tpl-b") is None
+        updated = session.get(Template, "tpl-a")
+        assert "新内容" in updated.content
+        assert updated.created_at == created_at
+
+    def test_templates_missing_from_database_are_reloaded(self, loader, session, templates_dir, tmp_path):
+        index_path = str(tmp_path / "index.json")
+        loader.sync_templates_from_directory(str(templates_dir), index_path=index_path)
+        session.query(Template).delete()
+        session.commit()
+
+        stats = loader.sync_templates_from_directory(str(templates_dir), index_path=index_path)
+
+        assert stats["added"] == 2
+        assert session.query(Template).count() == 2
+
+    def test_large_trees_use_parallel_parsing(self, loader, session, tmp_path):
+        directory = tmp_path / "many"
+        directory.mkdir()
+        for i in range(template_loader.PARALLEL_PARSE_THRESHOLD):
+            _write_template(directory / f"t{i}.md", f"tpl-{i}")
+        # 一个无法解析的文件不影响其他模板
+        (directory / "broken.md").write_bytes(b"\xff\xfe\x00")
+
+        stats = loader.sync_templates_from_directory(str(directory), max_workers=2, index_path=str(tmp_path / "index.json"))
+
+        assert stats["added"] == template_loader.PARALLEL_PARSE_THRESHOLD
+        assert session.query(Template).count() == template_loader.PARALLEL_PARSE_THRESHOLD
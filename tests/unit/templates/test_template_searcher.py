@@ -0,0 +1,84 @@
+"""
+模板查询器单元测试
+
+测试数据库侧搜索、分页以及更新后缓存失效
+"""
+
+import json
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.db.repositories.template_repository import TemplateRepository, TemplateVariableRepository
+from src.models.db import Base, Template
+from src.templates.core.managers.template_searcher import TemplateLRUCache, TemplateSearcher
+from src.templates.core.managers.template_updater import TemplateUpdater
+
+
+@pytest.fixture
+def session():
+    """创建内存数据库会话并写入测试模板"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    for i in range(20):
+        session.add(
+            Template(
+                id=f"t{i}",
+                name=f"template_{i}",
+                description="命令模板" if i % 2 else "文档模板",
+                type="command" if i % 4 == 0 else "doc",
+                content="{{ name }}",
+                tags=json.dumps(["核心"] if i % 5 == 0 else ["misc"]),
+            )
+        )
+    session.commit()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def searcher(session):
+    """创建模板查询器"""
+    return TemplateSearcher(session, TemplateRepository(), TemplateVariableRepository())
+
+
+class TestTemplateSearcher:
+    """模板查询器测试类"""
+
+    def test_search_by_query_type_and_tags(self, searcher):
+        """测试关键词、类型和标签条件在数据库中组合筛选"""
+        assert len(searcher.search_templates(query="命令")) == 10
+        assert len(searcher.search_templates(template_type="command")) == 5
+        assert {t.id for t in searcher.search_templates(tags=["核心"])} == {"t0", "t5", "t10", "t15"}
+        assert {t.id for t in searcher.search_templates(query="命令", tags=["核心"])} == {"t5", "t15"}
+
+    def test_like_wildcards_are_escaped(self, searcher):
+        """测试关键词中的下划线按字面匹配"""
+        ids = {t.id for t in searcher.search_templates(query="e_1")}
+        assert ids == {"t1"} | {f"t{i}" for i in range(10, 20)}
+
+    def test_pagination(self, searcher):
+        """测试分页结果和总数"""
+        page = searcher.search_templates_page(template_type="doc", page=2, page_size=10)
+
+        assert page["total"] == 15
+        assert len(page["items"]) == 5
+
+    def test_update_invalidates_cache(self, session, searcher):
+        """测试更新模板后缓存失效"""
+        updater = TemplateUpdater(session, searcher.template_repo, searcher.variable_repo, templates_cache=searcher.templates_cache)
+        assert searcher.get_template("t3").name == "template_3"
+
+        updater.update_template("t3", {"name": "renamed"})
+
+        assert searcher.get_template("t3").name == "renamed"
+
+    def test_cache_is_bounded(self):
+        """测试缓存容量有上限"""
+        cache = TemplateLRUCache(max_size=2)
+        for key in ["a", "b", "c"]:
+            cache[key] = key
+
+        assert list(cache) == ["b", "c"]
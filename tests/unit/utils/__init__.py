@@ -0,0 +1 @@
+"""工具模块测试包"""
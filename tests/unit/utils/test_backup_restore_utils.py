@@ -0,0 +1,137 @@
+"""
+备份恢复工具单元测试
+
+测试流式压缩JSONL备份、清单校验和以及批量恢复
+"""
+
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from src.db.repository import Repository
+from src.models.db import Base, Template, TemplateVariable
+from src.utils import backup_restore_utils
+from src.utils.backup_restore_utils import (
+    MANIFEST_FILE,
+    EntityBackupRestoreHandler,
+    backup_all_entities,
+    iter_jsonl_records,
+    read_backup_manifest,
+    restore_all_entities,
+)
+
+
+class TemplateHandler(EntityBackupRestoreHandler):
+    """测试用模板处理器"""
+
+    def get_repository(self, session):
+        return Repository(Template)
+
+
+class TemplateVariableHandler(EntityBackupRestoreHandler):
+    """测试用模板变量处理器"""
+
+    def get_repository(self, session):
+        return Repository(TemplateVariable)
+
+
+@pytest.fixture
+def session(tmp_path):
+    """创建文件数据库会话并写入测试数据（并行导出需要跨线程共享数据库）"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'source.db'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        for i in range(25):
+            session.add(Template(id=f"t{i}", name=f"模板{i}", type="doc", content="{{ x }}"))
+            session.add(TemplateVariable(id=f"v{i}", template_id=f"t{i}", name="x", type="string"))
+        session.commit()
+        yield session
+
+
+@pytest.fixture
+def handlers():
+    """注册测试处理器"""
+    with patch.dict(backup_restore_utils.ENTITY_HANDLERS, {"templates": TemplateHandler, "template_variables": TemplateVariableHandler}, clear=True):
+        yield
+
+
+class TestStreamingBackup:
+    """流式备份测试类"""
+
+    def test_single_entity_backup_streams_all_rows(self, session, tmp_path):
+        result = TemplateHandler("templates")._backup_to_jsonl(session, str(tmp_path / "out"), chunk_size=7)
+
+        assert result["count"] == 25
+        file_path = os.path.join(tmp_path / "out", result["file"])
+        chunks = list(iter_jsonl_records(file_path, chunk_size=10))
+        assert [len(c) for c in chunks] == [10, 10, 5]
+        assert {row["id"] for chunk in chunks for row in chunk} == {f"t{i}" for i in range(25)}
+        assert chunks[0][0]["name"].startswith("模板")
+
+    def test_backup_all_writes_manifest_with_checksums(self, session, handlers, tmp_path):
+        output_dir = str(tmp_path / "backup")
+        result = backup_all_entities(session, output_dir, format="jsonl", max_workers=2)
+
+        assert not any("error" in r for r in result["results"].values())
+        manifest = read_backup_manifest(output_dir)
+        assert manifest["entities"]["templates"]["count"] == 25
+        assert manifest["entities"]["template_variables"]["table"] == "template_variables"
+
+    def test_corrupted_archive_fails_verification(self, session, handlers, tmp_path):
+        output_dir = str(tmp_path / "backup")
+        backup_all_entities(session, output_dir, format="jsonl")
+        with open(os.path.join(output_dir, "templates.jsonl.gz"), "ab") as f:
+            f.write(b"garbage")
+
+        with pytest.raises(ValueError):
+            read_backup_manifest(output_dir)
+        assert json.load(open(os.path.join(output_dir, MANIFEST_FILE)))["version"] == 1
+
+
+class TestBulkRestore:
+    """批量恢复测试类"""
+
+    @pytest.fixture
+    def target(self, tmp_path):
+        """创建空的目标数据库会话"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'target.db'}")
+        Base.metadata.create_all(engine)
+        with Session(engine) as session:
+            yield session
+
+    def test_restore_all_round_trip(self, session, target, handlers, tmp_path):
+        output_dir = str(tmp_path / "backup")
+        backup_all_entities(session, output_dir, format="jsonl")
+
+        result = restore_all_entities(target, output_dir, format="jsonl")
+
+        assert result["results"]["templates"]["imported"] == 25
+        assert result["results"]["template_variables"]["imported"] == 25
+        assert target.get(Template, "t3").name == "模板3"
+
+    def test_existing_rows_skipped_or_updated_with_force(self, session, target, tmp_path):
+        handler = TemplateHandler("templates")
+        output_dir = str(tmp_path / "backup")
+        handler._backup_to_jsonl(session, output_dir)
+        target.add(Template(id="t0", name="旧名称", type="doc", content=""))
+        target.commit()
+
+        skipped = handler.restore(target, output_dir, format="jsonl")
+        assert (skipped["imported"], skipped["skipped"]) == (24, 1)
+        assert target.get(Template, "t0").name == "旧名称"
+
+        forced = handler.restore(target, output_dir, format="jsonl", force=True)
+        target.expire_all()
+        assert forced["updated"] == 25
+        assert target.get(Template, "t0").name == "模板0"
+
+    def test_restore_follows_foreign_key_order(self):
+        order = backup_restore_utils._dependency_order(
+            ["template_variables", "templates"], {"template_variables": "template_variables", "templates": "templates"}
+        )
+
+        assert order == ["templates", "template_variables"]
@@ -0,0 +1,148 @@
+"""
+SQLite在线备份单元测试
+
+测试在线备份、恢复以及增量快照的生成和还原
+"""
+
+import os
+import sqlite3
+
+import pytest
+
+from src.utils.sqlite_backup import SQLiteSnapshotStore, online_backup, online_restore
+
+
+def _rows(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT id, body FROM items ORDER BY id").fetchall()
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """创建包含测试数据的数据库"""
+    path = str(tmp_path / "live.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, body TEXT)")
+    conn.executemany("INSERT INTO items (body) VALUES (?)", [("x" * 500,) for _ in range(400)])
+    conn.commit()
+    conn.close()
+    return path
+
+
+class TestOnlineBackup:
+    """在线备份测试类"""
+
+    def test_backup_reports_progress_and_copies_data(self, db_path, tmp_path):
+        steps = []
+        output = str(tmp_path / "copy.db")
+
+        result = online_backup(db_path, output, pages=10, sleep=0, progress=lambda copied, total: steps.append((copied, total)))
+
+        assert _rows(output) == _rows(db_path)
+        assert len(steps) > 1
+        assert steps[-1][0] == steps[-1][1] == result["pages"]
+
+    def test_restore_into_open_database(self, db_path, tmp_path):
+        backup = str(tmp_path / "copy.db")
+        online_backup(db_path, backup)
+        reader = sqlite3.connect(db_path)
+        reader.execute("DELETE FROM items")
+        reader.commit()
+
+        online_restore(backup, db_path, pages=5, sleep=0)
+
+        assert reader.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 400
+        reader.close()
+
+
+class TestSnapshotStore:
+    """增量快照测试类"""
+
+    def test_incremental_snapshot_only_stores_changed_pages(self, db_path, tmp_path):
+        store = SQLiteSnapshotStore(str(tmp_path / "snapshots"))
+        first = store.create_snapshot(db_path)
+
+        conn = sqlite3.connect(db_path)
+        conn.execute("UPDATE items SET body = 'changed' WHERE id = 1")
+        conn.commit()
+        conn.close()
+        second = store.create_snapshot(db_path)
+
+        assert first["type"] == "full"
+        assert second["type"] == "incremental"
+        assert 0 < second["changed_pages"] < first["page_count"] / 4
+        assert second["size"] < first["size"]
+
+    def test_restore_any_snapshot_in_chain(self, db_path, tmp_path):
+        store = SQLiteSnapshotStore(str(tmp_path / "snapshots"))
+        first = store.create_snapshot(db_path)
+        expected_first = _rows(db_path)
+
+        conn = sqlite3.connect(db_path)
+        conn.execute("DELETE FROM items WHERE id > 100")
+        conn.commit()
+        conn.execute("VACUUM")
+        conn.close()
+        store.create_snapshot(db_path)
+
+        store.restore_snapshot(str(tmp_path / "latest.db"))
+        store.restore_snapshot(str(tmp_path / "first.db"), first["id"])
+
+        assert _rows(str(tmp_path / "latest.db")) == _rows(db_path)
+        assert _rows(str(tmp_path / "first.db")) == expected_first
+
+    def test_new_full_snapshot_after_max_chain(self, db_path, tmp_path):
+        store = SQLiteSnapshotStore(str(tmp_path / "snapshots"), max_chain=1)
+
+        types = [store.create_snapshot(db_path)["type"] for _ in range(3)]
+
+        assert types == ["full", "incremental", "full"]
+
+
+class TestBackupRestoreCommands:
+    """db backup --incremental 与 db restore 命令测试类"""
+
+    @pytest.fixture
+    def handlers(self, monkeypatch, db_path):
+        """创建指向测试数据库的备份和恢复处理器"""
+        if not os.environ.get("OPENAI_API_KEY"):
+            monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        from src.cli.commands.db.handlers import backup_handler, restore_handler
+
+        monkeypatch.setattr(backup_handler, "get_sqlite_db_path", lambda: db_path)
+        monkeypatch.setattr(restore_handler.RestoreHandler, "_get_db_path_from_config", lambda self: db_path)
+        return backup_handler.BackupHandler(), restore_handler.RestoreHandler()
+
+    def test_restore_incremental_snapshots(self, handlers, db_path, tmp_path):
+        backup, restore = handlers
+        snapshot_dir = str(tmp_path / "snapshots")
+        backup.execute(output=snapshot_dir, incremental=True)
+        expected_first = _rows(db_path)
+        first_id = SQLiteSnapshotStore(snapshot_dir).list_snapshots()[0]["id"]
+
+        conn = sqlite3.connect(db_path)
+        conn.execute("DELETE FROM items WHERE id > 100")
+        conn.commit()
+        conn.close()
+        backup.execute(output=snapshot_dir, incremental=True)
+        expected_latest = _rows(db_path)
+
+        conn = sqlite3.connect(db_path)
+        conn.execute("DELETE FROM items")
+        conn.commit()
+        conn.close()
+        assert restore.execute(backup_path=snapshot_dir, force=True) == 0
+        assert _rows(db_path) == expected_latest
+
+        assert restore.execute(backup_path=snapshot_dir, snapshot=first_id, force=True) == 0
+        assert _rows(db_path) == expected_first
+
+    def test_restore_rejects_directory_without_snapshots(self, handlers, tmp_path):
+        _, restore = handlers
+        from src.cli.commands.db.handlers.exceptions import ValidationError
+
+        with pytest.raises(ValidationError):
+            restore.execute(backup_path=str(tmp_path), force=True)
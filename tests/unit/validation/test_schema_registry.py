@@ -0,0 +1,123 @@
+"""
+Schema注册表单元测试
+
+测试Schema只编译一次、收集全部错误、structure格式转换以及进程池批量验证
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+import yaml
+
+from src.validation.core import schema_registry as registry_module
+from src.validation.core.schema_registry import SchemaRegistry, structure_to_json_schema
+from src.validation.core.workflow_validator import WorkflowValidator
+
+SCHEMA = {
+    "type": "object",
+    "required": ["id", "name"],
+    "properties": {"id": {"type": "string"}, "name": {"type": "string"}, "tags": {"type": "array", "items": {"type": "string"}}},
+}
+
+
+class FakeConfig:
+    """可控的配置对象"""
+
+    def __init__(self, values):
+        self.values = values
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+
+class TestSchemaRegistry:
+    """Schema注册表测试"""
+
+    def test_schema_compiled_once(self):
+        registry = SchemaRegistry()
+
+        with patch.object(registry_module.Draft7Validator, "check_schema", wraps=registry_module.Draft7Validator.check_schema) as check:
+            first = registry.validator_for(SCHEMA)
+            assert registry.validator_for(SCHEMA) is first
+            # 内容相同的新字典也复用编译结果
+            assert registry.validator_for(json.loads(json.dumps(SCHEMA))) is first
+            assert check.call_count == 1
+
+    def test_collects_all_errors(self):
+        registry = SchemaRegistry()
+
+        is_valid, errors = registry.validate(SCHEMA, {"id": 1, "tags": ["a", 2]})
+
+        assert is_valid is False
+        assert len(errors) == 3
+        assert any("'name' is a required property" in error for error in errors)
+        assert any(error.startswith("路径 'tags.1'") for error in errors)
+
+    def test_structure_conversion(self):
+        schema = structure_to_json_schema(
+            {
+                "id": {"type": "string", "required": True},
+                "type": {"type": "string", "required": True, "default": "rule", "enum": ["rule", "core-rule"]},
+                "fields": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {"required": {"type": "boolean", "required": False}, "value": {"type": "any", "required": True}},
+                    },
+                },
+            }
+        )
+
+        assert schema["required"] == ["id"]
+        assert schema["properties"]["type"]["enum"] == ["rule", "core-rule"]
+        items = schema["properties"]["fields"]["items"]
+        assert items["required"] == ["value"]
+        assert items["properties"]["required"] == {"type": "boolean"}
+        assert items["properties"]["value"] == {}
+
+    def test_builtin_schemas(self):
+        registry = SchemaRegistry()
+
+        assert {"roadmap", "rule", "template", "workflow"} <= set(registry.names())
+        assert registry.validate("rule", {"id": "r1", "name": "规则", "content": "内容"}) == (True, [])
+        assert registry.validate("rule", {"id": "r1", "name": "规则", "content": "内容", "type": "bad"})[0] is False
+
+    def test_base_validator_reports_every_error(self):
+        is_valid, errors = WorkflowValidator().validate_workflow({"id": 1, "tags": "x"})
+
+        assert is_valid is False
+        assert len(errors) == 4
+
+
+class TestBatchValidation:
+    """批量验证测试"""
+
+    @pytest.fixture
+    def parallel_config(self, monkeypatch):
+        monkeypatch.setattr(registry_module, "get_config", lambda: FakeConfig({"validation.parallel_threshold": 2}))
+
+    def test_validate_many_in_process_pool(self, parallel_config):
+        registry = SchemaRegistry()
+        documents = [{"id": str(i), "name": f"n{i}"} if i % 3 else {"id": i} for i in range(9)]
+
+        with patch.object(registry_module, "ProcessPoolExecutor", wraps=registry_module.ProcessPoolExecutor) as pool:
+            results = registry.validate_many(SCHEMA, documents, max_workers=2)
+            assert pool.call_count == 1
+
+        assert [ok for ok, _ in results] == [i % 3 != 0 for i in range(9)]
+        assert len(results[0][1]) == 2
+
+    def test_validate_directory(self, tmp_path, parallel_config):
+        (tmp_path / "nested").mkdir()
+        (tmp_path / "a.yaml").write_text(yaml.safe_dump({"id": "a", "name": "A"}), encoding="utf-8")
+        (tmp_path / "nested" / "b.json").write_text(json.dumps({"id": "b"}), encoding="utf-8")
+        (tmp_path / "c.yml").write_text("id: [unclosed", encoding="utf-8")
+        (tmp_path / "notes.txt").write_text("ignored", encoding="utf-8")
+
+        results = SchemaRegistry().validate_directory(SCHEMA, str(tmp_path), max_workers=2)
+
+        assert sorted(path.replace(str(tmp_path), "") for path in results) == ["/a.yaml", "/c.yml", "/nested/b.json"]
+        assert results[str(tmp_path / "a.yaml")] == (True, [])
+        assert results[str(tmp_path / "nested" / "b.json")][0] is False
+        assert results[str(tmp_path / "c.yml")][1][0].startswith("加载文件失败")
@@ -0,0 +1,112 @@
+"""
+工作流目录索引单元测试
+
+测试索引只解析变化的文件、持久化索引的复用、按需加载以及模糊查找
+"""
+
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from src.workflow.service import catalog as catalog_module
+from src.workflow.service.catalog import CATALOG_FILENAME, WorkflowCatalog
+
+
+def write_workflow(directory, workflow_id, name, workflow_type="dev", filename=None, **extra):
+    data = {"id": workflow_id, "name": name, "type": workflow_type, "stages": [{"id": "s1", "name": "开始"}], **extra}
+    path = directory / (filename or f"{workflow_id}.json")
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def workflows_dir(tmp_path):
+    write_workflow(tmp_path, "a1", "Code Review Flow", description="评审代码")
+    write_workflow(tmp_path, "b2", "Release Flow", workflow_type="ops")
+    write_workflow(tmp_path, "c3", "Stale Copy", filename="old.json")
+    (tmp_path / "broken.json").write_text("{not json", encoding="utf-8")
+    return tmp_path
+
+
+def count_reads():
+    return patch.object(catalog_module, "read_json_file", wraps=catalog_module.read_json_file)
+
+
+class TestWorkflowCatalog:
+    """工作流目录索引测试"""
+
+    def test_entries_skip_invalid_files(self, workflows_dir):
+        catalog = WorkflowCatalog(str(workflows_dir))
+
+        entries = catalog.entries()
+
+        assert [entry["id"] for entry in entries] == ["a1", "b2"]
+        assert entries[0]["stage_count"] == 1
+        assert catalog.get_summary("c3")["filename"] == "old.json"
+        assert (workflows_dir / CATALOG_FILENAME).exists()
+
+    def test_only_changed_files_are_reparsed(self, workflows_dir):
+        catalog = WorkflowCatalog(str(workflows_dir))
+        catalog.entries()
+
+        with count_reads() as reads:
+            assert catalog.find_by_name("Release Flow")["id"] == "b2"
+            assert reads.call_count == 0
+
+            path = write_workflow(workflows_dir, "b2", "Release Flow v2", workflow_type="ops")
+            os.utime(path, ns=(1, 1))
+            assert catalog.find_by_name("Release Flow v2")["id"] == "b2"
+            assert reads.call_count == 1
+
+    def test_persisted_index_avoids_parsing(self, workflows_dir):
+        WorkflowCatalog(str(workflows_dir)).entries()
+
+        with count_reads() as reads:
+            catalog = WorkflowCatalog(str(workflows_dir))
+            assert catalog.find_by_name("Code Review Flow")["id"] == "a1"
+            assert [s["id"] for s in catalog.find_by_type("ops")] == ["b2"]
+            assert reads.call_count == 0
+
+            workflow = catalog.load("a1")
+            assert reads.call_count == 1
+            assert workflow["description"] == "评审代码"
+
+            # 返回副本，修改不影响缓存
+            workflow["name"] = "changed"
+            assert catalog.load("a1")["name"] == "Code Review Flow"
+            assert reads.call_count == 1
+
+    def test_deleted_files_leave_index(self, workflows_dir):
+        catalog = WorkflowCatalog(str(workflows_dir))
+        catalog.entries()
+
+        (workflows_dir / "a1.json").unlink()
+
+        assert [entry["id"] for entry in catalog.entries()] == ["b2"]
+        assert catalog.load("a1") is None
+
+    def test_search_substring(self, workflows_dir):
+        catalog = WorkflowCatalog(str(workflows_dir))
+
+        assert [s["id"] for s in catalog.search("flow", "name")] == ["a1", "b2"]
+        assert [s["id"] for s in catalog.search("REVIEW", "name")] == ["a1"]
+        assert [s["id"] for s in catalog.search("re", "name")] == ["a1", "b2"]
+        assert catalog.search("deploy", "name") == []
+        assert [s["id"] for s in catalog.search("评审", "description")] == ["a1"]
+
+
+class TestWorkflowFuzzy:
+    """模糊查找测试"""
+
+    def test_fuzzy_lookup_uses_catalog(self, workflows_dir, monkeypatch):
+        from src.workflow.utils import workflow_search
+
+        catalog = WorkflowCatalog(str(workflows_dir))
+        monkeypatch.setattr(workflow_search, "get_workflow_catalog", lambda: catalog)
+        monkeypatch.setattr(workflow_search, "get_workflow_by_name", lambda name: None)
+
+        assert workflow_search.get_workflow_fuzzy("release")["id"] == "b2"
+        assert workflow_search.get_workflow_fuzzy("ops")["id"] == "b2"
+        assert workflow_search.get_workflow_fuzzy("nothing-here") is None
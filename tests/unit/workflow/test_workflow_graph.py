@@ -0,0 +1,176 @@
+"""
+工作流阶段图单元测试
+
+测试拓扑顺序、依赖位集下的下一阶段计算、会话进度、按版本缓存和失效以及会话上下文混入类
+"""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import src.status  # noqa: F401  先初始化状态模块，避免src.flow_session包导入时的循环依赖
+from src.flow_session.manager.session_context import SessionContextMixin
+from src.models.db import Base, FlowSession, Stage, WorkflowDefinition
+from src.workflow.graph import WorkflowGraph, get_workflow_graph, invalidate_workflow_graph
+
+STAGES = [
+    {"id": "review", "name": "评审", "depends_on": ["build", "test"], "weight": 1},
+    {"id": "design", "name": "设计", "weight": 5},
+    {"id": "build", "name": "构建", "depends_on": ["design"], "weight": 2},
+    {"id": "test", "name": "测试", "depends_on": ["design"], "weight": 1},
+    {"id": "release", "name": "发布", "depends_on": ["review"], "prerequisites": {"approved": True}},
+    {"id": "orphan", "name": "孤立", "depends_on": ["missing"]},
+]
+
+
+class TestWorkflowGraph:
+    """阶段图计算测试"""
+
+    def test_topological_order_keeps_definition_order_for_ties(self):
+        graph = WorkflowGraph("wf", 1, STAGES)
+
+        assert graph.order == ["design", "build", "test", "review", "release", "orphan"]
+        assert graph.first_stage()["id"] == "design"
+
+    def test_next_stages_uses_dependencies_and_weight(self):
+        graph = WorkflowGraph("wf", 1, STAGES)
+
+        next_ids = [stage["id"] for stage in graph.next_stages("design", [])]
+        assert next_ids == ["test", "build"]
+
+        # 当前阶段视为已完成，但其他依赖仍需完成
+        assert [s["id"] for s in graph.next_stages("build", ["design"])] == ["test"]
+        assert [s["id"] for s in graph.next_stages("test", ["design", "build"])] == ["review"]
+
+    def test_prerequisites_and_unknown_dependencies(self):
+        graph = WorkflowGraph("wf", 1, STAGES)
+        completed = ["design", "build", "test"]
+
+        assert graph.next_stages("review", completed, {}) == []
+        assert graph.next_stages("review", completed, {"approved": False}) == []
+        assert [s["id"] for s in graph.next_stages("review", completed, {"approved": True})] == ["release"]
+        # 依赖未定义阶段的阶段永远不可进入
+        assert all(s["id"] != "orphan" for s in graph.next_stages("release", completed + ["review"], {"approved": True}))
+
+    def test_progress(self):
+        graph = WorkflowGraph("wf", 1, STAGES)
+
+        progress = graph.progress("build", ["design"])
+
+        assert progress["total_stages"] == 6
+        assert progress["completed_count"] == 1
+        assert progress["current_stage"]["id"] == "build"
+        assert [s["id"] for s in progress["pending_stages"]] == ["test", "review", "release", "orphan"]
+        assert progress["progress_percentage"] == pytest.approx(100 / 6)
+
+    def test_cycle_does_not_drop_stages(self):
+        graph = WorkflowGraph("wf", 1, [{"id": "a", "depends_on": ["b"]}, {"id": "b", "depends_on": ["a"]}, {"id": "c"}])
+
+        assert sorted(graph.order) == ["a", "b", "c"]
+        assert graph.order[0] == "c"
+
+
+class TestWorkflowGraphCache:
+    """阶段图缓存测试"""
+
+    @pytest.fixture
+    def db_session(self):
+        engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        invalidate_workflow_graph()
+        yield session
+        session.close()
+        invalidate_workflow_graph()
+
+    def _create_workflow(self, db_session):
+        workflow = WorkflowDefinition(id="wf-1", name="开发流程", stages_data=[])
+        db_session.add(workflow)
+        db_session.add_all(
+            [
+                Stage(id="s1", workflow_id="wf-1", name="设计", order_index=0, depends_on=[]),
+                Stage(id="s2", workflow_id="wf-1", name="实现", order_index=1, depends_on=["s1"]),
+            ]
+        )
+        db_session.commit()
+        return workflow
+
+    def test_graph_is_cached_until_stage_changes(self, db_session):
+        workflow = self._create_workflow(db_session)
+
+        graph = get_workflow_graph(db_session, workflow)
+        assert get_workflow_graph(db_session, workflow) is graph
+        assert [s["id"] for s in graph.next_stages("s1", [])] == ["s2"]
+
+        stage = db_session.get(Stage, "s2")
+        stage.depends_on = ["s1", "s3"]
+        db_session.add(Stage(id="s3", workflow_id="wf-1", name="评审", order_index=2, depends_on=[]))
+        db_session.commit()
+
+        updated = get_workflow_graph(db_session, workflow)
+        assert updated is not graph
+        assert [s["id"] for s in updated.next_stages("s1", [])] == ["s3"]
+
+    def test_falls_back_to_stages_data(self, db_session):
+        workflow = WorkflowDefinition(id="wf-2", name="数据流程", stages_data=[{"id": "a", "name": "A"}, {"id": "b", "depends_on": ["a"]}])
+        db_session.add(workflow)
+        db_session.commit()
+
+        graph = get_workflow_graph(db_session, workflow)
+
+        assert graph.order == ["a", "b"]
+        assert [s["id"] for s in graph.next_stages("a", [])] == ["b"]
+
+
+class ContextManager(SessionContextMixin):
+    """只包含会话上下文混入类的会话管理器"""
+
+    def __init__(self, session):
+        self.session = session
+
+    def get_session(self, id_or_name):
+        return self.session.get(FlowSession, id_or_name)
+
+    def _log(self, method, *args, **kwargs):
+        pass
+
+
+class TestSessionContextMixin:
+    """会话上下文混入类测试"""
+
+    @pytest.fixture
+    def manager(self):
+        engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        invalidate_workflow_graph()
+        session.add(WorkflowDefinition(id="wf-1", name="开发流程", stages_data=[]))
+        session.add_all(
+            [
+                Stage(id="s1", workflow_id="wf-1", name="设计", order_index=0, depends_on=[]),
+                Stage(id="s2", workflow_id="wf-1", name="实现", order_index=1, depends_on=["s1"]),
+                Stage(id="s3", workflow_id="wf-1", name="发布", order_index=2, depends_on=["s2"]),
+            ]
+        )
+        session.add(FlowSession(id="fs-1", workflow_id="wf-1", name="会话", completed_stages=["s1"], context={"current_stage": "s2"}))
+        session.commit()
+        yield ContextManager(session)
+        session.close()
+        invalidate_workflow_graph()
+
+    def test_next_stages_and_progress(self, manager):
+        assert [s["id"] for s in manager.get_next_stages("fs-1")] == ["s3"]
+        assert [s["id"] for s in manager.get_next_stages("fs-1", "s1")] == ["s2"]
+
+        progress = manager.get_session_progress("fs-1")
+        assert progress["current_stage"]["id"] == "s2"
+        assert progress["completed_count"] == 1
+
+    def test_unknown_workflow_or_stage(self, manager):
+        with pytest.raises(ValueError):
+            manager.get_next_stages("fs-1", "missing")
+
+        manager.session.add(FlowSession(id="fs-2", workflow_id="wf-missing", name="孤立会话", context={"current_stage": "s1"}))
+        manager.session.commit()
+        with pytest.raises(ValueError):
+            manager.get_session_progress("fs-2")